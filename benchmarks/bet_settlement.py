@@ -0,0 +1,174 @@
+"""Benchmarks settling a bet with thousands of betters.
+
+Runs `BetManager.close_a_bet` against an in-memory stand-in for MongoDB that adds a fixed latency to every round trip
+and reports how long settling took and how many round trips were made. For comparison, the same bet is also settled
+the way it used to be: looking up and paying out each winner one at a time.
+
+Usage:
+    python -m benchmarks.bet_settlement --betters 5000 --latency 0.5
+"""
+
+import argparse
+import collections
+import contextlib
+import datetime
+import random
+import time
+from collections.abc import Callable, Generator
+from unittest import mock
+
+from bson import ObjectId
+
+from discordbot.betmanager import BetManager
+from discordbot.bot_enums import SupporterType, TransactionTypes
+from mongo import interface, ttlcache
+
+GUILD_ID = 123
+KING_ID = 1
+OPTIONS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
+
+
+def _make_bet(betters: int) -> dict[str, any]:
+    """Creates a synthetic bet document with the given number of betters spread across the options."""
+    now = datetime.datetime.now(tz=datetime.UTC)
+    return {
+        "_id": ObjectId(),
+        "guild_id": GUILD_ID,
+        "bet_id": "0001",
+        "user": KING_ID,
+        "title": "benchmark bet",
+        "options": OPTIONS,
+        "option_dict": {option: {"val": option} for option in OPTIONS},
+        "created": now,
+        "timeout": now,
+        "active": True,
+        "result": None,
+        "channel_id": 1,
+        "message_id": 1,
+        "users": list(range(10, betters + 10)),
+        "betters": {
+            str(uid): {
+                "user_id": uid,
+                "emoji": random.choice(OPTIONS),
+                "points": random.randint(1, 500),
+                "first_bet": now,
+                "last_bet": now,
+            }
+            for uid in range(10, betters + 10)
+        },
+    }
+
+
+def _make_user(uid: int) -> dict[str, any]:
+    """Creates a user document."""
+    return {
+        "_id": ObjectId(),
+        "guild_id": GUILD_ID,
+        "uid": uid,
+        "name": str(uid),
+        "points": 100,
+        "king": uid == KING_ID,
+        "supporter_type": SupporterType.SUPPORTER if uid % 5 == 0 else SupporterType.NEUTRAL,
+    }
+
+
+@contextlib.contextmanager
+def _fake_mongo(bet: dict[str, any], latency: float) -> Generator[collections.Counter]:
+    """Replaces the interface functions with in-memory ones that sleep for the given latency per round trip.
+
+    Args:
+        bet (dict[str, any]): the bet document to serve
+        latency (float): the number of seconds each round trip takes
+
+    Yields:
+        collections.Counter: the number of round trips made to each collection
+    """
+    # start from cold caches so both ways of settling pay for their lookups
+    for name in ttlcache.get_cache_stats():
+        ttlcache.get_cache(name).clear()
+
+    calls = collections.Counter()
+    guild = {
+        "_id": ObjectId(),
+        "guild_id": GUILD_ID,
+        "name": "guild",
+        "owner_id": KING_ID,
+        "created": bet["created"],
+        "king": KING_ID,
+        "tax_rate": 0.1,
+        "supporter_tax_rate": 0.05,
+    }
+
+    def _round_trip(func: Callable[..., any]) -> Callable[..., any]:
+        def _wrapper(collection: str, *args: any, **kwargs: any) -> any:  # noqa: ARG001
+            calls[collection] += 1
+            time.sleep(latency)
+            return func(collection, *args)
+
+        return _wrapper
+
+    def _query(collection: str, parameters: dict[str, any], *_: any) -> list[dict[str, any]]:
+        if collection == "userbets":
+            return [bet]
+        if collection == "guilds":
+            return [guild]
+        uid = parameters.get("uid")
+        uids = uid["$in"] if isinstance(uid, dict) else [uid]
+        return [_make_user(uid) for uid in uids]
+
+    with (
+        mock.patch.object(interface, "get_client"),
+        mock.patch.object(interface, "get_database"),
+        mock.patch.object(interface, "get_collection", new=lambda _, name: name),
+        mock.patch.object(interface, "query", new=_round_trip(_query)),
+        mock.patch.object(interface, "update", new=_round_trip(lambda *_: None)),
+        mock.patch.object(interface, "insert", new=_round_trip(lambda *_: [])),
+        mock.patch.object(interface, "bulk_write", new=_round_trip(lambda *_: None)),
+    ):
+        yield calls
+
+
+def _settle_one_at_a_time(bet_manager: BetManager, bet: dict[str, any], emoji: list[str]) -> None:
+    """Settles the bet paying out each winner with their own round trips, like we used to."""
+    bet_manager.user_bets.close_a_bet(bet["_id"], emoji)
+    tax = bet_manager.guilds.get_tax_rate(GUILD_ID)
+    for better_id, better in bet["betters"].items():
+        if better["emoji"] not in emoji:
+            continue
+        user = bet_manager.user_points.find_user(int(better_id), GUILD_ID)
+        won, _ = bet_manager._calculate_taxed_winnings(  # noqa: SLF001
+            user.supporter_type == SupporterType.SUPPORTER, tax, better["points"], better["points"] * 2
+        )
+        bet_manager.user_points.increment_points(int(better_id), GUILD_ID, won, TransactionTypes.BET_WIN)
+    bet_manager.guilds.get_king(GUILD_ID)
+    bet_manager.user_points.increment_points(KING_ID, GUILD_ID, 0, TransactionTypes.BET_TAX)
+    bet_manager.user_bets.update({"bet_id": bet["bet_id"], "guild_id": GUILD_ID}, {"$set": {"winners": {}}})
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--betters", type=int, default=5000, help="the number of betters on the bet")
+    parser.add_argument("--latency", type=float, default=0.5, help="the milliseconds each round trip takes")
+    args = parser.parse_args()
+
+    random.seed(0)
+    bet = _make_bet(args.betters)
+    emoji = [OPTIONS[0]]
+    winners = sum(better["emoji"] in emoji for better in bet["betters"].values())
+    print(f"Settling a bet with {args.betters} betters and {winners} winners, {args.latency}ms per round trip")
+
+    for name, settle in (
+        ("one at a time", lambda manager: _settle_one_at_a_time(manager, bet, emoji)),
+        ("bulk", lambda manager: manager.close_a_bet(bet["bet_id"], GUILD_ID, emoji)),
+    ):
+        with _fake_mongo(bet, args.latency / 1000) as calls:
+            bet_manager = BetManager()
+            start = time.perf_counter()
+            settle(bet_manager)
+            elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {elapsed * 1000:9.1f}ms {calls.total():6d} round trips {dict(calls)}")
+
+
+if __name__ == "__main__":
+    main()
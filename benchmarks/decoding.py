@@ -0,0 +1,193 @@
+"""Benchmarks decoding database documents into our datatypes.
+
+Decodes synthetic messages, bets, transactions and users with each collection's `make_data_class` and reports the
+throughput for each document type. For comparison, the same documents are also decoded the way they used to be: by
+calling each dataclass with keyword arguments, nested documents included.
+
+Messages are decoded twice: once without looking at their reactions and replies, which are decoded lazily, and once
+reading all of them.
+
+Usage:
+    python -m benchmarks.decoding --documents 100000
+"""
+
+import argparse
+import dataclasses
+import datetime
+import random
+import time
+from collections.abc import Callable
+
+from bson import ObjectId
+
+from mongo.bsepoints.bets import UserBets
+from mongo.bsepoints.interactions import UserInteractions
+from mongo.bsepoints.points import UserPoints
+from mongo.bsepoints.transactions import UserTransactions
+from mongo.datatypes.actions import TransactionDB
+from mongo.datatypes.bet import BetDB, BetterDB, OptionDB
+from mongo.datatypes.message import MessageDB, ReactionDB, ReplyDB
+from mongo.datatypes.user import UserDB
+
+NOW = datetime.datetime.now(tz=datetime.UTC)
+
+
+def _make_message(num: int) -> dict[str, any]:
+    """Creates a message document with a few reactions and replies."""
+    return {
+        "_id": ObjectId(),
+        "guild_id": 1,
+        "channel_id": 2,
+        "message_id": num,
+        "user_id": random.randint(1, 50),
+        "timestamp": NOW,
+        "content": "some message content",
+        "message_type": ["message"],
+        "is_thread": False,
+        "is_vc": False,
+        "is_bot": False,
+        "reactions": [
+            {"user_id": random.randint(1, 50), "content": "👍", "timestamp": NOW} for _ in range(random.randint(0, 6))
+        ],
+        "replies": [
+            {"user_id": random.randint(1, 50), "content": "reply", "timestamp": NOW, "message_id": num + 1}
+            for _ in range(random.randint(0, 2))
+        ],
+    }
+
+
+def _make_bet(num: int) -> dict[str, any]:
+    """Creates a bet document with a few betters."""
+    options = ["1️⃣", "2️⃣", "3️⃣"]
+    betters = random.sample(range(1, 50), random.randint(0, 10))
+    return {
+        "_id": ObjectId(),
+        "guild_id": 1,
+        "bet_id": f"{num:04d}",
+        "user": 1,
+        "title": "some bet",
+        "options": options,
+        "option_dict": {option: {"val": option} for option in options},
+        "created": NOW,
+        "timeout": NOW,
+        "active": False,
+        "result": None,
+        "channel_id": 2,
+        "message_id": num,
+        "users": betters,
+        "betters": {
+            str(uid): {
+                "user_id": uid,
+                "emoji": random.choice(options),
+                "points": random.randint(1, 500),
+                "first_bet": NOW,
+                "last_bet": NOW,
+            }
+            for uid in betters
+        },
+    }
+
+
+def _make_transaction(num: int) -> dict[str, any]:
+    """Creates a transaction document."""
+    return {
+        "_id": ObjectId(),
+        "guild_id": 1,
+        "uid": random.randint(1, 50),
+        "type": 1,
+        "amount": num % 100,
+        "timestamp": NOW,
+        "comment": "",
+        "message_id": num,
+    }
+
+
+def _make_user(num: int) -> dict[str, any]:
+    """Creates a user document."""
+    return {
+        "_id": ObjectId(),
+        "guild_id": 1,
+        "uid": num,
+        "name": str(num),
+        "points": random.randint(0, 10000),
+        "king": False,
+    }
+
+
+def _legacy_message(message: dict[str, any]) -> MessageDB:
+    """Decodes a message like we used to."""
+    message["reactions"] = [ReactionDB(**react) for react in message.get("reactions", [])]
+    message["replies"] = [ReplyDB(**reply) for reply in message.get("replies", [])]
+    return MessageDB(**message)
+
+
+def _legacy_bet(bet: dict[str, any]) -> BetDB:
+    """Decodes a bet like we used to."""
+    bet["betters"] = {key: BetterDB(**value) for key, value in bet.get("betters", {}).items()}
+    bet["option_dict"] = {key: OptionDB(**value) for key, value in bet.get("option_dict", {}).items()}
+    return BetDB(**bet)
+
+
+def _legacy_transaction(transaction: dict[str, any]) -> TransactionDB:
+    """Decodes a transaction like we used to."""
+    cls_fields = {f.name for f in dataclasses.fields(TransactionDB)}
+    extras = {k: v for k, v in transaction.items() if k not in cls_fields}
+    return TransactionDB(**{k: v for k, v in transaction.items() if k in cls_fields}, extras=extras)
+
+
+def _read_nested(message: MessageDB) -> None:
+    """Reads all of a message's reactions and replies."""
+    for _ in message.reactions:
+        pass
+    for _ in message.replies:
+        pass
+
+
+def _time(decode: Callable[[dict[str, any]], any], documents: list[dict[str, any]], after: Callable | None) -> float:
+    """Times decoding each of the documents.
+
+    Args:
+        decode (Callable[[dict[str, any]], any]): the decoding function
+        documents (list[dict[str, any]]): the documents to decode
+        after (Callable | None): something to do with each decoded document
+
+    Returns:
+        float: the number of documents decoded a second
+    """
+    # the legacy decoders change the documents
+    documents = [dict(document) for document in documents]
+    start = time.perf_counter()
+    for document in documents:
+        decoded = decode(document)
+        if after is not None:
+            after(decoded)
+    return len(documents) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100000, help="the number of documents of each type")
+    args = parser.parse_args()
+
+    random.seed(0)
+    messages = [_make_message(num) for num in range(args.documents)]
+    bets = [_make_bet(num) for num in range(args.documents)]
+    transactions = [_make_transaction(num) for num in range(args.documents)]
+    users = [_make_user(num) for num in range(args.documents)]
+
+    print(f"Decoding {args.documents} documents of each type")
+    for name, documents, legacy, decode, after in (
+        ("messages", messages, _legacy_message, UserInteractions.make_data_class, None),
+        ("messages (read)", messages, _legacy_message, UserInteractions.make_data_class, _read_nested),
+        ("bets", bets, _legacy_bet, UserBets.make_data_class, None),
+        ("transactions", transactions, _legacy_transaction, UserTransactions.make_data_class, None),
+        ("users", users, lambda user: UserDB(**user), UserPoints.make_data_class, None),
+    ):
+        before = _time(legacy, documents, after)
+        now = _time(decode, documents, after)
+        print(f"{name:>16}: {before:10.0f}/s before {now:10.0f}/s now ({now / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmarks how well our wordle guess picking does.
+
+Replays the answers to the wordles we've previously attempted without a browser, using the solving engine with an
+oracle that knows the answer. The answers are solved in batches across processes. Each way of picking guesses is run
+against every answer, from the same starting word, and we report the average number of guesses, how many were solved
+within six guesses and how long solving took.
+
+Without a database, `--sample` plays against that many random words from the word list instead.
+
+Usage:
+    python -m benchmarks.wordle_solver
+    python -m benchmarks.wordle_solver --sample 5000 --processes 8
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from discordbot.wordle.constants import WORDLE_MAX_GUESSES
+from discordbot.wordle.engine import solve_batch
+from discordbot.wordle.wordlist import WordList, load_word_list
+from mongo.bsedataclasses import WordleAttempts
+
+
+def _get_answers(word_list: WordList, sample: int | None) -> list[str]:
+    """Gets the answers to play against.
+
+    Args:
+        word_list (WordList): the word list
+        sample (int | None): the number of random words to use instead of our previous answers
+
+    Returns:
+        list[str]: the answers
+    """
+    if sample:
+        return random.sample(word_list.words, sample)
+
+    attempts = WordleAttempts().query(
+        {"solved": True}, limit=0, projection={"actual_word": True, "wordle_num": True}, convert=False
+    )
+    # we attempt each wordle once for each guild
+    answers = {attempt["wordle_num"]: attempt["actual_word"] for attempt in attempts}
+    return [answer for _, answer in sorted(answers.items()) if answer in word_list.words]
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, help="play against this many random words instead of past answers")
+    parser.add_argument("--start", default="soare", help="the starting word")
+    parser.add_argument("--processes", type=int, help="how many processes to solve with, defaults to the CPU count")
+    args = parser.parse_args()
+
+    random.seed(0)
+    word_list = load_word_list()
+    answers = _get_answers(word_list, args.sample)
+    print(f"Replaying {len(answers)} answers starting with '{args.start}'")
+
+    for name, entropy in (("frequency", False), ("entropy", True)):
+        start = time.perf_counter()
+        games = solve_batch(answers, args.start, entropy, args.processes)
+        elapsed = time.perf_counter() - start
+
+        # count unsolved games as taking one more guess than we get
+        results = [len(game.guesses) if game.solved else WORDLE_MAX_GUESSES + 1 for game in games]
+        solved = sum(game.solved for game in games)
+        print(
+            f"{name:>10}: {statistics.mean(results):.3f} guesses on average, "
+            f"{solved}/{len(results)} solved in {WORDLE_MAX_GUESSES}, "
+            f"{elapsed * 1000 / len(results):.2f}ms per solve"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,23 @@
 """Pytest configuration and globalfixtures."""
+
+from collections.abc import Generator
+
+import pytest
+
+from mongo import ttlcache, writebuffer
+
+
+@pytest.fixture(autouse=True)
+def _clear_write_buffers() -> Generator[None]:
+    """Drops any database writes buffered during a test so they don't leak into other tests."""
+    yield
+    for buffer in writebuffer._BUFFERS.values():  # noqa: SLF001
+        buffer.clear()
+    writebuffer._BUFFERS.clear()  # noqa: SLF001
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Generator[None]:
+    """Drops any lookups cached during a test so they don't leak into other tests."""
+    yield
+    ttlcache._CACHES.clear()  # noqa: SLF001
@@ -110,19 +110,17 @@ class BetManager:
             points_won += math.floor(extra_eddies / num_winners)
         return points_won
 
+    @staticmethod
     def _calculate_taxed_winnings(
-        self,
-        better_id: int,
-        guild_id: int,
-        tax: tuple[int, int],
+        supporter: bool,
+        tax: tuple[float, float],
         actual_amount_won: int,
         points_won: int,
     ) -> tuple[int, int]:
         """Calculates the taxed winnings.
 
         Args:
-            better_id (int): the better ID
-            guild_id (int): the guild ID
+            supporter (bool): whether the better is a supporter
             tax (tuple): the normal tax rate and supporter tax rate
             actual_amount_won (int): the amount of eddies actually won
             points_won (int):
@@ -131,43 +129,38 @@ class BetManager:
             tuple[int, int]: eddiws_won, tax
         """
         tax_value, supporter_tax = tax
-        user_db = self.user_points.find_user(int(better_id), guild_id)
-        tr = supporter_tax if user_db.supporter_type == SupporterType.SUPPORTER else tax_value
+        tr = supporter_tax if supporter else tax_value
         tax_amount = math.floor(actual_amount_won * tr)
         eddies_won_minus_tax = points_won - tax_amount
         return eddies_won_minus_tax, tax_amount
 
-    def _process_bet_winner(
-        self: "BetManager",
-        bet_id: str,
-        guild_id: int,
-        better_id: str,
-        eddies_won_minus_tax: int,
-    ) -> None:
-        """Processes a bet winner.
-
-        Adds the eddies to the winner's total.
+    def _get_supporters(self, guild_id: int, user_ids: list[int]) -> set[int]:
+        """Gets which of the given users are supporters with a single query.
 
         Args:
-            bet_id (str): the bet ID
             guild_id (int): the guild ID
-            better_id (str): the winner ID
-            eddies_won_minus_tax (int): the eddies the user actually will get
+            user_ids (list[int]): the user IDs to check
+
+        Returns:
+            set[int]: the IDs of the users that are supporters
         """
-        self.logger.debug("%s won - incrementing eddies by %s", better_id, eddies_won_minus_tax)
-        self.user_points.increment_points(
-            int(better_id),
-            guild_id,
-            eddies_won_minus_tax,
-            TransactionTypes.BET_WIN,
-            bet_id=bet_id,
+        if not user_ids:
+            return set()
+        users = self.user_points.query(
+            {"guild_id": guild_id, "uid": {"$in": user_ids}},
+            limit=len(user_ids),
+            projection={"supporter_type": True},
         )
+        return {user.uid for user in users if user.supporter_type == SupporterType.SUPPORTER}
 
     def close_a_bet(self: "BetManager", bet_id: str, guild_id: int, emoji: list[str]) -> dict[str, any]:
         """Close a bet from a given bet ID.
 
         Here we also calculate who the winners are and allocate their winnings to them.
 
+        All the winnings and the King's tax are calculated up front. The bet is then closed with the winnings recorded
+        on it in one update, and everyone's eddies are given out in a single bulk write.
+
         Args:
             bet_id (str): the Id of the bet to close
             guild_id (int): the guild ID the bet resides in
@@ -178,8 +171,6 @@ class BetManager:
         """
         bet = self.user_bets.get_bet_from_id(guild_id, bet_id)
 
-        self.user_bets.close_a_bet(bet._id, emoji)  # noqa: SLF001
-
         ret_dict = {
             "result": emoji,
             "outcome_name": [bet.option_dict[e] for e in emoji],
@@ -206,16 +197,19 @@ class BetManager:
         except (KeyError, TypeError, ValueError, AttributeError):
             _extra_eddies = 0
 
-        # get tax value
+        # get tax value and the King, these come from the same cached guild document
         tax_value, supporter_tax = self.guilds.get_tax_rate(guild_id)
+        guild = self.guilds.get_guild(guild_id)
+        king_id = guild.king if guild else None
 
         # total eddies won and total taxes
         total_eddies_winnings = 0
         total_eddies_won = 0
         total_eddies_taxed = 0
 
-        # assign winning points to the users who got the answer right
+        # work out the winning points for the users who got the answer right
         winners = [b for b in bet.betters if bet.betters[b].emoji in emoji]
+        supporters = self._get_supporters(guild_id, [int(better_id) for better_id in winners])
         for better_id in winners:
             points_bet = bet.betters[better_id].points
             points_won = self._calculate_single_bet_winnings(
@@ -223,11 +217,9 @@ class BetManager:
             )
             actual_amount_won = points_won - points_bet
             eddies_won_minus_tax, tax_amount = self._calculate_taxed_winnings(
-                better_id, guild_id, (tax_value, supporter_tax), actual_amount_won, points_won
+                int(better_id) in supporters, (tax_value, supporter_tax), actual_amount_won, points_won
             )
 
-            self._process_bet_winner(bet_id, guild_id, better_id, eddies_won_minus_tax)
-
             self.logger.debug(
                 "%s bet %s eddies and won %s (%s) - getting taxed %s so %s",
                 better_id,
@@ -251,21 +243,19 @@ class BetManager:
             total_eddies_taxed,
         )
 
-        # give taxed eddies to the King
-        king_id = self.guilds.get_king(guild_id)
-        self.user_points.increment_points(
-            king_id,
-            guild_id,
-            total_eddies_taxed,
-            TransactionTypes.BET_TAX,
-            bet_id=bet_id,
-        )
+        # close the bet and add winnings to the bet entry in the database for future purposes
+        self.user_bets.close_a_bet(bet._id, emoji, ret_dict["winners"])  # noqa: SLF001
+
+        # give the winners their eddies and the taxed eddies to the King
+        amounts = {
+            TransactionTypes.BET_WIN: {int(better_id): amount for better_id, amount in ret_dict["winners"].items()}
+        }
+        if king_id is not None:
+            amounts[TransactionTypes.BET_TAX] = {king_id: total_eddies_taxed}
+        self.user_points.increment_points_by_type(guild_id, amounts, bet_id=bet_id)
 
         ret_dict["king_tax"] = total_eddies_taxed
         ret_dict["king"] = king_id
         ret_dict["total_winnings"] = total_eddies_winnings
 
-        # add winnings to the bet entry in the database for future purposes
-        self.user_bets.update({"bet_id": bet_id, "guild_id": guild_id}, {"$set": {"winners": ret_dict["winners"]}})
-
         return ret_dict
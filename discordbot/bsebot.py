@@ -3,9 +3,14 @@
 Class exists to override fetch_guild and fetch_channel to make less API calls.
 """
 
+import asyncio
+
 import discord
 from slomanlogger import SlomanLogger
 
+from mongo import interface
+from mongo.writebuffer import flush_write_buffers
+
 
 class BSEBot(discord.Bot):
     """BSEBot class.
@@ -64,3 +69,9 @@ class BSEBot(discord.Bot):
             self.logger.debug("Couldn't get channel %s, fetching instead", channel_id)
             channel = await super().fetch_channel(channel_id)
         return channel
+
+    async def close(self: "BSEBot") -> None:
+        """Closes the connection to Discord and writes any buffered database writes."""
+        await super().close()
+        self.logger.info("Flushing buffered database writes")
+        await asyncio.get_running_loop().run_in_executor(interface.get_executor(), flush_write_buffers)
@@ -284,13 +284,17 @@ class OnMessage(BaseEvent):
         if referenced_message and referenced_message.author.id != user_id:
             message_type.append("reply")
             if not message_type_only:
-                self.interactions.add_reply_to_message(
+                await self.interactions.run_async(
+                    self.interactions.add_reply_to_message,
                     reference.message_id,
                     message.id,
                     guild_id,
                     user_id,
                     message.created_at,
                     message.content,
+                    referenced_message.author.id,
+                    referenced_message.channel.id,
+                    referenced_message.created_at,
                     is_bot,
                 )
             return True
@@ -346,7 +350,8 @@ class OnMessage(BaseEvent):
         if message_type_only:
             return message_type
 
-        self.interactions.add_entry(
+        await self.interactions.run_async(
+            self.interactions.add_entry,
             message.id,
             guild_id,
             user_id,
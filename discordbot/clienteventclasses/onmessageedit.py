@@ -97,5 +97,7 @@ class OnMessageEdit(BaseEvent):
                 "$inc": {"edit_count": 1},
             },
         )
+        self.interactions.daily_stats.edit_message(db_message, message_type, after.content)
+        self.interactions.salary_tally.edit_entry(db_message, message_type, after.content)
 
         self.logger.debug("%s was edited - updated DB", after.id)
@@ -110,6 +110,22 @@ class OnVoiceStateChange(BaseEvent):
             vc_doc["message_type"].append("vc_streaming")
         return {"timestamp": now, "event": "streaming" if after.self_stream else "unstreaming"}
 
+    def _tally_vc_session(self, vc_doc: dict[str, any]) -> None:
+        """Updates the salary tally with the times for a VC session.
+
+        Args:
+            vc_doc (dict[str, any]): the VC interaction
+        """
+        self.interactions.salary_tally.update_vc_session(
+            vc_doc["guild_id"],
+            vc_doc["user_id"],
+            vc_doc["_id"],
+            vc_doc["timestamp"],
+            vc_doc["time_in_vc"] or 0,
+            vc_doc["time_streaming"] or 0,
+            "vc_streaming" in vc_doc["message_type"],
+        )
+
     async def on_voice_state_change(
         self,
         member: discord.Member,
@@ -155,7 +171,8 @@ class OnVoiceStateChange(BaseEvent):
         """
         self.logger.info("User %s, %s is joining %s", member.id, member.name, after.channel)
 
-        self.interactions.add_voice_state_entry(
+        vc_doc_db = await self.interactions.run_async(
+            self.interactions.add_voice_state_entry,
             after.channel.guild.id,
             member.id,
             after.channel.id,
@@ -164,6 +181,7 @@ class OnVoiceStateChange(BaseEvent):
             after.self_deaf,
             after.self_stream,
         )
+        self._tally_vc_session(dataclasses.asdict(vc_doc_db))
 
     async def left_vc(self, member: discord.Member, before: discord.VoiceState) -> None:
         """Updates the DB entry when a user leaves.
@@ -176,8 +194,8 @@ class OnVoiceStateChange(BaseEvent):
 
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
 
-        vc_doc_db = self.interactions.find_active_voice_state(
-            before.channel.guild.id, member.id, before.channel.id, now
+        vc_doc_db = await self.interactions.run_async(
+            self.interactions.find_active_voice_state, before.channel.guild.id, member.id, before.channel.id, now
         )
 
         if not vc_doc_db:
@@ -201,7 +219,7 @@ class OnVoiceStateChange(BaseEvent):
 
         event = {"timestamp": now, "event": "left"}
 
-        self.interactions.update(
+        await self.interactions.async_update(
             {"_id": vc_doc["_id"]},
             {
                 "$set": {
@@ -215,6 +233,7 @@ class OnVoiceStateChange(BaseEvent):
                 "$push": {"events": event},
             },
         )
+        self._tally_vc_session(vc_doc)
 
     async def toggle_statuses(
         self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
@@ -227,8 +246,8 @@ class OnVoiceStateChange(BaseEvent):
             after (discord.VoiceState): voice state object
         """
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-        vc_doc_db = self.interactions.find_active_voice_state(
-            before.channel.guild.id, member.id, before.channel.id, now
+        vc_doc_db = await self.interactions.run_async(
+            self.interactions.find_active_voice_state, before.channel.guild.id, member.id, before.channel.id, now
         )
 
         vc_doc = dataclasses.asdict(vc_doc_db)
@@ -242,7 +261,7 @@ class OnVoiceStateChange(BaseEvent):
             if event
         ]
 
-        self.interactions.update(
+        await self.interactions.async_update(
             {"_id": vc_doc["_id"]},
             {
                 "$set": {
@@ -260,3 +279,4 @@ class OnVoiceStateChange(BaseEvent):
                 "$push": {"events": {"$each": new_events}},
             },
         )
+        self._tally_vc_session(vc_doc)
@@ -144,6 +144,9 @@ WORDLE_REGEX = r"Wordle \d?\,?\d\d\d [\dX]/\d\n\n"
 # regex for getting wordle score
 WORDLE_SCORE_REGEX = r"[\dX]/\d"
 
+# the swear words we count for stats
+SWEARS = ["fuck", "shit", "cunt", "piss", "cock", "bollock", "dick", "twat"]
+
 # cool down in seconds for marvel ad messages
 MARVEL_AD_COOLDOWN = 3600
 # cool down in seconds for remind me reminders
@@ -48,3 +48,6 @@ class AlphabeticalMessageAction(BaseMessageAction):
         """
         await message.add_reaction("🔤")
         self.user_interactions.update({"message_id": message.id}, {"$push": {"message_type": "alphabetical"}})
+        self.user_interactions.salary_tally.add_message_types(
+            message.guild.id, message.author.id, message.id, message.created_at, ["alphabetical"]
+        )
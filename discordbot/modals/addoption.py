@@ -121,6 +121,8 @@ class AddBetOption(discord.ui.Modal):
             },
         )
         self.bet: BetDB = self.user_bets.get_bet_from_id(self.bet.guild_id, self.bet.bet_id)
+        # reschedules closing the bet
+        self.place.client.dispatch("bet_timeout_set", self.bet)
 
         channel = await interaction.guild.fetch_channel(self.bet.channel_id)
         message = await channel.fetch_message(self.bet.message_id)
@@ -142,5 +142,7 @@ class CreateBet(BSEddies):
             {"_id": bet._id},  # noqa: SLF001
             {"$set": {"message_id": message.id, "channel_id": message.channel.id}},
         )
+        # schedules closing the bet when it times out
+        self.client.dispatch("bet_timeout_set", bet)
 
         await ctx.followup.send(content="Created bet for you.", ephemeral=True, delete_after=5)
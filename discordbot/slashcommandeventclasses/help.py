@@ -8,6 +8,7 @@ import discord
 from discordbot.bot_enums import ActivityTypes
 from discordbot.bsebot import BSEBot
 from discordbot.slashcommandeventclasses.bseddies import BSEddies
+from mongo.bsepoints.activities import UserActivities
 
 
 class Help(BSEddies):
@@ -44,19 +45,14 @@ class Help(BSEddies):
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
         now += datetime.timedelta(hours=1)
         threshold = now - datetime.timedelta(days=60)
-        activities = self.activities.get_guild_activities_by_timestamp(ctx.guild_id, threshold, now)
-
-        activities = [act for act in activities if act.type in available_commands]
+        counts = UserActivities.count_by_type(
+            self.activities.stream_guild_activities(ctx.guild_id, threshold, now, activity_types=available_commands)
+        )
 
         app_commands = self.client.application_commands
 
-        counts = {}
-        for act in activities:
-            if act.type not in counts:
-                counts[act.type] = 0
-            counts[act.type] += 1
-
-        sorted_types = sorted(counts, key=lambda x: counts[x], reverse=True)
+        # already sorted by count
+        sorted_types = list(counts)
         if len(sorted_types) > 10:  # noqa: PLR2004
             sorted_types = sorted_types[:10]
 
@@ -126,7 +126,7 @@ class PlaceBet(BSEddies):
             await response.edit_message(content=msg, view=None, delete_after=10)
             return False
 
-        bet = self.user_bets.get_bet_from_id(guild.id, bet_id)
+        bet = success["bet"]
         channel = await self.client.fetch_channel(bet.channel_id)
 
         if not channel:
@@ -38,14 +38,18 @@ class Predict(BSEddies):
 
         self._add_event_type_to_activity_history(ctx.author, ctx.guild_id, ActivityTypes.BSEDDIES_PREDICT)
 
-        eddies_dict = self.manager.give_out_eddies(ctx.guild_id, False, 0)
-
-        eddies = eddies_dict[ctx.author.id][0]
-        breakdown = eddies_dict[ctx.author.id][1]
-        tax = eddies_dict[ctx.author.id][2]
-
         king_id = self.user_points.get_current_king(ctx.guild_id).uid
 
+        # answered from the live salary tally so we don't have to count the whole day's interactions
+        if ctx.author.id == CREATOR:
+            # the creator gets to see everyone's predictions
+            eddies_dict = await self.interactions.run_async(self.manager.give_out_eddies, ctx.guild_id, False, 0)
+            eddies, breakdown, tax = eddies_dict[ctx.author.id]
+        else:
+            eddies, breakdown, tax = await self.interactions.run_async(
+                self.manager.predict_salary, ctx.guild_id, ctx.author.id, king_id
+            )
+
         if king_id == ctx.author.id:
             tax_message = f"You're estimated to gain `{tax}` from tax gains."
         else:
@@ -1,19 +1,16 @@
 """Stats slash command."""
 
 import datetime
-import re
 from zoneinfo import ZoneInfo
 
 import discord
 
 from discordbot.bot_enums import ActivityTypes
 from discordbot.bsebot import BSEBot
-from discordbot.constants import WORDLE_SCORE_REGEX
 from discordbot.slashcommandeventclasses.bseddies import BSEddies
 from discordbot.stats.statsdatacache import StatsDataCache
 from discordbot.stats.statsdataclasses import StatsData
 from discordbot.views.stats import StatsView
-from mongo.datatypes.message import MessageDB
 
 
 class Stats(BSEddies):
@@ -32,84 +29,53 @@ class Stats(BSEddies):
         self.command_name = "stats"
 
     @staticmethod
-    def _do_message_counts(messages: list[MessageDB]) -> dict[str, any]:  # noqa: PLR0915
-        _swears = ["fuck", "shit", "cunt", "piss", "cock", "bollock", "dick", "twat"]
+    def _do_message_counts(
+        totals: dict[str, any], channels: list[dict[str, any]], users: list[dict[str, any]]
+    ) -> dict[str, any]:
+        """Works out the message stats from the summed daily message counters.
 
+        Args:
+            totals (dict[str, any]): the counters summed over the whole period
+            channels (list[dict[str, any]]): the counters summed for each channel, busiest first
+            users (list[dict[str, any]]): the counters summed for each user, chattiest first
+
+        Returns:
+            dict[str, any]: the message stats
+        """
         _dict = {}
 
-        _lengths = []
-        _words = []
-        _channels_dict = {}
-        _users_dict = {}
-        _swears_dict = dict.fromkeys(_swears, 0)
-
-        # these two should only be different when NOT in server mode
-        _replies_count = 0  # how many times this user received a reply
-        _replied_count = 0  # how many times this user replied to someone
-
-        _wordle_scores = []
-
-        for message in messages:
-            _channel_id = message.channel_id
-            if _channel_id not in _channels_dict:
-                _channels_dict[_channel_id] = 0
-            _channels_dict[_channel_id] += 1
-
-            if "message" in message.message_type:
-                uid = message.user_id
-                if uid not in _users_dict:
-                    _users_dict[uid] = 0
-                _users_dict[uid] += 1
-
-            # replies
-            if "reply" in message.message_type:
-                _replied_count += 1
-            _replies_count += len(message.replies)
-
-            if content := message.content:
-                _lengths.append(len(content))
-                _words.append(len(content.split(" ")))
-
-                if "wordle" in message.message_type:
-                    result = re.search(WORDLE_SCORE_REGEX, content).group()
-                    guesses = result.split("/")[0]
-
-                    if guesses == "X":
-                        guesses = "10"
-                    guesses = int(guesses)
-                    _wordle_scores.append(guesses)
-
-                # count swears
-                for swear in _swears:
-                    _swears_dict[swear] += content.count(swear)
-
-        top_channels = sorted(_channels_dict, key=lambda x: _channels_dict[x], reverse=True)
         top_five_channels = [
-            (_chan, _channels_dict[_chan])
-            for _chan in top_channels[: 5 if len(top_channels) > 5 else -1]  # noqa: PLR2004
+            (channel["_id"], channel["count"])
+            for channel in channels[: 5 if len(channels) > 5 else -1]  # noqa: PLR2004
         ]
 
+        _swears_dict = totals["swears"]
         top_swears = sorted(_swears_dict, key=lambda x: _swears_dict[x], reverse=True)
         top_three_swears = [(_swear, _swears_dict[_swear]) for _swear in top_swears[:3] if _swears_dict[_swear]]
 
-        top_users = sorted(_users_dict, key=lambda x: _users_dict[x], reverse=True)
         top_five_users = [
-            (_user, _users_dict[_user])
-            for _user in top_users[: 5 if len(top_users) > 5 else -1]  # noqa: PLR2004
+            (user["_id"], user["count"])
+            for user in users[: 5 if len(users) > 5 else -1]  # noqa: PLR2004
         ]
 
+        _dict["total_messages"] = totals["count"]
         _dict["top_five"] = top_five_channels
-        _dict["average_length"] = round((sum(_lengths) / len(_lengths)), 2)
-        _dict["average_word_count"] = round((sum(_words) / len(_words)), 2)
         _dict["total_swears"] = sum(_swears_dict.values())
         _dict["top_swears"] = top_three_swears
-        _dict["replies_count"] = _replies_count
-        _dict["replied_count"] = _replied_count
+        _dict["replies_count"] = totals["replies_received"]
+        _dict["replied_count"] = totals["replied"]
         _dict["top_users"] = top_five_users
-        _dict["wordles"] = len(_wordle_scores)
+        _dict["wordles"] = totals["wordles"]
 
         try:
-            _dict["average_wordle_score"] = round((sum(_wordle_scores) / len(_wordle_scores)), 2)
+            _dict["average_length"] = round((totals["length"] / totals["content_messages"]), 2)
+            _dict["average_word_count"] = round((totals["words"] / totals["content_messages"]), 2)
+        except ZeroDivisionError:
+            _dict["average_length"] = 0.0
+            _dict["average_word_count"] = 0.0
+
+        try:
+            _dict["average_wordle_score"] = round((totals["wordle_score"] / totals["wordles"]), 2)
         except ZeroDivisionError:
             _dict["average_wordle_score"] = 0.0
 
@@ -286,19 +252,20 @@ class Stats(BSEddies):
         _cache = StatsDataCache(uid=interaction.user.id if not server else None)
 
         # messages
-        messages = _cache.get_messages(_guild_id, start, end)
-        monthly_messages = [m for m in messages if month_start <= m.timestamp <= month_end]
-
-        total_messages = len(messages)
-        monthly_total_messages = len(monthly_messages)
-
-        # start the count
-        counts = self._do_message_counts(messages)
-        monthly_counts = self._do_message_counts(monthly_messages)
+        counts = self._do_message_counts(
+            _cache.get_message_totals(_guild_id, start, end),
+            _cache.get_message_counters(_guild_id, start, end, "channel_id"),
+            _cache.get_message_counters(_guild_id, start, end, "user_id"),
+        )
+        monthly_counts = self._do_message_counts(
+            _cache.get_message_totals(_guild_id, month_start, month_end),
+            _cache.get_message_counters(_guild_id, month_start, month_end, "channel_id"),
+            _cache.get_message_counters(_guild_id, month_start, month_end, "user_id"),
+        )
 
         # create dataclasses
         total_stats = StatsData(
-            total_messages=total_messages,
+            total_messages=counts["total_messages"],
             top_channels=counts["top_five"],
             average_length=counts["average_length"],
             average_words=counts["average_word_count"],
@@ -312,7 +279,7 @@ class Stats(BSEddies):
         )
 
         monthly_stats = StatsData(
-            total_messages=monthly_total_messages,
+            total_messages=monthly_counts["total_messages"],
             top_channels=monthly_counts["top_five"],
             average_length=monthly_counts["average_length"],
             average_words=monthly_counts["average_word_count"],
@@ -0,0 +1,215 @@
+"""Single pass message aggregates.
+
+Most of the message based stats group the same list of messages by user, channel or day. Rather than
+having every stat iterate the full message list, we iterate it once here and build all the counters the
+stats need. The stats methods then become lookups on top of these counters.
+
+All the grouped dictionaries preserve the order in which keys were first seen so that any
+`max`/`min` tie-breaks behave exactly as they did when the stats iterated the messages themselves.
+"""
+
+from typing import TYPE_CHECKING
+
+from discordbot.constants import BSE_BOT_ID, JERK_OFF_CHAT
+from mongo.datatypes.message import MessageDB
+
+if TYPE_CHECKING:
+    import datetime
+
+
+class GroupCounter:
+    """Counts messages for a given group (a channel, thread or day) and tracks who and where they came from."""
+
+    __slots__ = ("channels", "count", "users")
+
+    def __init__(self) -> None:
+        """Initialisation method."""
+        self.count: int = 0
+        self.users: dict[int, None] = {}
+        self.channels: dict[int, None] = {}
+
+    @classmethod
+    def from_document(cls, document: dict[str, any]) -> "GroupCounter":
+        """Creates the group counter from a grouped aggregation document.
+
+        Args:
+            document (dict[str, any]): the document with a `count` and optional `users` and `channels` lists
+
+        Returns:
+            GroupCounter: the group counter
+        """
+        group = cls()
+        group.count = document["count"]
+        group.users = dict.fromkeys(document.get("users", []))
+        group.channels = dict.fromkeys(document.get("channels", []))
+        return group
+
+    def add(self, user_id: int, channel_id: int) -> None:
+        """Adds a message to the group.
+
+        Args:
+            user_id (int): the user who sent the message
+            channel_id (int): the channel the message was sent in
+        """
+        self.count += 1
+        self.users[user_id] = None
+        self.channels[channel_id] = None
+
+    def as_dict(self) -> dict[str, int | list[int]]:
+        """Returns the dict representation the stats store in their kwargs.
+
+        Returns:
+            dict[str, int | list[int]]: the count and the list of users
+        """
+        return {"count": self.count, "users": list(self.users)}
+
+
+class UserMessageCounter:
+    """Counts messages for a given user."""
+
+    __slots__ = ("channels", "count", "threads")
+
+    def __init__(self) -> None:
+        """Initialisation method."""
+        self.count: int = 0
+        self.channels: dict[int, None] = {}
+        self.threads: dict[int, None] = {}
+
+    @classmethod
+    def from_document(cls, document: dict[str, any]) -> "UserMessageCounter":
+        """Creates the user counter from a grouped aggregation document.
+
+        Args:
+            document (dict[str, any]): the document with a `count` and the `channels` and `threads` lists
+
+        Returns:
+            UserMessageCounter: the user counter
+        """
+        counter = cls()
+        counter.count = document["count"]
+        counter.channels = dict.fromkeys(document.get("channels", []))
+        counter.threads = dict.fromkeys(document.get("threads", []))
+        return counter
+
+
+class MessageAggregates:
+    """Aggregates a list of messages into all the counters the message stats need in a single pass."""
+
+    def __init__(self, messages: list[MessageDB]) -> None:
+        """Initialisation method.
+
+        Args:
+            messages (list[MessageDB]): the messages to aggregate
+        """
+        self.total: int = 0
+        self.thread_total: int = 0
+
+        self.channels: dict[int, None] = {}
+        self.users: dict[int, None] = {}
+        self.thread_channels: dict[int, None] = {}
+        self.thread_users: dict[int, None] = {}
+
+        self.content_count: int = 0
+        self.content_length: int = 0
+        self.content_words: int = 0
+
+        # non-thread, non-vc channels
+        self.channel_groups: dict[int, GroupCounter] = {}
+        self.thread_groups: dict[int, GroupCounter] = {}
+        self.day_groups: dict[datetime.date, GroupCounter] = {}
+        # unique users per channel for every message
+        self.channel_users: dict[int, dict[int, None]] = {}
+        # per user channel counts for every message
+        self.user_channel_counts: dict[int, dict[int, int]] = {}
+
+        # per user counts, excluding the bot
+        self.user_messages: dict[int, UserMessageCounter] = {}
+        self.user_thread_messages: dict[int, int] = {}
+
+        self.longest_message: MessageDB | None = None
+        self.wordle_messages: list[MessageDB] = []
+        self.alphabetical_users: dict[int, int] = {}
+        self.twitter_users: dict[int, int] = {}
+        self.jerk_off_users: dict[int, int] = {}
+
+        for message in messages:
+            self._add(message)
+
+    @staticmethod
+    def _get_group(groups: dict[any, GroupCounter], key: any) -> GroupCounter:
+        """Gets the group counter for the given key, creating it if it doesn't exist yet.
+
+        Args:
+            groups (dict[any, GroupCounter]): the groups to get the counter from
+            key (any): the key of the group
+
+        Returns:
+            GroupCounter: the group counter
+        """
+        if (group := groups.get(key)) is None:
+            group = groups[key] = GroupCounter()
+        return group
+
+    def _add(self, message: MessageDB) -> None:
+        """Adds a single message to all the counters.
+
+        Args:
+            message (MessageDB): the message to add
+        """
+        user_id = message.user_id
+        channel_id = message.channel_id
+        content = message.content
+        message_type = message.message_type
+
+        self.total += 1
+        self.channels[channel_id] = None
+        self.users[user_id] = None
+
+        if content:
+            self.content_count += 1
+            self.content_length += len(content)
+            self.content_words += len(content.split(" "))
+
+        if message.is_thread:
+            self.thread_total += 1
+            self.thread_channels[channel_id] = None
+            self.thread_users[user_id] = None
+            self._get_group(self.thread_groups, channel_id).add(user_id, channel_id)
+        elif not message.is_vc and channel_id:
+            self._get_group(self.channel_groups, channel_id).add(user_id, channel_id)
+
+        self._get_group(self.day_groups, message.timestamp.date()).add(user_id, channel_id)
+        self.channel_users.setdefault(channel_id, {})[user_id] = None
+
+        user_channels = self.user_channel_counts.setdefault(user_id, {})
+        user_channels[channel_id] = user_channels.get(channel_id, 0) + 1
+
+        if "wordle" in message_type:
+            self.wordle_messages.append(message)
+
+        if ("twitter" in content or "https://x.com/" in content) and "link" in message_type:
+            self.twitter_users[user_id] = self.twitter_users.get(user_id, 0) + 1
+
+        if channel_id == JERK_OFF_CHAT and ("link" in message_type or "attachment" in message_type):
+            self.jerk_off_users[user_id] = self.jerk_off_users.get(user_id, 0) + 1
+
+        if content:
+            message_parts = content.lower().split()
+            # don't count short messages
+            if len(message_parts) >= 4 and message_parts == sorted(message_parts):  # noqa: PLR2004
+                self.alphabetical_users[user_id] = self.alphabetical_users.get(user_id, 0) + 1
+
+        if user_id == BSE_BOT_ID:
+            return
+
+        if (user_counter := self.user_messages.get(user_id)) is None:
+            user_counter = self.user_messages[user_id] = UserMessageCounter()
+        user_counter.count += 1
+        if message.is_thread:
+            user_counter.threads[channel_id] = None
+            self.user_thread_messages[user_id] = self.user_thread_messages.get(user_id, 0) + 1
+        else:
+            user_counter.channels[channel_id] = None
+
+        if content and (not self.longest_message or len(content) > len(self.longest_message.content)):
+            self.longest_message = message
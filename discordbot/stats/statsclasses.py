@@ -2,6 +2,7 @@
 
 import dataclasses
 import datetime
+import operator
 import re
 from copy import deepcopy
 from typing import TYPE_CHECKING
@@ -15,13 +16,13 @@ from discordbot.constants import (
     ANNUAL_AWARDS_AWARD,
     BSE_BOT_ID,
     GENERAL_VC_CHAT,
-    JERK_OFF_CHAT,
     MONTHLY_AWARDS_PRIZE,
     STAT_DATETIME_FORMAT,
     WORDLE_SCORE_REGEX,
 )
 from discordbot.stats.statsdatacache import StatsDataCache
 from discordbot.stats.statsdataclasses import StatDB
+from mongo.keywordcounter import KeywordCounter
 
 if TYPE_CHECKING:
     from mongo.datatypes.message import ReactionDB
@@ -108,10 +109,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the number of messages stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-
-        channel_ids = {message.channel_id for message in messages}
-        user_ids = {message.user_id for message in messages}
+        totals = self.cache.get_message_totals(guild_id, start, end)
 
         data_class = StatDB(
             _id="",
@@ -119,11 +117,11 @@ class StatsGatherer:  # noqa: PLR0904
             guild_id=guild_id,
             stat=StatTypes.NUMBER_OF_MESSAGES,
             month=start.strftime(STAT_DATETIME_FORMAT),
-            value=len(messages),
+            value=totals["count"],
             timestamp=datetime.datetime.now(tz=ZoneInfo("UTC")),
             short_name="number_of_messages",
             annual=self.annual,
-            kwargs={"channels": len(channel_ids), "users": len(user_ids)},
+            kwargs={"channels": len(totals["channels"]), "users": len(totals["users"])},
         )
 
         return self.add_annual_changes(start, data_class)
@@ -139,10 +137,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the thread message stat
         """
-        messages = self.cache.get_threaded_messages(guild_id, start, end)
-
-        channel_ids = {m.channel_id for m in messages}
-        user_ids = {m.user_id for m in messages}
+        aggregates = self.cache.get_message_aggregates(guild_id, start, end)
 
         data_class = StatDB(
             _id="",
@@ -150,11 +145,11 @@ class StatsGatherer:  # noqa: PLR0904
             guild_id=guild_id,
             stat=StatTypes.NUMBER_OF_THREAD_MESSAGES,
             month=start.strftime(STAT_DATETIME_FORMAT),
-            value=len(messages),
+            value=aggregates.thread_total,
             timestamp=datetime.datetime.now(tz=ZoneInfo("UTC")),
             short_name="number_of_thread_messages",
             annual=self.annual,
-            kwargs={"channels": len(channel_ids), "users": len(user_ids)},
+            kwargs={"channels": len(aggregates.thread_channels), "users": len(aggregates.thread_users)},
         )
 
         return self.add_annual_changes(start, data_class)
@@ -175,15 +170,9 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             tuple[Stat, Stat]: returns a tuple of average message characters and average words per message stats
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        lengths = []
-        words = []
-        for message in messages:
-            if content := message.content:
-                lengths.append(len(content))
-                words.append(len(content.split(" ")))
-        average_message_len = round((sum(lengths) / len(lengths)), 2)
-        average_word_number = round((sum(words) / len(words)), 2)
+        totals = self.cache.get_message_totals(guild_id, start, end)
+        average_message_len = round((totals["length"] / totals["content_messages"]), 2)
+        average_word_number = round((totals["words"] / totals["content_messages"]), 2)
 
         data_class_a = StatDB(
             _id="",
@@ -225,20 +214,8 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the busiest channel stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        messages = [m for m in messages if not m.is_thread and not m.is_vc]
-
-        channels = {}
-        for message in messages:
-            channel_id = message.channel_id
-            user_id = message.user_id
-            if not channel_id:
-                continue
-            if channel_id not in channels:
-                channels[channel_id] = {"count": 0, "users": []}
-            channels[channel_id]["count"] += 1
-            if user_id not in channels[channel_id]["users"]:
-                channels[channel_id]["users"].append(user_id)
+        channel_groups = self.cache.get_channel_message_counts(guild_id, start, end)
+        channels = {channel_id: group.as_dict() for channel_id, group in channel_groups.items()}
 
         busiest = max(channels, key=lambda x: channels[x]["count"])
 
@@ -272,19 +249,8 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the stat class
         """
-        threaded = self.cache.get_threaded_messages(guild_id, start, end)
-
-        threads = {}
-        for thread_message in threaded:
-            thread_id = thread_message.channel_id
-            user_id = thread_message.user_id
-
-            if thread_id not in threads:
-                threads[thread_id] = {"count": 0, "users": []}
-            threads[thread_id]["count"] += 1
-
-            if user_id not in threads[thread_id]["users"]:
-                threads[thread_id]["users"].append(user_id)
+        aggregates = self.cache.get_message_aggregates(guild_id, start, end)
+        threads = {thread_id: group.as_dict() for thread_id, group in aggregates.thread_groups.items()}
 
         try:
             busiest = max(threads, key=lambda x: threads[x]["count"])
@@ -322,22 +288,9 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the busiest day stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        days = {}
-        for message in messages:
-            channel_id = message.channel_id
-            user_id = message.user_id
-            day = message.timestamp.date()
-            if day not in days:
-                days[day] = {"count": 0, "channels": [], "users": []}
-            days[day]["count"] += 1
-
-            if channel_id not in days[day]["channels"]:
-                days[day]["channels"].append(channel_id)
-            if user_id not in days[day]["users"]:
-                days[day]["users"].append(user_id)
+        days = self.cache.get_day_message_counts(guild_id, start, end)
 
-        busiest = max(days, key=lambda x: days[x]["count"])  # type: datetime.date
+        busiest = max(days, key=lambda x: days[x].count)  # type: datetime.date
 
         data_class = StatDB(
             _id="",
@@ -350,9 +303,9 @@ class StatsGatherer:  # noqa: PLR0904
             short_name="busiest_day",
             annual=self.annual,
             kwargs={
-                "messages": days[busiest]["count"],
-                "users": len(days[busiest]["users"]),
-                "channels": len(days[busiest]["channels"]),
+                "messages": days[busiest].count,
+                "users": len(days[busiest].users),
+                "channels": len(days[busiest].channels),
             },
         )
 
@@ -374,20 +327,8 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the quietest channel stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        messages = [m for m in messages if not m.is_thread and not m.is_vc]
-
-        channels: dict[int, dict[str, int | list]] = {}
-        for message in messages:
-            channel_id = message.channel_id
-            user_id = message.user_id
-            if not channel_id:
-                continue
-            if channel_id not in channels:
-                channels[channel_id] = {"count": 0, "users": []}
-            channels[channel_id]["count"] += 1
-            if user_id not in channels[channel_id]["users"]:
-                channels[channel_id]["users"].append(user_id)
+        channel_groups = self.cache.get_channel_message_counts(guild_id, start, end)
+        channels = {channel_id: group.as_dict() for channel_id, group in channel_groups.items()}
 
         quietest = min(channels, key=lambda x: channels[x]["count"])
 
@@ -421,19 +362,8 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the quietest thread stat
         """
-        threaded = self.cache.get_threaded_messages(guild_id, start, end)
-
-        threads: dict[int, dict[str, int | list]] = {}
-        for thread_message in threaded:
-            thread_id = thread_message.channel_id
-            user_id = thread_message.user_id
-
-            if thread_id not in threads:
-                threads[thread_id] = {"count": 0, "users": []}
-            threads[thread_id]["count"] += 1
-
-            if user_id not in threads[thread_id]["users"]:
-                threads[thread_id]["users"].append(user_id)
+        aggregates = self.cache.get_message_aggregates(guild_id, start, end)
+        threads = {thread_id: group.as_dict() for thread_id, group in aggregates.thread_groups.items()}
 
         try:
             quietest = min(threads, key=lambda x: threads[x]["count"])
@@ -471,22 +401,9 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the quietest day stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        days: dict[int, dict[str, int | list]] = {}
-        for message in messages:
-            channel_id = message.channel_id
-            user_id = message.user_id
-            day = message.timestamp.date()
-            if day not in days:
-                days[day] = {"count": 0, "channels": [], "users": []}
-            days[day]["count"] += 1
-
-            if channel_id not in days[day]["channels"]:
-                days[day]["channels"].append(channel_id)
-            if user_id not in days[day]["users"]:
-                days[day]["users"].append(user_id)
+        days = self.cache.get_day_message_counts(guild_id, start, end)
 
-        quietest = min(days, key=lambda x: days[x]["count"])  # type: datetime.date
+        quietest = min(days, key=lambda x: days[x].count)  # type: datetime.date
 
         data_class = StatDB(
             _id="",
@@ -499,9 +416,9 @@ class StatsGatherer:  # noqa: PLR0904
             short_name="quietest_day",
             annual=self.annual,
             kwargs={
-                "messages": days[quietest]["count"],
-                "channels": len(days[quietest]["channels"]),
-                "users": len(days[quietest]["users"]),
+                "messages": days[quietest].count,
+                "channels": len(days[quietest].channels),
+                "users": len(days[quietest].users),
             },
         )
 
@@ -545,12 +462,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the salary stat
         """
-        transactions = self.cache.get_transactions(guild_id, start, end)
-        salary_total = 0
-        for trans in transactions:
-            if trans.type != TransactionTypes.DAILY_SALARY:
-                continue
-            salary_total += trans.amount
+        salary_total = self.cache.get_transaction_totals(guild_id, start, end).get(TransactionTypes.DAILY_SALARY, 0)
 
         data_class = StatDB(
             _id="",
@@ -577,8 +489,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: average wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         wordle_count = []
         for wordle in wordle_messages:
@@ -595,6 +506,7 @@ class StatsGatherer:  # noqa: PLR0904
 
         bot_wordles = self.cache.user_interactions.paginated_query(
             {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}, "message_type": "wordle", "is_bot": True},
+            as_gen=True,
         )
         bot_wordle_count = []
         for wordle in bot_wordles:
@@ -646,16 +558,10 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Tuple[Stat, Stat]: returns a tuple of eddies placed and eddies won
         """
-        transactions = self.cache.get_transactions(guild_id, start, end)
+        totals = self.cache.get_transaction_totals(guild_id, start, end)
 
-        eddies_placed = 0
-        eddies_won = 0
-        for trans in transactions:
-            trans_type = trans.type
-            if trans_type == TransactionTypes.BET_PLACE:
-                eddies_placed -= trans.amount  # amount is negative in these cases
-            elif trans_type == TransactionTypes.BET_WIN:
-                eddies_won += trans.amount
+        eddies_placed = -totals.get(TransactionTypes.BET_PLACE, 0)  # amount is negative in these cases
+        eddies_won = totals.get(TransactionTypes.BET_WIN, 0)
 
         data_class_a = StatDB(
             _id="",
@@ -699,16 +605,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: channel contrib stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-
-        channels = {}
-        for message in messages:
-            channel_id = message.channel_id
-            user_id = message.user_id
-            if channel_id not in channels:
-                channels[channel_id] = []
-            if user_id not in channels[channel_id]:
-                channels[channel_id].append(user_id)
+        channels = self.cache.get_message_aggregates(guild_id, start, end).channel_users
 
         most_popular_channel = max(channels, key=lambda x: len(channels[x]))
 
@@ -738,20 +635,10 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: time spent in VC stat
         """
-        vc_interactions = self.cache.get_vc_interactions(guild_id, start, end)
-        vc_time = 0
-        channels = []
-        users = []
-
-        for interaction in vc_interactions:
-            time_spent = interaction.time_in_vc
-            user_id = interaction.user_id
-            channel_id = interaction.channel_id
-            vc_time += time_spent
-            if channel_id not in channels:
-                channels.append(channel_id)
-            if user_id not in users:
-                users.append(user_id)
+        vc_totals = self.cache.get_vc_totals(guild_id, start, end)
+        vc_time = vc_totals["time_in_vc"]
+        channels = vc_totals["channels"]
+        users = vc_totals["users"]
 
         data_class = StatDB(
             _id="",
@@ -901,7 +788,7 @@ class StatsGatherer:  # noqa: PLR0904
             reactions.extend(_reactions)
 
         all_emojis = self.cache.get_emojis(guild_id, start, end)
-        all_emoji_names = [emoji.name for emoji in all_emojis]
+        all_emoji_names = {emoji.name: None for emoji in all_emojis}
 
         emoji_count: dict[str, int] = {}
         for reaction in reactions:
@@ -912,12 +799,14 @@ class StatsGatherer:  # noqa: PLR0904
                 emoji_count[content] = 0
             emoji_count[content] += 1
 
+        # count all the emojis in each message in a single scan
+        counter = KeywordCounter(f":{emoji_name}:" for emoji_name in all_emoji_names)
         for message in messages:
-            for emoji_name in all_emoji_names:
-                if emojis := re.findall(f":{emoji_name}:", message.content):
-                    if emoji_name not in emoji_count:
-                        emoji_count[emoji_name] = 0
-                    emoji_count[emoji_name] += len(emojis)
+            for token, count in counter.count(message.content).items():
+                emoji_name = token[1:-1]
+                if emoji_name not in emoji_count:
+                    emoji_count[emoji_name] = 0
+                emoji_count[emoji_name] += count
 
         try:
             most_used_emoji = max(emoji_count, key=lambda x: emoji_count[x])
@@ -1046,21 +935,12 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the most messages stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
+        user_messages = self.cache.get_user_message_counts(guild_id, start, end)
 
-        message_users: dict[int, dict[str, int | list]] = {}
-        for message in messages:
-            uid = message.user_id
-            if uid == BSE_BOT_ID:
-                continue
-            if uid not in message_users:
-                message_users[uid] = {"count": 0, "channels": [], "threads": []}
-            message_users[uid]["count"] += 1
-            if message.is_thread:
-                if message.channel_id not in message_users[uid]["threads"]:
-                    message_users[uid]["threads"].append(message.channel_id)
-            elif message.channel_id not in message_users[uid]["channels"]:
-                message_users[uid]["channels"].append(message.channel_id)
+        message_users: dict[int, dict[str, int | list]] = {
+            uid: {"count": counter.count, "channels": list(counter.channels), "threads": list(counter.threads)}
+            for uid, counter in user_messages.items()
+        }
 
         try:
             chattiest = max(message_users, key=lambda x: message_users[x]["count"])
@@ -1096,16 +976,9 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: least messages stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
+        user_messages = self.cache.get_user_message_counts(guild_id, start, end)
 
-        message_users: dict[int, dict[str, int | list]] = {}
-        for message in messages:
-            uid = message.user_id
-            if uid == BSE_BOT_ID:
-                continue
-            if uid not in message_users:
-                message_users[uid] = 0
-            message_users[uid] += 1
+        message_users: dict[int, int] = {uid: counter.count for uid, counter in user_messages.items()}
 
         try:
             least_chattiest = min(message_users, key=lambda x: message_users[x])
@@ -1141,16 +1014,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the most thread messages stat
         """
-        messages = self.cache.get_threaded_messages(guild_id, start, end)
-
-        message_users: dict[int, int] = {}
-        for message in messages:
-            uid = message.user_id
-            if uid == BSE_BOT_ID:
-                continue
-            if uid not in message_users:
-                message_users[uid] = 0
-            message_users[uid] += 1
+        message_users = dict(self.cache.get_message_aggregates(guild_id, start, end).user_thread_messages)
 
         try:
             chattiest = max(message_users, key=lambda x: message_users[x])
@@ -1186,17 +1050,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the longest message stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        longest_message = None
-        for message in messages:
-            if message.user_id == BSE_BOT_ID:
-                continue
-            if content := message.content:
-                if not longest_message:
-                    longest_message = message
-                    continue
-                if len(content) > len(longest_message.content):
-                    longest_message = message
+        longest_message = self.cache.get_message_aggregates(guild_id, start, end).longest_message
 
         data_class = StatDB(
             _id="",
@@ -1225,22 +1079,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-
-        message_users: dict[int, int] = {}
-        for message in messages:
-            if not message.content:
-                continue
-            message_parts = message.content.lower().split()
-            if len(message_parts) < 4:  # noqa: PLR2004
-                # don't count short messages
-                continue
-            sorted_message_parts = sorted(message_parts)
-            if message_parts == sorted_message_parts:
-                # match! message parts are alphabetical
-                if message.user_id not in message_users:
-                    message_users[message.user_id] = 0
-                message_users[message.user_id] += 1
+        message_users = dict(self.cache.get_message_aggregates(guild_id, start, end).alphabetical_users)
 
         try:
             user = max(message_users, key=lambda x: message_users[x])
@@ -1276,8 +1115,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         # number of days in the time period
         days = (end - start).days
@@ -1352,8 +1190,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         # number of days in the time period
         days = (end - start).days
@@ -1429,8 +1266,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             StatDB: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         wordle_count: dict[int, int] = {}
         for wordle in wordle_messages:
@@ -1482,8 +1318,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             StatDB: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         wordle_count: dict[int, int] = {}
         for wordle in wordle_messages:
@@ -1540,8 +1375,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             StatDB: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m.message_type]
+        wordle_messages = self.cache.get_message_aggregates(guild_id, start, end).wordle_messages
 
         wordle_count: dict[int, int] = {}
         for wordle in wordle_messages:
@@ -1596,15 +1430,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: twitter stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-
-        tweet_users: dict[int, int] = {}
-        for message in messages:
-            if ("twitter" in message.content or "https://x.com/" in message.content) and "link" in message.message_type:
-                user_id = message.user_id
-                if user_id not in tweet_users:
-                    tweet_users[user_id] = 0
-                tweet_users[user_id] += 1
+        tweet_users = dict(self.cache.get_message_aggregates(guild_id, start, end).twitter_users)
 
         try:
             twitter_addict = max(tweet_users, key=lambda x: tweet_users[x])
@@ -1641,16 +1467,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: jerk off stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        jerk_off_messages = [m for m in messages if m.channel_id == JERK_OFF_CHAT]
-
-        jerk_off_users: dict[int, int] = {}
-        for message in jerk_off_messages:
-            if any(a for a in ["link", "attachment"] if a in message.message_type):
-                user_id = message.user_id
-                if user_id not in jerk_off_users:
-                    jerk_off_users[user_id] = 0
-                jerk_off_users[user_id] += 1
+        jerk_off_users = dict(self.cache.get_message_aggregates(guild_id, start, end).jerk_off_users)
 
         try:
             masturbator = max(jerk_off_users, key=lambda x: jerk_off_users[x])
@@ -1905,22 +1722,14 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the most swears stat
         """
-        swears = ["fuck", "shit", "cunt", "piss", "cock", "bollock", "dick", "twat"]
-        all_messages = self.cache.get_messages(guild_id, start, end)
-
-        swear_dict: dict[int, int] = {}
-        for message in all_messages:
-            uid = message.user_id
-            content = message.content
-            if not content:
-                continue
+        user_counters = self.cache.get_message_counters(guild_id, start, end, "user_id")
 
-            if uid not in swear_dict:
-                swear_dict[uid] = 0
-            swear_count = 0
-            for swear in swears:
-                swear_count += content.count(swear)
-            swear_dict[uid] += swear_count
+        # order the users by their first message so that ties are broken the same way as counting the messages
+        swear_dict: dict[int, int] = {
+            counters["_id"]: sum(counters["swears"].values())
+            for counters in sorted(user_counters, key=operator.itemgetter("first"))
+            if counters["content_messages"]
+        }
 
         try:
             most_swears = max(swear_dict, key=lambda x: swear_dict[x])
@@ -1961,20 +1770,12 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
+        aggregates = self.cache.get_message_aggregates(guild_id, start, end)
 
         users: dict[int, dict[str, int]] = {}
-        for message in messages:
-            user_id = message.user_id
-            channel_id = message.channel_id
-
-            if user_id not in users:
-                users[user_id] = {"total": 0}
-            if str(channel_id) not in users[user_id]:
-                users[user_id][str(channel_id)] = 0
-
-            users[user_id][str(channel_id)] += 1
-            users[user_id]["total"] += 1
+        for user_id, channel_counts in aggregates.user_channel_counts.items():
+            users[user_id] = {str(channel_id): count for channel_id, count in channel_counts.items()}
+            users[user_id]["total"] = sum(channel_counts.values())
 
         # calc highest percentage
         for u_dict in users.values():
@@ -2020,19 +1821,15 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: the stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-
-        users = {}
-        for message in messages:
-            user_id = message.user_id
-            channel_id = message.channel_id
+        aggregates = self.cache.get_message_aggregates(guild_id, start, end)
 
-            if user_id not in users:
-                users[user_id] = {"channels": {}, "messages": 0}
-            if str(channel_id) not in users[user_id]["channels"]:
-                users[user_id]["channels"][str(channel_id)] = 0
-            users[user_id]["messages"] += 1
-            users[user_id]["channels"][str(channel_id)] += 1
+        users = {
+            user_id: {
+                "channels": {str(channel_id): count for channel_id, count in channel_counts.items()},
+                "messages": sum(channel_counts.values()),
+            }
+            for user_id, channel_counts in aggregates.user_channel_counts.items()
+        }
 
         # sort the channels
         top = max(users, key=lambda x: len(users[x]["channels"]))
@@ -2109,15 +1906,9 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: most eddies bet stat
         """
-        transactions = self.cache.get_transactions(guild_id, start, end)
-
-        bet_users = {}
-        for trans in transactions:
-            if trans.type != TransactionTypes.BET_PLACE:
-                continue
-            if trans.uid not in bet_users:
-                bet_users[trans.uid] = 0
-            bet_users[trans.uid] -= trans.amount
+        bet_totals = self.cache.get_user_transaction_totals(guild_id, start, end, TransactionTypes.BET_PLACE)
+        # amount is negative in these cases
+        bet_users = {uid: -total for uid, total in bet_totals.items()}
 
         try:
             most_placed = max(bet_users, key=lambda x: bet_users[x])
@@ -2153,15 +1944,7 @@ class StatsGatherer:  # noqa: PLR0904
         Returns:
             Stat: most eddies won stat
         """
-        transactions = self.cache.get_transactions(guild_id, start, end)
-
-        bet_users = {}
-        for trans in transactions:
-            if trans.type != TransactionTypes.BET_WIN:
-                continue
-            if trans.uid not in bet_users:
-                bet_users[trans.uid] = 0
-            bet_users[trans.uid] += trans.amount
+        bet_users = dict(self.cache.get_user_transaction_totals(guild_id, start, end, TransactionTypes.BET_WIN))
 
         try:
             most_placed = max(bet_users, key=lambda x: bet_users[x])
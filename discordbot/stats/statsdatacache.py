@@ -1,11 +1,29 @@
-"""Stats data cache."""
+"""Stats data cache.
 
+The documents and aggregation results used to gather the stats are cached in a single process-wide cache that is
+shared by every StatsDataCache instance. Entries are keyed on the guild, the kind of data, the time window and the
+user, are evicted least recently used first, and the cache is bounded by the total number of cached documents.
+
+The cache isn't cleared when the collections are written to, as nearly every message we receive would clear it.
+Instead, entries only live for a few minutes so that the stats are never more than a few minutes out of date. That's
+still long enough for everything that gathers a set of stats at once (eg: a /stats command or the awards) to share
+the same documents.
+
+Documents for a time window that's within a window that's already cached (eg: a month within a cached year) are
+filtered from the cached documents rather than queried again.
+"""
+
+import dataclasses
 import datetime
-from zoneinfo import ZoneInfo
+from collections.abc import Callable, Hashable
 
+from discordbot.bot_enums import TransactionTypes
+from discordbot.constants import BSE_BOT_ID
+from discordbot.stats.messageaggregates import GroupCounter, MessageAggregates, UserMessageCounter
 from mongo.bsedataclasses import SpoilerThreads
 from mongo.bsepoints.activities import UserActivities
 from mongo.bsepoints.bets import UserBets
+from mongo.bsepoints.dailystats import DailyStats
 from mongo.bsepoints.emojis import ServerEmojis
 from mongo.bsepoints.interactions import UserInteractions
 from mongo.bsepoints.points import UserPoints
@@ -15,12 +33,68 @@ from mongo.datatypes.bet import BetDB
 from mongo.datatypes.customs import EmojiDB
 from mongo.datatypes.message import MessageDB, VCInteractionDB
 from mongo.datatypes.user import UserDB
+from mongo.ttlcache import TTLCache, get_cache
+
+
+@dataclasses.dataclass(frozen=True)
+class _DocumentKind:
+    """How to filter the documents of a kind from the documents of a larger time window."""
+
+    timestamps: Callable[[any], list[datetime.datetime | None]]
+    """Function to get the timestamps the documents were queried on."""
+    user_field: str | None = None
+    """The field the documents were queried on for a single user."""
+    limit: int | None = None
+    """The maximum number of documents the query returns."""
+
+
+_KINDS: dict[str, _DocumentKind] = {
+    "messages": _DocumentKind(lambda message: [message.timestamp], "user_id"),
+    "edited": _DocumentKind(lambda message: [message.edited], "user_id"),
+    "vc": _DocumentKind(lambda message: [message.timestamp], "user_id"),
+    "bets": _DocumentKind(lambda bet: [bet.created], limit=10000),
+    "transactions": _DocumentKind(lambda transaction: [transaction.timestamp], "uid"),
+    "activities": _DocumentKind(lambda activity: [activity.timestamp], "uid"),
+    "reactions": _DocumentKind(lambda message: [reaction.timestamp for reaction in message.reactions]),
+    "replies": _DocumentKind(lambda message: [reply.timestamp for reply in message.replies]),
+}
+
+
+def _weigh(value: any) -> int:
+    """Weighs a cached value by the number of documents in it.
 
+    Args:
+        value (any): the cached value
 
-class StatsDataCache:
+    Returns:
+        int: the weight of the value
+    """
+    return len(value) if isinstance(value, list) else 1
+
+
+def _in_window(timestamps: list[datetime.datetime | None], start: datetime.datetime, end: datetime.datetime) -> bool:
+    """Checks whether the timestamps match a `{"$gt": start, "$lt": end}` query.
+
+    Like MongoDB, an array of timestamps matches if any of them is after the start and any of them is before the end.
+
+    Args:
+        timestamps (list[datetime.datetime | None]): the timestamps to check
+        start (datetime.datetime): start of timestamp query
+        end (datetime.datetime): end of timestamp query
+
+    Returns:
+        bool: whether the timestamps match
+    """
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return any(timestamp > start for timestamp in timestamps) and any(timestamp < end for timestamp in timestamps)
+
+
+class StatsDataCache:  # noqa: PLR0904
     """Class for stats data cache."""
 
-    _cache_time = 3600
+    _cache_time = 300
+    _cache_size = 256
+    _cache_weight = 500_000
 
     def __init__(self, annual: bool = False, uid: int | None = None) -> None:
         """Initialisation method.
@@ -36,44 +110,71 @@ class StatsDataCache:
         self.threads = SpoilerThreads()
         self.trans = UserTransactions()
         self.activities = UserActivities()
+        self.daily_stats = DailyStats()
 
         self.annual = annual
 
-        self._start_cache: datetime.datetime | None = None
-        self._end_cache: datetime.datetime | None = None
         self._user_id_cache: int | None = uid
 
-        self._message_cache: list[MessageDB] = []
-        self._message_cache_time: datetime.datetime | None = None
-
-        self._vc_cache: list[VCInteractionDB] = []
-        self._vc_cache_time: datetime.datetime | None = None
-
-        self._bet_cache: list[BetDB] = []
-        self._bet_cache_time: datetime.datetime | None = None
-
-        self._user_cache: list[UserDB] = []
-        self._user_cache_time: datetime.datetime | None = None
-
-        self._transaction_cache: list[TransactionDB] = []
-        self._transaction_cache_time: datetime.datetime | None = None
-
-        self._activity_cache: list[ActivityDB] = []
-        self._activity_cache_time: datetime.datetime | None = None
+        self._cache: TTLCache = get_cache(
+            "statsdata",
+            max_size=self._cache_size,
+            ttl=self._cache_time,
+            max_weight=self._cache_weight,
+            weigher=_weigh,
+        )
 
-        self._reactions_cache: list[MessageDB] = []
-        self._reactions_cache_time: datetime.datetime | None = None
+    # caching functions
+    def _get_documents(
+        self,
+        kind: str,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        loader: Callable[[int | None], list[any]],
+    ) -> list[any]:
+        """Internal method to get the documents of a kind between a certain date.
 
-        self._emoji_cache: list[EmojiDB] = []
-        self._emoji_cache_time: datetime.datetime | None = None
+        The documents are filtered from the cached documents of a larger time window if there are any, otherwise the
+        loader is called to query for them.
 
-        self._reply_cache: list[MessageDB] = []
-        self._reply_cache_time: datetime.datetime | None = None
+        Args:
+            kind (str): the kind of documents
+            guild_id (int): the guild ID to get documents for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            loader (Callable[[int | None], list[any]]): function to query for the documents for the given user ID
 
-        self._edit_cache: list[MessageDB] = []
-        self._edit_cache_time: datetime.datetime | None = None
+        Returns:
+            list[any]: list of documents
+        """
+        spec = _KINDS[kind]
+        uid = self._user_id_cache if spec.user_field else None
+        key = (guild_id, kind, start, end, uid)
+
+        def _is_superset(other: Hashable, documents: list[any]) -> bool:
+            return (
+                other != key
+                and other[:2] == (guild_id, kind)
+                and other[4] in {uid, None}
+                and other[2] <= start
+                and other[3] >= end
+                # a query that hit its limit may be missing documents from our window
+                and (spec.limit is None or len(documents) < spec.limit)
+            )
+
+        def _load() -> list[any]:
+            superset = self._cache.find(_is_superset)
+            if superset is None:
+                return loader(uid)
+            return [
+                doc
+                for doc in superset
+                if _in_window(spec.timestamps(doc), start, end) and (not uid or getattr(doc, spec.user_field) == uid)
+            ]
+
+        return self._cache.get_or_load(key, _load)
 
-    # caching functions
     def get_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[MessageDB]:
         """Internal method to query for messages between a certain date.
 
@@ -87,30 +188,204 @@ class StatsDataCache:
         Returns:
             list[MessageDB]: list of messages
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._message_cache = []
-            self._start_cache = start
-            self._end_cache = end
 
-        if self._message_cache and (now - self._message_cache_time).total_seconds() < self._cache_time:
-            return self._message_cache
-
-        self._message_cache = self.user_interactions.paginated_query(
-            {
+        def _load(uid: int | None) -> list[MessageDB]:
+            query = {
                 "guild_id": guild_id,
                 "timestamp": {"$gt": start, "$lt": end},
                 "message_type": "message",
                 "is_bot": {"$ne": True},
-            },
+            }
+            if uid:
+                query["user_id"] = uid
+            return self.user_interactions.paginated_query(query)
+
+        return self._get_documents("messages", guild_id, start, end, _load)
+
+    def get_message_aggregates(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> MessageAggregates:
+        """Gets the aggregated message counters for the given time period.
+
+        The aggregates are cached alongside the messages they were made from.
+
+        Args:
+            guild_id (int): the guild ID to get messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            MessageAggregates: the aggregated messages
+        """
+        return self._cache.get_or_load(
+            (guild_id, "message_aggregates", start, end, self._user_id_cache),
+            lambda: MessageAggregates(self.get_messages(guild_id, start, end)),
+        )
+
+    def _get_aggregate(self, name: str, func: Callable[..., any], *args: any) -> any:
+        """Internal method to run a server side aggregation and cache the result.
+
+        The result is cached on the name and arguments and the cache is returned if it was set less than an hour ago.
+
+        Args:
+            name (str): the name of the aggregation
+            func (Callable): the collection method that runs the aggregation pipeline
+            args (any): the arguments to pass to the method
+
+        Returns:
+            any: the aggregation result
+        """
+        return self._cache.get_or_load((name, *args), lambda: func(*args))
+
+    def get_message_totals(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> dict[str, any]:
+        """Sums the daily message counters between a certain date.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            dict[str, any]: the count, the other counters, and the lists of users and channels
+        """
+        return self._get_aggregate(
+            "message_totals", self.daily_stats.get_message_totals, guild_id, start, end, self._user_id_cache
+        )
+
+    def get_message_counters(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, group_by: str
+    ) -> list[dict[str, any]]:
+        """Sums the daily message counters for each user, channel or day between a certain date.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            group_by (str): the field to group on, eg: 'user_id'
+
+        Returns:
+            list[dict[str, any]]: the counters for each group, busiest first
+        """
+        return self._get_aggregate(
+            "message_counters", self.daily_stats.get_counters, guild_id, start, end, self._user_id_cache, group_by
+        )
+
+    def get_channel_message_counts(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> dict[int, GroupCounter]:
+        """Counts the messages in each channel between a certain date using the daily message counters.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            dict[int, GroupCounter]: the counters for each channel, busiest first
+        """
+        docs = self._get_aggregate(
+            "channel_counts",
+            self.daily_stats.get_message_counts_by_channel,
+            guild_id,
+            start,
+            end,
+            self._user_id_cache,
+        )
+        return {doc["_id"]: GroupCounter.from_document(doc) for doc in docs}
+
+    def get_day_message_counts(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> dict[datetime.date, GroupCounter]:
+        """Counts the messages on each day between a certain date using the daily message counters.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            dict[datetime.date, GroupCounter]: the counters for each day, busiest first
+        """
+        docs = self._get_aggregate(
+            "day_counts", self.daily_stats.get_message_counts_by_day, guild_id, start, end, self._user_id_cache
+        )
+        return {doc["_id"]: GroupCounter.from_document(doc) for doc in docs}
+
+    def get_user_message_counts(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> dict[int, UserMessageCounter]:
+        """Counts the messages each user sent between a certain date using the daily message counters.
+
+        Excludes the bot.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            dict[int, UserMessageCounter]: the counters for each user, chattiest first
+        """
+        docs = self._get_aggregate(
+            "user_counts", self.daily_stats.get_message_counts_by_user, guild_id, start, end, self._user_id_cache
+        )
+        return {doc["_id"]: UserMessageCounter.from_document(doc) for doc in docs if doc["_id"] != BSE_BOT_ID}
+
+    def get_vc_totals(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> dict[str, float | list[int]]:
+        """Sums the time spent in VCs between a certain date using an aggregation pipeline.
+
+        Args:
+            guild_id (int): the guild ID to sum VC time for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+
+        Returns:
+            dict[str, float | list[int]]: the time in VC, and the lists of users and channels
+        """
+        return self._get_aggregate(
+            "vc_totals", self.user_interactions.get_vc_totals, guild_id, start, end, self._user_id_cache
+        )
+
+    def get_transaction_totals(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> dict[int, int]:
+        """Sums the transaction amounts for each type between a certain date using an aggregation pipeline.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the beginning of time period
+            end (datetime.datetime): the end of the time period
+
+        Returns:
+            dict[int, int]: the total amount for each transaction type
+        """
+        return self._get_aggregate(
+            "transaction_totals", self.trans.get_amount_totals_by_type, guild_id, start, end, self._user_id_cache
         )
 
-        if self._user_id_cache:
-            self._message_cache = [m for m in self._message_cache if m.user_id == self._user_id_cache]
+    def get_user_transaction_totals(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, transaction_type: TransactionTypes
+    ) -> dict[int, int]:
+        """Sums the transaction amounts of a type for each user between a certain date using an aggregation pipeline.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the beginning of time period
+            end (datetime.datetime): the end of the time period
+            transaction_type (TransactionTypes): the type of transaction to sum
 
-        self._message_cache_time = now
-        return self._message_cache
+        Returns:
+            dict[int, int]: the total amount for each user ID, largest first
+        """
+        return self._get_aggregate(
+            "user_transaction_totals",
+            self.trans.get_amount_totals_by_user,
+            guild_id,
+            start,
+            end,
+            transaction_type,
+            self._user_id_cache,
+        )
 
     def get_edited_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[MessageDB]:
         """Internal method to query for edited messages between a certain date.
@@ -125,31 +400,20 @@ class StatsDataCache:
         Returns:
             list[MessageDB]: list of edited messages
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
 
-        if start != self._start_cache or end != self._end_cache:
-            self._edit_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._edit_cache and (now - self._edit_cache_time).total_seconds() < self._cache_time:
-            return self._edit_cache
-
-        self._edit_cache = self.user_interactions.paginated_query(
-            {
+        def _load(uid: int | None) -> list[MessageDB]:
+            query = {
                 "guild_id": guild_id,
                 "edited": {"$gt": start, "$lt": end},
                 "edit_count": {"$gte": 1},
                 "message_type": "message",
                 "is_bot": {"$ne": True},
-            },
-        )
+            }
+            if uid:
+                query["user_id"] = uid
+            return self.user_interactions.paginated_query(query)
 
-        if self._user_id_cache:
-            self._edit_cache = [m for m in self._edit_cache if m.user_id == self._user_id_cache]
-
-        self._edit_cache_time = now
-        return self._edit_cache
+        return self._get_documents("edited", guild_id, start, end, _load)
 
     def get_vc_interactions(
         self,
@@ -169,25 +433,14 @@ class StatsDataCache:
         Returns:
             list[VCInteractionDB]: list of VC interactions
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._vc_cache = []
-            self._start_cache = start
-            self._end_cache = end
 
-        if self._vc_cache and (now - self._vc_cache_time).total_seconds() < self._cache_time:
-            return self._vc_cache
+        def _load(uid: int | None) -> list[VCInteractionDB]:
+            query = {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}, "message_type": "vc_joined"}
+            if uid:
+                query["user_id"] = uid
+            return self.user_interactions.paginated_query(query)
 
-        self._vc_cache = self.user_interactions.paginated_query(
-            {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}, "message_type": "vc_joined"},
-        )
-
-        if self._user_id_cache:
-            self._vc_cache = [m for m in self._vc_cache if m.user_id == self._user_id_cache]
-
-        self._vc_cache_time = now
-        return self._vc_cache
+        return self._get_documents("vc", guild_id, start, end, _load)
 
     def get_bets(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[BetDB]:
         """Internal method to query for bets between a certain date.
@@ -202,24 +455,15 @@ class StatsDataCache:
         Returns:
             list[BetDB]: list of bets
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._bet_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._bet_cache and (now - self._bet_cache_time).total_seconds() < self._cache_time:
-            return self._bet_cache
-
-        self._bet_cache = self.user_bets.query(
-            {"guild_id": guild_id, "created": {"$gt": start, "$lt": end}},
-            limit=10000,
+        return self._get_documents(
+            "bets",
+            guild_id,
+            start,
+            end,
+            lambda _: self.user_bets.query({"guild_id": guild_id, "created": {"$gt": start, "$lt": end}}, limit=10000),
         )
-        self._bet_cache_time = now
-        return self._bet_cache
 
-    def get_users(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[UserDB]:
+    def get_users(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[UserDB]:  # noqa: ARG002
         """Internal method to query for users.
 
         Will cache the users on first parse and return the cache if cache was set less than an hour ago.
@@ -230,19 +474,9 @@ class StatsDataCache:
         Returns:
             list[UserDB]: list of users
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._user_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._user_cache and (now - self._user_cache_time).total_seconds() < self._cache_time:
-            return self._user_cache
-
-        self._user_cache = self.user_points.query({"guild_id": guild_id})
-        self._user_cache_time = now
-        return self._user_cache
+        return self._cache.get_or_load(
+            (guild_id, "users", None, None, None), lambda: self.user_points.query({"guild_id": guild_id})
+        )
 
     def get_transactions(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[TransactionDB]:
         """Internal method to query for transactions between a certain date.
@@ -257,22 +491,11 @@ class StatsDataCache:
         Returns:
             list[TransactionDB]: a list of transactions
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
 
-        if start != self._start_cache or end != self._end_cache:
-            self._transaction_cache = []
-            self._start_cache = start
-            self._end_cache = end
+        def _load(uid: int | None) -> list[TransactionDB]:
+            return list(self.trans.stream_guild_transactions(guild_id, start, end, user_id=uid))
 
-        if self._transaction_cache and (now - self._transaction_cache_time).total_seconds() < self._cache_time:
-            return self._transaction_cache
-
-        _transactions = self.trans.get_guild_transactions_by_timestamp(guild_id, start, end)
-        if self._user_id_cache:
-            _transactions = [t for t in _transactions if t.uid == self._user_id_cache]
-        self._transaction_cache = _transactions
-        self._transaction_cache_time = now
-        return self._transaction_cache
+        return self._get_documents("transactions", guild_id, start, end, _load)
 
     def get_activities(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[ActivityDB]:
         """Internal method to query for activities between a certain date.
@@ -287,22 +510,11 @@ class StatsDataCache:
         Returns:
             List[dict]: a list of activities
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._activity_cache = []
-            self._start_cache = start
-            self._end_cache = end
 
-        if self._activity_cache and (now - self._activity_cache_time).total_seconds() < self._cache_time:
-            return self._activity_cache
+        def _load(uid: int | None) -> list[ActivityDB]:
+            return list(self.activities.stream_guild_activities(guild_id, start, end, user_id=uid))
 
-        _activities = self.activities.get_guild_activities_by_timestamp(guild_id, start, end)
-        if self._user_id_cache:
-            _activities = [a for a in _activities if a.uid == self._user_id_cache]
-        self._activity_cache = _activities
-        self._activity_cache_time = now
-        return self._activity_cache
+        return self._get_documents("activities", guild_id, start, end, _load)
 
     def get_reactions(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[MessageDB]:
         """Internal method to query for messages between a certain date.
@@ -317,24 +529,17 @@ class StatsDataCache:
         Returns:
             list: list of message dicts
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._reactions_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._reactions_cache and (now - self._reactions_cache_time).total_seconds() < self._cache_time:
-            return self._reactions_cache
-
-        self._reactions_cache = self.user_interactions.paginated_query(
-            {"guild_id": guild_id, "reactions.timestamp": {"$gt": start, "$lt": end}},
+        return self._get_documents(
+            "reactions",
+            guild_id,
+            start,
+            end,
+            lambda _: self.user_interactions.paginated_query(
+                {"guild_id": guild_id, "reactions.timestamp": {"$gt": start, "$lt": end}},
+            ),
         )
 
-        self._reactions_cache_time = now
-        return self._reactions_cache
-
-    def get_emojis(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[EmojiDB]:
+    def get_emojis(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[EmojiDB]:  # noqa: ARG002
         """Internal method to query for server emojis.
 
         Will cache the emojis on first parse and return the cache if cache was set less than an hour ago.
@@ -347,19 +552,9 @@ class StatsDataCache:
         Returns:
             list: list of message dicts
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._emoji_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._emoji_cache and (now - self._emoji_cache_time).total_seconds() < self._cache_time:
-            return self._emoji_cache
-
-        self._emoji_cache = self.server_emojis.get_all_emojis(guild_id)
-        self._emoji_cache_time = now
-        return self._emoji_cache
+        return self._cache.get_or_load(
+            (guild_id, "emojis", None, None, None), lambda: self.server_emojis.get_all_emojis(guild_id)
+        )
 
     def get_threaded_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> list[MessageDB]:
         """Get the threaded messages from the cache.
@@ -388,19 +583,12 @@ class StatsDataCache:
         Returns:
             list[MessageDB]: list of messages
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-
-        if start != self._start_cache or end != self._end_cache:
-            self._reply_cache = []
-            self._start_cache = start
-            self._end_cache = end
-
-        if self._reply_cache and (now - self._reply_cache_time).total_seconds() < self._cache_time:
-            return self._reply_cache
-
-        self._reply_cache = self.user_interactions.paginated_query(
-            {"guild_id": guild_id, "replies.timestamp": {"$gt": start, "$lt": end}},
+        return self._get_documents(
+            "replies",
+            guild_id,
+            start,
+            end,
+            lambda _: self.user_interactions.paginated_query(
+                {"guild_id": guild_id, "replies.timestamp": {"$gt": start, "$lt": end}},
+            ),
         )
-
-        self._reply_cache_time = now
-        return self._reply_cache
@@ -5,8 +5,11 @@ This is where we should initialise all the database Collection classes we want t
 in the various tasks.
 """
 
+import asyncio
 import dataclasses
 import datetime
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING
 
 from discord.ext import commands, tasks
 from slomanlogger import SlomanLogger
@@ -24,6 +27,9 @@ from mongo.bsepoints.points import UserPoints
 from mongo.bsepoints.stickers import ServerStickers
 from mongo.bseticketedevents import RevolutionEvent
 
+if TYPE_CHECKING:
+    from discordbot.tasks.scheduler import Scheduler
+
 
 @dataclasses.dataclass
 class TaskSchedule:
@@ -40,10 +46,82 @@ class TaskSchedule:
     dates: list[datetime.datetime] | None = None
     """Particular dates the task should be running."""
 
+    def _matches_day(self, when: datetime.datetime) -> bool:
+        """Whether the given datetime is on one of the scheduled days and dates."""
+        if self.days and when.weekday() not in self.days:
+            return False
+        if self.dates:
+            viable_months = [date.month for date in self.dates]
+            viable_days = [date.day for date in self.dates]
+            return when.month in viable_months and when.day in viable_days
+        return True
+
+    def matches(self, when: datetime.datetime) -> bool:
+        """Whether the given datetime is within the schedule.
+
+        Doesn't take `overriden` into account.
+
+        Args:
+            when (datetime.datetime): the datetime to check
+
+        Returns:
+            bool: whether the task should be running at the given time
+        """
+        if not self._matches_day(when) or when.hour not in self.hours:
+            return False
+        return self.minute is None or when.minute == self.minute
+
+    def _is_constant(self) -> bool:
+        """Whether the schedule always or never matches."""
+        if not self.hours:
+            return True
+        return (
+            self.minute is None
+            and not self.dates
+            and (not self.days or set(self.days) >= set(range(7)))
+            and set(self.hours) >= set(range(24))
+        )
+
+    def next_change(self, when: datetime.datetime) -> datetime.datetime | None:
+        """Calculates when the schedule next starts or stops matching after the given datetime.
+
+        Schedules only change on minute boundaries so rather than checking every minute we skip ahead a day, an
+        hour or to the scheduled minute wherever we can.
+
+        Args:
+            when (datetime.datetime): the datetime to start from
+
+        Returns:
+            datetime.datetime | None: the next change or None if the schedule never changes
+        """
+        if self._is_constant():
+            return None
+
+        current = self.matches(when)
+        moment = when.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        # dates repeat every year but allow for the 29th of February
+        limit = moment + datetime.timedelta(days=366 * 4)
+        while moment < limit:
+            if self.matches(moment) != current:
+                return moment
+
+            if not self._matches_day(moment):
+                moment = (moment + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours or self.minute is None or moment.minute > self.minute:
+                moment = moment.replace(minute=0) + datetime.timedelta(hours=1)
+            elif moment.minute < self.minute:
+                moment = moment.replace(minute=self.minute)
+            else:
+                moment += datetime.timedelta(minutes=1)
+        return None
+
 
 class BaseTask(commands.Cog):
     """Our BaseTask class."""
 
+    # the most guilds a task processes at once
+    GUILD_CONCURRENCY: int = 4
+
     def __init__(
         self,
         bot: BSEBot,
@@ -67,6 +145,9 @@ class BaseTask(commands.Cog):
         self._task: tasks.Loop | None = None
         self._schedule: TaskSchedule | None = None
 
+        # set by the TaskManager so tasks can schedule their own one-off timers
+        self.scheduler: Scheduler | None = None
+
         self.embed_manager = EmbedManager()
 
         # database classes
@@ -88,6 +169,38 @@ class BaseTask(commands.Cog):
         """Checks start up tasks."""
         return all(task.finished for task in self.startup_tasks)
 
+    async def for_each_guild[T](
+        self, guild_ids: Iterable[int], func: Callable[[int], Awaitable[T]], limit: int | None = None
+    ) -> dict[int, T]:
+        """Runs the given coroutine function for each guild concurrently.
+
+        At most `limit` guilds are processed at once. A guild failing is logged and doesn't stop the other guilds
+        from being processed. Blocking database work should be done via `run_async` so it doesn't hold up the
+        other guilds.
+
+        Args:
+            guild_ids (Iterable[int]): the IDs of the guilds to process
+            func (Callable[[int], Awaitable[T]]): the coroutine function to call with each guild ID
+            limit (int | None, optional): how many guilds to process at once. Defaults to GUILD_CONCURRENCY.
+
+        Returns:
+            dict[int, T]: the result for each guild that didn't fail, in the order the guilds were given
+        """
+        semaphore = asyncio.Semaphore(limit or self.GUILD_CONCURRENCY)
+        failed = object()
+
+        async def _process(guild_id: int) -> T | object:
+            async with semaphore:
+                try:
+                    return await func(guild_id)
+                except Exception:
+                    self.logger.exception("Failed to process guild %s", guild_id)
+                    return failed
+
+        guild_ids = list(guild_ids)
+        results = await asyncio.gather(*(_process(guild_id) for guild_id in guild_ids))
+        return {guild_id: result for guild_id, result in zip(guild_ids, results, strict=True) if result is not failed}
+
     @property
     def task(self) -> tasks.Loop:
         """Property for this task."""
@@ -4,6 +4,7 @@ import asyncio
 import contextlib
 import dataclasses
 import datetime
+import functools
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
@@ -14,6 +15,7 @@ from discordbot.bsebot import BSEBot
 from discordbot.embedmanager import EmbedManager
 from discordbot.tasks.basetask import BaseTask, TaskSchedule
 from discordbot.views.bet import BetView
+from mongo.datatypes.bet import BetDB
 
 if TYPE_CHECKING:
     from discordbot.slashcommandeventclasses.close import CloseBet
@@ -42,53 +44,100 @@ class BetCloser(BaseTask):
             start (bool) whether to start the task. Defaults to False.
         """
         super().__init__(bot, startup_tasks)
-        self.schedule = TaskSchedule(range(7), range(24))
+        # run at startup to schedule the timers for all the open bets
+        # and then daily in case we've missed any
+        self.schedule = TaskSchedule(range(7), [3], minute=20, overriden=True)
         self.task = self.bet_closer
 
         self.embed_manager = EmbedManager()
         self.place: PlaceBet = place
         self.close: CloseBet = close
+
+        self.bot.add_listener(self.on_bet_timeout_set)
+
         if start:
             self.task.start()
 
-    @tasks.loop(seconds=15.0)
-    async def bet_closer(self) -> None:
-        """Loop that takes all our active bets and ensures they haven't expired.
+    def _schedule_bet(self, bet: BetDB) -> None:
+        """Schedules closing the given bet when it times out.
+
+        Replaces any timer already scheduled for the bet.
+
+        Args:
+            bet (BetDB): the bet to schedule
+        """
+        if self.scheduler is None or not bet.active or not bet.timeout:
+            return
+        self.scheduler.schedule(
+            bet.timeout,
+            ("bet", bet.guild_id, bet.bet_id),
+            functools.partial(self.close_bet, bet.guild_id, bet.bet_id),
+        )
+
+    async def on_bet_timeout_set(self, bet: BetDB) -> None:
+        """Listener for when a bet is created or has its timeout changed.
 
-        If they have expired - they get closed.
+        Args:
+            bet (BetDB): the bet
         """
+        self.logger.debug("Scheduling closing %s at %s", bet.bet_id, bet.timeout)
+        self._schedule_bet(bet)
+
+    async def close_bet(self, guild_id: int, bet_id: str) -> None:
+        """Closes the given bet for betting if it's timed out.
+
+        Called by the timer for the bet so we get the bet again in case it's changed since we scheduled it.
+
+        Args:
+            guild_id (int): the guild ID
+            bet_id (str): the bet ID
+        """
+        bet = self.user_bets.get_bet_from_id(guild_id, bet_id)
+        if not bet or not bet.active or not bet.timeout:
+            return
+
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        if bet.timeout > now:
+            # timeout was extended
+            self._schedule_bet(bet)
+            return
+
+        # set the bet to no longer active
+        self.user_bets.update({"_id": bet._id}, {"$set": {"active": False}})  # noqa: SLF001
+        guild_obj = await self.bot.fetch_guild(guild_id)  # type: discord.Guild
+        member = guild_obj.get_member(bet.user)
+        channel = await self.bot.fetch_channel(bet.channel_id)
+        message = await channel.fetch_message(bet.message_id)
+        # create a new bet with active set to False to pass around
+        _bet = dataclasses.replace(bet, active=False)
+
+        embed = self.embed_manager.get_bet_embed(bet)
+        content = f"# {_bet.title}\n_Created by <@{_bet.user}>_"
+        bet_view = BetView(_bet, self.place, self.close)
+
+        # disable bet button
+        bet_view.children[0].disabled = True
+
+        await message.edit(content=content, embed=embed, view=bet_view)
+        msg = (
+            f"[Your bet](<{message.jump_url}>) `{_bet.bet_id} - {_bet.title}` "
+            f"is now closed for bets and is waiting a result from you."
+        )
+        if not member.dm_channel:
+            await member.create_dm()
+        with contextlib.suppress(discord.Forbidden):
+            await member.send(content=msg, silent=True)
+
+    @tasks.loop(count=1)
+    async def bet_closer(self) -> None:
+        """Loop that schedules a timer to close each of our active bets when they time out.
+
+        Bets that have already timed out are closed straight away.
+        """
         for guild in self.bot.guilds:
-            guild_obj = await self.bot.fetch_guild(guild.id)  # type: discord.Guild
-            active = self.user_bets.get_all_active_bets(guild.id)
-            for bet in active:
-                timeout = bet.timeout
-                if not timeout or timeout > now:
-                    continue
-                # set the bet to no longer active
-                self.user_bets.update({"_id": bet._id}, {"$set": {"active": False}})  # noqa: SLF001
-                member = guild_obj.get_member(bet.user)
-                channel = await self.bot.fetch_channel(bet.channel_id)
-                message = await channel.fetch_message(bet.message_id)
-                # create a new bet with active set to False to pass around
-                _bet = dataclasses.replace(bet, active=False)
-
-                embed = self.embed_manager.get_bet_embed(bet)
-                content = f"# {_bet.title}\n_Created by <@{_bet.user}>_"
-                bet_view = BetView(_bet, self.place, self.close)
-
-                # disable bet button
-                bet_view.children[0].disabled = True
-
-                await message.edit(content=content, embed=embed, view=bet_view)
-                msg = (
-                    f"[Your bet](<{message.jump_url}>) `{_bet.bet_id} - {_bet.title}` "
-                    f"is now closed for bets and is waiting a result from you."
-                )
-                if not member.dm_channel:
-                    await member.create_dm()
-                with contextlib.suppress(discord.Forbidden):
-                    await member.send(content=msg, silent=True)
+            for bet in self.user_bets.get_all_active_bets(guild.id):
+                self._schedule_bet(bet)
+        self.schedule.overriden = False
 
     @bet_closer.before_loop
     async def before_bet_closer(self) -> None:
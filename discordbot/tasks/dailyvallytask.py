@@ -111,11 +111,12 @@ class AfterWorkVally(BaseTask):
                 [0, 1],
             )
 
-            message = random.choices([message[0] for message in odds], [message[1] for message in odds])[0]
-            message = message.format(role=_mention)
+            template = random.choices([message[0] for message in odds], [message[1] for message in odds])[0]
+            message = template.format(role=_mention)
 
             self.logger.info("Sending daily vally message: %s", message)
             await channel.send(content=message)
+            self.interactions.message_usages.increment(_guild.id, template)
 
     @vally_message.before_loop
     async def before_vally_message(self) -> None:
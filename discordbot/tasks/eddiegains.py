@@ -6,6 +6,7 @@ import math
 import operator
 import re
 from collections import Counter
+from collections.abc import Iterable
 from zoneinfo import ZoneInfo
 
 import discord
@@ -26,6 +27,7 @@ from discordbot.tasks.basetask import BaseTask, TaskSchedule
 from mongo.datatypes.guild import GuildDB
 from mongo.datatypes.message import MessageDB, VCInteractionDB
 from mongo.datatypes.user import UserDB
+from mongo.salarytally import GuildDayTally, SalaryCounters
 
 
 class EddieGainMessager(BaseTask):
@@ -175,8 +177,7 @@ class EddieGainMessager(BaseTask):
             data (dict[int, dict[int, list[int]]]): all the eddies data to process
         """
         # send guild admin messages
-        for guild_id in [guild.id for guild in self.bot.guilds]:
-            guild_db = guilds[guild_id]
+        for guild_id, guild_db in guilds.items():
             summary_message = self._format_guild_admin_message(guild_id, data[guild_id])
             for user_id in {*guild_db.admins, CREATOR, guild_db.owner_id}:
                 user_db = self.user_points.find_user(user_id, guild_id)
@@ -208,29 +209,38 @@ class EddieGainMessager(BaseTask):
             self.logger.warning("Somehow task was started outside operational hours - %s?", now)
             return None
 
+        async def _pay_guild(guild_id: int) -> tuple[GuildDB, dict[int, list[int]]] | None:
+            guild_db = await self.guilds.run_async(self.guilds.get_guild, guild_id)
+            if (last_salary_time := guild_db.last_salary_time) and last_salary_time.date() == now.date():
+                self.logger.warning("Already did the salary for %s at %s", guild_db.name, last_salary_time.date())
+                return None
+            # actually calculate and give the users their earnt eddies
+            eddie_dict = await self.guilds.run_async(self.eddie_manager.give_out_eddies, guild_id, real=True)
+            await self.guilds.run_async(self.guilds.set_last_salary_time, guild_id, now)
+            return guild_db, eddie_dict
+
+        results = await self.for_each_guild([guild.id for guild in self.bot.guilds], _pay_guild)
+
         # {server ID: salary breakdown}
         data: dict[int, dict[int, list[int]]] = {}
         # {user ID: {server ID: salary breakdown}}
         user_to_eddies: dict[int, dict[int, list[int]]] = {}
         guilds: dict[int, GuildDB] = {}
-        for guild_id in [guild.id for guild in self.bot.guilds]:
-            guild_db = self.guilds.get_guild(guild_id)
-            if (last_salary_time := guild_db.last_salary_time) and last_salary_time.date() == now.date():
-                self.logger.warning("Already did the salary for %s at %s", guild_db.name, last_salary_time.date())
+        for guild_id, result in results.items():
+            if result is None:
                 continue
-            guilds[guild_id] = guild_db
-            # actually calculate and give the users their earnt eddies
-            eddie_dict = self.eddie_manager.give_out_eddies(guild_id, real=True)
+            guilds[guild_id], eddie_dict = result
             for user_id in eddie_dict:
                 if user_id not in user_to_eddies:
                     user_to_eddies[user_id] = {}
                 user_to_eddies[user_id][guild_id] = eddie_dict[user_id]
             data[guild_id] = eddie_dict
-            self.guilds.set_last_salary_time(guild_id, now)
 
         await self._send_user_summaries(guilds, user_to_eddies)
         await self._send_guild_admin_summaries(guilds, data)
 
+        # caught up with any missed salaries
+        self.schedule.overriden = False
         return data
 
     @eddie_distributer.before_loop
@@ -299,10 +309,41 @@ class BSEddiesManager(BaseTask):
                 self.logger.info("%s for %s", t_points, message_type)
         return points
 
-    def calc_individual(  # noqa: C901, PLR0913, PLR0912, PLR0915, PLR0917
+    @staticmethod
+    def _bucket_interactions(
+        results: list[MessageDB | VCInteractionDB], reactions: list[MessageDB]
+    ) -> tuple[
+        dict[int, list[MessageDB | VCInteractionDB]],
+        dict[int, list[MessageDB]],
+        dict[int, list[MessageDB]],
+    ]:
+        """Buckets the day's interactions by user in a single pass.
+
+        Args:
+            results (list[MessageDB | VCInteractionDB]): all the interactions for the day
+            reactions (list[MessageDB]): all the messages that were reacted to in the day
+
+        Returns:
+            tuple[dict, dict, dict]: mappings of user ID to their interactions, to the messages they sent that were
+                reacted to, and to the messages they reacted to
+        """
+        user_results: dict[int, list[MessageDB | VCInteractionDB]] = {}
+        for message in results:
+            user_results.setdefault(message.user_id, []).append(message)
+
+        user_reacted: dict[int, list[MessageDB]] = {}
+        user_reactions: dict[int, list[MessageDB]] = {}
+        for message in reactions:
+            user_reacted.setdefault(message.user_id, []).append(message)
+            # a user may have reacted more than once but we only want the message once
+            for reactor in dict.fromkeys(react.user_id for react in message.reactions):
+                user_reactions.setdefault(reactor, []).append(message)
+
+        return user_results, user_reacted, user_reactions
+
+    def _count_individual(  # noqa: C901, PLR0912, PLR0913, PLR0917
         self,
         user: int,
-        user_dict: UserDB,
         user_results: list[MessageDB | VCInteractionDB],
         user_reacted: list[MessageDB],
         user_reactions: list[MessageDB],
@@ -310,15 +351,12 @@ class BSEddiesManager(BaseTask):
         end: datetime.datetime,
         guild_id: int,
         wordle_word: str | None = None,
-        real: bool = False,
-    ) -> tuple[int, dict[str, any]]:
-        """Method that calculates the daily salary for a given individual.
-
-        Needs all the data given to it.
+        emoji_names: set[str] | None = None,
+    ) -> SalaryCounters:
+        """Counts the salary-relevant interactions for a given individual.
 
         Args:
             user (int): The user ID of the user
-            user_dict (User): The user database object
             user_results (list[MessageDB | VCInteractionDB]): list of user interactions
             user_reacted (list[MessageDB]): list of messages the user reacted to
             user_reactions (list[MessageDB]): list of messages the user had reactions on
@@ -326,34 +364,13 @@ class BSEddiesManager(BaseTask):
             end (datetime.datetime): end time to calc eddies for
             guild_id (int): the guild ID the user exists in
             wordle_word (str, optional): the wordle word for the day
-            real (bool, optional): Whether to actually do operations. Defaults to False.
+            emoji_names (set[str] | None, optional): the names of the server's emojis. Looked up for each reaction
+                when not provided. Defaults to None.
 
         Returns:
-            (int, dict): eddies earnt, breakdown dict
+            SalaryCounters: the user's counters
         """
-        minimum = user_dict.daily_minimum
-
-        if minimum is None:
-            minimum = self.server_min
-
-        if not user_results and not user_reactions and not user_reacted:
-            if minimum == 0:
-                return 0, {}
-
-            if minimum < 0:
-                if real:
-                    self.user_points.set_daily_minimum(user, guild_id, 0)
-                return 0, {}
-
-            minimum -= 1
-            if real:
-                self.user_points.set_daily_minimum(user, guild_id, minimum)
-            if minimum == 0:
-                return 0, {}
-        elif minimum != self.server_min:
-            minimum = self.server_min
-            if real:
-                self.user_points.set_daily_minimum(user, guild_id, minimum)
+        counters = SalaryCounters(active=bool(user_results or user_reactions or user_reacted))
 
         message_types = []
         for mess in user_results:
@@ -382,7 +399,10 @@ class BSEddiesManager(BaseTask):
                 react for react in reactions if react.user_id == user and (start < react.timestamp < end)
             ]
             for reaction in our_user_reactions:
-                if _ := self.server_emojis.get_emoji_from_name(guild_id, reaction.content):
+                if emoji_names is not None:
+                    if reaction.content in emoji_names:
+                        message_types.append("custom_emoji_reaction")
+                elif _ := self.server_emojis.get_emoji_from_name(guild_id, reaction.content):
                     message_types.append("custom_emoji_reaction")
 
                 matching_reactions = [
@@ -406,24 +426,85 @@ class BSEddiesManager(BaseTask):
             # add used wordle words
             if wordle_word and wordle_word in message.content:
                 message_types.append("wordle_word_used")
+            if counters.wordle is None and "wordle" in message.message_type:
+                counters.wordle = message.content
+
+        counters.message_types.update(message_types)
+
+        # VC events are different as we want to work out eddies on time spent in VC
+        for vc in user_results:
+            if "vc_joined" in vc.message_type:
+                counters.vc_sessions[vc._id] = (vc.time_in_vc, vc.time_streaming, "vc_streaming" in vc.message_type)  # noqa: SLF001
+
+        return counters
+
+    def calc_salary(  # noqa: C901, PLR0913, PLR0917
+        self,
+        user: int,
+        user_dict: UserDB,
+        counters: SalaryCounters,
+        guild_id: int,
+        real: bool = False,
+        emoji_names: Iterable[str] = (),
+        server_min: int | None = None,
+    ) -> tuple[int, dict[str, any]]:
+        """Method that calculates the daily salary for a given individual from their counters.
+
+        Args:
+            user (int): The user ID of the user
+            user_dict (User): The user database object
+            counters (SalaryCounters): the user's counters
+            guild_id (int): the guild ID the user exists in
+            real (bool, optional): Whether to actually do operations. Defaults to False.
+            emoji_names (Iterable[str], optional): the names of the server's emojis. Defaults to none.
+            server_min (int | None, optional): the server's daily minimum. Defaults to `self.server_min`.
 
-        count = Counter(message_types)
+        Returns:
+            (int, dict): eddies earnt, breakdown dict
+        """
+        if server_min is None:
+            server_min = self.server_min
+
+        minimum = user_dict.daily_minimum
+
+        if minimum is None:
+            minimum = server_min
+
+        if not counters.active:
+            if minimum == 0:
+                return 0, {}
+
+            if minimum < 0:
+                if real:
+                    self.user_points.set_daily_minimum(user, guild_id, 0)
+                return 0, {}
+
+            minimum -= 1
+            if real:
+                self.user_points.set_daily_minimum(user, guild_id, minimum)
+            if minimum == 0:
+                return 0, {}
+        elif minimum != server_min:
+            minimum = server_min
+            if real:
+                self.user_points.set_daily_minimum(user, guild_id, minimum)
+
+        count = counters.counts(emoji_names)
         eddies_gained = self._calc_eddies(count, minimum)
 
         # handle VC stuff here
         # VC events are different as we want to work out eddies on time spent in VC
-        vc_joined_events = [vc for vc in user_results if "vc_joined" in vc.message_type]
-        vc_total_time = sum(vc.time_in_vc for vc in vc_joined_events)
+        vc_total_time = sum(time_in_vc for time_in_vc, _, _ in counters.vc_sessions.values())
         vc_eddies = vc_total_time * MESSAGE_VALUES["vc_joined"]
 
         if vc_total_time:
             # add a minimum of 1 for each VC event
-            vc_eddies += len(vc_joined_events)
+            vc_eddies += len(counters.vc_sessions)
 
         eddies_gained += vc_eddies
 
-        vc_streaming_events = [vc for vc in user_results if "vc_streaming" in vc.message_type]
-        stream_total_time = sum(vc.time_streaming for vc in vc_streaming_events)
+        vc_streaming_events = [streaming for _, streaming, streamed in counters.vc_sessions.values() if streamed]
+        stream_total_time = sum(vc_streaming_events)
         stream_eddies = stream_total_time * MESSAGE_VALUES["vc_streaming"]
 
         if stream_total_time:
@@ -444,98 +525,168 @@ class BSEddiesManager(BaseTask):
 
         return eddies_gained, count
 
-    def give_out_eddies(  # noqa: PLR0915, PLR0912, C901
-        self, guild_id: int, real: bool = False, days: int = 1
-    ) -> dict[int, list[int, dict[str, float]]]:
-        """Works out all the predicted salary gain for a given server's members.
+    def calc_individual(  # noqa: PLR0913, PLR0917
+        self,
+        user: int,
+        user_dict: UserDB,
+        user_results: list[MessageDB | VCInteractionDB],
+        user_reacted: list[MessageDB],
+        user_reactions: list[MessageDB],
+        start: datetime.datetime,
+        end: datetime.datetime,
+        guild_id: int,
+        wordle_word: str | None = None,
+        real: bool = False,
+        emoji_names: set[str] | None = None,
+        server_min: int | None = None,
+    ) -> tuple[int, dict[str, any]]:
+        """Method that calculates the daily salary for a given individual.
 
-        Only distributes them if specified.
+        Needs all the data given to it.
 
         Args:
-            guild_id (int): The guild ID to process
-            real (bool): whether to actually perform operations or not
-            days (int): number of days to go back to calc eddies for. Defaults to 1.
+            user (int): The user ID of the user
+            user_dict (User): The user database object
+            user_results (list[MessageDB | VCInteractionDB]): list of user interactions
+            user_reacted (list[MessageDB]): list of messages the user reacted to
+            user_reactions (list[MessageDB]): list of messages the user had reactions on
+            start (datetime.datetime): start time to calc eddies for
+            end (datetime.datetime): end time to calc eddies for
+            guild_id (int): the guild ID the user exists in
+            wordle_word (str, optional): the wordle word for the day
+            real (bool, optional): Whether to actually do operations. Defaults to False.
+            emoji_names (set[str] | None, optional): the names of the server's emojis. Looked up for each reaction
+                when not provided. Defaults to None.
+            server_min (int | None, optional): the server's daily minimum. Defaults to `self.server_min`.
 
         Returns:
-            dict: the eddie breakdown for each server member
+            (int, dict): eddies earnt, breakdown dict
         """
-        start, end = self.get_datetime_objects(days)
+        counters = self._count_individual(
+            user, user_results, user_reacted, user_reactions, start, end, guild_id, wordle_word, emoji_names
+        )
+        return self.calc_salary(user, user_dict, counters, guild_id, real, server_min=server_min)
 
-        server_min = self.guilds.get_daily_minimum(guild_id)
-        if not server_min:
-            server_min = 4
-        self.server_min = server_min
+    def _count_interactions(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        wordle_word: str | None,
+        emoji_names: set[str],
+    ) -> GuildDayTally:
+        """Counts everyone's salary-relevant interactions between the two timestamps from the database.
 
+        Args:
+            guild_id (int): The guild ID to process
+            start (datetime.datetime): start time to count interactions for
+            end (datetime.datetime): end time to count interactions for
+            wordle_word (str | None): the wordle word for the day
+            emoji_names (set[str]): the names of the server's emojis
+
+        Returns:
+            GuildDayTally: the counters for each user
+        """
         # query gets all messages yesterday
         results = self.interactions.query({"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}})
 
         reactions = self.interactions.query({"guild_id": guild_id, "reactions.timestamp": {"$gt": start, "$lt": end}})
 
-        users = self.user_points.get_all_users_for_guild(guild_id)
-        users = [u for u in users if not u.inactive]
-        user_ids = [u.uid for u in users]
-        user_dict = {u.uid: u for u in users}
-
-        eddie_gain_dict: dict[int, list[int, dict[str, float]]] = {}
-        wordle_messages = []
-
-        try:
-            wordle_doc = self.wordles.find_wordles_at_timestamp(start, guild_id)
-            wordle_word = wordle_doc.actual_word
-        except (AttributeError, IndexError, KeyError):
-            wordle_doc = None
-            wordle_word = None
+        # bucket the interactions per user once rather than filtering everything for every user
+        user_results, user_reacted, user_reactions = self._bucket_interactions(results, reactions)
 
-        for user in user_ids:
-            self.logger.info("processing %s", user)
-
-            user_results = [r for r in results if r.user_id == user]
-            user_reacted_messages = [r for r in reactions if r.user_id == user]
-            user_reactions = [r for r in reactions if any(react for react in r.reactions if react.user_id == user)]
-
-            eddies_gained, breakdown = self.calc_individual(
+        tally = GuildDayTally(
+            message_ids={message.message_id for message in results if "message" in message.message_type},
+            wordle_word=wordle_word,
+        )
+        for user in user_results.keys() | user_reacted.keys() | user_reactions.keys():
+            tally.users[user] = self._count_individual(
                 user,
-                user_dict[user],
-                user_results,
-                user_reacted_messages,
-                user_reactions,
+                user_results.get(user, []),
+                user_reacted.get(user, []),
+                user_reactions.get(user, []),
                 start,
                 end,
                 guild_id,
                 wordle_word,
-                real,
+                emoji_names,
             )
+            if wordle_word is None:
+                # keep the contents so the wordle word can be counted when we know it
+                tally.contents[user] = [message.content for message in user_results.get(user, []) if message.content]
+        return tally
 
-            try:
-                wordle_message = next(w for w in user_results if "wordle" in w.message_type)
-                result = re.search(WORDLE_SCORE_REGEX, wordle_message.content).group()
-                guesses = result.split("/")[0]
+    def get_salary_counters(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        wordle_word: str | None,
+        emoji_names: set[str],
+        real: bool = False,
+    ) -> dict[int, SalaryCounters]:
+        """Gets everyone's salary counters for the day.
 
-                if guesses != "X":
-                    guesses = int(guesses)
+        Predictions use the live salary tally, seeding it from the database if we started partway through the day.
+        Actually giving out eddies always counts the interactions from the database so that anything the tally
+        missed (eg: a dropped event) can't change anyone's eddies.
+
+        Args:
+            guild_id (int): The guild ID to process
+            start (datetime.datetime): start time to count interactions for
+            end (datetime.datetime): end time to count interactions for
+            wordle_word (str | None): the wordle word for the day
+            emoji_names (set[str]): the names of the server's emojis
+            real (bool): whether the counters are for actually giving out eddies. Defaults to False.
+
+        Returns:
+            dict[int, SalaryCounters]: the counters for each user
+        """
+        if real:
+            return self._count_interactions(guild_id, start, end, wordle_word, emoji_names).users
 
-                wordle_value = WORDLE_VALUES[guesses]
-                eddies_gained += wordle_value
+        day = start.date()
+        tally = self.interactions.salary_tally
 
-                if "wordle" not in breakdown:
-                    breakdown["wordle"] = 3
+        if wordle_word and tally.needs_wordle_word(guild_id, day):
+            tally.set_wordle_word(guild_id, day, wordle_word)
 
-                breakdown["wordle"] += wordle_value
+        def _seed(since: datetime.datetime) -> GuildDayTally:
+            return self._count_interactions(guild_id, start, min(end, since), wordle_word, emoji_names)
 
-                if guesses != "X":
-                    wordle_messages.append((user, guesses))
+        if tally.warm(guild_id, day, _seed) and (counters := tally.get_counters(guild_id, day)) is not None:
+            self.logger.info("Using the salary tally for %s on %s", guild_id, day)
+            return counters
 
-            except (IndexError, StopIteration):
-                # just means we had an error with this
-                pass
+        return self._count_interactions(guild_id, start, end, wordle_word, emoji_names).users
 
-            if eddies_gained == 0:
-                continue
+    def _get_wordle_word(self, guild_id: int, start: datetime.datetime) -> str | None:
+        """Gets the day's wordle word.
 
-            eddie_gain_dict[user] = [eddies_gained, breakdown]
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the start of the day
+
+        Returns:
+            str | None: the wordle word, or None if we don't know it
+        """
+        try:
+            return self.wordles.find_wordles_at_timestamp(start, guild_id).actual_word
+        except (AttributeError, IndexError, KeyError):
+            return None
 
-        # grab the bot's wordle message here
-        results = self.interactions.query(
+    def _get_bot_wordle_guesses(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> int:
+        """Gets the number of guesses the bot took for the day's wordle.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the start of the day
+            end (datetime.datetime): the end of the day
+
+        Returns:
+            int: the number of guesses, or an arbitrarily high number if the bot didn't solve it
+        """
+        bot_results = self.interactions.query(
             {
                 "guild_id": guild_id,
                 "timestamp": {"$gt": start, "$lt": end},
@@ -546,18 +697,151 @@ class BSEddiesManager(BaseTask):
         )
 
         bot_guesses = 100  # arbitrarily high number
-        if results:
-            bot_message = results[0]
+        if bot_results:
+            bot_message = bot_results[0]
             bot_result = re.search(r"[\dX]/\d", bot_message.content).group()
             bot_guesses = bot_result.split("/")[0]
             bot_guesses = int(bot_guesses) if bot_guesses != "X" else 100
+        return bot_guesses
+
+    @staticmethod
+    def _add_wordle(breakdown: dict[str, any], wordle: str | None) -> int | str | None:
+        """Adds the user's wordle to their salary breakdown.
+
+        Args:
+            breakdown (dict[str, any]): the user's salary breakdown
+            wordle (str | None): the content of the user's wordle message
+
+        Returns:
+            int | str | None: the number of guesses the user took, "X" if they didn't solve it, or None if they didn't
+                do the wordle
+        """
+        if wordle is None:
+            return None
+        try:
+            result = re.search(WORDLE_SCORE_REGEX, wordle).group()
+            guesses = result.split("/")[0]
+
+            if guesses != "X":
+                guesses = int(guesses)
+
+            wordle_value = WORDLE_VALUES[guesses]
+        except IndexError:
+            # just means we had an error with this
+            return None
+
+        if "wordle" not in breakdown:
+            breakdown["wordle"] = 3
+
+        breakdown["wordle"] += wordle_value
+        return guesses
+
+    def predict_salary(self, guild_id: int, user_id: int, king_id: int) -> tuple[int, dict[str, any], int]:
+        """Predicts a single user's salary for today.
+
+        Only the user is priced, from their counters in the live salary tally. The king's tax gains depend on
+        everyone's salaries so predicting the king's salary still works out everyone's.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user ID
+            king_id (int): the current king's user ID
+
+        Returns:
+            tuple[int, dict[str, any], int]: the eddies the user would gain after tax, their breakdown and the tax
+        """
+        if user_id == king_id:
+            eddies, breakdown, tax = self.give_out_eddies(guild_id, False, 0)[user_id]
+            return eddies, breakdown, tax
+
+        user_db = self.user_points.find_user(user_id, guild_id)
+        if user_db is None or user_db.inactive:
+            return 0, {}, 0
+
+        start, end = self.get_datetime_objects(0)
+        server_min = self.guilds.get_daily_minimum(guild_id) or 4
+        emoji_names = {emoji.name for emoji in self.server_emojis.get_all_emojis(guild_id)}
+        wordle_word = self._get_wordle_word(guild_id, start)
+
+        salary_counters = self.get_salary_counters(guild_id, start, end, wordle_word, emoji_names)
+        counters = salary_counters.get(user_id) or SalaryCounters()
+        eddies, breakdown = self.calc_salary(user_id, user_db, counters, guild_id, False, emoji_names, server_min)
+
+        if (guesses := self._add_wordle(breakdown, counters.wordle)) is not None:
+            eddies += WORDLE_VALUES[guesses]
+            others = (self._add_wordle({}, other.wordle) for other in salary_counters.values())
+            top_guess = min(
+                (other for other in others if other not in {None, "X"}),
+                default=100,
+            )
+            if guesses != "X" and guesses == min(top_guess, self._get_bot_wordle_guesses(guild_id, start, end)):
+                breakdown["wordle_win"] = 1
+                eddies += 5
+
+        if eddies == 0:
+            return 0, {}, 0
+
+        tax_rate, supporter_tax_rate = self.guilds.get_tax_rate(guild_id)
+        tax_rate = supporter_tax_rate if user_db.supporter_type == SupporterType.SUPPORTER else tax_rate
+        tax = math.floor(eddies * tax_rate)
+        return eddies - tax, breakdown, tax
+
+    def give_out_eddies(  # noqa: PLR0915, C901
+        self, guild_id: int, real: bool = False, days: int = 1
+    ) -> dict[int, list[int, dict[str, float]]]:
+        """Works out all the predicted salary gain for a given server's members.
+
+        Only distributes them if specified.
+
+        Args:
+            guild_id (int): The guild ID to process
+            real (bool): whether to actually perform operations or not
+            days (int): number of days to go back to calc eddies for. Defaults to 1.
+
+        Returns:
+            dict: the eddie breakdown for each server member
+        """
+        start, end = self.get_datetime_objects(days)
+
+        server_min = self.guilds.get_daily_minimum(guild_id)
+        if not server_min:
+            server_min = 4
+
+        users = self.user_points.get_all_users_for_guild(guild_id)
+        users_by_id = {u.uid: u for u in users if not u.inactive}
+
+        emoji_names = {emoji.name for emoji in self.server_emojis.get_all_emojis(guild_id)}
+
+        eddie_gain_dict: dict[int, list[int, dict[str, float]]] = {}
+        wordle_messages = []
+
+        wordle_word = self._get_wordle_word(guild_id, start)
+        salary_counters = self.get_salary_counters(guild_id, start, end, wordle_word, emoji_names, real)
+
+        for user, user_db in users_by_id.items():
+            self.logger.info("processing %s", user)
+
+            counters = salary_counters.get(user) or SalaryCounters()
+            eddies_gained, breakdown = self.calc_salary(
+                user, user_db, counters, guild_id, real, emoji_names, server_min
+            )
+
+            if (guesses := self._add_wordle(breakdown, counters.wordle)) is not None:
+                eddies_gained += WORDLE_VALUES[guesses]
+                if guesses != "X":
+                    wordle_messages.append((user, guesses))
+
+            if eddies_gained == 0:
+                continue
+
+            eddie_gain_dict[user] = [eddies_gained, breakdown]
 
         # do wordle here
         if wordle_messages:
             wordle_messages = sorted(wordle_messages, key=operator.itemgetter(1))
             top_guess = wordle_messages[0][1]
 
-            top_guess = min(bot_guesses, top_guess)
+            top_guess = min(self._get_bot_wordle_guesses(guild_id, start, end), top_guess)
 
             for wordle_attempt in wordle_messages:
                 if wordle_attempt[1] == top_guess:
@@ -571,11 +855,14 @@ class BSEddiesManager(BaseTask):
         tax_rate, supporter_tax_rate = self.guilds.get_tax_rate(guild_id)
         self.logger.info("Tax rate is: %s, %s", tax_rate, supporter_tax_rate)
 
+        # {user ID: amount} of all the salaries to give out in one go
+        salaries: dict[int, int] = {}
+
         for _user, user_dict in eddie_gain_dict.items():
             if _user == "guild":
                 continue
 
-            user_db = self.user_points.find_user(_user, guild_id)
+            user_db = users_by_id[_user]
             tr = supporter_tax_rate if user_db.supporter_type == SupporterType.SUPPORTER else tax_rate
 
             if _user != current_king_id:
@@ -586,16 +873,11 @@ class BSEddiesManager(BaseTask):
                 tax_gains += taxed
 
             self.logger.info("%s gained %s", _user, user_dict[0])
-            if not real:
-                continue
+            salaries[_user] = user_dict[0]
 
-            self.logger.info("Incrementing %s by %s", _user, user_dict[0])
-            self.user_points.increment_points(
-                _user,
-                guild_id,
-                user_dict[0],
-                TransactionTypes.DAILY_SALARY,
-            )
+        if real:
+            self.logger.info("Incrementing %s users' salaries", len(salaries))
+            self.user_points.increment_points_many(guild_id, salaries, TransactionTypes.DAILY_SALARY)
 
         if current_king_id not in eddie_gain_dict:
             # king isn't gaining eddies lol
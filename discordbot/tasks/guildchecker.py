@@ -14,11 +14,13 @@ from discordbot.tasks.basetask import BaseTask, TaskSchedule
 from discordbot.views.bet import BetView
 from discordbot.views.leaderboard import LeaderBoardView
 from discordbot.views.revolution import RevolutionView
+from mongo.bsepoints.generic import DataStore
 from mongo.datatypes.guild import GuildDB
 
 if TYPE_CHECKING:
     from discordbot.slashcommandeventclasses.close import CloseBet
     from discordbot.slashcommandeventclasses.place import PlaceBet
+    from mongo.baseclass import BaseClass
 
 
 class GuildChecker(BaseTask):
@@ -47,6 +49,7 @@ class GuildChecker(BaseTask):
         self.finished: bool = False
 
         self.embed_manager = EmbedManager()
+        self.data_store = DataStore()
 
         self.close: CloseBet = close
         self.place: PlaceBet = place
@@ -104,43 +107,35 @@ class GuildChecker(BaseTask):
     async def _check_guild_members(self, guild: discord.Guild) -> None:
         """Checks a guild's members match what we have in the database.
 
+        Works out which members joined, changed their name or left by comparing the guild's members with the users we
+        have and then applies all the changes in a single bulk write.
+
         Args:
             guild (discord.Guild): the guild to check
         """
         members = await guild.fetch_members().flatten()
+        names = {member.id: member.nick or member.name for member in members if not member.bot}
+        users = await self.user_points.run_async(self.user_points.get_guild_user_states, guild.id)
 
         self.logger.debug("Checking guilds for new members")
-        for member in members:  # type: discord.Member
-            if member.bot:
-                continue
-
-            self.logger.debug("Checking %s - %s", member.id, member.name)
-            name = member.nick or member.name
-            user = self.user_points.find_user(member.id, guild.id)
-            if not user:
-                self.user_points.create_user(member.id, guild.id, name, False)
-                self.activities.add_activity(member.id, guild.id, ActivityTypes.SERVER_JOIN)
-                self.logger.debug(
-                    "Creating new user entry for %s - %s for %s - %s", member.id, member.name, guild.id, guild.name
-                )
-                continue
-
-            if name != user.name:
-                self.logger.debug("Updating db name for %s", name)
-                self.user_points.update({"_id": user._id}, {"$set": {"name": name}})  # noqa: SLF001
+        joined = {uid: name for uid, name in names.items() if uid not in users}
+        renamed = {uid: name for uid, name in names.items() if uid in users and users[uid][0] != name}
 
         self.logger.debug("Checking for users that have left")
-        member_ids = [member.id for member in members]
-        if not member_ids:
-            # exit here if we failed to get members (and therefore IDs)
-            # otherwise we think everyone has left the server (which is not accurate)
+        member_ids = {member.id for member in members}
+        # if we failed to get members (and therefore IDs)
+        # we'd otherwise think everyone has left the server (which is not accurate)
+        left = {uid for uid, (_, inactive) in users.items() if not inactive} - member_ids if member_ids else set()
+
+        if not (joined or renamed or left):
             return
-        _users = self.user_points.get_all_users_for_guild(guild.id)
-        _users = [u for u in _users if not u.inactive]
-        for user in _users:
-            if user.uid not in member_ids:
-                self.user_points.update({"_id": user._id}, {"$set": {"inactive": True}})  # noqa: SLF001
-                self.activities.add_activity(user._id, guild.id, ActivityTypes.SERVER_LEAVE)  # noqa: SLF001
+
+        self.logger.info(
+            "%s joined, %s renamed and %s left %s - %s", len(joined), len(renamed), len(left), guild.id, guild.name
+        )
+        await self.user_points.run_async(self.user_points.sync_guild_members, guild.id, joined, renamed, left)
+        await self.activities.run_async(self.activities.add_activities, joined, guild.id, ActivityTypes.SERVER_JOIN)
+        await self.activities.run_async(self.activities.add_activities, left, guild.id, ActivityTypes.SERVER_LEAVE)
 
     async def _check_guild_emojis(self, guild: discord.Guild) -> None:
         """Checks we have all the guild emojis in the database.
@@ -323,11 +318,70 @@ class GuildChecker(BaseTask):
             if channel_db.name != channel.name or channel_db.is_nsfw != channel.is_nsfw():
                 self.guild_channels.update_channel(channel_db, channel.name, channel.is_nsfw())
 
+    def _check_indexes(self) -> None:
+        """Makes sure each collection has its indexes and reports any queries that would scan a whole collection."""
+        collections: list[BaseClass] = [
+            self.interactions,
+            self.interactions.daily_stats,
+            self.interactions.message_usages,
+            self.user_points,
+            self.user_points._trans,  # noqa: SLF001
+            self.user_bets,
+            self.activities,
+            self.guilds,
+            self.server_emojis,
+            self.server_stickers,
+        ]
+        for collection in collections:
+            name = type(collection).__name__
+            for index, error in collection.ensure_indexes().items():
+                self.logger.warning("Couldn't create index %s for %s: %s", index, name, error)
+            for shape in collection.find_collection_scans():
+                self.logger.warning("Query on %s would scan the whole collection: %s", name, shape)
+
+    def _check_bet_users(self) -> None:
+        """Backfills the users of any bets where they don't match the betters, so that the users index is complete."""
+        count = self.user_bets.backfill_users()
+        if count:
+            self.logger.info("Backfilled the users for %s bets", count)
+
+    def _check_daily_stats(self, guild_id: int) -> None:
+        """Backfills the daily message counters from the message history.
+
+        Resumes from the guild's checkpoint if we have one. Otherwise, goes through the whole message history. The
+        counters are rebuilt for whole days, which also fills any gaps and retries any earlier backfill that failed.
+        Today is left alone as its counters are being incremented as messages are received; it's rebuilt by the next
+        backfill once it's over. Once done, the checkpoint is moved up to the start of today.
+
+        Args:
+            guild_id (int): the guild ID
+        """
+        daily_stats = self.interactions.daily_stats
+        today = daily_stats.day_start(datetime.datetime.now(tz=ZoneInfo("UTC")))
+
+        query = {"guild_id": guild_id, "timestamp": {"$lt": today}, "message_type": "message", "is_bot": {"$ne": True}}
+        if (checkpoint := self.data_store.get_daily_stats_checkpoint(guild_id)) is not None:
+            if checkpoint >= today:
+                return
+            query["timestamp"]["$gte"] = daily_stats.day_start(checkpoint)
+
+        messages = self.interactions.paginated_query(query, as_gen=True)
+        count = daily_stats.rebuild(guild_id, messages)
+        self.data_store.set_daily_stats_checkpoint(guild_id, today)
+        self.logger.info("Backfilled %s daily message counters for %s", count, guild_id)
+
     @tasks.loop(count=1)
     async def guild_checker(self) -> None:
         """Loop that makes sure that guild information is synced correctly."""
         datetime.datetime.now(tz=ZoneInfo("UTC"))
 
+        if not self.finished:
+            self.logger.info("Checking collection indexes")
+            await self.guilds.run_async(self._check_indexes)
+
+            self.logger.info("Checking bet users")
+            await self.user_bets.run_async(self._check_bet_users)
+
         self.logger.info("Running guild sync")
         async for guild in self.bot.fetch_guilds():
             self.logger.debug("Checking guild: %s - %s", guild.id, guild.name)
@@ -364,6 +418,9 @@ class GuildChecker(BaseTask):
             # theoretically event views should be initialised now
             # same for all the open bet views
 
+            self.logger.info("Checking daily message counters")
+            await self.interactions.run_async(self._check_daily_stats, guild.id)
+
             self.logger.debug("Initialising event views")
             self._check_events(guild)
 
@@ -2,6 +2,7 @@
 
 import asyncio
 import datetime
+from collections.abc import AsyncGenerator
 from zoneinfo import ZoneInfo
 
 import discord
@@ -10,6 +11,12 @@ from discord.ext import tasks
 from discordbot.bsebot import BSEBot
 from discordbot.clienteventclasses.onmessage import OnMessage
 from discordbot.tasks.basetask import BaseTask, TaskSchedule
+from mongo.bsepoints.generic import DataStore
+
+# the most channels to sync at once
+SYNC_CONCURRENCY = 3
+# the number of unsynced messages to process at a time
+SYNC_BATCH_SIZE = 100
 
 
 class MessageSync(BaseTask):
@@ -34,104 +41,167 @@ class MessageSync(BaseTask):
         self.schedule = TaskSchedule(range(7), [2], minute=15, overriden=True)
         self.task = self.message_sync
         self.on_message = on_message
+        self.data_store = DataStore()
         if start:
             self.task.start()
 
     @staticmethod
     async def get_unsynced_messages(
         channel: discord.TextChannel | discord.Thread,
-        message_ids: list[int],
+        message_ids: set[int],
         before: datetime.datetime | None = None,
         after: datetime.datetime | None = None,
-    ) -> list[discord.Message]:
-        """Retrieves messages from a discord Channel and checks if they're in our cache already.
-
-        Returns messages that aren't in the cache.
+        batch_size: int = SYNC_BATCH_SIZE,
+    ) -> AsyncGenerator[list[discord.Message]]:
+        """Streams the messages from a discord Channel that aren't in our cache already, oldest first.
 
         Args:
             channel (discord.TextChannel | discord.Thread): the channel/thread to check for
-            message_ids (list[int]): list of cached message IDs
+            message_ids (set[int]): set of cached message IDs
             before (datetime.datetime, optional): latest time to check. Defaults to None.
             after (datetime.datetime, optional): earliest time to check. Defaults to None.
+            batch_size (int, optional): the number of messages in each batch. Defaults to SYNC_BATCH_SIZE.
 
-        Returns:
-            list[discord.Message]: list of unsynced messages
+        Yields:
+            list[discord.Message]: batches of unsynced messages
         """
         _messages_to_sync = []
-        async for message in channel.history(limit=None, oldest_first=False, after=after, before=before):
+        async for message in channel.history(limit=None, oldest_first=True, after=after, before=before):
             if message.id in message_ids:
                 # already got this message ID synced
                 continue
             _messages_to_sync.append(message)
+            if len(_messages_to_sync) == batch_size:
+                yield _messages_to_sync
+                _messages_to_sync = []
+
+        if _messages_to_sync:
+            yield _messages_to_sync
+
+    async def _sync_window(
+        self, channel: discord.TextChannel | discord.Thread, after: datetime.datetime, before: datetime.datetime
+    ) -> int:
+        """Syncs the messages in a channel between two times.
+
+        Args:
+            channel (discord.TextChannel | discord.Thread): the channel to sync
+            after (datetime.datetime): the earliest time to sync
+            before (datetime.datetime): the latest time to sync
+
+        Returns:
+            int: the number of messages that were synced
+        """
+        message_ids = await self.interactions.run_async(
+            self.interactions.get_message_ids, channel.guild.id, channel.id, after, before
+        )
 
-        return _messages_to_sync
+        synced = 0
+        async for unsynced in self.get_unsynced_messages(channel, message_ids, before, after):
+            self.logger.info("Found %s unsynced messages in %s", len(unsynced), channel.name)
+            for message in unsynced:
+                _trigger_actions = False
+                if (datetime.datetime.now(tz=datetime.UTC) - message.created_at).total_seconds() < 120:  # noqa: PLR2004
+                    # if message is relatively new; trigger actions
+                    # for when we miss a message during a restart
+                    self.logger.info("%s was created less than two minutes ago - WILL trigger actions", message.id)
+                    _trigger_actions = True
+                await self.on_message.message_received(message, False, _trigger_actions)
+            synced += len(unsynced)
+        return synced
 
-    async def _message_sync(self, channel: discord.TextChannel | discord.Thread) -> None:
+    async def _message_sync(
+        self, channel: discord.TextChannel | discord.Thread, checkpoint: datetime.datetime | None = None
+    ) -> None:
         """Checks a given channel for unsynced messages.
 
-        Initially goes back a week to find unsynced messages, but will go back further
-        if it finds unsynced messages for the given channel.
+        Resumes from when the channel was last fully synced if we have a checkpoint for it. Otherwise, initially goes
+        back a week to find unsynced messages, but will go back further if it finds unsynced messages for the given
+        channel. Once done, the checkpoint is moved up to when we started.
 
         Args:
             channel (discord.TextChannel | discord.Thread): the channel to check
+            checkpoint (datetime.datetime | None, optional): when the channel was last synced up to. Defaults to None.
         """
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
-        offset_days = 7
-        offset = now - datetime.timedelta(days=offset_days)
-        before = now
 
         self.logger.info("Checking %s for unsynced messages", channel.name)
 
-        _cached_messages = self.interactions.get_all_messages_for_channel(channel.guild.id, channel.id)
-        _cached_ids = [c.message_id for c in _cached_messages]
+        if checkpoint is not None:
+            # everything before the checkpoint has already been synced
+            await self._sync_window(channel, checkpoint, now)
+        else:
+            offset_days = 7
+            offset = now - datetime.timedelta(days=offset_days)
+            before = now
+            while await self._sync_window(channel, offset, before):
+                before = offset
+                offset_days += 30
+                offset = now - datetime.timedelta(days=offset_days)
+                self.logger.debug("Setting offset to %s and looping again", offset)
+
+        # make sure the synced messages are written before we move the checkpoint past them
+        await self.interactions.run_async(self.interactions.flush)
+        await self.data_store.run_async(self.data_store.set_message_sync_checkpoint, channel.guild.id, channel.id, now)
+
+    async def _get_channels(self, guild: discord.Guild) -> list[discord.TextChannel | discord.Thread]:
+        """Gets the channels and threads to sync for a guild.
 
-        sync = True
-        while sync:
-            unsynced = await self.get_unsynced_messages(channel, _cached_ids, before, offset)
+        Args:
+            guild (discord.Guild): the guild
 
-            if not unsynced:
-                sync = False
+        Returns:
+            list[discord.TextChannel | discord.Thread]: the channels and threads
+        """
+        channels = []
+        for channel in guild.channels:
+            if type(channel) not in {discord.TextChannel, discord.Thread}:
                 continue
+            channels.append(channel)
 
-            self.logger.info("Found %s unsynced messages in %s", len(unsynced), channel.name)
+            # check threads for channel
+            try:
+                archived = await channel.archived_threads().flatten()
+            except discord.Forbidden:
+                self.logger.debug("Don't have permissions to access %s", channel.name)
+                continue
+            channels.extend(channel.threads + archived)
+        return channels
 
-            for message in unsynced:
-                _trigger_actions = False
-                if (datetime.datetime.now(tz=datetime.UTC) - message.created_at).total_seconds() < 120:  # noqa: PLR2004
-                    # if message is relatively new; trigger actions
-                    # for when we miss a message during a restart
-                    self.logger.info("%s was created less than two minutes ago - WILL trigger actions", message.id)
-                    _trigger_actions = True
-                await self.on_message.message_received(message, False, _trigger_actions)
+    async def _sync_channel(
+        self,
+        channel: discord.TextChannel | discord.Thread,
+        checkpoint: datetime.datetime | None,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Syncs a channel once there aren't too many other channels syncing.
 
-            before = offset
-            offset_days += 30
-            offset = now - datetime.timedelta(days=offset_days)
-            self.logger.debug("Setting offset to %s and looping again", offset)
+        Args:
+            channel (discord.TextChannel | discord.Thread): the channel to sync
+            checkpoint (datetime.datetime | None): when the channel was last synced up to
+            semaphore (asyncio.Semaphore): limits how many channels sync at once
+        """
+        async with semaphore:
+            try:
+                await self._message_sync(channel, checkpoint)
+            except discord.Forbidden:
+                self.logger.debug("Don't have permissions to access %s", channel.name)
+            except Exception:
+                self.logger.exception("Failed to sync %s", channel.name)
 
     @tasks.loop(count=1)
     async def message_sync(self) -> None:
-        """Loop that makes sure all messages are synced correctly."""
+        """Loop that makes sure all messages are synced correctly.
+
+        Channels are synced concurrently, a few at a time, so that we stay well within Discord's rate limits.
+        """
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
         for guild in self.bot.guilds:
             self.logger.debug("Checking %s for unsynced messages", guild.name)
-
-            for channel in guild.channels:
-                if type(channel) not in {discord.TextChannel, discord.Thread}:
-                    continue
-
-                try:
-                    await self._message_sync(channel)
-                except discord.Forbidden:
-                    self.logger.debug("Don't have permissions to access %s", channel.name)
-                    continue
-                # check threads for channel
-                archived = await channel.archived_threads().flatten()
-                for thread in channel.threads + archived:
-                    try:
-                        await self._message_sync(thread)
-                    except discord.Forbidden:
-                        self.logger.debug("Don't have permissions to access %s", channel.name)
-                        continue
+            checkpoints = await self.data_store.run_async(self.data_store.get_message_sync_checkpoints, guild.id)
+            channels = await self._get_channels(guild)
+            await asyncio.gather(
+                *(self._sync_channel(channel, checkpoints.get(channel.id), semaphore) for channel in channels)
+            )
             self.logger.debug("Finished sync for %s", guild.name)
         self.schedule.overriden = False
 
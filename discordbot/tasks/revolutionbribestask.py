@@ -50,14 +50,14 @@ class RevolutionBribeTask(BaseTask):
         """
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
         start = now.replace(year=2021, month=1, day=1)
-        activity_history = self.activities.get_guild_activities_by_timestamp(guild.id, start, now)
-        king_events = sorted(
-            [act for act in activity_history if act.type in {ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS}],
-            key=lambda x: x.timestamp,
+        # sorted by timestamp by the database
+        king_events = self.activities.stream_guild_activities(
+            guild.id, start, now, activity_types={ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS}
         )
 
         kings: dict[int, float] = {}
         previous_time = start
+        event = None
 
         for event in king_events:
             if event.type == ActivityTypes.KING_LOSS:
@@ -74,7 +74,7 @@ class RevolutionBribeTask(BaseTask):
                 # has to be a ActivityTypes.KING_GAIN event
                 previous_time = event.timestamp
 
-        if king_events[-1] == event and event.type == ActivityTypes.KING_GAIN:
+        if event is not None and event.type == ActivityTypes.KING_GAIN:
             # last thing someone did was become KING
             if event.uid not in kings:
                 kings[event.uid] = 0
@@ -2,6 +2,7 @@
 
 import asyncio
 import datetime
+import functools
 import math
 import random
 from zoneinfo import ZoneInfo
@@ -17,6 +18,12 @@ from discordbot.views.revolution import RevolutionView
 from mongo.datatypes.guild import GuildDB
 from mongo.datatypes.revolution import RevolutionEventDB
 
+# how long before the event ends to send each countdown gif and the event key that records we've sent it
+REMINDERS: dict[datetime.timedelta, tuple[str, str]] = {
+    datetime.timedelta(hours=1): ("One hour", "one_hour"),
+    datetime.timedelta(minutes=15): ("15 MINUTES", "quarter_hour"),
+}
+
 
 class RevolutionTask(BaseTask):
     """Class for our revolution task."""
@@ -35,7 +42,7 @@ class RevolutionTask(BaseTask):
             start (bool): whether to start the task at startup. Default to False.
         """
         super().__init__(bot, startup_tasks)
-        self.schedule = TaskSchedule([6], [16, 17, 18, 19])
+        self.schedule = TaskSchedule([6], [16], minute=0)
         self.task = self.revolution
         self.embed_manager = EmbedManager()
         self.giphy_api = GiphyAPI()
@@ -46,85 +53,120 @@ class RevolutionTask(BaseTask):
             if _ := self.revolutions.get_open_events(guild_id):
                 self.rev_started[guild_id] = True
 
+        # run at startup to schedule the timers for any open events
+        self.schedule.overriden = any(self.rev_started.values())
+
         if start:
             self.task.start()
 
-    @tasks.loop(minutes=1)
-    async def revolution(self) -> None:
-        """Our revolution task.
+    def _schedule_event(self, event: RevolutionEventDB) -> None:
+        """Schedules the countdown gifs and resolving the event.
 
-        Creates a revolution event weekly and then handles the
-        closing/resolving of that event.
+        Args:
+            event (RevolutionEventDB): the event to schedule
         """
-        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        if self.scheduler is None:
+            return
+
+        for reminder, (hours_string, key) in REMINDERS.items():
+            if getattr(event, key):
+                continue
+            self.scheduler.schedule(
+                event.expired - reminder,
+                ("revolution", event.guild_id, event.event_id, key),
+                functools.partial(self._event_timer, event.guild_id, event.event_id, hours_string, key),
+            )
+
+        self.scheduler.schedule(
+            event.expired,
+            ("revolution", event.guild_id, event.event_id),
+            functools.partial(self._event_timer, event.guild_id, event.event_id),
+        )
+
+    async def _event_timer(
+        self, guild_id: int, event_id: str, hours_string: str | None = None, key: str | None = None
+    ) -> None:
+        """Timer for sending a countdown gif or resolving the event.
 
-        if not any(self.rev_started[g] for g in self.rev_started) and (
-            now.weekday() != 6 or now.hour != 16 or now.minute != 0  # noqa: PLR2004
-        ):
+        Args:
+            guild_id (int): the guild ID
+            event_id (str): the event ID
+            hours_string (str | None, optional): the countdown text. Defaults to None to resolve the event.
+            key (str | None, optional): the countdown key. Defaults to None to resolve the event.
+        """
+        event = self.revolutions.get_event(guild_id, event_id)
+        if not event or not event.open:
             return
 
-        for guild in self.bot.guilds:
-            guild_db = self.guilds.get_guild(guild.id)
+        if key is None:
+            await self.resolve_revolution(guild_id, event)
+        elif not getattr(event, key):
+            await self.send_excited_gif(event, hours_string, key)
 
-            if guild_db.revolution is False:
-                # revolution event has been disabled
-                if now.hour == 16 and now.minute == 0:  # noqa: PLR2004
-                    # only log once per revolution event that this guild is disabled
-                    self.logger.debug("Revolution event has been disabled for %s", guild.name)
-                continue
+    @tasks.loop(count=1)
+    async def revolution(self) -> None:
+        """Our revolution task.
+
+        Creates a revolution event weekly and schedules the countdown and resolving of that event.
+        """
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        await self.for_each_guild(
+            [guild.id for guild in self.bot.guilds], functools.partial(self._start_revolution, now=now)
+        )
+        self.schedule.overriden = False
 
-            king_user = self.user_points.find_user(guild_db.king, guild.id)
+    async def _start_revolution(self, guild_id: int, now: datetime.datetime) -> None:
+        """Creates a revolution event for the guild, if it's time to, and schedules its countdown and resolving.
 
-            user_points = king_user.points
+        Args:
+            guild_id (int): the guild ID
+            now (datetime.datetime): when the task ran
+        """
+        guild_db = await self.guilds.run_async(self.guilds.get_guild, guild_id)
 
+        if guild_db.revolution is False:
+            # revolution event has been disabled
+            self.logger.debug("Revolution event has been disabled for %s", guild_db.name)
+            return
+
+        if events := await self.revolutions.run_async(self.revolutions.get_open_events, guild_id):
+            event = events[0]
+        elif self.schedule.matches(now):
             # if we don't have an actual revolution event and it IS 4PM then we trigger a new event
-            if not self.rev_started.get(guild.id) and now.hour == 16 and now.minute == 0:  # noqa: PLR2004
-                # only trigger if King was King for more than twenty four hours
-                king_since = guild_db.king_since or (
-                    datetime.datetime.now(tz=ZoneInfo("UTC")) - datetime.timedelta(days=1)
-                )
-                if (now - king_since).total_seconds() < 86400:  # noqa: PLR2004
-                    # user hasn't been king for more than twenty four hours
-                    channel = await self.bot.fetch_channel(guild_db.channel)
-                    await channel.send(
-                        content=(
-                            f"<@{guild_db.king}> has been <@&{guild_db.role}> for less than **24** hours. "
-                            "There will be no revolution today."
-                        ),
-                        silent=True,
-                    )
-                    return
-
-                event = self.revolutions.create_event(
-                    guild.id,
-                    datetime.datetime.now(tz=ZoneInfo("UTC")),
-                    datetime.datetime.now(tz=ZoneInfo("UTC")) + datetime.timedelta(hours=3, minutes=30),
-                    king_user.uid,
-                    user_points,
-                    guild_db.channel,
+            # only trigger if King was King for more than twenty four hours
+            king_since = guild_db.king_since or (datetime.datetime.now(tz=ZoneInfo("UTC")) - datetime.timedelta(days=1))
+            if (now - king_since).total_seconds() < 86400:  # noqa: PLR2004
+                # user hasn't been king for more than twenty four hours
+                channel = await self.bot.fetch_channel(guild_db.channel)
+                await channel.send(
+                    content=(
+                        f"<@{guild_db.king}> has been <@&{guild_db.role}> for less than **24** hours. "
+                        "There will be no revolution today."
+                    ),
+                    silent=True,
                 )
-            else:
-                try:
-                    event = self.revolutions.get_open_events(guild.id)[0]
-                except IndexError:
-                    # this guild doesn't have an open event so let's skip for now
-                    continue
-
-            self.rev_started[guild.id] = True
+                return
 
-            if event.message_id is None:
-                await self.create_event(guild.id, event, guild_db)
-                continue
+            king_user = await self.user_points.run_async(self.user_points.find_user, guild_db.king, guild_id)
+            event = await self.revolutions.run_async(
+                self.revolutions.create_event,
+                guild_id,
+                datetime.datetime.now(tz=ZoneInfo("UTC")),
+                datetime.datetime.now(tz=ZoneInfo("UTC")) + datetime.timedelta(hours=3, minutes=30),
+                king_user.uid,
+                king_user.points,
+                guild_db.channel,
+            )
+        else:
+            # this guild doesn't have an open event so let's skip for now
+            return
 
-            if now > event.expired:
-                await self.resolve_revolution(guild.id, event)
-                continue
+        self.rev_started[guild_id] = True
 
-            if now.hour == 18 and now.minute == 30 and not event.one_hour:  # noqa: PLR2004
-                await self.send_excited_gif(event, "One hour", "one_hour")
+        if event.message_id is None:
+            await self.create_event(guild_id, event, guild_db)
 
-            elif now.hour == 19 and now.minute == 15 and not event.quarter_hour:  # noqa: PLR2004
-                await self.send_excited_gif(event, "15 MINUTES", "quarter_hour")
+        self._schedule_event(event)
 
     async def send_excited_gif(self, event: RevolutionEventDB, hours_string: str, key: str) -> None:
         """Method for sending a countdown gif in regards to tickets and things.
@@ -212,7 +254,8 @@ class RevolutionTask(BaseTask):
         chance = event.chance
         king_id = event.king or self.guilds.get_king(guild_id)
         _users = event.users
-        revolutionaries = event.revolutionaries
+        # each revolutionary gets an equal share, however many times they're in the list
+        revolutionaries = list(dict.fromkeys(event.revolutionaries))
         supporters = event.supporters
         channel_id = event.channel_id
         guild_db = self.guilds.get_guild(guild_id)
@@ -285,15 +328,13 @@ class RevolutionTask(BaseTask):
 
             gif = await self.giphy_api.random_gif("celebrate")
 
-            for user_id in revolutionaries:
-                self.user_points.increment_points(
-                    user_id,
-                    guild_id,
-                    points_each,
-                    TransactionTypes.REV_TICKET_WIN,
-                    event_id=event.event_id,
-                    comment="User won a REVOLUTION",
-                )
+            self.user_points.increment_points_many(
+                guild_id,
+                dict.fromkeys(revolutionaries, points_each),
+                TransactionTypes.REV_TICKET_WIN,
+                event_id=event.event_id,
+                comment="User won a REVOLUTION",
+            )
 
         # reset those that pledged to support - users can now _not_ support if they want
         self.guilds.reset_pledges(guild_id)
@@ -0,0 +1,124 @@
+"""Our Scheduler class.
+
+Rather than waking up regularly to check whether anything needs doing, things that need to happen at a given time
+register a timer with the scheduler. The timers are kept in a priority queue and the scheduler sleeps until the
+earliest one is due, or until a new timer is added.
+
+Each timer has a key. Scheduling a timer with a key that's already scheduled replaces the existing timer, which makes
+it easy to move a timer (eg: when a bet's timeout is extended).
+"""
+
+import asyncio
+import datetime
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable, Hashable
+from zoneinfo import ZoneInfo
+
+from slomanlogger import SlomanLogger
+
+type TimerCallback = Callable[[], Awaitable[None]]
+
+
+class Scheduler:
+    """Runs callbacks at the times they're scheduled for."""
+
+    def __init__(self) -> None:
+        """Initialisation method."""
+        self.logger = SlomanLogger("bsebot")
+
+        # heap of (when, sequence number, key)
+        self._timers: list[tuple[datetime.datetime, int, Hashable]] = []
+        # the current sequence number and callback for each key
+        # timers in the heap with a different sequence number have been replaced or cancelled
+        self._callbacks: dict[Hashable, tuple[int, TimerCallback]] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        """The number of scheduled timers."""
+        return len(self._callbacks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether there's a timer scheduled with the given key."""
+        return key in self._callbacks
+
+    def schedule(self, when: datetime.datetime, key: Hashable, callback: TimerCallback) -> None:
+        """Schedules the callback to be run at the given time.
+
+        Replaces any timer already scheduled with the same key.
+
+        Args:
+            when (datetime.datetime): when to run the callback, times in the past are run straight away
+            key (Hashable): the key for the timer
+            callback (TimerCallback): the coroutine function to call
+        """
+        sequence = next(self._counter)
+        self._callbacks[key] = (sequence, callback)
+        heapq.heappush(self._timers, (when, sequence, key))
+        # the new timer may be due before the one we're currently sleeping until
+        self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> None:
+        """Cancels the timer with the given key, if there is one.
+
+        Args:
+            key (Hashable): the key for the timer
+        """
+        self._callbacks.pop(key, None)
+
+    def next_due(self) -> datetime.datetime | None:
+        """When the next timer is due.
+
+        Returns:
+            datetime.datetime | None: when the next timer is due or None if there aren't any timers
+        """
+        while self._timers:
+            _, sequence, key = self._timers[0]
+            if key in self._callbacks and self._callbacks[key][0] == sequence:
+                return self._timers[0][0]
+            # replaced or cancelled
+            heapq.heappop(self._timers)
+        return None
+
+    def pop_due(self, now: datetime.datetime) -> list[TimerCallback]:
+        """Removes and returns the callbacks for all the timers that are due.
+
+        Args:
+            now (datetime.datetime): the current time
+
+        Returns:
+            list[TimerCallback]: the callbacks in the order they were due
+        """
+        callbacks: list[TimerCallback] = []
+        while (when := self.next_due()) and when <= now:
+            _, _, key = heapq.heappop(self._timers)
+            _, callback = self._callbacks.pop(key)
+            callbacks.append(callback)
+        return callbacks
+
+    async def run_pending(self) -> None:
+        """Sleeps until the next timer is due and runs it, along with any others that are due.
+
+        Returns early without running anything if a new timer is scheduled while we're waiting.
+        """
+        self._wakeup.clear()
+        if when := self.next_due():
+            timeout = (when - datetime.datetime.now(tz=ZoneInfo("UTC"))).total_seconds()
+        else:
+            timeout = None
+
+        if timeout is None or timeout > 0:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+            else:
+                return
+
+        for callback in self.pop_due(datetime.datetime.now(tz=ZoneInfo("UTC"))):
+            try:
+                await callback()
+            except Exception:
+                # one failing timer shouldn't stop the others
+                self.logger.exception("Timer %s failed", callback)
@@ -1,12 +1,19 @@
-"""Task Manager."""
+"""Task Manager.
 
+Starts and stops all our other tasks according to their schedules. Instead of checking every task every minute, we
+work out when each task's schedule next changes and use a `Scheduler` to sleep until then.
+"""
+
+import asyncio
 import datetime
+import functools
 from zoneinfo import ZoneInfo
 
 from discord.ext import tasks
 
 from discordbot.bsebot import BSEBot
 from discordbot.tasks.basetask import BaseTask
+from discordbot.tasks.scheduler import Scheduler
 
 
 class TaskManager(BaseTask):
@@ -28,6 +35,11 @@ class TaskManager(BaseTask):
         super().__init__(bot, startup_tasks)
         self.task = self.task_checker
         self.tasks = tasks
+
+        self.scheduler = Scheduler()
+        for task in self.tasks:
+            task.scheduler = self.scheduler
+
         self.task.start()
 
     def _should_task_be_running(self, task: BaseTask, now: datetime.datetime) -> bool:
@@ -35,9 +47,7 @@ class TaskManager(BaseTask):
 
         Using the task schedule - validate when the task should be running.
         A task should only be running if our day and hour is within the tasks defined
-        schedule. Additionally, the task may define a minute in the schedule - we give the
-        task a bit of leeway and have it running for two minutes before and two minutes after it's
-        alloted time. This is to allow time for the task to execute properly.
+        schedule. Additionally, the task may define a minute in the schedule.
 
         Tasks should still be checking themselves that they're running at the right time as well.
         This is just to reduce the need to have such ridiculous loops.
@@ -53,33 +63,9 @@ class TaskManager(BaseTask):
             # overriden schedule - pass
             return True
 
-        should_run: bool = True
-        if task.schedule.days and now.weekday() not in task.schedule.days:
-            # not the right day or hour for this task - exit
-            self.logger.debug(
-                "%s: weekday %s not in scheduled days %s", task.qualified_name, now.weekday(), task.schedule.days
-            )
-            should_run = False
-
-        if should_run and now.hour not in task.schedule.hours:
-            self.logger.debug(
-                "%s: hour %s not in scheduled hours %s", task.qualified_name, now.hour, task.schedule.hours
-            )
-            should_run = False
-
-        if should_run and task.schedule.minute and now.minute != task.schedule.minute:
-            # if we define a specific minute - make sure that we're within a few minutes of that time
-            # otherwise - exit
-            self.logger.debug("%s: minute %s not as scheduled %s", task.qualified_name, now.hour, task.schedule.minute)
-            should_run = False
-
-        if should_run and task.schedule.dates:
-            viable_months = [date.month for date in task.schedule.dates]
-            viable_days = [date.day for date in task.schedule.dates]
-            if now.month not in viable_months or now.day not in viable_days:
-                # not the right day or month - exit
-                should_run = False
-
+        should_run = task.schedule.matches(now)
+        if not should_run:
+            self.logger.debug("%s: %s not within schedule %s", task.qualified_name, now, task.schedule)
         return should_run
 
     def _stop_task(self, task: BaseTask, now: datetime.datetime) -> None:
@@ -103,41 +89,82 @@ class TaskManager(BaseTask):
             )
             task.task.stop()
 
-    @tasks.loop(minutes=1)
-    async def task_checker(self) -> None:
-        """Loop that checks that all the tasks are still running.
+    def _schedule_check(self, task: BaseTask, when: datetime.datetime) -> None:
+        """Schedules checking the given task at the given time.
+
+        Replaces any check that was already scheduled for the task.
 
-        Attempts to restart them if they are not running.
+        Args:
+            task (BaseTask): the task to check
+            when (datetime.datetime): when to check it
+        """
+        self.scheduler.schedule(when, ("task", task.qualified_name), functools.partial(self._check_task, task))
+
+    def _on_task_done(self, task: BaseTask, _: asyncio.Task) -> None:
+        """Callback for when a task's loop finishes.
+
+        Once the start up tasks have finished we can check all the other tasks. Otherwise, the task may have
+        changed its schedule (eg: cleared `overriden`) so check it again from the next minute.
+
+        Args:
+            task (BaseTask): the task that finished
         """
         now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        if task in self.startup_tasks and self._check_start_up_tasks():
+            self.logger.debug("Start up tasks have finished - checking all tasks.")
+            for _task in self.tasks:
+                self._schedule_check(_task, now)
+            return
+        self._schedule_check(task, now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1))
 
-        running_tasks: list[str] = []
-        for task in self.tasks:
-            task_name = task.qualified_name
+    async def _check_task(self, task: BaseTask) -> None:
+        """Starts or stops the given task and schedules when to next check it.
+
+        Args:
+            task (BaseTask): the task to check
+        """
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        task_name = task.qualified_name
 
-            if not self._should_task_be_running(task, now):
-                # task shouldn't be running - ensure that it isn't running
-                self._stop_task(task, now)
-                continue
+        if not self._should_task_be_running(task, now):
+            # task shouldn't be running - ensure that it isn't running
+            self._stop_task(task, now)
 
-            if not self._check_start_up_tasks() and task_name not in [
-                stask.qualified_name for stask in self.startup_tasks
-            ]:
-                # startup tasks haven't finished yet and this isn't one - skip
-                continue
+        elif not self._check_start_up_tasks() and task not in self.startup_tasks:
+            # startup tasks haven't finished yet and this isn't one - we'll check again once they have
+            self.logger.debug("Waiting for start up tasks before starting %s", task_name)
+            return
 
+        elif not task.task.is_running():
             # task should be running!
-            if not task.task.is_running():
-                self.logger.debug("Starting %s - within task's schedule (%s, %s).", task_name, now, task.schedule)
-                task.task.start()
+            self.logger.debug("Starting %s - within task's schedule (%s, %s).", task_name, now, task.schedule)
+            task.task.start().add_done_callback(functools.partial(self._on_task_done, task))
 
-            running_tasks.append(task_name)
-            if task.task.next_iteration:
-                self.logger.debug("%s is running - next iteration is: %s", task_name, task.task.next_iteration)
+        if not task.schedule:
+            return
 
-        self.logger.debug("Running tasks are: %s", running_tasks)
+        if task.schedule.overriden:
+            # tasks clear their own override once they've run so keep an eye on it
+            when = now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        elif not (when := task.schedule.next_change(now)):
+            return
+
+        self.logger.debug("Next checking %s at %s", task_name, when)
+        self._schedule_check(task, when)
+
+    @tasks.loop()
+    async def task_checker(self) -> None:
+        """Loop that waits for the next scheduled timer and runs it.
+
+        This is either starting/stopping one of our tasks or a one-off timer that a task has scheduled.
+        """
+        await self.scheduler.run_pending()
 
     @task_checker.before_loop
     async def before_task_checker(self) -> None:
         """Make sure that websocket is open before we start querying via it."""
         await self.bot.wait_until_ready()
+
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        for task in self.tasks:
+            self._schedule_check(task, now)
@@ -126,10 +126,11 @@ class WordleReminder(BaseTask):
                     iterations += 1
 
                 _messages_sent.append(message)
-                message = message.format(mention=f"<@!{reminder.user_id}>")
+                content = message.format(mention=f"<@!{reminder.user_id}>")
 
-                self.logger.debug(message)
-                await y_message.reply(content=message)
+                self.logger.debug(content)
+                await y_message.reply(content=content)
+                self.interactions.message_usages.increment(guild.id, message)
 
     @wordle_reminder.before_loop
     async def before_wordle_reminder(self) -> None:
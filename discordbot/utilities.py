@@ -37,6 +37,33 @@ def convert_time_str(time_str: str) -> int:
     return total_time
 
 
+def _count_message_uses(interactions: UserInteractions, guild_id: int, message: str, split: str) -> int:
+    """Counts how many times the bot has sent the given message by searching the message history.
+
+    Args:
+        interactions (UserInteractions): UserInteractions class for queries
+        guild_id (int): the guild ID
+        message (str): the message template
+        split (str): the marker to split the message on to validate text search results
+
+    Returns:
+        int: the number of times the message was sent
+    """
+    parts = message.split(split)
+    main_bit = max(parts, key=len)
+
+    try:
+        results = interactions.query(
+            {"guild_id": guild_id, "is_bot": True, "$text": {"$search": message}},
+            limit=0,
+            projection={"content": True},
+            convert=False,
+        )
+    except OperationFailure:
+        return 0
+    return sum(main_bit in result["content"] for result in results)
+
+
 def calculate_message_odds(
     interactions: UserInteractions,
     guild_id: int,
@@ -46,8 +73,9 @@ def calculate_message_odds(
 ) -> list[tuple[str, float]]:
     """Given a list of messages, calculates what the odds should be of each one getting picked.
 
-    This searches for previously used instances of those messages and then works out which ones should have
-    higher/lower odds.
+    This looks up how many times each of those messages have been used and then works out which ones should have
+    higher/lower odds. The usage counts are fetched in a single query; messages that haven't been counted yet are
+    counted from the message history once.
 
     Args:
         interactions (UserInteractions): UserInteractions class for queries
@@ -61,8 +89,7 @@ def calculate_message_odds(
     """
     # work out message odds
     odds = []
-    totals = {}
-    # get the number of times each rollcall message has been used
+    messages = []
     for message in message_list:
         if type(message) is tuple:
             # if message type is tuple
@@ -78,24 +105,24 @@ def calculate_message_odds(
 
             odds.append(message)
             continue
-
-        parts = message.split(split)
-        main_bit = max(parts, key=len)
-
-        try:
-            results = interactions.query({"guild_id": guild_id, "is_bot": True, "$text": {"$search": message}})
-            results = [result for result in results if main_bit in result.content]
-        except OperationFailure:
-            totals[message] = 0
-            continue
-
-        totals[message] = len(results)
+        messages.append(message)
+
+    # get the number of times each message has been used
+    usages = interactions.message_usages
+    totals = usages.get_counts(guild_id, messages)
+    if missing := {
+        message: _count_message_uses(interactions, guild_id, message, split)
+        for message in messages
+        if message not in totals
+    }:
+        usages.set_counts(guild_id, missing)
+        totals.update(missing)
 
     # work out the weight that a given message should be picked
     total_values = sum(totals.values())
-    for message in message_list:
+    for message in messages:
         _times = totals[message]
-        _chance = (1 - (_times / total_values)) * 100
+        _chance = (1 - (_times / total_values)) * 100 if total_values else 100
 
         # give greater weighting to standard messages
         if message_list.index(message) in main_indexes:
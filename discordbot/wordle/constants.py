@@ -12,3 +12,7 @@ WORDLE_PLAY_CLASS_NAME = "Welcome-module_button__"
 
 WORDLE_WORD_LENGTH = 5
 WORDLE_EXCELLENT_GUESS_NUM = 3
+WORDLE_MAX_GUESSES = 6
+
+# the most candidates we'll work out the best guess from by information gain
+WORDLE_ENTROPY_MAX_CANDIDATES = 500
@@ -0,0 +1,212 @@
+"""The wordle solving engine, without a browser.
+
+The engine keeps track of the candidate words and picks each guess whilst an oracle tells us the tiles for each
+guess. The NYT wordle board (`WordleSolver`) is one oracle and `AnswerOracle`, which already knows the answer, is
+another so solving can be run (and benchmarked) offline. `solve_batch` solves lots of answers across processes.
+"""
+
+import abc
+import asyncio
+import concurrent.futures
+import dataclasses
+import itertools
+import math
+import multiprocessing
+import os
+
+from discordbot.wordle.constants import WORDLE_ENTROPY_MAX_CANDIDATES, WORDLE_MAX_GUESSES
+from discordbot.wordle.wordlist import ABSENT, CORRECT, PRESENT, TILES, WordList, encode_pattern, load_word_list
+
+# the tile states, indexed by tile value
+_TILE_STATES = tuple(TILES)
+
+
+def get_tiles(guess: str, answer: str) -> list[str]:
+    """Works out the tiles the board would show for the guess.
+
+    Args:
+        guess (str): the guessed word
+        answer (str): the answer
+
+    Returns:
+        list[str]: the state of each tile
+    """
+    tiles = [ABSENT] * len(guess)
+    # the answer's letters that haven't been matched by a correct tile
+    remaining: dict[str, int] = {}
+    for idx, (guess_letter, answer_letter) in enumerate(zip(guess, answer, strict=True)):
+        if guess_letter == answer_letter:
+            tiles[idx] = CORRECT
+        else:
+            remaining[answer_letter] = remaining.get(answer_letter, 0) + 1
+
+    for idx, letter in enumerate(guess):
+        if tiles[idx] != CORRECT and remaining.get(letter):
+            tiles[idx] = PRESENT
+            remaining[letter] -= 1
+    return [_TILE_STATES[tile] for tile in tiles]
+
+
+class WordleOracle(abc.ABC):
+    """Something that tells us how good our guesses are."""
+
+    @abc.abstractmethod
+    async def submit(self, word: str) -> list[str]:
+        """Submits a guess.
+
+        Args:
+            word (str): the word to guess
+
+        Returns:
+            list[str]: the state of each tile; 'absent', 'present' or 'correct'
+        """
+
+
+class AnswerOracle(WordleOracle):
+    """An oracle that knows the answer."""
+
+    def __init__(self, answer: str) -> None:
+        """Initialisation method.
+
+        Args:
+            answer (str): the answer
+        """
+        self.answer = answer
+
+    async def submit(self, word: str) -> list[str]:
+        """Submits a guess.
+
+        Args:
+            word (str): the word to guess
+
+        Returns:
+            list[str]: the state of each tile
+        """
+        return get_tiles(word, self.answer)
+
+
+@dataclasses.dataclass
+class WordleGame:
+    """The outcome of playing a wordle."""
+
+    solved: bool
+    guesses: list[str]
+    states: list[list[str]]
+
+
+class WordleEngine:
+    """Picks guesses and narrows down the candidates from the tiles we get back."""
+
+    def __init__(self, word_list: WordList | None = None, entropy: bool = False) -> None:
+        """Initialisation method.
+
+        Args:
+            word_list (WordList | None, optional): the words we can guess. Defaults to our word list.
+            entropy (bool, optional): whether to pick guesses by information gain. Defaults to False.
+        """
+        self.word_list = word_list or load_word_list()
+        self.entropy = entropy
+        self.candidates = self.word_list.all()
+
+    def reset(self) -> None:
+        """Makes every word a candidate again, ready for a new game."""
+        self.candidates = self.word_list.all()
+
+    def pick_guess(self) -> str:
+        """Picks a word from the remaining candidates.
+
+        Picks the word that gives the most information if we're picking by information gain and there aren't too
+        many candidates to work that out quickly. Otherwise, picks a word at random weighted by how common it is.
+
+        Returns:
+            str: the word to guess
+        """
+        if self.entropy and len(self.candidates) <= WORDLE_ENTROPY_MAX_CANDIDATES:
+            return self.word_list.words[self.word_list.best_guess(self.candidates)]
+        return self.word_list.words[self.word_list.pick_weighted(self.candidates)]
+
+    def update(self, word: str, states: list[str]) -> None:
+        """Filters the candidates down to those that would have given the same tiles for our guess.
+
+        Args:
+            word (str): the word we guessed
+            states (list[str]): the state of each tile
+        """
+        self.candidates = self.word_list.filter(self.candidates, word, encode_pattern(states))
+
+    async def play(self, oracle: WordleOracle, starting_word: str, max_guesses: int = WORDLE_MAX_GUESSES) -> WordleGame:
+        """Plays a game of wordle.
+
+        Args:
+            oracle (WordleOracle): the oracle to submit our guesses to
+            starting_word (str): the first word to guess
+            max_guesses (int, optional): how many guesses we get. Defaults to WORDLE_MAX_GUESSES.
+
+        Returns:
+            WordleGame: the guesses we made and the tiles we got back
+        """
+        self.reset()
+        game = WordleGame(False, [], [])
+        word = starting_word
+        while True:
+            states = await oracle.submit(word)
+            game.guesses.append(word)
+            game.states.append(states)
+
+            if all(state == _TILE_STATES[CORRECT] for state in states):
+                game.solved = True
+                break
+
+            if len(game.guesses) == max_guesses:
+                break
+
+            self.update(word, states)
+            word = self.pick_guess()
+        return game
+
+
+async def _solve_answers(answers: list[str], starting_word: str, entropy: bool) -> list[WordleGame]:
+    """Solves each of the answers in turn.
+
+    Args:
+        answers (list[str]): the answers
+        starting_word (str): the first word to guess
+        entropy (bool): whether to pick guesses by information gain
+
+    Returns:
+        list[WordleGame]: the game for each answer
+    """
+    engine = WordleEngine(entropy=entropy)
+    return [await engine.play(AnswerOracle(answer), starting_word) for answer in answers]
+
+
+def _solve_chunk(answers: list[str], starting_word: str, entropy: bool) -> list[WordleGame]:
+    """Solves a chunk of the answers; run in a worker process."""
+    return asyncio.run(_solve_answers(answers, starting_word, entropy))
+
+
+def solve_batch(
+    answers: list[str], starting_word: str, entropy: bool = False, processes: int | None = None
+) -> list[WordleGame]:
+    """Solves lots of answers offline, split across processes.
+
+    Args:
+        answers (list[str]): the answers
+        starting_word (str): the first word to guess
+        entropy (bool, optional): whether to pick guesses by information gain. Defaults to False.
+        processes (int | None, optional): how many processes to use. Defaults to the number of CPUs.
+
+    Returns:
+        list[WordleGame]: the game for each answer, in the same order as the answers
+    """
+    processes = max(1, min(processes or os.cpu_count() or 1, len(answers)))
+    if processes == 1:
+        return _solve_chunk(answers, starting_word, entropy)
+
+    size = math.ceil(len(answers) / processes)
+    chunks = [answers[num : num + size] for num in range(0, len(answers), size)]
+    # spawn rather than fork as we may be forked from a process with other threads running
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        results = executor.map(_solve_chunk, chunks, itertools.repeat(starting_word), itertools.repeat(entropy))
+        return list(itertools.chain.from_iterable(results))
@@ -1,12 +1,8 @@
 """File for WordleSolver class."""
 
 import asyncio
-import copy
-import csv
 import datetime
-import os
 import random
-import re
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
@@ -35,9 +31,9 @@ from discordbot.wordle.constants import (
     WORDLE_SETTINGS_BUTTON,
     WORDLE_TUTORIAL_CLOSE_CLASS_NAME,
     WORDLE_URL,
-    WORDLE_WORD_LENGTH,
 )
 from discordbot.wordle.data_type import WordleSolve
+from discordbot.wordle.engine import WordleEngine, WordleOracle
 from mongo.bsedataclasses import WordleAttempts
 from mongo.bsepoints.generic import DataStore
 
@@ -45,24 +41,28 @@ if TYPE_CHECKING:
     from mongo.datatypes.wordle import WordleAttemptDB
 
 
-class WordleSolver:
-    """Wordle solver class."""
+class WordleSolver(WordleOracle):
+    """Wordle solver class.
 
-    def __init__(self, headless: bool = True) -> None:
+    Solves the NYT wordle in a browser; the board is the oracle for our solving engine.
+    """
+
+    def __init__(self, headless: bool = True, entropy: bool = False) -> None:
         """Initialisation method.
 
         Args:
             headless (bool, optional): _description_. Defaults to True.
+            entropy (bool, optional): whether to pick guesses by information gain. Defaults to False.
         """
         self.firefox_opts = Options()
         if headless:
             self.firefox_opts.add_argument("--headless")
         self.firefox_opts.add_argument("--no-sandbox")
-        self.words = self._get_words()
-        self.words_freq = self._get_word_frequency()
+        self.engine = WordleEngine(entropy=entropy)
         self.driver = None
         self.action_chain = None
-        self.possible_words = copy.deepcopy(self.words)
+        self._rows: list[WebElement] = []
+        self._guesses: list[str] = []
         self.logger = SlomanLogger("bsebot")
         self.wordles = WordleAttempts()
         self.data_store = DataStore()
@@ -127,38 +127,6 @@ class WordleSolver:
         self.driver = driver
         self.action_chain = ActionChains(self.driver)
 
-    @staticmethod
-    def _get_words() -> list[str]:
-        """Returns a list of possible words.
-
-        Returns:
-            _type_: Returns the list of possible words we can guess
-        """
-        fp = os.path.abspath(__file__)
-        path = os.path.join(os.path.dirname(fp), "wordle_guesses")
-        with open(path, encoding="utf-8") as f:
-            words = [line.rstrip() for line in f]
-        return sorted(words)
-
-    @staticmethod
-    def _get_word_frequency() -> dict[str, float]:
-        """Returns a list of possible words.
-
-        Returns:
-            _type_: Returns the list of possible words we can guess
-        """
-        fp = os.path.abspath(__file__)
-        path = os.path.join(os.path.dirname(fp), "unigram_freq.csv")
-        words_f = {}
-        with open(path, encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if row[0] == "word" and row[1] == "count":
-                    continue
-                words_f[row[0]] = int(row[1])
-        _sum = sum(words_f[i] for i in words_f if len(i) == WORDLE_WORD_LENGTH)
-        return {word: float(words_f[word]) / _sum for word in words_f if len(word) == WORDLE_WORD_LENGTH}
-
     def _pick_starting_word(self) -> str:
         """Returns a random starting word.
 
@@ -173,9 +141,7 @@ class WordleSolver:
         _flag = random.random()
         if _flag < 0.25:  # noqa: PLR2004
             # pick a new starting word to refine our starting word list
-            starting_word = self._pick_word_from_list()
-            if isinstance(starting_word, list):
-                starting_word = starting_word[0]
+            starting_word = self.engine.pick_guess()
         else:
             for word in self._starting_words:
                 results: list[WordleAttemptDB] = self.wordles.query({"starting_word": word})
@@ -201,53 +167,6 @@ class WordleSolver:
         self.logger.debug("Selected: %s from %s", starting_word, _attempts)
         return starting_word
 
-    def _pick_word_from_list(self) -> str:
-        """Picks a word at random from the word list.
-
-        Returns:
-            str: _description_
-        """
-        return random.choices(
-            self.possible_words,
-            weights=[self.words_freq.get(word, 0) for word in self.possible_words],
-        )
-
-    def _filter_word_list(
-        self, game_state: dict[str, any], present_letters: list[str], correct_letters: list[str]
-    ) -> None:
-        """Filters the possible word list based on our current game state.
-
-        Args:
-            game_state (dict): the current game state
-        """
-        new_possible_words = []
-
-        answer_regex = "[{letter}]"
-        not_letters = "[^{letters}]"
-
-        _word_list = copy.deepcopy(self.words) if not self.possible_words else copy.deepcopy(self.possible_words)
-
-        regex_search = []
-        for index in game_state:
-            if game_state[index]["answer"]:
-                letter_regex = answer_regex.format(letter=game_state[index]["answer"])
-            else:
-                cannot = game_state[index]["cannot"]
-                _letters = "".join(cannot)
-                letter_regex = not_letters.format(letters=_letters)
-            regex_search.append(letter_regex)
-        pattern = "".join(regex_search)
-
-        for word in _word_list:
-            if re.match(pattern, word):
-                # still need to filter to match 'present' letters
-                for letter in present_letters:
-                    if word.count(letter) < (present_letters.count(letter) + correct_letters.count(letter)):
-                        break
-                else:
-                    new_possible_words.append(word)
-        self.possible_words = new_possible_words
-
     @staticmethod
     def _get_rows(board: WebElement) -> list[WebElement]:
         return board.find_elements(By.CSS_SELECTOR, f"div[class*='{WORDLE_ROWS_CLASS_NAME}']")
@@ -292,7 +211,23 @@ class WordleSolver:
         # wait for animations
         await asyncio.sleep(3)
 
-    async def solve(self) -> WordleSolve:  # noqa: C901, PLR0912, PLR0915
+    async def submit(self, word: str) -> list[str]:
+        """Types the guess into the board and reads back the tiles.
+
+        Args:
+            word (str): the word to guess
+
+        Returns:
+            list[str]: the state of each tile
+        """
+        row = self._rows[len(self._guesses)]
+        self._guesses.append(word)
+        self.logger.info("Guess number: %s", len(self._guesses))
+        self.logger.info("Selected %s", word)
+        await self._submit_word(word)
+        return self._get_row_state(row)
+
+    async def solve(self) -> WordleSolve:  # noqa: PLR0915
         """Main solve method.
 
         Attempts to solve the wordle.
@@ -302,8 +237,6 @@ class WordleSolver:
         """
         # wait to load
         await asyncio.sleep(2)
-        solved = False
-        row = 0
         actual_word = ["", "", "", "", ""]
         game_state = {
             0: {"answer": None, "cannot": []},
@@ -312,12 +245,12 @@ class WordleSolver:
             3: {"answer": None, "cannot": []},
             4: {"answer": None, "cannot": []},
         }
-        guesses = []
         emoji_str = ""
         wordle_number = await self._get_wordle_number()
 
         board = self._get_board()
-        rows = self._get_rows(board)
+        self._rows = self._get_rows(board)
+        self._guesses = []
         # doing a click to focus the stuff
         try:
             board.click()
@@ -326,31 +259,14 @@ class WordleSolver:
             container = self.driver.find_element(By.CSS_SELECTOR, "div[class*='App-module_gameContainer__']")
             container.click()
 
-        _starting_word = None
-
-        while not solved:
-            self.logger.info("Guess number: %s", row + 1)
-
-            # iterate until we solve the wordle
-            if row == 0:
-                word = self._pick_starting_word()
-                _starting_word = word
-            else:
-                word = self._pick_word_from_list()
+        _starting_word = self._pick_starting_word()
+        game = await self.engine.play(self, _starting_word)
+        guesses = game.guesses
+        solved = game.solved
 
-            if isinstance(word, list):
-                word = word[0]
-
-            guesses.append(word)
-
-            self.logger.info("Selected %s", word)
-
-            await self._submit_word(word)
-            state = self._get_row_state(rows[row])
-            idx = 0
+        for word, state in zip(guesses, game.states, strict=True):
             possible_denies = []
             present_letters = []
-            correct_letters = []
             for idx, tile in enumerate(state):
                 letter = word[idx]
                 if tile == "absent":
@@ -361,7 +277,6 @@ class WordleSolver:
                     # we found a letter!
                     actual_word[idx] = letter
                     game_state[idx]["answer"] = letter
-                    correct_letters.append(letter)
                     emoji_str += "🟩"
                 elif tile == "present":
                     # present somewhere but not where we are
@@ -378,21 +293,11 @@ class WordleSolver:
                         continue
                     game_state[index]["cannot"].append(letter)
 
-            if all(actual_word):
-                # solved
-                actual_word = "".join(actual_word)
-                self.logger.info("We got it right - %s", actual_word)
-                solved = True
-                continue
-
-            self._filter_word_list(game_state, present_letters, correct_letters)
-            self.logger.debug("After: %s - there are %s possible words remaining", word, len(self.possible_words))
-
-            if row == WORDLE_WORD_LENGTH:
-                # we failed
-                self.logger.debug("We failed to do the wordle...")
-                break
-            row += 1
+        if solved:
+            actual_word = "".join(actual_word)
+            self.logger.info("We got it right - %s", actual_word)
+        else:
+            self.logger.debug("We failed to do the wordle...")
 
         await asyncio.sleep(1)
         guess_num = "X" if not solved else len(guesses)
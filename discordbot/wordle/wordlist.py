@@ -0,0 +1,332 @@
+"""Compact representation of our wordle dictionary.
+
+Each word is stored as its letters (0-25) at each position, a bitmask of its letter at each position and how many of
+each letter it has. Feedback from a guess can then be turned into per-position masks of allowed letters and bounds on
+the letter counts, and the candidate words filtered with a handful of vectorised NumPy operations.
+
+The feedback pattern for a guess is encoded as a number from 0-242: each tile is absent (0), present (1) or
+correct (2) and tile `i` is worth `3 ** i`. For picking guesses by information gain we work out the table of patterns
+each guess would give against each candidate. The patterns a guess gives against every word are cached, as the
+dictionary never changes and we make the same guesses (eg: our starting words) day after day.
+"""
+
+import collections
+import contextlib
+import csv
+import functools
+import pathlib
+import random
+from collections.abc import Iterable
+
+import numpy as np
+
+from discordbot.wordle.constants import WORDLE_WORD_LENGTH
+
+LETTERS = 26
+PATTERNS = 3**WORDLE_WORD_LENGTH
+SOLVED_PATTERN = PATTERNS - 1
+
+ABSENT = 0
+PRESENT = 1
+CORRECT = 2
+TILES = {"absent": ABSENT, "present": PRESENT, "correct": CORRECT}
+
+_POWERS = 3 ** np.arange(WORDLE_WORD_LENGTH)
+_ALL_LETTERS = np.uint32((1 << LETTERS) - 1)
+# the most guess/answer pairs to work out the feedback for at once
+_MAX_TABLE_SIZE = 1_000_000
+
+_WORDS_PATH = pathlib.Path(__file__).parent / "wordle_guesses"
+_FREQUENCIES_PATH = pathlib.Path(__file__).parent / "unigram_freq.csv"
+
+
+def encode_pattern(tiles: Iterable[str | int]) -> int:
+    """Encodes the tiles for a guess as a pattern.
+
+    Args:
+        tiles (Iterable[str | int]): the tile states, either the wordle `data-state` strings or tile values
+
+    Returns:
+        int: the pattern
+    """
+    return sum(TILES.get(tile, tile) * 3**idx for idx, tile in enumerate(tiles))
+
+
+def decode_pattern(pattern: int) -> list[int]:
+    """Decodes a pattern into the tile values.
+
+    Args:
+        pattern (int): the pattern
+
+    Returns:
+        list[int]: the value of each tile
+    """
+    return [(pattern // 3**idx) % 3 for idx in range(WORDLE_WORD_LENGTH)]
+
+
+def read_words() -> list[str]:
+    """Reads the words we can guess.
+
+    Returns:
+        list[str]: the words we can guess
+    """
+    with _WORDS_PATH.open(encoding="utf-8") as f:
+        words = [line.rstrip() for line in f]
+    return sorted(words)
+
+
+def read_word_frequencies() -> dict[str, float]:
+    """Reads how common each five letter word is.
+
+    Returns:
+        dict[str, float]: the frequency of each five letter word
+    """
+    words_f = {}
+    with _FREQUENCIES_PATH.open(encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if row[0] == "word" and row[1] == "count":
+                continue
+            words_f[row[0]] = int(row[1])
+    _sum = sum(words_f[i] for i in words_f if len(i) == WORDLE_WORD_LENGTH)
+    return {word: float(words_f[word]) / _sum for word in words_f if len(word) == WORDLE_WORD_LENGTH}
+
+
+class WordList:
+    """Our word list with per-position letter bitmasks and letter counts."""
+
+    def __init__(
+        self, words: Iterable[str], frequencies: dict[str, float] | None = None, cache_size: int = 1024
+    ) -> None:
+        """Initialisation method.
+
+        Args:
+            words (Iterable[str]): the words, anything that isn't five lowercase letters is ignored
+            frequencies (dict[str, float] | None, optional): how common each word is. Defaults to None.
+            cache_size (int, optional): how many rows of feedback patterns to cache. Defaults to 1024.
+        """
+        self.words: list[str] = sorted({
+            word
+            for word in words
+            if len(word) == WORDLE_WORD_LENGTH and word.isascii() and word.isalpha() and word.islower()
+        })
+        self._index: dict[str, int] = {word: idx for idx, word in enumerate(self.words)}
+
+        size = len(self.words)
+        codes = np.frombuffer("".join(self.words).encode("ascii"), dtype=np.uint8).reshape(size, WORDLE_WORD_LENGTH)
+        self.letters: np.ndarray = (codes - ord("a")).astype(np.intp)
+        """The letter (0-25) at each position of each word."""
+        self.masks: np.ndarray = np.left_shift(np.uint32(1), self.letters.astype(np.uint32))
+        """The bitmask of the letter at each position of each word."""
+        self.counts: np.ndarray = np.zeros((size, LETTERS), dtype=np.int8)
+        """How many of each letter each word has."""
+        np.add.at(self.counts, (np.arange(size)[:, None], self.letters), 1)
+
+        frequencies = frequencies or {}
+        self.frequencies: np.ndarray = np.array([frequencies.get(word, 0.0) for word in self.words], dtype=np.float64)
+
+        self._cache_size = cache_size
+        self._rows: collections.OrderedDict[int, np.ndarray] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """The number of words."""
+        return len(self.words)
+
+    def index(self, word: str) -> int:
+        """Gets the index of the given word.
+
+        Args:
+            word (str): the word
+
+        Returns:
+            int: the index of the word
+        """
+        return self._index[word]
+
+    def all(self) -> np.ndarray:
+        """All the word indexes, for starting with every word as a candidate.
+
+        Returns:
+            np.ndarray: the word indexes
+        """
+        return np.arange(len(self.words))
+
+    @staticmethod
+    def _constraints(guess: str, pattern: int) -> tuple[np.ndarray, dict[int, tuple[int, int]]]:
+        """Works out what the feedback for a guess tells us about the answer.
+
+        Args:
+            guess (str): the guessed word
+            pattern (int): the feedback pattern
+
+        Returns:
+            tuple[np.ndarray, dict[int, tuple[int, int]]]: the mask of letters allowed at each position and the
+                minimum and maximum count of each letter in the guess
+        """
+        letters = [ord(letter) - ord("a") for letter in guess]
+        tiles = decode_pattern(pattern)
+
+        allowed = np.full(WORDLE_WORD_LENGTH, _ALL_LETTERS, dtype=np.uint32)
+        found: dict[int, int] = {}
+        absent: set[int] = set()
+        for idx, (letter, tile) in enumerate(zip(letters, tiles, strict=True)):
+            bit = np.uint32(1 << letter)
+            if tile == CORRECT:
+                allowed[idx] = bit
+            else:
+                allowed[idx] &= ~bit
+
+            if tile == ABSENT:
+                absent.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+
+        bounds = {}
+        for letter in set(letters):
+            minimum = found.get(letter, 0)
+            # an absent tile means we've found every copy of that letter
+            bounds[letter] = (minimum, minimum if letter in absent else WORDLE_WORD_LENGTH)
+        return allowed, bounds
+
+    def filter(self, candidates: np.ndarray, guess: str, pattern: int) -> np.ndarray:
+        """Filters the candidates down to those that would give the same feedback for the guess.
+
+        The guess doesn't need to be in the word list.
+
+        Args:
+            candidates (np.ndarray): the indexes of the candidate words
+            guess (str): the guessed word
+            pattern (int): the feedback pattern
+
+        Returns:
+            np.ndarray: the indexes of the remaining candidate words
+        """
+        allowed, bounds = self._constraints(guess, pattern)
+        keep = ((self.masks[candidates] & allowed) != 0).all(axis=1)
+
+        letters = list(bounds)
+        counts = self.counts[np.ix_(candidates, letters)]
+        minimums = np.array([bounds[letter][0] for letter in letters])
+        maximums = np.array([bounds[letter][1] for letter in letters])
+        keep &= ((counts >= minimums) & (counts <= maximums)).all(axis=1)
+        return candidates[keep]
+
+    def _calculate_feedback(self, guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+        """Calculates the feedback pattern each guess would give against each answer.
+
+        Args:
+            guesses (np.ndarray): the indexes of the guessed words
+            answers (np.ndarray): the indexes of the answers
+
+        Returns:
+            np.ndarray: the pattern for each guess (rows) and answer (columns)
+        """
+        letters = self.letters[guesses][:, None, :]
+        correct = letters == self.letters[answers][None, :, :]
+        tiles = correct.astype(np.uint8) * CORRECT
+
+        # which of each guess' letters are the same letter
+        same = (letters[:, 0, :, None] == letters[:, 0, None, :]).astype(np.int8)
+        # how many of each guessed letter are left to be marked as present once the correct letters are accounted for
+        remaining = self.counts[answers[None, :, None], letters] - correct.astype(np.int8) @ same
+        for idx in range(WORDLE_WORD_LENGTH):
+            present = ~correct[..., idx] & (remaining[..., idx] > 0)
+            tiles[..., idx] += present
+            remaining -= present[..., None] * same[:, None, idx, :]
+        return (tiles @ _POWERS).astype(np.uint8)
+
+    def feedback(self, guess: int) -> np.ndarray:
+        """Gets the feedback pattern the guess would give against every word.
+
+        The rows are cached as the same guesses (eg: our starting words) get made day after day.
+
+        Args:
+            guess (int): the index of the guessed word
+
+        Returns:
+            np.ndarray: the pattern for each word
+        """
+        if (row := self._rows.get(guess)) is not None:
+            self._rows.move_to_end(guess)
+            return row
+
+        row = self._calculate_feedback(np.array([guess]), self.all())[0]
+        self._rows[guess] = row
+        if len(self._rows) > self._cache_size:
+            self._rows.popitem(last=False)
+        return row
+
+    def entropies(self, candidates: np.ndarray, guesses: np.ndarray) -> np.ndarray:
+        """Calculates how much information (in bits) each guess would give us about the answer.
+
+        Args:
+            candidates (np.ndarray): the indexes of the candidate words
+            guesses (np.ndarray): the indexes of the words we could guess
+
+        Returns:
+            np.ndarray: the expected information for each guess
+        """
+        # work out the patterns in chunks of guesses to bound how much memory we use
+        chunk = max(1, _MAX_TABLE_SIZE // len(candidates))
+        table = np.concatenate([
+            self._calculate_feedback(guesses[num : num + chunk], candidates) for num in range(0, len(guesses), chunk)
+        ]).astype(np.intp)
+
+        # count each pattern for each guess in one go by offsetting each guess' patterns
+        offsets = np.arange(len(guesses))[:, None] * PATTERNS
+        counts = np.bincount((table + offsets).ravel(), minlength=len(guesses) * PATTERNS)
+        probabilities = counts.reshape(len(guesses), PATTERNS) / len(candidates)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logs = np.where(probabilities > 0, np.log2(probabilities), 0.0)
+        return -(probabilities * logs).sum(axis=1)
+
+    def best_guess(self, candidates: np.ndarray, guesses: np.ndarray | None = None) -> int:
+        """Picks the guess that gives us the most information about the answer.
+
+        Args:
+            candidates (np.ndarray): the indexes of the candidate words
+            guesses (np.ndarray | None, optional): the indexes of the words we could guess. Defaults to the candidates.
+
+        Returns:
+            int: the index of the best guess
+        """
+        if guesses is None:
+            guesses = candidates
+        if len(candidates) <= 2:  # noqa: PLR2004
+            # may as well guess one of them
+            return int(candidates[np.argmax(self.frequencies[candidates])])
+
+        entropies = self.entropies(candidates, guesses)
+        # when guesses are as good as each other, prefer one that could be the answer
+        entropies += np.isin(guesses, candidates) * 1e-9
+        return int(guesses[np.argmax(entropies)])
+
+    def pick_weighted(self, candidates: np.ndarray) -> int:
+        """Picks a candidate at random, weighted by how common each word is.
+
+        Args:
+            candidates (np.ndarray): the indexes of the candidate words
+
+        Returns:
+            int: the index of the picked word
+        """
+        weights = self.frequencies[candidates].tolist()
+        if not sum(weights):
+            # none of the words are common
+            weights = None
+        return int(random.choices(candidates.tolist(), weights=weights)[0])
+
+
+@functools.cache
+def load_word_list() -> WordList:
+    """Loads our word list, building it once as it's the same for every solve.
+
+    Words are weighted evenly if we don't have the word frequencies.
+
+    Returns:
+        WordList: the word list
+    """
+    frequencies = None
+    with contextlib.suppress(FileNotFoundError):
+        frequencies = read_word_frequencies()
+    return WordList(read_words(), frequencies)
@@ -1,18 +1,25 @@
 """Mongo baseclass."""
 
+import asyncio
+import functools
 import os
+from collections.abc import Callable, Generator
 
 from bson import ObjectId
 from pymongo import MongoClient
 from pymongo.collection import Collection
+from pymongo.command_cursor import CommandCursor
 from pymongo.cursor import Cursor
 from pymongo.database import Database
-from pymongo.results import UpdateResult
+from pymongo.errors import OperationFailure
+from pymongo.operations import DeleteMany, DeleteOne, IndexModel, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, UpdateResult
 
 from mongo import interface
+from mongo.ttlcache import TTLCache, get_cache
 
 
-class BaseClass:
+class BaseClass:  # noqa: PLR0904
     """Base MongoDB DB Class.
 
     Provides basic method and properties that all other DB Classes will need.
@@ -21,6 +28,12 @@ class BaseClass:
 
     _NO_VAULT_MESSAGE = "No vault instantiated."
     _MINIMUM_PROJECTION_DICT: dict | None = None
+    # set to the name of a shared cache to enable read-through caching of lookups
+    _CACHE_NAME: str | None = None
+    # the indexes the collection's queries rely on
+    _INDEXES: tuple[IndexModel, ...] = ()
+    # representative filters of the collection's common queries, used to check the indexes are used
+    _QUERY_SHAPES: tuple[dict[str, any], ...] = ()
 
     def __init__(
         self,
@@ -78,6 +91,36 @@ class BaseClass:
             raise NoVaultError(msg)
         return self._vault
 
+    @property
+    def cache(self) -> TTLCache | None:
+        """Cache property.
+
+        Returns:
+            TTLCache | None: the shared cache for this class, or None if caching isn't enabled
+        """
+        return get_cache(self._CACHE_NAME) if self._CACHE_NAME else None
+
+    def cached(self, key: tuple, loader: Callable[[], any]) -> any:
+        """Gets the result of the given lookup from the cache, calling the loader on a miss.
+
+        Calls the loader directly if caching isn't enabled for this class.
+
+        Args:
+            key (tuple): the key to cache the result with
+            loader (Callable[[], any]): function that does the lookup
+
+        Returns:
+            any: the result of the lookup
+        """
+        if (cache := self.cache) is None:
+            return loader()
+        return cache.get_or_load(key, loader)
+
+    def invalidate_cache(self) -> None:
+        """Clears any cached lookups for this class."""
+        if (cache := self.cache) is not None:
+            cache.clear()
+
     @property
     def minimum_projection(self) -> dict | None:
         """Minimum projection property.
@@ -142,20 +185,57 @@ class BaseClass:
             msg = "Not all documents in the list are dictionaries."
             raise IncorrectDocumentError(msg)
 
-        return interface.insert(self.vault, document)
+        ret = interface.insert(self.vault, document)
+        self.invalidate_cache()
+        return ret
 
-    def update(self, parameters: dict[str, any], updated_vals: dict[str, any], many: bool = False) -> UpdateResult:
+    def update(
+        self, parameters: dict[str, any], updated_vals: dict[str, any] | list[dict[str, any]], many: bool = False
+    ) -> UpdateResult:
         """Updates all documents based on the given parameters with the provided values.
 
         Args:
             parameters (dict): the parameters to match documents on
-            updated_vals (dict): the update parameters
+            updated_vals (dict | list[dict]): the update parameters
             many (bool, optional): whether to update many. Defaults to False.
 
         Returns:
             UpdateResult: the update result
         """
-        return interface.update(self.vault, parameters, updated_vals, many)
+        ret = interface.update(self.vault, parameters, updated_vals, many)
+        self.invalidate_cache()
+        return ret
+
+    def find_one_and_update(
+        self,
+        parameters: dict[str, any],
+        updated_vals: dict[str, any] | list[dict[str, any]],
+        projection: dict | None = None,
+        upsert: bool = False,
+        return_after: bool = True,
+        convert: bool = True,
+    ) -> any:
+        """Atomically updates the first document matching the given parameters and returns it.
+
+        Args:
+            parameters (dict): the parameters to match the document on
+            updated_vals (dict | list[dict]): the update parameters
+            projection (dict | None, optional): which keys to return/not return. Defaults to None.
+            upsert (bool, optional): whether to insert a new document if none match. Defaults to False.
+            return_after (bool, optional): whether to return the document after the update. Defaults to True.
+            convert (bool, optional): whether to convert the document to a dataclass. Defaults to True.
+
+        Returns:
+            any: the dataclass or document, or None if no documents matched
+        """
+        if projection is not None:
+            self._update_projection(projection)
+
+        ret = interface.find_one_and_update(self.vault, parameters, updated_vals, projection, upsert, return_after)
+        self.invalidate_cache()
+        if ret is None or not convert:
+            return ret
+        return self.make_data_class(ret)
 
     def delete(self, parameters: dict[str, any], many: bool = True) -> int:
         """Deletes documents based on the given parameters.
@@ -169,7 +249,32 @@ class BaseClass:
         Returns:
             int: the number of documents deleted
         """
-        return interface.delete(self.vault, parameters, many)
+        ret = interface.delete(self.vault, parameters, many)
+        self.invalidate_cache()
+        return ret
+
+    def bulk_write(
+        self,
+        requests: list[InsertOne | UpdateOne | UpdateMany | ReplaceOne | DeleteOne | DeleteMany],
+        ordered: bool = False,
+    ) -> BulkWriteResult | None:
+        """Sends a batch of write operations to this class' Collection object in a single bulk write.
+
+        By default the operations are unordered so the server can apply them in parallel and a failure doesn't stop
+        the remaining operations from being applied.
+
+        Args:
+            requests (list): the list of write operations
+            ordered (bool, optional): whether to apply the operations serially. Defaults to False.
+
+        Returns:
+            BulkWriteResult | None: the bulk write result, or None if there was nothing to write
+        """
+        if not requests:
+            return None
+        ret = interface.bulk_write(self.vault, requests, ordered)
+        self.invalidate_cache()
+        return ret
 
     def query(  # noqa: PLR0913, PLR0917
         self,
@@ -223,26 +328,270 @@ class BaseClass:
             for data in interface.query(self.vault, parameters, limit, projection, as_gen, skip=skip, sort=sort)
         ]
 
-    def paginated_query(self, query_dict: dict[str, any], limit: int = 1000, skip: int = 0) -> list[dict[str, any]]:
+    @staticmethod
+    def _keyset_filter(last: dict[str, any], sort_key: str) -> dict[str, any]:
+        """Creates the query parameters to match the documents that come after the given document.
+
+        When the sort key isn't `_id` we also page on `_id` to break ties between documents with the same key.
+
+        Args:
+            last (dict): the last document of the previous page
+            sort_key (str): the key the documents are sorted on
+
+        Returns:
+            dict[str, any]: the parameters to match documents after the last one
+        """
+        if sort_key == "_id":
+            return {"_id": {"$gt": last["_id"]}}
+        return {
+            "$or": [
+                {sort_key: {"$gt": last[sort_key]}},
+                {sort_key: last[sort_key], "_id": {"$gt": last["_id"]}},
+            ],
+        }
+
+    def _paginate(self, query_dict: dict[str, any], limit: int, skip: int, sort_key: str) -> Generator[any]:
+        """Yields dataclasses for the matching documents a page at a time.
+
+        Each page starts where the previous one finished using the sort key rather than an increasing skip so the
+        server doesn't have to walk past every document it has already returned.
+
+        Args:
+            query_dict (dict): a dict of query operators
+            limit (int): limit of items to retrieve at a time
+            skip (int): number of documents to skip at the start
+            sort_key (str): the (indexed) key to page on
+
+        Yields:
+            any: the dataclass for each document
+        """
+        sort = [("_id", 1)] if sort_key == "_id" else [(sort_key, 1), ("_id", 1)]
+        page_query = query_dict
+        while True:
+            page = interface.query(
+                self.vault, page_query, lim=limit, projection=None, as_gen=False, skip=skip, sort=sort
+            )
+            skip = 0
+            for doc in page:
+                yield self.make_data_class(doc)
+            if len(page) < limit:
+                return
+            page_query = {"$and": [query_dict, self._keyset_filter(page[-1], sort_key)]}
+
+    def paginated_query(
+        self,
+        query_dict: dict[str, any],
+        limit: int = 1000,
+        skip: int = 0,
+        as_gen: bool = False,
+        sort_key: str = "_id",
+    ) -> list[any] | Generator[any]:
         """Performs a paginated query with the specified query dict.
 
+        Documents are fetched in pages using range based pagination on the sort key and are returned in that order.
+        The sort key must exist on every matching document and should be indexed.
+
+        Args:
+            query_dict (dict): a dict of query operators
+            limit (int): limit of items to retrieve at a time
+            skip (int): number of documents to skip at the start
+            as_gen (bool): whether to lazily yield the dataclasses instead of returning a list. Defaults to False.
+            sort_key (str): the key to page on. Defaults to '_id'.
+
+        Returns:
+            list[any] | Generator: a list of dataclasses from the DB, or a generator of them
+        """
+        results = self._paginate(query_dict, limit, skip, sort_key)
+        return results if as_gen else list(results)
+
+    def aggregate(
+        self, pipeline: list[dict[str, any]], as_gen: bool = False, allow_disk_use: bool = False
+    ) -> list[dict[str, any]] | CommandCursor:
+        """Runs an aggregation pipeline on this class' Collection object.
+
+        The results are not converted into dataclasses as the pipeline stages usually change the shape of the
+        documents (eg: `$group` or `$project`).
+
+        Args:
+            pipeline (list[dict]): the list of pipeline stages
+            as_gen (bool, optional): whether to return a CommandCursor or not. Defaults to False.
+            allow_disk_use (bool, optional): whether stages can write temporary data to disk. Defaults to False.
+
+        Returns:
+            list | CommandCursor: either a list of the resulting documents, or a CommandCursor
+        """
+        return interface.aggregate(self.vault, pipeline, as_gen, allow_disk_use)
+
+    @staticmethod
+    async def run_async(func: Callable[..., any], /, *args: any, **kwargs: any) -> any:
+        """Runs the given blocking database method in the database executor and awaits the result.
+
+        Allows event handlers and tasks to do database work without blocking the event loop.
+        Any of the collection specific methods can be passed in here, eg:
+            await self.interactions.run_async(self.interactions.add_entry, message_id, ...)
+
+        Args:
+            func (Callable): the blocking method to run
+            args (any): positional args to pass to the method
+            kwargs (any): keyword args to pass to the method
+
+        Returns:
+            any: whatever the method returned
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(interface.get_executor(), functools.partial(func, *args, **kwargs))
+
+    async def async_insert(self, document: dict | list) -> list[ObjectId]:
+        """Awaitable version of `insert`.
+
+        Args:
+            document (dict | list): the document or list of documents to insert
+
+        Returns:
+            list[ObjectId]: list of inserted IDs
+        """
+        return await self.run_async(self.insert, document)
+
+    async def async_update(
+        self, parameters: dict[str, any], updated_vals: dict[str, any], many: bool = False
+    ) -> UpdateResult:
+        """Awaitable version of `update`.
+
+        Args:
+            parameters (dict): the parameters to match documents on
+            updated_vals (dict): the update parameters
+            many (bool, optional): whether to update many. Defaults to False.
+
+        Returns:
+            UpdateResult: the update result
+        """
+        return await self.run_async(self.update, parameters, updated_vals, many)
+
+    async def async_find_one_and_update(
+        self,
+        parameters: dict[str, any],
+        updated_vals: dict[str, any] | list[dict[str, any]],
+        projection: dict | None = None,
+        upsert: bool = False,
+        return_after: bool = True,
+        convert: bool = True,
+    ) -> any:
+        """Awaitable version of `find_one_and_update`.
+
+        Args:
+            parameters (dict): the parameters to match the document on
+            updated_vals (dict | list[dict]): the update parameters
+            projection (dict | None, optional): which keys to return/not return. Defaults to None.
+            upsert (bool, optional): whether to insert a new document if none match. Defaults to False.
+            return_after (bool, optional): whether to return the document after the update. Defaults to True.
+            convert (bool, optional): whether to convert the document to a dataclass. Defaults to True.
+
+        Returns:
+            any: the dataclass or document, or None if no documents matched
+        """
+        return await self.run_async(
+            self.find_one_and_update, parameters, updated_vals, projection, upsert, return_after, convert
+        )
+
+    async def async_delete(self, parameters: dict[str, any], many: bool = True) -> int:
+        """Awaitable version of `delete`.
+
+        Args:
+            parameters (dict): the parameters to match documents on
+            many (bool, optional): whether to delete many or not. Defaults to True.
+
+        Returns:
+            int: the number of documents deleted
+        """
+        return await self.run_async(self.delete, parameters, many)
+
+    async def async_bulk_write(
+        self,
+        requests: list[InsertOne | UpdateOne | UpdateMany | ReplaceOne | DeleteOne | DeleteMany],
+        ordered: bool = False,
+    ) -> BulkWriteResult | None:
+        """Awaitable version of `bulk_write`.
+
+        Args:
+            requests (list): the list of write operations
+            ordered (bool, optional): whether to apply the operations serially. Defaults to False.
+
+        Returns:
+            BulkWriteResult | None: the bulk write result, or None if there was nothing to write
+        """
+        return await self.run_async(self.bulk_write, requests, ordered)
+
+    async def async_query(  # noqa: PLR0913, PLR0917
+        self,
+        parameters: dict[str, any],
+        limit: int = 1000,
+        projection: dict | None = None,
+        skip: int | None = None,
+        use_paginated: bool = False,
+        sort: list[tuple] | None = None,
+        convert: bool = True,
+    ) -> list[any]:
+        """Awaitable version of `query`.
+
+        Always returns a list as a Cursor would do blocking I/O when iterated.
+
+        Args:
+            parameters (dict): parameters to match documents on.
+            limit (int, optional): the max number of documents to return. Defaults to 1000.
+            projection (dict | None, optional): which keys to return/not return. Defaults to None.
+            skip (int | None, optional): how many documents to skip. Defaults to None.
+            use_paginated (bool, optional): whether to use a paginated response. Defaults to False.
+            sort (list[tuple] | None, optional): sort options for the results. Defaults to None.
+            convert (bool, optional): whether to convert the documents into dataclasses. Defaults to True.
+
+        Returns:
+            list: list of dataclasses (or documents if not converting)
+        """
+        return await self.run_async(
+            self.query,
+            parameters,
+            limit,
+            projection,
+            False,
+            skip,
+            use_paginated,
+            sort,
+            convert,
+        )
+
+    async def async_paginated_query(
+        self, query_dict: dict[str, any], limit: int = 1000, skip: int = 0, sort_key: str = "_id"
+    ) -> list[any]:
+        """Awaitable version of `paginated_query`.
+
+        Always returns a list as the generator would do blocking I/O when iterated.
+
         Args:
             query_dict (dict): a dict of query operators
             limit (int): limit of items to retrieve at a time
             skip (int): number of documents to skip at the start
+            sort_key (str): the key to page on. Defaults to '_id'.
+
+        Returns:
+            list[any]: a list of dataclasses from the DB
+        """
+        return await self.run_async(self.paginated_query, query_dict, limit, skip, False, sort_key)
+
+    async def async_aggregate(
+        self, pipeline: list[dict[str, any]], allow_disk_use: bool = False
+    ) -> list[dict[str, any]]:
+        """Awaitable version of `aggregate`.
+
+        Always returns a list as a CommandCursor would do blocking I/O when iterated.
+
+        Args:
+            pipeline (list[dict]): the list of pipeline stages
+            allow_disk_use (bool, optional): whether stages can write temporary data to disk. Defaults to False.
 
         Returns:
-            list[any]: a list of documents from the DB
-        """
-        docs = []
-        len_ret = limit
-        while len_ret == limit:
-            # keep looping
-            ret = interface.query(self.vault, query_dict, lim=limit, projection=None, as_gen=False, skip=skip)
-            skip += limit
-            len_ret = len(ret)
-            docs.extend(ret)
-        return [self.make_data_class(doc) for doc in docs]
+            list: list of the resulting documents
+        """
+        return await self.run_async(self.aggregate, pipeline, False, allow_disk_use)
 
     def get_collection_names(self) -> list | None:
         """Gets collection names of database.
@@ -271,6 +620,61 @@ class BaseClass:
         """
         return interface.get_indexes(self.vault)
 
+    def ensure_indexes(self) -> dict[str, str]:
+        """Creates the indexes declared for this collection if they don't already exist.
+
+        Each index is created separately so that one failing (eg: conflicting with an existing index) doesn't
+        stop the others being created.
+
+        Returns:
+            dict[str, str]: mapping of index name to the error for any indexes that couldn't be created
+        """
+        errors = {}
+        for index in self._INDEXES:
+            try:
+                interface.create_indexes(self.vault, [index])
+            except OperationFailure as exc:
+                errors[index.document["name"]] = str(exc)
+        return errors
+
+    @staticmethod
+    def _has_stage(plan: dict[str, any] | list, stage: str) -> bool:
+        """Checks whether the given query plan, or any of its input stages, is the given stage.
+
+        Args:
+            plan (dict[str, any] | list): the query plan
+            stage (str): the stage to look for, eg: 'COLLSCAN'
+
+        Returns:
+            bool: whether the stage is in the plan
+        """
+        if isinstance(plan, list):
+            return any(BaseClass._has_stage(sub_plan, stage) for sub_plan in plan)
+        if not isinstance(plan, dict):
+            return False
+        if plan.get("stage") == stage:
+            return True
+        return any(BaseClass._has_stage(value, stage) for value in plan.values() if isinstance(value, dict | list))
+
+    def find_collection_scans(self) -> list[dict[str, any]]:
+        """Explains each of the declared query shapes and finds the ones that would scan the whole collection.
+
+        Query shapes that the server can't plan at all (eg: a `$text` query without a text index) are included.
+
+        Returns:
+            list[dict[str, any]]: the query shapes that would do a collection scan
+        """
+        scans = []
+        for shape in self._QUERY_SHAPES:
+            try:
+                plan = interface.explain(self.vault, shape)
+            except OperationFailure:
+                scans.append(shape)
+                continue
+            if self._has_stage(plan.get("queryPlanner", {}).get("winningPlan", {}), "COLLSCAN"):
+                scans.append(shape)
+        return scans
+
 
 class NoVaultError(Exception):
     """Custom exception for when we haven't instantiated a vault properly."""
@@ -15,6 +15,7 @@ from mongo.datatypes.autogeneratedbets import AutoGeneratedBetDB
 from mongo.datatypes.botactivities import BotActivityDB
 from mongo.datatypes.thread import ThreadDB
 from mongo.datatypes.wordle import WordleAttemptDB, WordleReminderDB
+from mongo.decoder import get_decoder
 
 
 class AutoGeneratedBets(BaseClass):
@@ -34,7 +35,7 @@ class AutoGeneratedBets(BaseClass):
         Returns:
             AutoGeneratedBetDB: the dataclass
         """
-        return AutoGeneratedBetDB(**data)
+        return get_decoder(AutoGeneratedBetDB)(data)
 
     def insert_generated_bet(self, scenario_type: str, title: str, options: list[str]) -> AutoGeneratedBetDB:
         """Insert a bet into the DB that we can pull out later.
@@ -122,7 +123,7 @@ class SpoilerThreads(BaseClass):
         Returns:
             ThreadDB: the dataclass
         """
-        return ThreadDB(**data)
+        return get_decoder(ThreadDB)(data)
 
     def get_all_threads(self, guild_id: int) -> list[ThreadDB]:
         """Gets all threads from the DB.
@@ -394,7 +395,7 @@ class WordleAttempts(BaseClass):
         Returns:
             WordleAttemptDB: the data class
         """
-        return WordleAttemptDB(**data)
+        return get_decoder(WordleAttemptDB)(data)
 
     def document_wordle(self, guild_id: int, wordle_solve: WordleSolve) -> WordleAttemptDB:
         """Inserts a wordle entry into the database.
@@ -450,7 +451,7 @@ class BotActivities(BaseClass):
         Returns:
             BotActivityDB: the dataclass
         """
-        return BotActivityDB(**data)
+        return get_decoder(BotActivityDB)(data)
 
     def insert_activity(self, category: str, name: str, created_by: int) -> BotActivityDB:
         """Inserts a new bot activity into the database.
@@ -515,7 +516,7 @@ class WordleReminders(BaseClass):
         Returns:
             WordleReminderDB: the dataclass
         """
-        return WordleReminderDB(**data)
+        return get_decoder(WordleReminderDB)(data)
 
     def insert_reminder(self, name: str, created_by: int) -> WordleReminderDB:
         """Inserts a new wordle reminder into the database.
@@ -1,20 +1,33 @@
 """Activities collection interface."""
 
-import dataclasses
+import collections
 import datetime
+from collections.abc import Generator, Iterable
 from zoneinfo import ZoneInfo
 
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.results import InsertManyResult, InsertOneResult
 
 from discordbot.bot_enums import ActivityTypes
 from mongo import interface
 from mongo.baseclass import BaseClass
 from mongo.datatypes.actions import ActivityDB
+from mongo.decoder import DataclassDecoder
+
+_TIMESTAMP = datetime.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC"))
+"""Placeholder timestamp for the query shapes."""
+
+# any keys that aren't fields go in the extras
+_ACTIVITY_DECODER = DataclassDecoder(ActivityDB, extras="extras")
 
 
 class UserActivities(BaseClass):
     """Class for interacting with the 'useractivities' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _INDEXES = (IndexModel([("guild_id", ASCENDING), ("timestamp", ASCENDING)]),)
+    _QUERY_SHAPES = ({"guild_id": 0, "timestamp": {"$gt": _TIMESTAMP, "$lt": _TIMESTAMP}},)
+
     def __init__(self) -> None:
         """Constructor method that initialises the vault object."""
         super().__init__(collection="useractivities")
@@ -30,9 +43,7 @@ class UserActivities(BaseClass):
         Returns:
             ActivityDB: the dataclass.
         """
-        cls_fields = {f.name for f in dataclasses.fields(ActivityDB)}
-        extras = {k: v for k, v in activity.items() if k not in cls_fields}
-        return ActivityDB(**{k: v for k, v in activity.items() if k in cls_fields}, extras=extras)
+        return _ACTIVITY_DECODER(activity)
 
     def add_activity(
         self,
@@ -61,6 +72,69 @@ class UserActivities(BaseClass):
         doc.update(kwargs)
         return self.insert(doc)
 
+    def add_activities(
+        self,
+        user_ids: Iterable[int],
+        guild_id: int,
+        activity_type: ActivityTypes,
+        **kwargs: dict[str, any],
+    ) -> list[ObjectId]:
+        """Adds an activity of the same type for each of the given users in a single insert.
+
+        Args:
+            user_ids (Iterable[int]): the user IDs
+            guild_id (int): the guild ID the activities happened in
+            activity_type (ActivityTypes): the type of activity
+
+        Returns:
+            list[ObjectId]: list of inserted IDs
+        """
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        docs = [
+            {"uid": user_id, "guild_id": guild_id, "type": activity_type, "timestamp": now, **kwargs}
+            for user_id in user_ids
+        ]
+        if not docs:
+            return []
+        return self.insert(docs)
+
+    def stream_guild_activities(
+        self,
+        guild_id: int,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+        user_id: int | None = None,
+        activity_types: Iterable[ActivityTypes] | None = None,
+    ) -> Generator[ActivityDB]:
+        """Lazily yields a guild's activities, oldest first.
+
+        The activities are filtered by the database and fetched a page at a time so that any number of them can be
+        processed without loading them all into memory.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime | None, optional): only activities after this time. Defaults to None.
+            end (datetime.datetime | None, optional): only activities before this time. Defaults to None.
+            user_id (int | None, optional): only activities for this user. Defaults to None.
+            activity_types (Iterable[ActivityTypes] | None, optional): only activities of these types.
+                Defaults to None.
+
+        Yields:
+            ActivityDB: each activity
+        """
+        query = {"guild_id": guild_id}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gt"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        if user_id:
+            query["uid"] = user_id
+        if activity_types is not None:
+            query["type"] = {"$in": list(activity_types)}
+        yield from self.paginated_query(query, as_gen=True, sort_key="timestamp")
+
     def get_guild_activities_by_timestamp(
         self,
         guild_id: int,
@@ -69,6 +143,8 @@ class UserActivities(BaseClass):
     ) -> list[ActivityDB]:
         """Get guild activities between two timestamps.
 
+        Loads all of them into memory; use `stream_guild_activities` when there could be a lot of them.
+
         Args:
             guild_id (int): the guild ID
             start (datetime.datetime): start time
@@ -77,15 +153,32 @@ class UserActivities(BaseClass):
         Returns:
             list[Activity]: activities between those times
         """
-        return self.query({"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}}, limit=10000)
+        return list(self.stream_guild_activities(guild_id, start, end))
 
     def get_all_guild_activities(self, guild_id: int) -> list[ActivityDB]:
         """Get all activities for the given guild ID.
 
+        Loads all of them into memory; use `stream_guild_activities` when there could be a lot of them.
+
         Args:
             guild_id (int): the guild ID
 
         Returns:
             list[Activity]: the activities
         """
-        return self.query({"guild_id": guild_id}, limit=10000)
+        return list(self.stream_guild_activities(guild_id))
+
+    @staticmethod
+    def count_by_type(activities: Iterable[ActivityDB]) -> dict[ActivityTypes, int]:
+        """Counts the given activities of each activity type.
+
+        Only keeps the running counts so the activities can be streamed. Types are ordered by their count, largest
+        first.
+
+        Args:
+            activities (Iterable[ActivityDB]): the activities
+
+        Returns:
+            dict[ActivityTypes, int]: the number of activities of each type
+        """
+        return dict(collections.Counter(activity.type for activity in activities).most_common())
@@ -1,20 +1,44 @@
 """Bets collection interface."""
 
-import copy
 import datetime
 from zoneinfo import ZoneInfo
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 
 from discordbot.bot_enums import TransactionTypes
 from mongo.baseclass import BaseClass
 from mongo.bsepoints.points import UserPoints
+from mongo.bsepoints.transactions import UserTransactions
 from mongo.datatypes.bet import BetDB, BetterDB, OptionDB
+from mongo.decoder import DataclassDecoder, dict_of, get_decoder
+
+_BET_DECODER = DataclassDecoder(
+    BetDB,
+    converters={"betters": dict_of(get_decoder(BetterDB)), "option_dict": dict_of(get_decoder(OptionDB))},
+)
+
+# the user IDs of a bet's betters, as an aggregation expression
+_BETTER_IDS = {
+    "$map": {"input": {"$objectToArray": {"$ifNull": ["$betters", {}]}}, "as": "better", "in": "$$better.v.user_id"}
+}
 
 
 class UserBets(BaseClass):
     """Class for interacting with the 'userbets' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _INDEXES = (
+        IndexModel([("guild_id", ASCENDING), ("bet_id", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("active", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("users", ASCENDING), ("result", ASCENDING)]),
+    )
+    _QUERY_SHAPES = (
+        {"guild_id": 0, "bet_id": "0001"},
+        {"guild_id": 0, "active": True},
+        {"guild_id": 0, "users": 0, "result": None},
+        {"guild_id": 0, "result": None, "type": {"$exists": False}},
+    )
+
     def __init__(self) -> None:
         """Constructor method. We initialise the collection object and also the UserPoints instance we need.
 
@@ -24,6 +48,7 @@ class UserBets(BaseClass):
         """
         super().__init__(collection="userbets")
         self.user_points = UserPoints()
+        self._trans = UserTransactions()
 
     def create_counter_document(self, guild_id: int) -> None:
         """Method that creates our base 'counter' document for counting bet IDs.
@@ -40,67 +65,19 @@ class UserBets(BaseClass):
         :param guild_id: int - guild ID to create the new unique bet ID for
         :return: str - new unique bet ID
         """
-        count = self.query({"type": "counter", "guild_id": guild_id}, projection={"count": True}, convert=False)[0][
-            "count"
-        ]
-        self.update({"type": "counter", "guild_id": guild_id}, {"$inc": {"count": 1}})
-        return f"{count:04d}"
-
-    def _add_new_better_to_bet(self, bet: BetDB, user_id: int, emoji: str, points: int) -> dict[str, bool]:
-        """Adds a new better to a bet.
-
-        Args:
-            bet (Bet): the bet to addd them to
-            user_id (int): the user ID to add
-            emoji (str): the option the user is betting on
-            points (int): the amount of points the user is better
-
-        Returns:
-            dict: result dict
-        """
-        doc = {
-            "user_id": user_id,
-            "emoji": emoji,
-            "first_bet": datetime.datetime.now(tz=ZoneInfo("UTC")),
-            "last_bet": datetime.datetime.now(tz=ZoneInfo("UTC")),
-            "points": points,
-        }
-
-        new_users = copy.deepcopy(bet.users)
-        if user_id not in bet.users:
-            new_users.append(user_id)
-
-        self.update({"_id": bet._id}, {"$set": {f"betters.{user_id}": doc, "users": new_users}})  # noqa: SLF001
-        self.user_points.increment_points(
-            user_id,
-            bet.guild_id,
-            points * -1,
-            TransactionTypes.BET_PLACE,
-            bet_id=bet.bet_id,
-            comment="Bet placed through slash command",
+        counter = self.find_one_and_update(
+            {"type": "counter", "guild_id": guild_id},
+            {"$inc": {"count": 1}},
+            projection={"count": True},
+            return_after=False,
+            convert=False,
         )
-        return {"success": True}
+        return f"{counter['count']:04d}"
 
     @staticmethod
     def make_data_class(bet: dict[str, any]) -> BetDB:
         """Turns a bet dict into a dataclass representation."""
-        # convert betters
-        new_betters = {}
-        for key, value in bet.get("betters", {}).items():
-            if isinstance(value, BetterDB):
-                new_betters[key] = value
-                continue
-            new_betters[key] = BetterDB(**value)
-        bet["betters"] = new_betters
-
-        new_options = {}
-        for key, value in bet.get("option_dict", {}).items():
-            if isinstance(value, OptionDB):
-                new_options[key] = value
-                continue
-            new_options[key] = OptionDB(**value)
-        bet["option_dict"] = new_options
-        return BetDB(**bet)
+        return _BET_DECODER(bet)
 
     @staticmethod
     def count_eddies_for_bet(bet: BetDB) -> int:
@@ -146,22 +123,17 @@ class UserBets(BaseClass):
     def get_user_pending_points(self, user_id: int, guild_id: int) -> int:
         """Returns a users points from a given guild.
 
-        We search for all the non-closed bets in the DB and get the points directly from there.
+        We find the non-closed bets the user is in using the `users` index and sum their points in the DB.
 
         :param user_id: int - The ID of the user to look for
         :param guild_id: int - The guild ID that the user belongs in
         :return: int - amount of pending points the user has
         """
-        pending = 0
-
-        pending_bets: list[BetDB] = self.query(
-            {f"betters.{user_id}": {"$exists": True}, "guild_id": guild_id, "result": None},
-        )
-        for bet in pending_bets:
-            our_user = bet.betters[str(user_id)]
-            pending += our_user.points
-
-        return pending
+        results = self.aggregate([
+            {"$match": {"guild_id": guild_id, "users": user_id, "result": None}},
+            {"$group": {"_id": None, "pending": {"$sum": f"$betters.{user_id}.points"}}},
+        ])
+        return results[0]["pending"] if results else 0
 
     def get_all_pending_bets_for_user(self, user_id: int, guild_id: int) -> list[BetDB]:
         """Gets all pending bets for a given user_id.
@@ -174,8 +146,8 @@ class UserBets(BaseClass):
             list[Bet]: a list of Bets
         """
         return self.query({
-            f"betters.{user_id}": {"$exists": True},
             "guild_id": guild_id,
+            "users": user_id,
             "result": None,
             "type": {"$exists": False},
         })
@@ -237,68 +209,89 @@ class UserBets(BaseClass):
             return ret[0]
         return None
 
-    def add_better_to_bet(self, bet_id: int, guild_id: int, user_id: int, emoji: str, points: int) -> dict[str, bool]:
+    def add_better_to_bet(
+        self, bet_id: str, guild_id: int, user_id: int, emoji: str, points: int
+    ) -> dict[str, bool | str | BetDB]:
         """Logic for adding a 'better' to a bet.
 
-        If the user is betting on this for the first time - we simply add the details to the DB
-        If not, we check that the user has enough points, that they're betting on an option they have
-        already bet on and if the bet is still active.
+        The user's points are taken with a single conditional update that checks they have enough. The bet is then
+        updated with a single conditional update that only matches if the bet is still active and the user hasn't
+        bet yet or is betting on the same option as before. If the bet update doesn't match, the points are given
+        back and the bet is read to work out why it failed.
 
         Args:
-            bet_id (int): ID of the bet to get
+            bet_id (str): ID of the bet to get
             guild_id (int): the guild ID the bet exists in
             user_id (int): the user ID of the user betting
             emoji (str): the option the user is attempting to bet on
             points (int): the amount of points the user is betting
 
         Returns:
-            dict: the success dict
+            dict: the success dict, with the updated bet if it was successful
         """
-        bet: BetDB = self.query({"bet_id": bet_id, "guild_id": guild_id})[0]
-
-        # checking the user has enough points
-        cur_points = self.user_points.get_user_points(user_id, guild_id)
-        if (points > cur_points) or cur_points == 0:
+        if not self.user_points.deduct_points(user_id, guild_id, points):
             return {"success": False, "reason": "not enough points"}
 
-        # this section is the logic if the user hasn't bet on this bet yet
-        if str(user_id) not in bet.betters:
-            return self._add_new_better_to_bet(bet, user_id, emoji, points)
-
-        # here we're checking if the user has already bet on the option they have selected
-        # if they haven't - then it's an error
-        current_better = bet.betters[str(user_id)]
-        if emoji != current_better.emoji:
-            return {"success": False, "reason": "wrong option"}
-
-        self.update(
-            {"_id": bet._id},  # noqa: SLF001
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        better = f"betters.{user_id}"
+        bet: BetDB | None = self.find_one_and_update(
             {
-                "$inc": {f"betters.{user_id}.points": points},
-                "$set": {"last_bet": datetime.datetime.now(tz=ZoneInfo("UTC")), "users": bet.users},
+                "bet_id": bet_id,
+                "guild_id": guild_id,
+                "active": True,
+                "$or": [{better: {"$exists": False}}, {f"{better}.emoji": emoji}],
+            },
+            {
+                "$inc": {f"{better}.points": points},
+                "$set": {f"{better}.user_id": user_id, f"{better}.emoji": emoji, f"{better}.last_bet": now},
+                "$min": {f"{better}.first_bet": now},
+                "$addToSet": {"users": user_id},
             },
         )
 
-        self.user_points.increment_points(
+        if bet is None:
+            self.user_points.restore_points(user_id, guild_id, points)
+            current = self.get_bet_from_id(guild_id, bet_id)
+            if current is None or not current.active:
+                return {"success": False, "reason": "bet is closed"}
+            # the user has already bet on a different option
+            return {"success": False, "reason": "wrong option"}
+
+        self._trans.add_transaction(
             user_id,
             guild_id,
-            points * -1,
             TransactionTypes.BET_PLACE,
+            points * -1,
             bet_id=bet_id,
             comment="Bet placed through slash command",
         )
-        return {"success": True}
+        return {"success": True, "bet": bet}
 
-    def close_a_bet(self, _id: ObjectId, emoji: str | None) -> None:
-        """Close a bet from a bet ID.
+    def backfill_users(self) -> int:
+        """Makes sure the `users` array of each bet matches its betters.
 
-        Here we also calculate who the winners are and allocate their winnings to them.
+        The `users` array is what we index to find the bets a user is in; older bets might not have it or have it
+        out of sync with the betters. Only the bets that don't match are updated.
+
+        Returns:
+            int: the number of bets that were updated
+        """
+        result = self.update(
+            {"type": {"$exists": False}, "$expr": {"$ne": [{"$ifNull": ["$users", []]}, _BETTER_IDS]}},
+            [{"$set": {"users": _BETTER_IDS}}],
+            many=True,
+        )
+        return result.modified_count
+
+    def close_a_bet(self, _id: ObjectId, emoji: str | list[str] | None, winners: dict[str, int] | None = None) -> None:
+        """Close a bet from a bet ID.
 
         :param _id: ObjectId - the bet to close
         :param emoji: str - the winning result of the bet
+        :param winners: dict - the eddies each winner won, to record on the bet in the same update
         :return: None
         """
-        self.update(
-            {"_id": _id},
-            {"$set": {"active": False, "result": emoji, "closed": datetime.datetime.now(tz=ZoneInfo("UTC"))}},
-        )
+        values = {"active": False, "result": emoji, "closed": datetime.datetime.now(tz=ZoneInfo("UTC"))}
+        if winners is not None:
+            values["winners"] = winners
+        self.update({"_id": _id}, {"$set": values})
@@ -5,6 +5,7 @@ import datetime
 
 from mongo.baseclass import BaseClass
 from mongo.datatypes.channel import ChannelDB
+from mongo.decoder import get_decoder
 
 
 class GuildChannels(BaseClass):
@@ -24,7 +25,7 @@ class GuildChannels(BaseClass):
         Returns:
             ChannelDB: the dataclass.
         """
-        return ChannelDB(**data)
+        return get_decoder(ChannelDB)(data)
 
     def find_channel(self, guild_id: int, channel_id: int) -> ChannelDB | None:
         """Finds a channel from the database.
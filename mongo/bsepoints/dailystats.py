@@ -0,0 +1,511 @@
+"""Daily stats collection interface."""
+
+import datetime
+import re
+from collections.abc import Generator, Iterable
+from zoneinfo import ZoneInfo
+
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+from pymongo.command_cursor import CommandCursor
+
+from discordbot.constants import SWEARS, WORDLE_SCORE_REGEX
+from mongo.baseclass import BaseClass
+from mongo.datatypes.dailystats import DailyStatsDB
+from mongo.datatypes.message import MessageDB
+from mongo.decoder import get_decoder
+from mongo.keywordcounter import KeywordCounter
+from mongo.writebuffer import WriteBuffer, get_write_buffer
+
+_TIMESTAMP = datetime.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC"))
+"""Placeholder timestamp for the query shapes."""
+
+_COUNTERS = (
+    "messages",
+    "content_messages",
+    "length",
+    "words",
+    "replied",
+    "replies_received",
+    "wordles",
+    "wordle_score",
+)
+"""The numeric counters each daily document holds, alongside the swears."""
+
+_SWEAR_COUNTER = KeywordCounter(SWEARS)
+
+
+class DailyStats(BaseClass):
+    """Class for interacting with the 'dailystats' MongoDB collection in the 'bestsummereverpoints' DB.
+
+    Holds pre-aggregated message counters for each user in each channel for each (UTC) day. The counters are
+    incremented as messages are written to 'userinteractions' so that the message stats can be calculated from
+    these documents rather than from every message. The counters only have a daily granularity.
+    """
+
+    _INDEXES = (
+        IndexModel(
+            [("guild_id", ASCENDING), ("day", ASCENDING), ("user_id", ASCENDING), ("channel_id", ASCENDING)],
+            unique=True,
+        ),
+    )
+    _QUERY_SHAPES = (
+        {"guild_id": 0, "day": {"$gte": _TIMESTAMP, "$lt": _TIMESTAMP}},
+        {"guild_id": 0, "day": {"$gte": _TIMESTAMP, "$lt": _TIMESTAMP}, "user_id": 0},
+    )
+
+    def __init__(self) -> None:
+        """Constructor method for the class. Initialises the collection object."""
+        super().__init__(collection="dailystats")
+        self._write_buffer: WriteBuffer | None = None
+
+    @property
+    def write_buffer(self) -> WriteBuffer:
+        """The shared write buffer for the counter increments.
+
+        Returns:
+            WriteBuffer: the write buffer
+        """
+        if self._write_buffer is None:
+            self._write_buffer = get_write_buffer("dailystats", self.vault)
+        return self._write_buffer
+
+    def flush(self) -> None:
+        """Writes any buffered increments to the database."""
+        self.write_buffer.flush()
+
+    @staticmethod
+    def make_data_class(data: dict[str, any]) -> DailyStatsDB:
+        """Convert the dict into a dataclass.
+
+        Args:
+            data (dict): the daily stats dict
+
+        Returns:
+            DailyStatsDB: the dataclass.
+        """
+        return get_decoder(DailyStatsDB)(data)
+
+    def aggregate(
+        self, pipeline: list[dict[str, any]], as_gen: bool = False, allow_disk_use: bool = False
+    ) -> list[dict[str, any]] | CommandCursor:
+        """Overriding to make sure buffered increments are visible."""
+        self.flush()
+        return super().aggregate(pipeline, as_gen, allow_disk_use)
+
+    def query(  # noqa: PLR0913, PLR0917
+        self,
+        query_dict: dict[str, any],
+        limit: int = 1000,
+        projection: dict | None = None,
+        as_gen: bool = False,
+        skip: int | None = None,
+        use_paginated: bool = False,
+        sort: list[tuple] | None = None,
+        convert: bool = True,
+    ) -> list[DailyStatsDB]:
+        """Overriding to define return type and to make sure buffered increments are visible."""
+        self.flush()
+        return super().query(query_dict, limit, projection, as_gen, skip, use_paginated, sort, convert)
+
+    def paginated_query(
+        self,
+        query_dict: dict[str, any],
+        limit: int = 1000,
+        skip: int = 0,
+        as_gen: bool = False,
+        sort_key: str = "_id",
+    ) -> list[DailyStatsDB] | Generator[DailyStatsDB]:
+        """Overriding to define return type and to make sure buffered increments are visible."""
+        self.flush()
+        return super().paginated_query(query_dict, limit, skip, as_gen, sort_key)
+
+    @staticmethod
+    def day_start(timestamp: datetime.datetime) -> datetime.datetime:
+        """Gets the start of the day the given timestamp is in.
+
+        Args:
+            timestamp (datetime.datetime): the timestamp
+
+        Returns:
+            datetime.datetime: midnight on the same day
+        """
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def is_counted(message_type: list[str], is_bot: bool = False) -> bool:
+        """Whether a message of the given type is included in the counters.
+
+        Args:
+            message_type (list[str]): the message type
+            is_bot (bool, optional): whether the message came from a bot. Defaults to False.
+
+        Returns:
+            bool: whether the message is counted
+        """
+        return "message" in message_type and not is_bot
+
+    @staticmethod
+    def message_counters(message_type: list[str], content: str | None) -> dict[str, int]:
+        """Calculates the counter increments for a single message.
+
+        Args:
+            message_type (list[str]): the message type
+            content (str | None): the message content
+
+        Returns:
+            dict[str, int]: the increments, with the swears as dotted keys (eg: 'swears.fuck')
+        """
+        counters = {"messages": 1}
+        if "reply" in message_type:
+            counters["replied"] = 1
+
+        if not content:
+            return counters
+
+        counters["content_messages"] = 1
+        counters["length"] = len(content)
+        counters["words"] = len(content.split(" "))
+
+        if "wordle" in message_type and (result := re.search(WORDLE_SCORE_REGEX, content)):
+            guesses = result.group().split("/")[0]
+            counters["wordles"] = 1
+            counters["wordle_score"] = 10 if guesses == "X" else int(guesses)
+
+        for swear, count in _SWEAR_COUNTER.count(content).items():
+            counters[f"swears.{swear}"] = count
+        return counters
+
+    def _increment(  # noqa: PLR0913, PLR0917
+        self,
+        guild_id: int,
+        user_id: int,
+        channel_id: int,
+        timestamp: datetime.datetime,
+        counters: dict[str, int],
+        is_thread: bool = False,
+        is_vc: bool = False,
+    ) -> None:
+        """Buffers an increment of the counters for the day the message was sent in.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user that sent the message
+            channel_id (int): the channel the message was sent in
+            timestamp (datetime.datetime): when the message was sent
+            counters (dict[str, int]): the counter increments
+            is_thread (bool, optional): whether the channel is a thread. Defaults to False.
+            is_vc (bool, optional): whether the channel is a VC text channel. Defaults to False.
+        """
+        if not counters:
+            return
+
+        self.write_buffer.update(
+            {"guild_id": guild_id, "day": self.day_start(timestamp), "user_id": user_id, "channel_id": channel_id},
+            {
+                "$inc": counters,
+                "$min": {"first": timestamp},
+                "$setOnInsert": {"is_thread": is_thread, "is_vc": is_vc},
+            },
+            upsert=True,
+        )
+
+    def add_message(  # noqa: PLR0913, PLR0917
+        self,
+        guild_id: int,
+        user_id: int,
+        channel_id: int,
+        message_type: list[str],
+        content: str | None,
+        timestamp: datetime.datetime,
+        is_thread: bool = False,
+        is_vc: bool = False,
+        is_bot: bool = False,
+    ) -> None:
+        """Adds a new message to the counters.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user that sent the message
+            channel_id (int): the channel the message was sent in
+            message_type (list[str]): the message type
+            content (str | None): the message content
+            timestamp (datetime.datetime): when the message was sent
+            is_thread (bool, optional): whether the message was sent in a thread. Defaults to False.
+            is_vc (bool, optional): whether the message was sent in a VC text channel. Defaults to False.
+            is_bot (bool, optional): whether the message came from a bot. Defaults to False.
+        """
+        if not self.is_counted(message_type, is_bot):
+            return
+        self._increment(
+            guild_id,
+            user_id,
+            channel_id,
+            timestamp,
+            self.message_counters(message_type, content),
+            is_thread,
+            is_vc,
+        )
+
+    def add_reply(self, guild_id: int, user_id: int, channel_id: int, timestamp: datetime.datetime) -> None:
+        """Adds a reply to the counters of the message that was replied to.
+
+        The counters are only updated if they already exist, ie: if the message that was replied to was counted.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user that sent the message that was replied to
+            channel_id (int): the channel the message was sent in
+            timestamp (datetime.datetime): when the message was sent
+        """
+        self.write_buffer.update(
+            {"guild_id": guild_id, "day": self.day_start(timestamp), "user_id": user_id, "channel_id": channel_id},
+            {"$inc": {"replies_received": 1}},
+        )
+
+    def edit_message(self, message: MessageDB, message_type: list[str], content: str | None) -> None:
+        """Updates the counters for an edited message.
+
+        Args:
+            message (MessageDB): the message before it was edited
+            message_type (list[str]): the new message type
+            content (str | None): the new message content
+        """
+        if not self.is_counted(message.message_type, message.is_bot):
+            return
+
+        before = self.message_counters(message.message_type, message.content)
+        after = self.message_counters(message_type, content)
+        counters = {key: after.get(key, 0) - before.get(key, 0) for key in before.keys() | after.keys()}
+        self._increment(
+            message.guild_id,
+            message.user_id,
+            message.channel_id,
+            message.timestamp,
+            {key: value for key, value in sorted(counters.items()) if value},
+            message.is_thread,
+            message.is_vc,
+        )
+
+    def rebuild(self, guild_id: int, messages: Iterable[MessageDB]) -> int:
+        """Recalculates the counters from the given messages, replacing the existing counters for those days.
+
+        Used to backfill the counters from the existing message history. Only pass the messages from days that are
+        over: the current day's counters are being incremented as messages are received and replacing them would lose
+        or double count those increments.
+
+        Args:
+            guild_id (int): the guild ID
+            messages (Iterable[MessageDB]): the messages to count
+
+        Returns:
+            int: the number of daily documents written
+        """
+        documents: dict[tuple, dict[str, any]] = {}
+        for message in messages:
+            if not self.is_counted(message.message_type, message.is_bot):
+                continue
+
+            day = self.day_start(message.timestamp)
+            key = (day, message.user_id, message.channel_id)
+            if (document := documents.get(key)) is None:
+                document = documents[key] = {
+                    "guild_id": guild_id,
+                    "day": day,
+                    "user_id": message.user_id,
+                    "channel_id": message.channel_id,
+                    "first": message.timestamp,
+                    "is_thread": message.is_thread,
+                    "is_vc": message.is_vc,
+                    **dict.fromkeys(_COUNTERS, 0),
+                    "swears": {},
+                }
+
+            document["first"] = min(document["first"], message.timestamp)
+            document["replies_received"] += len(message.replies or [])
+            for counter, value in self.message_counters(message.message_type, message.content).items():
+                if counter.startswith("swears."):
+                    swear = counter.removeprefix("swears.")
+                    document["swears"][swear] = document["swears"].get(swear, 0) + value
+                else:
+                    document[counter] += value
+
+        self.flush()
+        self.bulk_write([
+            ReplaceOne(
+                {"guild_id": guild_id, "day": doc["day"], "user_id": doc["user_id"], "channel_id": doc["channel_id"]},
+                doc,
+                upsert=True,
+            )
+            for doc in documents.values()
+        ])
+        return len(documents)
+
+    @staticmethod
+    def _match(
+        guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> dict[str, any]:
+        """Creates the `$match` stage parameters for the days between two timestamps.
+
+        Matches whole days, from the day `start` is in up to, but not including, the day `end` is in.
+
+        Args:
+            guild_id (int): the guild ID to match counters for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only match counters for this user. Defaults to None.
+
+        Returns:
+            dict[str, any]: the match parameters
+        """
+        match = {"guild_id": guild_id, "day": {"$gte": DailyStats.day_start(start), "$lt": DailyStats.day_start(end)}}
+        if user_id:
+            match["user_id"] = user_id
+        return match
+
+    def _grouped_counters(self, match: dict[str, any], group_key: str | None) -> list[dict[str, any]]:
+        """Sums the counters of the matching documents for each group and sorts the groups by their message count.
+
+        Groups with the same count are sorted by their earliest message to give the same order as grouping the
+        messages themselves.
+
+        Args:
+            match (dict): the `$match` stage parameters
+            group_key (str | None): the `$group` `_id` expression
+
+        Returns:
+            list[dict[str, any]]: the grouped documents, with the `messages` also as `count`, the lists of `users`,
+                `channels` (excluding threads) and `threads`, and the `swears` as a dict
+        """
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": group_key,
+                    **{counter: {"$sum": f"${counter}"} for counter in _COUNTERS},
+                    **{f"swear_{swear}": {"$sum": f"$swears.{swear}"} for swear in SWEARS},
+                    "first": {"$min": "$first"},
+                    "users": {"$addToSet": "$user_id"},
+                    "channels": {"$addToSet": {"$cond": [{"$eq": ["$is_thread", True]}, "$$REMOVE", "$channel_id"]}},
+                    "threads": {"$addToSet": {"$cond": [{"$eq": ["$is_thread", True]}, "$channel_id", "$$REMOVE"]}},
+                }
+            },
+            {"$sort": {"messages": -1, "first": 1}},
+        ]
+        ret = self.aggregate(pipeline)
+        for doc in ret:
+            doc["count"] = doc["messages"]
+            doc["swears"] = {swear: doc.pop(f"swear_{swear}", 0) for swear in SWEARS}
+        return ret
+
+    def get_counters(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        user_id: int | None = None,
+        group_by: str | None = None,
+    ) -> list[dict[str, any]]:
+        """Sums the counters between two timestamps, optionally for each user, channel or day.
+
+        Results are sorted by the message count, busiest first.
+
+        Args:
+            guild_id (int): the guild ID to sum counters for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only sum counters for this user. Defaults to None.
+            group_by (str | None, optional): the field to group on, eg: 'user_id'. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: the summed counters
+        """
+        return self._grouped_counters(self._match(guild_id, start, end, user_id), f"${group_by}" if group_by else None)
+
+    def get_message_totals(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> dict[str, any]:
+        """Sums all the counters between two timestamps.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            dict[str, any]: the `count`, the other counters, and the lists of `users` and `channels`
+        """
+        ret = self.get_counters(guild_id, start, end, user_id)
+        if not ret:
+            return {
+                "count": 0,
+                **dict.fromkeys(_COUNTERS, 0),
+                "swears": dict.fromkeys(SWEARS, 0),
+                "users": [],
+                "channels": [],
+            }
+        totals = ret[0]
+        # include the threads like counting the messages does
+        totals["channels"] += totals.pop("threads")
+        return totals
+
+    def get_message_counts_by_channel(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages in each channel between two timestamps.
+
+        Threads and VC text channels are excluded. Results are sorted by the count, busiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the channel ID as `_id`, the `count` and the list of `users`
+        """
+        match = self._match(guild_id, start, end, user_id)
+        match.update({"is_thread": {"$ne": True}, "is_vc": {"$ne": True}, "channel_id": {"$nin": [None, 0]}})
+        return self._grouped_counters(match, "$channel_id")
+
+    def get_message_counts_by_day(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages on each (UTC) day between two timestamps.
+
+        Results are sorted by the count, busiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the date as `_id`, the `count` and the lists of `users` and `channels`
+        """
+        ret = self.get_counters(guild_id, start, end, user_id, "day")
+        for doc in ret:
+            doc["_id"] = doc["_id"].date()
+            doc["channels"] += doc.pop("threads")
+        return ret
+
+    def get_message_counts_by_user(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages each user sent between two timestamps.
+
+        Results are sorted by the count, chattiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the user ID as `_id`, the `count`, and the lists of
+                `channels` and `threads` the user sent messages in
+        """
+        return self.get_counters(guild_id, start, end, user_id, "user_id")
@@ -3,15 +3,24 @@
 import datetime
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 
 from mongo import interface
 from mongo.baseclass import BaseClass
 from mongo.datatypes.customs import EmojiDB
+from mongo.decoder import get_decoder
 
 
 class ServerEmojis(BaseClass):
     """Class for interacting with the 'serveremojis' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _CACHE_NAME = "serveremojis"
+    _INDEXES = (
+        IndexModel([("guild_id", ASCENDING), ("eid", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("name", ASCENDING)]),
+    )
+    _QUERY_SHAPES = ({"guild_id": 0, "eid": 0}, {"guild_id": 0, "name": ""})
+
     def __init__(self) -> None:
         """Constructor method for the class. Initialises the collection object."""
         super().__init__()
@@ -27,7 +36,19 @@ class ServerEmojis(BaseClass):
         Returns:
             EmojiDB: the emoji dataclass
         """
-        return EmojiDB(**emoji)
+        return get_decoder(EmojiDB)(emoji)
+
+    def _get_one(self, query_dict: dict[str, any]) -> EmojiDB | None:
+        """Gets the first emoji matching the query.
+
+        Args:
+            query_dict (dict[str, any]): the query parameters
+
+        Returns:
+            EmojiDB | None: the emoji, or None if there was no match
+        """
+        ret = self.query(query_dict, limit=1)
+        return ret[0] if ret else None
 
     def get_all_emojis(self, guild_id: int) -> list[EmojiDB]:
         """Gets all emoji objects from the database.
@@ -47,10 +68,7 @@ class ServerEmojis(BaseClass):
         :param emoji_id: str - The ID of the emoji to get
         :return: a dict of the emoji or None if there's no matching bet ID
         """
-        ret = self.query({"eid": emoji_id, "guild_id": guild_id})
-        if ret:
-            return ret[0]
-        return None
+        return self.cached(("eid", guild_id, emoji_id), lambda: self._get_one({"eid": emoji_id, "guild_id": guild_id}))
 
     def get_emoji_from_name(self, guild_id: int, name: str) -> EmojiDB | None:
         """Gets emoji from name.
@@ -62,10 +80,7 @@ class ServerEmojis(BaseClass):
         Returns:
             Emoji | None: _description_
         """
-        ret = self.query({"name": name, "guild_id": guild_id})
-        if ret:
-            return ret[0]
-        return None
+        return self.cached(("name", guild_id, name), lambda: self._get_one({"name": name, "guild_id": guild_id}))
 
     def insert_emoji(
         self, emoji_id: int, name: str, created: datetime.datetime, user_id: int, guild_id: int
@@ -1,5 +1,8 @@
 """Generic collection interface."""
 
+import datetime
+
+from pymongo import UpdateOne
 from pymongo.results import UpdateResult
 
 from mongo.baseclass import BaseClass
@@ -56,3 +59,62 @@ class DataStore(BaseClass):
             UpdateResult: the update result
         """
         return self.update({"type": "wordle_starting_words"}, {"$push": {"words": word}})
+
+    def get_message_sync_checkpoints(self, guild_id: int) -> dict[int, datetime.datetime]:
+        """Gets when each of the guild's channels were last fully synced up to.
+
+        Args:
+            guild_id (int): the guild ID
+
+        Returns:
+            dict[int, datetime.datetime]: the checkpoint for each channel ID
+        """
+        results = self.query({"type": "message_sync", "guild_id": guild_id}, limit=0)
+        return {result["channel_id"]: result["synced_until"] for result in results}
+
+    def set_message_sync_checkpoint(self, guild_id: int, channel_id: int, synced_until: datetime.datetime) -> None:
+        """Records that a channel has been fully synced up to the given time.
+
+        The checkpoint only ever moves forward.
+
+        Args:
+            guild_id (int): the guild ID
+            channel_id (int): the channel ID
+            synced_until (datetime.datetime): when the channel has been synced up to
+        """
+        self.bulk_write([
+            UpdateOne(
+                {"type": "message_sync", "guild_id": guild_id, "channel_id": channel_id},
+                {"$max": {"synced_until": synced_until}},
+                upsert=True,
+            )
+        ])
+
+    def get_daily_stats_checkpoint(self, guild_id: int) -> datetime.datetime | None:
+        """Gets when the guild's daily message counters were last backfilled up to.
+
+        Args:
+            guild_id (int): the guild ID
+
+        Returns:
+            datetime.datetime | None: the checkpoint, if the counters have ever been backfilled
+        """
+        results = self.query({"type": "daily_stats", "guild_id": guild_id}, limit=1)
+        return results[0]["counted_until"] if results else None
+
+    def set_daily_stats_checkpoint(self, guild_id: int, counted_until: datetime.datetime) -> None:
+        """Records that the guild's daily message counters have been backfilled up to the given time.
+
+        The checkpoint only ever moves forward.
+
+        Args:
+            guild_id (int): the guild ID
+            counted_until (datetime.datetime): when the counters have been backfilled up to
+        """
+        self.bulk_write([
+            UpdateOne(
+                {"type": "daily_stats", "guild_id": guild_id},
+                {"$max": {"counted_until": counted_until}},
+                upsert=True,
+            )
+        ])
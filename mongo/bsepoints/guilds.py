@@ -4,6 +4,7 @@ import datetime
 import typing
 from zoneinfo import ZoneInfo
 
+from pymongo import ASCENDING, IndexModel
 from pymongo.results import InsertOneResult, UpdateResult
 
 from discordbot.bot_enums import ActivityTypes
@@ -11,6 +12,7 @@ from mongo.baseclass import BaseClass
 from mongo.bsepoints.points import UserPoints
 from mongo.datatypes.guild import GuildDB
 from mongo.datatypes.user import UserDB
+from mongo.decoder import get_decoder
 
 
 class Guilds(BaseClass):  # noqa: PLR0904
@@ -22,6 +24,9 @@ class Guilds(BaseClass):  # noqa: PLR0904
         "name": True,
         "owner_id": True,
     }
+    _CACHE_NAME = "guilds"
+    _INDEXES = (IndexModel([("guild_id", ASCENDING)]),)
+    _QUERY_SHAPES = ({"guild_id": 0},)
 
     def __init__(self) -> None:
         """Constructor method for the class. Initialises the collection object."""
@@ -38,7 +43,7 @@ class Guilds(BaseClass):  # noqa: PLR0904
         Returns:
             GuildDB: the guild data class
         """
-        return GuildDB(**data)
+        return get_decoder(GuildDB)(data)
 
     def get_all_guilds(self) -> list[GuildDB]:
         """Gets all the guilds from the database.
@@ -55,6 +60,17 @@ class Guilds(BaseClass):  # noqa: PLR0904
         :param guild_id: int - The guild ID
         :return: a dict of the guild or None if there's no matching ID
         """
+        return self.cached(("guild", guild_id), lambda: self._get_guild(guild_id))
+
+    def _get_guild(self, guild_id: int) -> GuildDB | None:
+        """Gets the guild document from the database without using the cache.
+
+        Args:
+            guild_id (int): the guild ID
+
+        Returns:
+            GuildDB | None: the guild, or None if there's no matching ID
+        """
         ret: list[GuildDB] = self.query(
             {"guild_id": guild_id}, projection={"tax_rate_history": False, "king_history": False}
         )
@@ -210,8 +226,8 @@ class Guilds(BaseClass):  # noqa: PLR0904
         Returns:
             int: the minimum
         """
-        ret: list[GuildDB] = self.query({"guild_id": guild_id})
-        return ret[0].daily_minimum if ret else None
+        guild = self.get_guild(guild_id)
+        return guild.daily_minimum if guild else None
 
     def set_daily_minimum(self, guild_id: int, amount: int) -> UpdateResult:
         """Updates daily minimum salary for given guild ID with given amount.
@@ -282,14 +298,12 @@ class Guilds(BaseClass):  # noqa: PLR0904
         Returns:
             float: tax rate as float
         """
-        ret: list[GuildDB] = self.query(
-            {"guild_id": guild_id}, projection={"tax_rate": True, "supporter_tax_rate": True}
-        )
-        if not ret or not ret[0].tax_rate:
+        guild = self.get_guild(guild_id)
+        if not guild or not guild.tax_rate:
             self.set_tax_rate(guild_id, 0.1, 0.0)
             self.update_tax_history(guild_id, 0.1, 0.0, 0)
             return 0.1, 0.0
-        return ret[0].tax_rate, ret[0].supporter_tax_rate
+        return guild.tax_rate, guild.supporter_tax_rate
 
     #
     # Ad stuff
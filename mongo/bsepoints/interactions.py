@@ -1,17 +1,113 @@
 """Interactions collection interface."""
 
 import datetime
+import functools
+from collections.abc import Generator
+from zoneinfo import ZoneInfo
+
+from bson import ObjectId
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.command_cursor import CommandCursor
+from pymongo.results import UpdateResult
 
 from mongo.baseclass import BaseClass
+from mongo.bsepoints.dailystats import DailyStats
+from mongo.bsepoints.messageusages import MessageUsages
 from mongo.datatypes.message import MessageDB, ReactionDB, ReplyDB, VCInteractionDB
+from mongo.decoder import DataclassDecoder, get_decoder, list_of
+from mongo.salarytally import SalaryTally, get_salary_tally
+from mongo.writebuffer import WriteBuffer, get_write_buffer
+
+_TIMESTAMP = datetime.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC"))
+"""Placeholder timestamp for the query shapes."""
+
+# most of the time the reactions and replies aren't looked at, so only decode them when they are
+_MESSAGE_DECODER = DataclassDecoder(
+    MessageDB,
+    converters={
+        "reactions": list_of(get_decoder(ReactionDB), lazy=True),
+        "replies": list_of(get_decoder(ReplyDB), lazy=True),
+    },
+)
 
 
-class UserInteractions(BaseClass):
+class UserInteractions(BaseClass):  # noqa: PLR0904
     """Class for interacting with the 'userinteractions' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _INDEXES = (
+        IndexModel([("guild_id", ASCENDING), ("timestamp", ASCENDING)]),
+        IndexModel([("message_id", ASCENDING), ("guild_id", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("reactions.timestamp", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("user_id", ASCENDING), ("timestamp", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("channel_id", ASCENDING), ("timestamp", ASCENDING)]),
+        IndexModel([("content", TEXT)]),
+    )
+    _QUERY_SHAPES = (
+        {"guild_id": 0, "timestamp": {"$gt": _TIMESTAMP, "$lt": _TIMESTAMP}},
+        {"guild_id": 0, "message_id": 0},
+        {"guild_id": 0, "reactions.timestamp": {"$gt": _TIMESTAMP, "$lt": _TIMESTAMP}},
+        {"guild_id": 0, "user_id": 0, "timestamp": {"$gt": _TIMESTAMP, "$lt": _TIMESTAMP}},
+        {"guild_id": 0, "user_id": 0, "channel_id": 0, "active": True},
+        {"guild_id": 0, "channel_id": 0, "timestamp": {"$gte": _TIMESTAMP, "$lte": _TIMESTAMP}},
+        {"guild_id": 0, "$text": {"$search": "link"}},
+    )
+
     def __init__(self) -> None:
         """Constructor method for the class. Initialises the collection object."""
         super().__init__(collection="userinteractions")
+        self._write_buffer: WriteBuffer | None = None
+        self.daily_stats = DailyStats()
+        self.message_usages = MessageUsages()
+        self.salary_tally: SalaryTally = get_salary_tally()
+
+    @property
+    def write_buffer(self) -> WriteBuffer:
+        """The shared write buffer for message inserts, replies and reactions.
+
+        Returns:
+            WriteBuffer: the write buffer
+        """
+        if self._write_buffer is None:
+            self._write_buffer = get_write_buffer("userinteractions", self.vault)
+        return self._write_buffer
+
+    def flush(self) -> None:
+        """Writes any buffered inserts and updates to the database."""
+        self.write_buffer.flush()
+
+    @staticmethod
+    def _could_match(parameters: dict[str, any], key: tuple[int, int]) -> bool:
+        """Checks whether a buffered write for the given message could match the given parameters.
+
+        Args:
+            parameters (dict[str, any]): the parameters the documents are matched on
+            key (tuple[int, int]): the guild and message ID of the buffered write
+
+        Returns:
+            bool: whether the buffered write could match
+        """
+        guild_id, message_id = key
+        if isinstance(parameters.get("guild_id"), int) and parameters["guild_id"] != guild_id:
+            return False
+        match parameters.get("message_id"):
+            case int() as matched_id:
+                return matched_id == message_id
+            case {"$ne": int() as excluded_id} if len(parameters["message_id"]) == 1:
+                # eg: looking for other messages like the one that was just buffered
+                return excluded_id != message_id
+        return True
+
+    def _flush_for(self, parameters: dict[str, any]) -> None:
+        """Writes the buffered inserts and updates if any of them could match the given parameters.
+
+        Buffered writes are keyed by guild and message ID. Reads for a single message only wait for that message's
+        writes, and reads for a guild only wait if the guild has buffered writes.
+
+        Args:
+            parameters (dict[str, any]): the parameters the documents are matched on
+        """
+        if self.write_buffer.has_pending(functools.partial(self._could_match, parameters)):
+            self.flush()
 
     @staticmethod
     def make_data_class(message: dict | MessageDB) -> MessageDB | VCInteractionDB:
@@ -26,15 +122,9 @@ class UserInteractions(BaseClass):
         if "vc_joined" in message["message_type"]:
             if "message_id" not in message:
                 message["message_id"] = None
-            return VCInteractionDB(**message)
+            return get_decoder(VCInteractionDB)(message)
 
-        message["reactions"] = [
-            ReactionDB(**react) for react in message.get("reactions", []) if not isinstance(react, ReactionDB)
-        ]
-        message["replies"] = [
-            ReplyDB(**reply) for reply in message.get("replies", []) if not isinstance(reply, ReplyDB)
-        ]
-        return MessageDB(**message)
+        return _MESSAGE_DECODER(message)
 
     def query(  # noqa: PLR0913, PLR0917
         self,
@@ -47,12 +137,46 @@ class UserInteractions(BaseClass):
         sort: list[tuple] | None = None,
         convert: bool = True,
     ) -> list[MessageDB]:
-        """Overriding to define return type."""
+        """Overriding to define return type and to make sure buffered writes are visible."""
+        self._flush_for(query_dict)
         return super().query(query_dict, limit, projection, as_gen, skip, use_paginated, sort, convert)
 
-    def paginated_query(self, query_dict: dict[str, any], limit: int = 1000, skip: int = 0) -> list[MessageDB]:
-        """Overriding to define return type."""
-        return super().paginated_query(query_dict, limit, skip)
+    def paginated_query(
+        self,
+        query_dict: dict[str, any],
+        limit: int = 1000,
+        skip: int = 0,
+        as_gen: bool = False,
+        sort_key: str = "_id",
+    ) -> list[MessageDB] | Generator[MessageDB]:
+        """Overriding to define return type and to make sure buffered writes are visible."""
+        self._flush_for(query_dict)
+        return super().paginated_query(query_dict, limit, skip, as_gen, sort_key)
+
+    def aggregate(
+        self, pipeline: list[dict[str, any]], as_gen: bool = False, allow_disk_use: bool = False
+    ) -> list[dict[str, any]] | CommandCursor:
+        """Overriding to make sure buffered writes are visible."""
+        self._flush_for(pipeline[0].get("$match", {}) if pipeline else {})
+        return super().aggregate(pipeline, as_gen, allow_disk_use)
+
+    def insert(self, document: dict | list) -> list[ObjectId]:
+        """Overriding to make sure buffered writes to the same messages are applied first."""
+        documents = document if isinstance(document, list) else [document]
+        keys = {(doc.get("guild_id"), doc.get("message_id")) for doc in documents}
+        if self.write_buffer.has_pending(keys.__contains__):
+            self.flush()
+        return super().insert(document)
+
+    def update(self, parameters: dict[str, any], updated_vals: dict[str, any], many: bool = False) -> UpdateResult:
+        """Overriding to make sure buffered writes are applied first."""
+        self._flush_for(parameters)
+        return super().update(parameters, updated_vals, many)
+
+    def delete(self, parameters: dict[str, any], many: bool = True) -> int:
+        """Overriding to make sure buffered writes are applied first."""
+        self._flush_for(parameters)
+        return super().delete(parameters, many)
 
     def get_all_messages_for_server(self, guild_id: int) -> list[MessageDB]:
         """Gets all messages for a given server.
@@ -77,6 +201,202 @@ class UserInteractions(BaseClass):
         """
         return self.paginated_query({"guild_id": guild_id, "channel_id": channel_id})
 
+    def get_message_ids(
+        self, guild_id: int, channel_id: int, start: datetime.datetime, end: datetime.datetime
+    ) -> set[int]:
+        """Gets the IDs of the messages we have for a channel between two timestamps.
+
+        Only the IDs are fetched, rather than the whole messages.
+
+        Args:
+            guild_id (int): the guild ID
+            channel_id (int): the channel ID
+            start (datetime.datetime): the earliest timestamp, inclusive
+            end (datetime.datetime): the latest timestamp, inclusive
+
+        Returns:
+            set[int]: the message IDs
+        """
+        results = self.query(
+            {"guild_id": guild_id, "channel_id": channel_id, "timestamp": {"$gte": start, "$lte": end}},
+            limit=0,
+            projection={"message_id": True, "_id": False},
+            as_gen=True,
+            convert=False,
+        )
+        return {result["message_id"] for result in results if "message_id" in result}
+
+    @staticmethod
+    def _message_match(
+        guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> dict[str, any]:
+        """Creates the `$match` stage parameters for non-bot messages between two timestamps.
+
+        Args:
+            guild_id (int): the guild ID to match messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only match messages from this user. Defaults to None.
+
+        Returns:
+            dict[str, any]: the match parameters
+        """
+        match = {
+            "guild_id": guild_id,
+            "timestamp": {"$gt": start, "$lt": end},
+            "message_type": "message",
+            "is_bot": {"$ne": True},
+        }
+        if user_id:
+            match["user_id"] = user_id
+        return match
+
+    def _grouped_counts(
+        self, match: dict[str, any], group_key: str | dict | None, accumulators: dict[str, any]
+    ) -> list[dict[str, any]]:
+        """Groups the matching documents by the given key and sorts the groups by their count.
+
+        Groups with the same count are sorted by their earliest timestamp to give stable results.
+
+        Args:
+            match (dict): the `$match` stage parameters
+            group_key (str | dict | None): the `$group` `_id` expression
+            accumulators (dict): any additional `$group` accumulators
+
+        Returns:
+            list[dict[str, any]]: the grouped documents
+        """
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": group_key, "count": {"$sum": 1}, "first": {"$min": "$timestamp"}, **accumulators}},
+            {"$sort": {"count": -1, "first": 1}},
+        ]
+        return self.aggregate(pipeline)
+
+    def get_message_totals(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> dict[str, int | list[int]]:
+        """Counts the messages between two timestamps along with the unique users and channels.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            dict[str, int | list[int]]: the count, and the lists of users and channels
+        """
+        ret = self._grouped_counts(
+            self._message_match(guild_id, start, end, user_id),
+            None,
+            {"users": {"$addToSet": "$user_id"}, "channels": {"$addToSet": "$channel_id"}},
+        )
+        if not ret:
+            return {"count": 0, "users": [], "channels": []}
+        return {"count": ret[0]["count"], "users": ret[0]["users"], "channels": ret[0]["channels"]}
+
+    def get_message_counts_by_channel(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages in each channel between two timestamps.
+
+        Threads and VC text channels are excluded. Results are sorted by the count, busiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the channel ID as `_id`, the `count` and the list of `users`
+        """
+        match = self._message_match(guild_id, start, end, user_id)
+        match.update({"is_thread": {"$ne": True}, "is_vc": {"$ne": True}, "channel_id": {"$nin": [None, 0]}})
+        return self._grouped_counts(match, "$channel_id", {"users": {"$addToSet": "$user_id"}})
+
+    def get_message_counts_by_day(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages on each (UTC) day between two timestamps.
+
+        Results are sorted by the count, busiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the date as `_id`, the `count` and the lists of `users` and `channels`
+        """
+        ret = self._grouped_counts(
+            self._message_match(guild_id, start, end, user_id),
+            {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+            {"users": {"$addToSet": "$user_id"}, "channels": {"$addToSet": "$channel_id"}},
+        )
+        for doc in ret:
+            doc["_id"] = datetime.date.fromisoformat(doc["_id"])
+        return ret
+
+    def get_message_counts_by_user(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> list[dict[str, any]]:
+        """Counts the messages each user sent between two timestamps.
+
+        Results are sorted by the count, chattiest first.
+
+        Args:
+            guild_id (int): the guild ID to count messages for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only count messages from this user. Defaults to None.
+
+        Returns:
+            list[dict[str, any]]: documents with the user ID as `_id`, the `count`, and the lists of
+                `channels` and `threads` the user sent messages in
+        """
+        return self._grouped_counts(
+            self._message_match(guild_id, start, end, user_id),
+            "$user_id",
+            {
+                "channels": {"$addToSet": {"$cond": [{"$eq": ["$is_thread", True]}, "$$REMOVE", "$channel_id"]}},
+                "threads": {"$addToSet": {"$cond": [{"$eq": ["$is_thread", True]}, "$channel_id", "$$REMOVE"]}},
+            },
+        )
+
+    def get_vc_totals(
+        self, guild_id: int, start: datetime.datetime, end: datetime.datetime, user_id: int | None = None
+    ) -> dict[str, float | list[int]]:
+        """Sums the time spent in VCs between two timestamps.
+
+        Args:
+            guild_id (int): the guild ID to sum VC time for
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+            user_id (int | None, optional): only sum VC time for this user. Defaults to None.
+
+        Returns:
+            dict[str, float | list[int]]: the `time_in_vc`, and the lists of `users` and `channels`
+        """
+        match = {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}, "message_type": "vc_joined"}
+        if user_id:
+            match["user_id"] = user_id
+        ret = self._grouped_counts(
+            match,
+            None,
+            {
+                "time_in_vc": {"$sum": "$time_in_vc"},
+                "users": {"$addToSet": "$user_id"},
+                "channels": {"$addToSet": "$channel_id"},
+            },
+        )
+        if not ret:
+            return {"time_in_vc": 0, "users": [], "channels": []}
+        return {"time_in_vc": ret[0]["time_in_vc"], "users": ret[0]["users"], "channels": ret[0]["channels"]}
+
     def add_entry(  # noqa: PLR0913, PLR0917
         self,
         message_id: int,
@@ -122,9 +442,14 @@ class UserInteractions(BaseClass):
         if additional_keys:
             message.update(additional_keys)
 
-        result = self.insert(message)
-        message["_id"] = result[0]
-        return self.make_data_class(message)
+        # the write is buffered so generate the ID ourselves
+        message["_id"] = ObjectId()
+        self.write_buffer.insert(message, (guild_id, message_id))
+        self.daily_stats.add_message(
+            guild_id, user_id, channel_id, message_type, message_content, timestamp, is_thread, is_vc, is_bot
+        )
+        self.salary_tally.add_entry(guild_id, user_id, message_id, message_type, message_content, timestamp)
+        return self.make_data_class(dict(message))
 
     def add_reply_to_message(  # noqa: PLR0913, PLR0917
         self,
@@ -134,10 +459,16 @@ class UserInteractions(BaseClass):
         user_id: int,
         timestamp: datetime.datetime,
         content: str,
+        reference_user_id: int,
+        reference_channel_id: int,
+        reference_timestamp: datetime.datetime,
         is_bot: bool = False,
     ) -> ReplyDB:
         """Adds a reply to a message.
 
+        The caller passes in who sent the message that was replied to, and where and when, so that the reply can be
+        counted without looking the message up.
+
         Args:
             reference_message_id (int): _description_
             message_id (int): _description_
@@ -145,6 +476,9 @@ class UserInteractions(BaseClass):
             user_id (int): _description_
             timestamp (datetime.datetime): _description_
             content (str): _description_
+            reference_user_id (int): the user that sent the message that was replied to
+            reference_channel_id (int): the channel the message that was replied to was sent in
+            reference_timestamp (datetime.datetime): when the message that was replied to was sent
             is_bot (bool, optional): _description_. Defaults to False.
 
         Returns:
@@ -158,9 +492,15 @@ class UserInteractions(BaseClass):
             "is_bot": is_bot,
         }
 
-        self.update(
+        self.daily_stats.add_reply(guild_id, reference_user_id, reference_channel_id, reference_timestamp)
+        self.salary_tally.add_reply(
+            guild_id, reference_message_id, reference_user_id, reference_timestamp, user_id, timestamp
+        )
+
+        self.write_buffer.update(
             {"message_id": reference_message_id, "guild_id": guild_id},
             {"$push": {"replies": entry}},
+            (guild_id, reference_message_id),
         )
         return ReplyDB(**entry)
 
@@ -194,10 +534,17 @@ class UserInteractions(BaseClass):
             "timestamp": timestamp,
         }
 
-        self.update(
+        # the salary tally needs the message's previous reactions the first time it sees a reaction to it
+        message = None
+        if self.salary_tally.needs_message(guild_id, message_id, timestamp):
+            message = self.get_message(guild_id, message_id)
+
+        self.write_buffer.update(
             {"message_id": message_id, "guild_id": guild_id, "channel_id": channel_id, "user_id": author_id},
             {"$push": {"reactions": entry}},
+            (guild_id, message_id),
         )
+        self.salary_tally.add_reaction(guild_id, message_id, author_id, user_id, message_content, timestamp, message)
 
         return ReactionDB(**entry)
 
@@ -211,7 +558,7 @@ class UserInteractions(BaseClass):
         timestamp: datetime.datetime,
         author_id: int,
     ) -> None:
-        """Adds a reaction entry into our interactions DB with the corresponding message.
+        """Removes a reaction entry from the corresponding message in our interactions DB.
 
         Args:
             message_id (int): message ID
@@ -219,7 +566,7 @@ class UserInteractions(BaseClass):
             user_id (int): user ID
             channel_id (int): channel ID
             message_content (str): message content
-            timestamp (datetime.datetime): timestamp
+            timestamp (datetime.datetime): when the reaction happened
             author_id (int): the author ID
         """
         entry = {
@@ -228,10 +575,12 @@ class UserInteractions(BaseClass):
             "timestamp": timestamp,
         }
 
-        self.update(
+        self.write_buffer.update(
             {"message_id": message_id, "guild_id": guild_id, "channel_id": channel_id, "user_id": author_id},
             {"$pull": {"reactions": entry}},
+            (guild_id, message_id),
         )
+        self.salary_tally.remove_reaction(guild_id, message_id, author_id, user_id, message_content, timestamp)
 
     def get_message(self, guild_id: int, message_id: int) -> MessageDB | None:
         """Retrieves a message from the DB cache with the specific guild ID and message ID.
@@ -243,6 +592,9 @@ class UserInteractions(BaseClass):
         Returns:
             Optional[Message]: The Message or None
         """
+        if message := self.write_buffer.get_pending_document((guild_id, message_id)):
+            # message hasn't been written yet
+            return self.make_data_class(message)
         ret = self.query({"guild_id": guild_id, "message_id": message_id})
         return ret[0] if ret else None
 
@@ -0,0 +1,100 @@
+"""Message usages collection interface."""
+
+import hashlib
+from collections.abc import Iterable
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from mongo.baseclass import BaseClass
+from mongo.datatypes.messageusage import MessageUsageDB
+from mongo.decoder import get_decoder
+
+
+class MessageUsages(BaseClass):
+    """Class for interacting with the 'messageusages' MongoDB collection in the 'bestsummereverpoints' DB.
+
+    Counts how many times the bot has sent each of its templated messages (eg: the valorant rollcalls) in each guild
+    so that we can favour the messages that haven't been used much. Templates are keyed by a hash of the template.
+    """
+
+    _INDEXES = (IndexModel([("guild_id", ASCENDING), ("template", ASCENDING)], unique=True),)
+    _QUERY_SHAPES = ({"guild_id": 0, "template": {"$in": [""]}},)
+
+    def __init__(self) -> None:
+        """Constructor method for the class. Initialises the collection object."""
+        super().__init__(collection="messageusages")
+
+    @staticmethod
+    def make_data_class(data: dict[str, any]) -> MessageUsageDB:
+        """Convert the dict into a dataclass.
+
+        Args:
+            data (dict): the message usage dict
+
+        Returns:
+            MessageUsageDB: the dataclass.
+        """
+        return get_decoder(MessageUsageDB)(data)
+
+    @staticmethod
+    def template_hash(template: str) -> str:
+        """Creates the key for the given message template.
+
+        Args:
+            template (str): the message template
+
+        Returns:
+            str: the hash of the template
+        """
+        return hashlib.sha256(template.encode("utf-8")).hexdigest()
+
+    def get_counts(self, guild_id: int, templates: Iterable[str]) -> dict[str, int]:
+        """Gets how many times each of the given templates have been sent in one query.
+
+        Args:
+            guild_id (int): the guild ID
+            templates (Iterable[str]): the message templates
+
+        Returns:
+            dict[str, int]: the number of uses of each template, templates that haven't been counted yet are missing
+        """
+        hashes = {self.template_hash(template): template for template in templates}
+        results = self.query(
+            {"guild_id": guild_id, "template": {"$in": list(hashes)}},
+            limit=0,
+            projection={"template": True, "count": True},
+            convert=False,
+        )
+        return {hashes[result["template"]]: result["count"] for result in results if result["template"] in hashes}
+
+    def increment(self, guild_id: int, template: str) -> None:
+        """Counts another use of the given template.
+
+        Args:
+            guild_id (int): the guild ID
+            template (str): the message template
+        """
+        self.bulk_write([
+            UpdateOne(
+                {"guild_id": guild_id, "template": self.template_hash(template)}, {"$inc": {"count": 1}}, upsert=True
+            )
+        ])
+
+    def set_counts(self, guild_id: int, counts: dict[str, int]) -> None:
+        """Sets the counts for templates that haven't been counted yet.
+
+        Used to seed the counts from the message history. Counts are only ever raised so concurrent increments aren't
+        lost.
+
+        Args:
+            guild_id (int): the guild ID
+            counts (dict[str, int]): the number of uses of each template
+        """
+        self.bulk_write([
+            UpdateOne(
+                {"guild_id": guild_id, "template": self.template_hash(template)},
+                {"$max": {"count": count}},
+                upsert=True,
+            )
+            for template, count in counts.items()
+        ])
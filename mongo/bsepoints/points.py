@@ -1,13 +1,16 @@
 """Points collection interface."""
 
 import typing
+from collections.abc import Iterable
 
-from pymongo.results import UpdateResult
+from pymongo import ASCENDING, IndexModel, InsertOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, UpdateResult
 
 from discordbot.bot_enums import TransactionTypes
 from mongo.baseclass import BaseClass
 from mongo.bsepoints.transactions import UserTransactions
 from mongo.datatypes.user import UserDB
+from mongo.decoder import get_decoder
 
 
 class UserPoints(BaseClass):
@@ -21,29 +24,39 @@ class UserPoints(BaseClass):
         "points": True,
         "king": True,
     }
+    _INDEXES = (
+        IndexModel([("uid", ASCENDING), ("guild_id", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING)]),
+    )
+    _QUERY_SHAPES = (
+        {"uid": 0, "guild_id": 0},
+        {"guild_id": 0},
+    )
 
     def __init__(self) -> None:
         """Constructor method that initialises the vault object."""
         super().__init__(collection="userpoints")
         self._trans = UserTransactions()
 
-    def _check_highest_eddie_count(self, user_id: int, guild_id: int) -> None:
-        """Internal function for making sure the user always has the high score set correctly.
+    @staticmethod
+    def _increment_update(amount: int) -> dict[str, any] | list[dict[str, any]]:
+        """Creates the update for incrementing a user's points by the given amount.
 
-        :param user_id:
-        :param guild_id:
-        :return:
-        """
-        try:
-            ret: UserDB = self.query(
-                {"uid": user_id, "guild_id": guild_id},
-                projection={"_id": True, "high_score": True, "points": True},
-            )[0]
-        except IndexError:
-            return
+        When the amount is positive we use a pipeline update so that the high score is set from the new points
+        total within the same atomic write rather than reading the user back afterwards.
+
+        Args:
+            amount (int): the amount to increment the points by
 
-        if ret.points > ret.high_score:
-            self.update({"_id": ret._id}, {"$set": {"high_score": ret.points}})  # noqa: SLF001
+        Returns:
+            dict | list[dict]: the update operators, or the update pipeline
+        """
+        if amount <= 0:
+            return {"$inc": {"points": amount}}
+        return [
+            {"$set": {"points": {"$add": [{"$ifNull": ["$points", 0]}, amount]}}},
+            {"$set": {"high_score": {"$max": ["$high_score", "$points"]}}},
+        ]
 
     @staticmethod
     def make_data_class(user: dict[str, any]) -> UserDB:
@@ -55,7 +68,7 @@ class UserPoints(BaseClass):
         Returns:
             UserDB: the dataclass
         """
-        return UserDB(**user)
+        return get_decoder(UserDB)(user)
 
     def find_user_guildless(self, user_id: int) -> list[UserDB]:
         """Returns all matching user objects for the given ID.
@@ -149,22 +162,111 @@ class UserPoints(BaseClass):
         :param amount: int - amount to increase pending points by
         :return: UpdateResults object
         """
-        ret = self.update({"uid": user_id, "guild_id": guild_id}, {"$inc": {"points": amount}})
-        if amount > 0:
-            self._check_highest_eddie_count(user_id, guild_id)
+        ret = self.update({"uid": user_id, "guild_id": guild_id}, self._increment_update(amount))
         self._trans.add_transaction(user_id, guild_id, transaction_type, amount, **kwargs)
         return ret
 
-    def create_user(self, user_id: int, guild_id: int, name: str, dailies: bool = False) -> None:
-        """Create basic user points document.
+    def increment_points_many(
+        self,
+        guild_id: int,
+        amounts: dict[int, int],
+        transaction_type: TransactionTypes,
+        **kwargs: dict[str, any],
+    ) -> BulkWriteResult | None:
+        """Increases the points of many users in a single bulk write.
 
-        :param dailies:
-        :param user_id: int - The ID of the user to look for
-        :param name: str - username
-        :param guild_id: int - The guild ID that the user belongs in
-        :return: None
+        Adds a transaction for each user with a single insert.
+
+        Args:
+            guild_id (int): the guild ID the users belong to
+            amounts (dict[int, int]): mapping of user ID to the amount to increment their points by
+            transaction_type (TransactionTypes): the type of transaction
+
+        Returns:
+            BulkWriteResult | None: the bulk write result, or None if there were no users
+        """
+        if not amounts:
+            return None
+        ret = self.bulk_write([
+            UpdateOne({"uid": user_id, "guild_id": guild_id}, self._increment_update(amount))
+            for user_id, amount in amounts.items()
+        ])
+        self._trans.add_transactions(guild_id, amounts, transaction_type, **kwargs)
+        return ret
+
+    def increment_points_by_type(
+        self,
+        guild_id: int,
+        amounts: dict[TransactionTypes, dict[int, int]],
+        **kwargs: dict[str, any],
+    ) -> BulkWriteResult | None:
+        """Increases the points of many users for transactions of different types in a single bulk write.
+
+        A user can appear under more than one transaction type. Adds all the transactions with a single insert.
+
+        Args:
+            guild_id (int): the guild ID the users belong to
+            amounts (dict[TransactionTypes, dict[int, int]]): mapping of transaction type to a mapping of user ID to
+                the amount to increment their points by
+
+        Returns:
+            BulkWriteResult | None: the bulk write result, or None if there were no users
         """
-        user_doc = {
+        requests = [
+            UpdateOne({"uid": user_id, "guild_id": guild_id}, self._increment_update(amount))
+            for type_amounts in amounts.values()
+            for user_id, amount in type_amounts.items()
+        ]
+        if not requests:
+            return None
+        ret = self.bulk_write(requests)
+        self._trans.add_transactions_by_type(guild_id, amounts, **kwargs)
+        return ret
+
+    def deduct_points(self, user_id: int, guild_id: int, amount: int) -> bool:
+        """Takes points from a user only if they have enough points.
+
+        The check and the deduction are a single conditional update so concurrent deductions can never take a
+        user's points below zero. No transaction is added.
+
+        Args:
+            user_id (int): the ID of the user
+            guild_id (int): the guild ID the user belongs to
+            amount (int): the amount of points to take
+
+        Returns:
+            bool: whether the user had enough points
+        """
+        ret = self.update(
+            {"uid": user_id, "guild_id": guild_id, "points": {"$gte": amount, "$gt": 0}},
+            {"$inc": {"points": -amount}},
+        )
+        return bool(ret.matched_count)
+
+    def restore_points(self, user_id: int, guild_id: int, amount: int) -> None:
+        """Gives back points taken with `deduct_points` that ended up not being spent.
+
+        Args:
+            user_id (int): the ID of the user
+            guild_id (int): the guild ID the user belongs to
+            amount (int): the amount of points to give back
+        """
+        self.update({"uid": user_id, "guild_id": guild_id}, {"$inc": {"points": amount}})
+
+    @staticmethod
+    def _make_user_document(user_id: int, guild_id: int, name: str, dailies: bool = False) -> dict[str, any]:
+        """Makes the document for a new user.
+
+        Args:
+            user_id (int): the user ID
+            guild_id (int): the guild ID the user belongs to
+            name (str): the user's name
+            dailies (bool, optional): whether the user gets the daily eddies messages. Defaults to False.
+
+        Returns:
+            dict[str, any]: the user document
+        """
+        return {
             "uid": user_id,
             "guild_id": guild_id,
             "name": name,
@@ -177,9 +279,74 @@ class UserPoints(BaseClass):
             "king": False,
             "high_score": 10,
         }
-        self.insert(user_doc)
+
+    def create_user(self, user_id: int, guild_id: int, name: str, dailies: bool = False) -> None:
+        """Create basic user points document.
+
+        :param dailies:
+        :param user_id: int - The ID of the user to look for
+        :param name: str - username
+        :param guild_id: int - The guild ID that the user belongs in
+        :return: None
+        """
+        self.insert(self._make_user_document(user_id, guild_id, name, dailies))
         self._trans.add_transaction(user_id, guild_id, TransactionTypes.USER_CREATE, 10, comment="User created")
 
+    def get_guild_user_states(self, guild_id: int) -> dict[int, tuple[str, bool]]:
+        """Gets the name and whether they're inactive for every user we have for the given guild.
+
+        Only fetches the fields we need, without converting them into dataclasses, so it's cheap for big guilds.
+
+        Args:
+            guild_id (int): the guild ID
+
+        Returns:
+            dict[int, tuple[str, bool]]: mapping of user ID to the user's name and whether they're inactive
+        """
+        users = self.query(
+            {"guild_id": guild_id},
+            limit=0,
+            projection={"uid": True, "name": True, "inactive": True},
+            convert=False,
+        )
+        return {user["uid"]: (user["name"], bool(user.get("inactive"))) for user in users}
+
+    def sync_guild_members(
+        self,
+        guild_id: int,
+        joined: dict[int, str],
+        renamed: dict[int, str],
+        left: Iterable[int],
+    ) -> BulkWriteResult | None:
+        """Applies the changes to a guild's members in a single bulk write.
+
+        Creates the users that joined, updates the names of the users that were renamed and marks the users that left
+        as inactive. Adds the user creation transactions with a single insert.
+
+        Args:
+            guild_id (int): the guild ID the users belong to
+            joined (dict[int, str]): mapping of user ID to name for the users to create
+            renamed (dict[int, str]): mapping of user ID to the new name for the users to rename
+            left (Iterable[int]): the IDs of the users to mark as inactive
+
+        Returns:
+            BulkWriteResult | None: the bulk write result, or None if there was nothing to change
+        """
+        requests = [InsertOne(self._make_user_document(user_id, guild_id, name)) for user_id, name in joined.items()]
+        requests.extend(
+            UpdateOne({"uid": user_id, "guild_id": guild_id}, {"$set": {"name": name}})
+            for user_id, name in renamed.items()
+        )
+        if left := list(left):
+            requests.append(UpdateMany({"uid": {"$in": left}, "guild_id": guild_id}, {"$set": {"inactive": True}}))
+        if not requests:
+            return None
+        ret = self.bulk_write(requests)
+        self._trans.add_transactions(
+            guild_id, dict.fromkeys(joined, 10), TransactionTypes.USER_CREATE, comment="User created"
+        )
+        return ret
+
     def set_daily_eddies_toggle(self, user_id: int, guild_id: int, value: bool, summary_enabled: bool = False) -> None:
         """Sets the "daily eddies" toggle for the given user.
 
@@ -3,14 +3,23 @@
 import datetime
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 
 from mongo.baseclass import BaseClass
 from mongo.datatypes.customs import StickerDB
+from mongo.decoder import get_decoder
 
 
 class ServerStickers(BaseClass):
     """Class for interacting with the 'serverstickers' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _CACHE_NAME = "serverstickers"
+    _INDEXES = (
+        IndexModel([("guild_id", ASCENDING), ("stid", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("name", ASCENDING)]),
+    )
+    _QUERY_SHAPES = ({"guild_id": 0, "stid": 0}, {"guild_id": 0, "name": ""})
+
     def __init__(self) -> None:
         """Constructor method for the class. Initialises the collection object."""
         super().__init__(collection="serverstickers")
@@ -25,7 +34,19 @@ class ServerStickers(BaseClass):
         Returns:
             StickerDB: the emoji dataclass
         """
-        return StickerDB(**sticker)
+        return get_decoder(StickerDB)(sticker)
+
+    def _get_one(self, query_dict: dict[str, any]) -> StickerDB | None:
+        """Gets the first sticker matching the query.
+
+        Args:
+            query_dict (dict[str, any]): the query parameters
+
+        Returns:
+            StickerDB | None: the sticker, or None if there was no match
+        """
+        ret: list[StickerDB] = self.query(query_dict, limit=1)
+        return ret[0] if ret else None
 
     def get_sticker(self, guild_id: int, sticker_id: int) -> StickerDB | None:
         """Gets an already created sticker document from the database.
@@ -34,10 +55,9 @@ class ServerStickers(BaseClass):
         :param sticker_id: str - The ID of the sticker to get
         :return: a dict of the sticker or None if there's no matching bet ID
         """
-        ret: list[StickerDB] = self.query({"stid": sticker_id, "guild_id": guild_id})
-        if ret:
-            return ret[0]
-        return None
+        return self.cached(
+            ("stid", guild_id, sticker_id), lambda: self._get_one({"stid": sticker_id, "guild_id": guild_id})
+        )
 
     def get_sticker_from_name(self, guild_id: int, name: str) -> StickerDB | None:
         """Get sticker from name.
@@ -49,10 +69,7 @@ class ServerStickers(BaseClass):
         Returns:
             Sticker | None: _description_
         """
-        ret: list[StickerDB] = self.query({"name": name, "guild_id": guild_id})
-        if ret:
-            return ret[0]
-        return None
+        return self.cached(("name", guild_id, name), lambda: self._get_one({"name": name, "guild_id": guild_id}))
 
     def insert_sticker(
         self, emoji_id: int, name: str, created: datetime.datetime, user_id: int, guild_id: int
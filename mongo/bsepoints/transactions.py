@@ -1,19 +1,31 @@
 """Transactions collection interface."""
 
-import dataclasses
 import datetime
+from collections.abc import Generator, Iterable
 from zoneinfo import ZoneInfo
 
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.results import InsertManyResult, InsertOneResult
 
 from discordbot.bot_enums import TransactionTypes
 from mongo.baseclass import BaseClass
 from mongo.datatypes.actions import TransactionDB
+from mongo.decoder import DataclassDecoder
+
+_TIMESTAMP = datetime.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC"))
+"""Placeholder timestamp for the query shapes."""
+
+# any keys that aren't fields go in the extras
+_TRANSACTION_DECODER = DataclassDecoder(TransactionDB, extras="extras")
 
 
 class UserTransactions(BaseClass):
     """Class for interacting with the 'usertransactions' MongoDB collection in the 'bestsummereverpoints' DB."""
 
+    _INDEXES = (IndexModel([("guild_id", ASCENDING), ("timestamp", ASCENDING)]),)
+    _QUERY_SHAPES = ({"guild_id": 0, "timestamp": {"$gt": _TIMESTAMP, "$lt": _TIMESTAMP}},)
+
     def __init__(self) -> None:
         """Constructor method that initialises the vault object."""
         super().__init__(collection="usertransactions")
@@ -28,9 +40,38 @@ class UserTransactions(BaseClass):
         Returns:
             TransactionDB: the dataclass.
         """
-        cls_fields = {f.name for f in dataclasses.fields(TransactionDB)}
-        extras = {k: v for k, v in transaction.items() if k not in cls_fields}
-        return TransactionDB(**{k: v for k, v in transaction.items() if k in cls_fields}, extras=extras)
+        return _TRANSACTION_DECODER(transaction)
+
+    @staticmethod
+    def make_transaction_document(
+        user_id: int,
+        guild_id: int,
+        transaction_type: TransactionTypes,
+        amount: int,
+        timestamp: datetime.datetime | None = None,
+        **kwargs: dict[str, any],
+    ) -> dict[str, any]:
+        """Creates a transaction document ready to be inserted.
+
+        Args:
+            user_id (int): the user ID the transaction is for
+            guild_id (int): the guild ID the transaction happened in
+            transaction_type (TransactionTypes): the type of transaction
+            amount (int): the amount of eddies
+            timestamp (datetime.datetime | None, optional): when the transaction happened. Defaults to now.
+
+        Returns:
+            dict[str, any]: the transaction document
+        """
+        doc = {
+            "uid": user_id,
+            "guild_id": guild_id,
+            "type": transaction_type,
+            "amount": amount,
+            "timestamp": timestamp or datetime.datetime.now(tz=ZoneInfo("UTC")),
+        }
+        doc.update(kwargs)
+        return doc
 
     def add_transaction(
         self,
@@ -51,17 +92,98 @@ class UserTransactions(BaseClass):
         Returns:
             InsertOneResult | InsertManyResult: _description_
         """
-        doc = {
-            "uid": user_id,
-            "guild_id": guild_id,
-            "type": transaction_type,
-            "amount": amount,
-            "timestamp": datetime.datetime.now(tz=ZoneInfo("UTC")),
-        }
-
-        doc.update(kwargs)
+        doc = self.make_transaction_document(user_id, guild_id, transaction_type, amount, **kwargs)
         self.insert(doc)
 
+    def add_transactions(
+        self,
+        guild_id: int,
+        amounts: dict[int, int],
+        transaction_type: TransactionTypes,
+        **kwargs: dict[str, any],
+    ) -> list[ObjectId]:
+        """Adds a transaction of the same type for each of the given users in a single insert.
+
+        Args:
+            guild_id (int): the guild ID the transactions happened in
+            amounts (dict[int, int]): mapping of user ID to the amount of eddies
+            transaction_type (TransactionTypes): the type of transaction
+
+        Returns:
+            list[ObjectId]: list of inserted IDs
+        """
+        if not amounts:
+            return []
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        docs = [
+            self.make_transaction_document(user_id, guild_id, transaction_type, amount, now, **kwargs)
+            for user_id, amount in amounts.items()
+        ]
+        return self.insert(docs)
+
+    def add_transactions_by_type(
+        self,
+        guild_id: int,
+        amounts: dict[TransactionTypes, dict[int, int]],
+        **kwargs: dict[str, any],
+    ) -> list[ObjectId]:
+        """Adds transactions of different types for many users in a single insert.
+
+        Args:
+            guild_id (int): the guild ID the transactions happened in
+            amounts (dict[TransactionTypes, dict[int, int]]): mapping of transaction type to a mapping of user ID to
+                the amount of eddies
+
+        Returns:
+            list[ObjectId]: list of inserted IDs
+        """
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        docs = [
+            self.make_transaction_document(user_id, guild_id, transaction_type, amount, now, **kwargs)
+            for transaction_type, type_amounts in amounts.items()
+            for user_id, amount in type_amounts.items()
+        ]
+        if not docs:
+            return []
+        return self.insert(docs)
+
+    def stream_guild_transactions(
+        self,
+        guild_id: int,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+        user_id: int | None = None,
+        transaction_types: Iterable[TransactionTypes] | None = None,
+    ) -> Generator[TransactionDB]:
+        """Lazily yields a guild's transactions, oldest first.
+
+        The transactions are filtered by the database and fetched a page at a time so that any number of them can be
+        processed without loading them all into memory.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime | None, optional): only transactions after this time. Defaults to None.
+            end (datetime.datetime | None, optional): only transactions before this time. Defaults to None.
+            user_id (int | None, optional): only transactions for this user. Defaults to None.
+            transaction_types (Iterable[TransactionTypes] | None, optional): only transactions of these types.
+                Defaults to None.
+
+        Yields:
+            TransactionDB: each transaction
+        """
+        query = {"guild_id": guild_id}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gt"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        if user_id:
+            query["uid"] = user_id
+        if transaction_types is not None:
+            query["type"] = {"$in": list(transaction_types)}
+        yield from self.paginated_query(query, as_gen=True, sort_key="timestamp")
+
     def get_guild_transactions_by_timestamp(
         self,
         guild_id: int,
@@ -70,6 +192,8 @@ class UserTransactions(BaseClass):
     ) -> list[TransactionDB]:
         """Get guild transactions between two timestamps.
 
+        Loads all of them into memory; use `stream_guild_transactions` when there could be a lot of them.
+
         Args:
             guild_id (int): the guild ID
             start (datetime.datetime): start time
@@ -78,15 +202,94 @@ class UserTransactions(BaseClass):
         Returns:
             list[Transaction]: transactions between those times
         """
-        return self.query({"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}}, limit=10000)
+        return list(self.stream_guild_transactions(guild_id, start, end))
 
     def get_all_guild_transactions(self, guild_id: int) -> list[TransactionDB]:
         """Get all transactions for a given guild ID.
 
+        Loads all of them into memory; use `stream_guild_transactions` when there could be a lot of them.
+
         Args:
             guild_id (int): the guild ID
 
         Returns:
             list[Transaction]: list of transactions
         """
-        return self.query({"guild_id": guild_id}, limit=10000)
+        return list(self.stream_guild_transactions(guild_id))
+
+    def _amount_totals(self, match: dict[str, any], group_key: str) -> list[dict[str, any]]:
+        """Sums the amounts of the matching transactions grouped by the given key.
+
+        Groups are sorted by their total, largest first. Groups with the same total are sorted by their earliest
+        timestamp to give stable results.
+
+        Args:
+            match (dict): the `$match` stage parameters
+            group_key (str): the `$group` `_id` expression
+
+        Returns:
+            list[dict[str, any]]: documents with the key as `_id`, the `total` and the `count`
+        """
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": group_key,
+                    "total": {"$sum": "$amount"},
+                    "count": {"$sum": 1},
+                    "first": {"$min": "$timestamp"},
+                },
+            },
+            {"$sort": {"total": -1, "first": 1}},
+        ]
+        return self.aggregate(pipeline)
+
+    def get_amount_totals_by_type(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        user_id: int | None = None,
+    ) -> dict[int, int]:
+        """Sums the transaction amounts for each transaction type between two timestamps.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): start time
+            end (datetime.datetime): end time
+            user_id (int | None, optional): only sum transactions for this user. Defaults to None.
+
+        Returns:
+            dict[int, int]: the total amount for each transaction type
+        """
+        match = {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}}
+        if user_id:
+            match["uid"] = user_id
+        return {doc["_id"]: doc["total"] for doc in self._amount_totals(match, "$type")}
+
+    def get_amount_totals_by_user(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        transaction_type: TransactionTypes,
+        user_id: int | None = None,
+    ) -> dict[int, int]:
+        """Sums the transaction amounts of the given type for each user between two timestamps.
+
+        Users are ordered by their total, largest first.
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): start time
+            end (datetime.datetime): end time
+            transaction_type (TransactionTypes): the type of transaction to sum
+            user_id (int | None, optional): only sum transactions for this user. Defaults to None.
+
+        Returns:
+            dict[int, int]: the total amount for each user ID
+        """
+        match = {"guild_id": guild_id, "timestamp": {"$gt": start, "$lt": end}, "type": transaction_type}
+        if user_id:
+            match["uid"] = user_id
+        return {doc["_id"]: doc["total"] for doc in self._amount_totals(match, "$uid")}
@@ -13,6 +13,7 @@ from pymongo.results import UpdateResult
 from mongo.baseclass import BaseClass
 from mongo.bsepoints.guilds import Guilds
 from mongo.datatypes.revolution import RevolutionEventDB
+from mongo.decoder import get_decoder
 
 
 class TicketedEvent(BaseClass):
@@ -66,7 +67,7 @@ class RevolutionEvent(TicketedEvent):
         Returns:
             RevolutionEventDB: the dataclass
         """
-        return RevolutionEventDB(**event)
+        return get_decoder(RevolutionEventDB)(event)
 
     def create_event(
         self,
@@ -6,7 +6,7 @@ import datetime
 from mongo.datatypes.basedatatypes import GuildedDBObject, ImplementsMessage
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class OptionDB:
     """A dict representing an option in a bet."""
 
@@ -16,7 +16,7 @@ class OptionDB:
     """**DEPRECATED.**"""
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BetterDB:
     """Represents a better on a bet."""
 
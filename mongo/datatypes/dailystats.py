@@ -0,0 +1,42 @@
+"""Our DailyStatsDB datatype."""
+
+import dataclasses
+import datetime
+
+from mongo.datatypes.basedatatypes import GuildedDBObject
+
+
+@dataclasses.dataclass(frozen=True)
+class DailyStatsDB(GuildedDBObject):
+    """A dict representing the message counters for a user in a channel on a given day."""
+
+    day: datetime.datetime
+    """The start of the (UTC) day."""
+    user_id: int
+    """The user who sent the messages."""
+    channel_id: int
+    """The channel the messages were sent in."""
+    first: datetime.datetime
+    """When the earliest message was sent."""
+    is_thread: bool = False
+    """Whether the channel is a thread."""
+    is_vc: bool = False
+    """Whether the channel is a VC text channel."""
+    messages: int = 0
+    """The number of messages."""
+    content_messages: int = 0
+    """The number of messages with content."""
+    length: int = 0
+    """The total length of the message content."""
+    words: int = 0
+    """The total number of words in the message content."""
+    replied: int = 0
+    """The number of messages that were replies to someone else."""
+    replies_received: int = 0
+    """The number of replies the messages received."""
+    wordles: int = 0
+    """The number of wordle messages."""
+    wordle_score: int = 0
+    """The total of the wordle scores."""
+    swears: dict[str, int] = dataclasses.field(default_factory=dict)
+    """The number of times each swear was used."""
@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from mongo.datatypes.basedatatypes import GuildedDBObject, ImplementsMessage
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReactionDB:
     """A dict representing a user reaction."""
 
@@ -21,7 +21,7 @@ class ReactionDB:
     """Whether the reply was from a bot."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReplyDB:
     """Represents a user reply."""
 
@@ -0,0 +1,15 @@
+"""Our MessageUsageDB datatype."""
+
+import dataclasses
+
+from mongo.datatypes.basedatatypes import GuildedDBObject
+
+
+@dataclasses.dataclass(frozen=True)
+class MessageUsageDB(GuildedDBObject):
+    """A dict representing how many times the bot has sent a templated message in a guild."""
+
+    template: str
+    """The hash of the message template."""
+    count: int = 0
+    """The number of times the message has been sent."""
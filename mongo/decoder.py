@@ -0,0 +1,306 @@
+"""Fast decoding of database documents into our datatypes.
+
+Our datatypes are frozen dataclasses and building them with keyword arguments goes through the generated `__init__`,
+which sets each field with `object.__setattr__`. When decoding hundreds of thousands of documents (eg: for the stats
+and salaries) that adds up, as does building the nested reactions, replies and betters.
+
+Decoders work out the fields of their dataclass once and generate a function that sets the instance's attributes
+directly from the document. Nested documents are decoded with converters and lists of them can be decoded lazily, the
+first time the list is accessed.
+
+There is a single plain decoder per datatype that is shared by every collection class.
+"""
+
+import dataclasses
+import functools
+import threading
+from collections.abc import Callable, Iterable
+
+_DECODERS: dict[type, "DataclassDecoder"] = {}
+_DECODERS_LOCK = threading.Lock()
+_DECODING_LOCK = threading.RLock()
+
+
+class LazyList(list):  # noqa: FURB189
+    """A list of documents that are only decoded the first time the list is accessed.
+
+    Subclasses `list` so that it can be used anywhere a list of the decoded documents is expected. Getting the length
+    or checking whether the list is empty doesn't decode the documents.
+
+    Anything that reads the items of a list directly at the C level, without going through the list's methods, gets the
+    documents rather than the decoded items. Concatenating onto another list (`[] + items`) is covered, but callers
+    mustn't rely on others, like `str.join` or calling `list.__iter__` directly.
+    """
+
+    _convert: Callable[[any], any] | None = None
+
+    def __init__(self, items: Iterable = (), convert: Callable[[any], any] | None = None) -> None:
+        """Initialisation method.
+
+        Args:
+            items (Iterable, optional): the documents. Defaults to ().
+            convert (Callable[[any], any] | None, optional): decodes each document. Defaults to None.
+        """
+        super().__init__(items)
+        self._convert = convert
+
+    def _decode(self) -> None:
+        """Decodes the documents, if they haven't been decoded already.
+
+        The decoded items are written before the converter is cleared, so another thread never sees the documents
+        without a converter. The lock makes sure that only one thread decodes them.
+        """
+        if self._convert is None:
+            return
+        with _DECODING_LOCK:
+            if (convert := self._convert) is None:
+                return
+            # go through `list` directly so that we don't decode again
+            list.__setitem__(self, slice(None), [convert(item) for item in list.__iter__(self)])  # noqa: PLC2801
+            self._convert = None
+
+    def __radd__(self, other: any) -> list:
+        """Decodes the documents before they're concatenated onto another list.
+
+        `list.__add__` copies the other list's items directly, so we have to step in first.
+
+        Args:
+            other (any): the list we're being added to
+
+        Returns:
+            list: the concatenated list
+        """
+        if not isinstance(other, list):
+            return NotImplemented
+        self._decode()
+        return list.__add__(other, self)
+
+
+def _decoding(method: Callable[..., any]) -> Callable[..., any]:
+    """Wraps a list method so that the documents are decoded before it's called.
+
+    Args:
+        method (Callable[..., any]): the list method
+
+    Returns:
+        Callable[..., any]: the wrapped method
+    """
+
+    @functools.wraps(method)
+    def _wrapper(self: LazyList, *args: any, **kwargs: any) -> any:
+        self._decode()
+        for arg in args:
+            if isinstance(arg, LazyList):
+                arg._decode()  # noqa: SLF001
+        return method(self, *args, **kwargs)
+
+    return _wrapper
+
+
+for _name in (
+    "__getitem__",
+    "__iter__",
+    "__reversed__",
+    "__contains__",
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__add__",
+    "__mul__",
+    "__rmul__",
+    "__repr__",
+    "__reduce_ex__",
+    "copy",
+    "count",
+    "index",
+    "pop",
+    "remove",
+    "sort",
+):
+    setattr(LazyList, _name, _decoding(getattr(list, _name)))
+
+
+class DataclassDecoder:
+    """Decodes documents into a dataclass.
+
+    Like dataclasses do for `__init__`, we generate the source of a function to decode documents for each dataclass.
+    """
+
+    def __init__(
+        self,
+        cls: type,
+        converters: dict[str, Callable[[any], any]] | None = None,
+        extras: str | None = None,
+    ) -> None:
+        """Initialisation method.
+
+        Works out everything we need to know about the dataclass' fields up front and generates the decoding function.
+
+        Args:
+            cls (type): the dataclass to decode into
+            converters (dict[str, Callable[[any], any]] | None, optional): functions to decode the values of the
+                given fields. They are given the document's value, or None if the document doesn't have the field.
+                Defaults to None.
+            extras (str | None, optional): the field to put any unknown keys in, rather than raising an error.
+                Defaults to None.
+        """
+        self.cls = cls
+        self.fields = dataclasses.fields(cls)
+        self.names = frozenset(field.name for field in self.fields)
+        self.required = frozenset(
+            field.name
+            for field in self.fields
+            if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+        )
+        self.converters = converters or {}
+        self.extras = extras
+        # slotted classes don't have a `__dict__` to fill in
+        self.slotted = "__dict__" not in dir(cls)
+        self.decode: Callable[[dict[str, any]], any] = self._generate()
+
+    def _check(self, document: dict[str, any]) -> None:
+        """Raises the same errors as the dataclass would for unknown or missing fields.
+
+        Args:
+            document (dict[str, any]): the document
+
+        Raises:
+            TypeError: if the document has unknown fields or is missing required fields
+        """
+        if unknown := document.keys() - self.names:
+            msg = f"{self.cls.__name__}.__init__() got unexpected keyword arguments: {sorted(unknown)}"
+            raise TypeError(msg)
+        missing = self.required - document.keys()
+        msg = f"{self.cls.__name__}.__init__() missing required arguments: {sorted(missing)}"
+        raise TypeError(msg)
+
+    def _generate(self) -> Callable[[dict[str, any]], any]:
+        """Generates the function that decodes documents.
+
+        Returns:
+            Callable[[dict[str, any]], any]: the decoding function
+        """
+        namespace = {
+            "cls": self.cls,
+            "names": self.names,
+            "required": self.required,
+            "check": self._check,
+            "new": object.__new__,
+            "set_attr": object.__setattr__,
+            "defaults": {
+                field.name: field.default for field in self.fields if field.default is not dataclasses.MISSING
+            },
+        }
+        lines = [
+            "def decode(document):",
+            "    if isinstance(document, cls):",
+            "        return document",
+        ]
+        if self.extras is not None:
+            lines += [
+                "    extras = {key: value for key, value in document.items() if key not in names}",
+                "    document = {key: value for key, value in document.items() if key in names}",
+            ]
+        lines += [
+            "    if not (required <= document.keys() <= names):",
+            "        check(document)",
+            "    get = document.get",
+            "    instance = new(cls)",
+        ]
+        if not self.slotted:
+            # copy the defaults and the document in one go and then fix up the rest
+            lines += ["    values = defaults.copy()", "    values.update(document)"]
+
+        for num, field in enumerate(self.fields):
+            name = field.name
+            if name == self.extras:
+                value = "extras"
+            elif name in self.converters:
+                namespace[f"convert_{num}"] = getattr(self.converters[name], "decode", self.converters[name])
+                value = f"convert_{num}(get({name!r}))"
+            elif field.default_factory is not dataclasses.MISSING:
+                namespace[f"factory_{num}"] = field.default_factory
+                value = f"document[{name!r}] if {name!r} in document else factory_{num}()"
+            elif self.slotted and field.default is not dataclasses.MISSING:
+                value = f"get({name!r}, defaults[{name!r}])"
+            elif self.slotted:
+                value = f"document[{name!r}]"
+            else:
+                # already copied from the defaults or the document
+                continue
+
+            if self.slotted:
+                lines.append(f"    set_attr(instance, {name!r}, {value})")
+            else:
+                lines.append(f"    values[{name!r}] = {value}")
+
+        if not self.slotted:
+            lines.append('    set_attr(instance, "__dict__", values)')
+        if hasattr(self.cls, "__post_init__"):
+            lines.append("    instance.__post_init__()")
+        lines.append("    return instance")
+
+        exec("\n".join(lines), namespace)  # noqa: S102
+        return namespace["decode"]
+
+    def __call__(self, document: dict[str, any]) -> any:
+        """Decodes the document.
+
+        Documents that have already been decoded are returned as they are.
+
+        Args:
+            document (dict[str, any]): the document
+
+        Returns:
+            any: the dataclass instance
+        """
+        return self.decode(document)
+
+
+def list_of(decoder: Callable[[any], any], lazy: bool = False) -> Callable[[list | None], list]:
+    """Makes a converter for a list of documents.
+
+    Args:
+        decoder (Callable[[any], any]): decodes each document
+        lazy (bool, optional): whether to only decode the documents once the list is accessed. Defaults to False.
+
+    Returns:
+        Callable[[list | None], list]: the converter
+    """
+    decode = getattr(decoder, "decode", decoder)
+    if lazy:
+        return lambda items: LazyList(items or (), decode)
+    return lambda items: [decode(item) for item in items or ()]
+
+
+def dict_of(decoder: Callable[[any], any]) -> Callable[[dict | None], dict]:
+    """Makes a converter for a dict of documents.
+
+    Args:
+        decoder (Callable[[any], any]): decodes each document
+
+    Returns:
+        Callable[[dict | None], dict]: the converter
+    """
+    decode = getattr(decoder, "decode", decoder)
+    return lambda items: {key: decode(item) for key, item in (items or {}).items()}
+
+
+def get_decoder(cls: type) -> DataclassDecoder:
+    """Gets the shared plain decoder for the given dataclass, creating it if it doesn't exist yet.
+
+    Args:
+        cls (type): the dataclass
+
+    Returns:
+        DataclassDecoder: the decoder
+    """
+    if (decoder := _DECODERS.get(cls)) is not None:
+        return decoder
+    with _DECODERS_LOCK:
+        if (decoder := _DECODERS.get(cls)) is None:
+            decoder = _DECODERS[cls] = DataclassDecoder(cls)
+        return decoder
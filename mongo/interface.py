@@ -4,16 +4,21 @@ We use MongoClient from pymongo. These functions are our abstractions of pre-exi
 MongoDB methods.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
 from pymongo.collection import Collection
+from pymongo.command_cursor import CommandCursor
 from pymongo.cursor import Cursor
 from pymongo.database import Database
-from pymongo.results import UpdateResult
+from pymongo.operations import DeleteMany, DeleteOne, IndexModel, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, UpdateResult
 
 CACHED_CLIENT = None  # type: MongoClient
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_WORKERS = 8
 
 
 class CachedMongoClient:
@@ -86,6 +91,21 @@ def get_client(
     return client_cls.client
 
 
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool used for running blocking database calls off the event loop.
+
+    The pool is created lazily and shared by every collection class. MongoClient is thread-safe
+    so all the workers can share the one cached client.
+
+    Returns:
+        ThreadPoolExecutor: the shared database executor
+    """
+    global _EXECUTOR  # noqa: PLW0603
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS, thread_name_prefix="bsebot-mongo")
+    return _EXECUTOR
+
+
 def get_database_names(client: MongoClient) -> list[str]:
     """Returns a list of database names for a given client.
 
@@ -187,7 +207,7 @@ def delete(collection: Collection, params: dict[str, any], many: bool = True) ->
 def update(
     collection: Collection,
     parameters: dict[str, any],
-    updated_vals: dict[str, any],
+    updated_vals: dict[str, any] | list[dict[str, any]],
     many: bool = True,
     upsert: bool = False,
 ) -> UpdateResult:
@@ -205,7 +225,7 @@ def update(
     Args:
         collection (Collection): mongoDB collection object
         parameters (dict[str, any]): dictionary of search parameters
-        updated_vals (dict[str, any): dict of update operators and values to apply
+        updated_vals (dict[str, any] | list[dict[str, any]]): dict of update operators and values to apply
         many (bool): whether to update many docs at once. Defaults to True.
         upsert (bool): whether to create new parameters. Defaults to False.
 
@@ -217,6 +237,68 @@ def update(
     return update_func(filter=parameters, update=updated_vals, upsert=upsert)
 
 
+def find_one_and_update(
+    collection: Collection,
+    parameters: dict[str, any],
+    updated_vals: dict[str, any] | list[dict[str, any]],
+    projection: dict | None = None,
+    upsert: bool = False,
+    return_after: bool = True,
+) -> dict[str, any] | None:
+    """Atomically updates the first document matching the given parameters and returns it.
+
+    As the match and the update happen in a single server operation, the parameters can be used as a guard (eg: only
+    update the document if a field is still a certain value) without any other writes happening in between.
+    See the following specifications for more information.
+    https://pymongo.readthedocs.io/en/stable/api/pymongo/collection.html#pymongo.collection.Collection.find_one_and_update
+
+    Args:
+        collection (Collection): mongoDB collection object
+        parameters (dict[str, any]): dictionary of search parameters
+        updated_vals (dict[str, any] | list[dict[str, any]]): dict of update operators and values to apply
+        projection (dict | None): which keys to return/not return. Defaults to None.
+        upsert (bool): whether to insert a new document if none match. Defaults to False.
+        return_after (bool): whether to return the document after the update rather than before. Defaults to True.
+
+    Returns:
+        dict[str, any] | None: the document, or None if no documents matched
+    """
+    return collection.find_one_and_update(
+        parameters,
+        updated_vals,
+        projection=projection,
+        upsert=upsert,
+        return_document=ReturnDocument.AFTER if return_after else ReturnDocument.BEFORE,
+    )
+
+
+def bulk_write(
+    collection: Collection,
+    requests: list[InsertOne | UpdateOne | UpdateMany | ReplaceOne | DeleteOne | DeleteMany],
+    ordered: bool = False,
+) -> BulkWriteResult:
+    """Sends a batch of write operations to the given collection in as few round trips as possible.
+
+    Operations are pymongo operation objects, eg:
+        requests = [
+            InsertOne({"key": "value"}),
+            UpdateOne({"key": "value"}, {"$inc": {"count": 1}}),
+        ]
+    See the following specifications for more information.
+    https://pymongo.readthedocs.io/en/stable/api/pymongo/collection.html#pymongo.collection.Collection.bulk_write
+
+    Args:
+        collection (Collection): mongoDB collection object
+        requests (list): the list of write operations
+        ordered (bool): whether the operations should be applied serially and stop on the first error.
+            Defaults to False.
+
+    Returns:
+        BulkWriteResult: the bulk write result
+    """
+    return collection.bulk_write(requests, ordered=ordered)
+
+
 def query(  # noqa: PLR0913, PLR0917
     collection: Collection,
     parameters: dict[str, any],
@@ -258,6 +340,35 @@ def query(  # noqa: PLR0913, PLR0917
     return results if as_gen else list(results)
 
 
+def aggregate(
+    collection: Collection,
+    pipeline: list[dict[str, any]],
+    as_gen: bool = False,
+    allow_disk_use: bool = False,
+) -> list[dict[str, any]] | CommandCursor:
+    """Runs an aggregation pipeline on the given collection.
+
+    The pipeline is a list of stages that are executed server side, eg:
+        pipeline = [
+            {"$match": {"guild_id": 123}},
+            {"$group": {"_id": "$channel_id", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ]
+    Stages: https://www.mongodb.com/docs/manual/reference/operator/aggregation-pipeline/
+
+    Args:
+        collection (Collection): collection object to aggregate
+        pipeline (list[dict]): the list of pipeline stages
+        as_gen (bool): True returns the CommandCursor and False returns a list of results. Defaults to False.
+        allow_disk_use (bool): whether stages can write temporary data to disk. Defaults to False.
+
+    Returns:
+        list | CommandCursor: a cursor if as_gen else a list of results
+    """
+    results = collection.aggregate(pipeline, allowDiskUse=allow_disk_use)
+    return results if as_gen else list(results)
+
+
 def drop_collection(name_or_collection: str | Collection, database: Database = None) -> bool:
     """Drops a given collection.
 
@@ -303,6 +414,38 @@ def create_index(collection: Collection, key_or_list_of_keys_to_index: str | lis
     return rets if len(rets) > 1 else rets[0]
 
 
+def create_indexes(collection: Collection, indexes: list[IndexModel]) -> list[str]:
+    """Creates the given indexes for a given collection if they don't already exist.
+
+    Docs: https://pymongo.readthedocs.io/en/stable/api/pymongo/collection.html#pymongo.collection.Collection.create_indexes
+
+    Args:
+        collection (Collection): the collection to create the indexes for
+        indexes (list[IndexModel]): the indexes to create
+
+    Returns:
+        list[str]: the names of the indexes
+    """
+    return collection.create_indexes(indexes)
+
+
+def explain(collection: Collection, parameters: dict[str, any], sort: list[tuple] | None = None) -> dict[str, any]:
+    """Returns the query plan the server would use for the given query.
+
+    Args:
+        collection (Collection): the collection to query
+        parameters (dict[str, any]): the query parameters
+        sort (list[tuple] | None, optional): the sort to apply to the query. Defaults to None.
+
+    Returns:
+        dict[str, any]: the explain output
+    """
+    cursor = collection.find(parameters)
+    if sort:
+        cursor = cursor.sort(sort)
+    return cursor.explain()
+
+
 def get_indexes(collection: Collection) -> dict[str, any] | bool:
     """Returns the indexes for the given collection.
 
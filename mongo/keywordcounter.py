@@ -0,0 +1,79 @@
+"""Counting many keywords in a single scan.
+
+Some stats count how often each of a set of keywords (eg: server emojis or swear words) appears in every message.
+Rather than scanning each message once per keyword, we compile all the keywords into a single pattern once and
+then find every keyword occurrence in one scan of each message.
+
+The counts match calling `str.count` for each keyword: overlapping occurrences of different keywords are all
+counted but occurrences of the same keyword don't overlap.
+"""
+
+import re
+from collections.abc import Iterable
+
+
+class KeywordCounter:
+    """Counts the occurrences of a set of keywords in text with one compiled pattern."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """Initialisation method.
+
+        Compiles the keywords into a single pattern.
+
+        Args:
+            keywords (Iterable[str]): the keywords to count, empty keywords are ignored
+        """
+        self.keywords: list[str] = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self._index: dict[str, int] = {keyword: num for num, keyword in enumerate(self.keywords)}
+
+        # the pattern finds the longest keyword at each position, so we also need to know which other keywords
+        # are prefixes of it as they occur at the same position
+        self._prefixes: dict[str, list[str]] = {
+            keyword: [other for other in self.keywords if other != keyword and keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+        self._pattern: re.Pattern | None = None
+        if self.keywords:
+            alternation = "|".join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+            # zero width lookahead so that every position is checked
+            self._pattern = re.compile(f"(?=({alternation}))")
+
+    def count(self, text: str) -> dict[str, int]:
+        """Counts the keywords in the given text.
+
+        Args:
+            text (str): the text to scan
+
+        Returns:
+            dict[str, int]: mapping of each keyword found to its count, in the order the keywords were given
+        """
+        if not self._pattern or not text:
+            return {}
+
+        counts: dict[str, int] = {}
+        # the end of the last counted occurrence of each keyword
+        ends: dict[str, int] = {}
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+            for keyword in (longest, *self._prefixes[longest]):
+                if start < ends.get(keyword, 0):
+                    continue
+                ends[keyword] = start + len(keyword)
+                counts[keyword] = counts.get(keyword, 0) + 1
+
+        if len(counts) > 1:
+            counts = dict(sorted(counts.items(), key=lambda item: self._index[item[0]]))
+        return counts
+
+    def total(self, text: str) -> int:
+        """Counts the total number of keyword occurrences in the given text.
+
+        Args:
+            text (str): the text to scan
+
+        Returns:
+            int: the total number of occurrences
+        """
+        return sum(self.count(text).values())
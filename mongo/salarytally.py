@@ -0,0 +1,597 @@
+"""Live, in-process tally of the salary-relevant interactions for the current day.
+
+Working out the daily salary means querying every interaction and reaction for the day and counting them for each
+member. Rather than doing that every time someone wants to `/predict` their salary, we keep a running tally of the
+same counters for each user in each guild as the interactions are recorded.
+
+A day's tally is only complete if we've been running since the start of that day. The day we start up on is
+seeded from the database the first time it's needed. Only the last two days are kept.
+"""
+
+import dataclasses
+import datetime
+import threading
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable
+from zoneinfo import ZoneInfo
+
+from mongo.datatypes.message import MessageDB
+
+_KEEP_DAYS = 2
+"""The number of days of tallies to keep."""
+
+
+@dataclasses.dataclass
+class SalaryCounters:
+    """The salary-relevant counters for a user on a given day."""
+
+    message_types: Counter[str] = dataclasses.field(default_factory=Counter)
+    """The types of the user's interactions and of the events they earn eddies for (eg: 'reaction_received')."""
+    reactions: Counter[str] = dataclasses.field(default_factory=Counter)
+    """The reactions the user made, used to count their custom emoji reactions."""
+    vc_sessions: dict[Hashable, tuple[float, float, bool]] = dataclasses.field(default_factory=dict)
+    """The time in VC and the time streaming for each of the user's VC sessions, and whether they streamed."""
+    wordle: str | None = None
+    """The content of the user's first wordle message."""
+    active: bool = False
+    """Whether the user interacted at all, including reacting."""
+
+    def counts(self, emoji_names: Iterable[str]) -> Counter[str]:
+        """Gets the counts of the message types, including the custom emoji reactions.
+
+        Args:
+            emoji_names (Iterable[str]): the names of the server's emojis
+
+        Returns:
+            Counter[str]: the counts, without any VC time
+        """
+        count = +self.message_types
+        if custom := sum(self.reactions[name] for name in emoji_names if name in self.reactions):
+            count["custom_emoji_reaction"] += custom
+        return count
+
+    def copy(self) -> "SalaryCounters":
+        """Copies the counters.
+
+        Returns:
+            SalaryCounters: the copy
+        """
+        return dataclasses.replace(
+            self,
+            message_types=Counter(self.message_types),
+            reactions=Counter(self.reactions),
+            vc_sessions=dict(self.vc_sessions),
+        )
+
+
+@dataclasses.dataclass
+class GuildDayTally:
+    """The salary counters for all the users in a guild on a given day."""
+
+    users: dict[int, SalaryCounters] = dataclasses.field(default_factory=dict)
+    """The counters for each user."""
+    message_ids: set[int] = dataclasses.field(default_factory=set)
+    """The messages that have been counted, so that re-synced messages aren't counted twice."""
+    wordle_word: str | None = None
+    """The day's wordle word, once we know it."""
+    contents: dict[int, list[str]] = dataclasses.field(default_factory=dict)
+    """The content of each user's interactions, kept until we know the wordle word."""
+    complete: bool = True
+    """Whether the day has been tallied since it started, rather than seeded partway through."""
+    since: datetime.datetime | None = None
+    """While the day is being seeded, only interactions from this time are tallied as the database counts the rest."""
+
+    def tallies(self, timestamp: datetime.datetime | None) -> bool:
+        """Whether an interaction at the given time should be tallied.
+
+        Args:
+            timestamp (datetime.datetime | None): when the interaction happened, if we know
+
+        Returns:
+            bool: whether to tally the interaction
+        """
+        return self.since is None or timestamp is None or timestamp >= self.since
+
+    def merge(self, other: "GuildDayTally") -> None:
+        """Adds the counters from a tally of the interactions that happened after the ones in this one.
+
+        Args:
+            other (GuildDayTally): the other tally
+        """
+        self.message_ids |= other.message_ids
+        for user_id, other_counters in other.users.items():
+            counters = self.user(user_id)
+            counters.message_types.update(other_counters.message_types)
+            counters.reactions.update(other_counters.reactions)
+            # the VC sessions have the latest times
+            counters.vc_sessions.update(other_counters.vc_sessions)
+            if counters.wordle is None:
+                counters.wordle = other_counters.wordle
+            counters.active = counters.active or other_counters.active
+
+        if self.wordle_word is None and other.wordle_word is not None:
+            self.wordle_word = other.wordle_word
+            contents, self.contents = self.contents, {}
+            for user_id, user_contents in contents.items():
+                for content in user_contents:
+                    self.count_content(user_id, content)
+        for user_id, user_contents in other.contents.items():
+            for content in user_contents:
+                self.count_content(user_id, content)
+
+    def user(self, user_id: int) -> SalaryCounters:
+        """Gets the counters for the user, creating them if they don't exist yet.
+
+        Args:
+            user_id (int): the user ID
+
+        Returns:
+            SalaryCounters: the user's counters
+        """
+        if (counters := self.users.get(user_id)) is None:
+            counters = self.users[user_id] = SalaryCounters()
+        return counters
+
+    def count_content(self, user_id: int, content: str | None, sign: int = 1) -> None:
+        """Counts whether the content uses the wordle word, or keeps it until we know the word.
+
+        Args:
+            user_id (int): the user ID
+            content (str | None): the interaction content
+            sign (int, optional): 1 to count the content, -1 to uncount it. Defaults to 1.
+        """
+        if not content:
+            return
+        if self.wordle_word is None:
+            contents = self.contents.setdefault(user_id, [])
+            if sign > 0:
+                contents.append(content)
+            elif content in contents:
+                contents.remove(content)
+        elif self.wordle_word in content:
+            self.user(user_id).message_types["wordle_word_used"] += sign
+
+
+def _react_trains(reactions: list[tuple[int, datetime.datetime]]) -> Counter[tuple[datetime.date, int]]:
+    """Works out the react train counts for the reactions with the same emoji on a message.
+
+    A user that reacted before anyone else used the same emoji gets one for each of the other reactions.
+
+    Args:
+        reactions (list[tuple[int, datetime.datetime]]): the user ID and the timestamp of each reaction
+
+    Returns:
+        Counter[tuple[datetime.date, int]]: the react train count for the day of the reaction and the user
+    """
+    trains = Counter()
+    for user_id, timestamp in reactions:
+        matching = [other for other_id, other in reactions if other_id != user_id]
+        if matching and min(matching) > timestamp:
+            trains[timestamp.date(), user_id] += len(matching)
+    return trains
+
+
+class SalaryTally:
+    """Keeps a running tally of each user's salary counters for each guild."""
+
+    def __init__(self, started: datetime.datetime | None = None) -> None:
+        """Initialisation method.
+
+        Args:
+            started (datetime.datetime | None, optional): when we started tallying. Defaults to now.
+        """
+        self.started = started or datetime.datetime.now(tz=ZoneInfo("UTC"))
+
+        self._days: dict[tuple[int, datetime.date], GuildDayTally] = {}
+        # the reactions on each message we've seen reactions for: {(guild ID, message ID): {emoji: reactions}}
+        self._reactions: dict[tuple[int, int], dict[str, list[tuple[int, datetime.datetime]]]] = {}
+        # set once the day being seeded has been loaded
+        self._seeding: dict[tuple[int, datetime.date], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _get_day(self, guild_id: int, day: datetime.date) -> GuildDayTally | None:
+        """Gets the tally for the guild and day if we're tallying it. Must be called with the lock held.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+
+        Returns:
+            GuildDayTally | None: the tally, or None if we're not tallying that day
+        """
+        if (tally := self._days.get((guild_id, day))) is not None:
+            return tally
+        if day <= self.started.date():
+            # we weren't running for all of the day
+            return None
+        latest = max((key[1] for key in self._days), default=day)
+        if day < latest - datetime.timedelta(days=_KEEP_DAYS - 1):
+            # too old to keep
+            return None
+        tally = self._days[guild_id, day] = GuildDayTally()
+        self._prune(max(latest, day))
+        return tally
+
+    def _prune(self, latest: datetime.date) -> None:
+        """Drops the tallies that are too old to keep. Must be called with the lock held.
+
+        Args:
+            latest (datetime.date): the latest day we're tallying
+        """
+        oldest = latest - datetime.timedelta(days=_KEEP_DAYS - 1)
+        if old := [key for key in self._days if key[1] < oldest]:
+            for key in old:
+                del self._days[key]
+            # the reactions are looked up again when they're next needed
+            self._reactions.clear()
+
+    def is_complete(self, guild_id: int, day: datetime.date) -> bool:
+        """Whether we've tallied all of the given day.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+
+        Returns:
+            bool: whether the tally is complete
+        """
+        with self._lock:
+            tally = self._get_day(guild_id, day)
+            return tally is not None and tally.complete
+
+    def warm(self, guild_id: int, day: datetime.date, loader: Callable[[datetime.datetime], GuildDayTally]) -> bool:
+        """Makes sure we're tallying the given day, seeding it with the loader if we started partway through it.
+
+        The loader runs without the lock held so that recording interactions isn't held up by the database. It's
+        given the time we started seeding and only counts the interactions before then. The interactions recorded
+        while it runs are tallied from that time and merged in afterwards.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+            loader (Callable[[datetime.datetime], GuildDayTally]): counts the day's interactions before the given
+                time from the database
+
+        Returns:
+            bool: whether we're tallying the day
+        """
+        key = guild_id, day
+        with self._lock:
+            tally = self._get_day(guild_id, day)
+            if tally is None and day != self.started.date():
+                return False
+            if tally is not None and tally.since is None:
+                return True
+            if tally is not None:
+                # something else is already seeding the day
+                seeded = self._seeding[key]
+                tally = None
+            else:
+                seeded = self._seeding[key] = threading.Event()
+                tally = self._days[key] = GuildDayTally(complete=False, since=datetime.datetime.now(tz=ZoneInfo("UTC")))
+
+        if tally is None:
+            seeded.wait()
+            with self._lock:
+                return (tally := self._days.get(key)) is not None and tally.since is None
+
+        try:
+            loaded = loader(tally.since)
+        except Exception:
+            with self._lock:
+                if self._days.get(key) is tally:
+                    del self._days[key]
+                del self._seeding[key]
+            seeded.set()
+            raise
+
+        with self._lock:
+            del self._seeding[key]
+            if self._days.get(key) is tally:
+                loaded.complete = False
+                loaded.merge(tally)
+                self._days[key] = loaded
+        seeded.set()
+        return True
+
+    def get_counters(self, guild_id: int, day: datetime.date) -> dict[int, SalaryCounters] | None:
+        """Gets a copy of each user's counters for the given day.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+
+        Returns:
+            dict[int, SalaryCounters] | None: the counters for each user, or None if we're not tallying that day
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, day)) is None or tally.since is not None:
+                # not tallying the day, or it's still being seeded
+                return None
+            return {user_id: counters.copy() for user_id, counters in tally.users.items()}
+
+    def needs_wordle_word(self, guild_id: int, day: datetime.date) -> bool:
+        """Whether we're tallying the given day but don't know the wordle word yet.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+
+        Returns:
+            bool: whether we need the wordle word
+        """
+        with self._lock:
+            tally = self._get_day(guild_id, day)
+            return tally is not None and tally.wordle_word is None
+
+    def set_wordle_word(self, guild_id: int, day: datetime.date, word: str) -> None:
+        """Sets the day's wordle word and counts the uses of it so far.
+
+        Args:
+            guild_id (int): the guild ID
+            day (datetime.date): the day
+            word (str): the wordle word
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, day)) is None or tally.wordle_word is not None:
+                return
+            tally.wordle_word = word
+            contents, tally.contents = tally.contents, {}
+            for user_id, user_contents in contents.items():
+                for content in user_contents:
+                    tally.count_content(user_id, content)
+
+    def add_entry(
+        self,
+        guild_id: int,
+        user_id: int,
+        message_id: int,
+        message_type: list[str],
+        content: str | None,
+        timestamp: datetime.datetime,
+    ) -> None:
+        """Counts a new interaction.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user the interaction is for
+            message_id (int): the message ID
+            message_type (list[str]): the message type
+            content (str | None): the interaction content
+            timestamp (datetime.datetime): when the interaction happened
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, timestamp.date())) is None or not tally.tallies(timestamp):
+                return
+            if "message" in message_type:
+                if message_id in tally.message_ids:
+                    # already counted this message
+                    return
+                tally.message_ids.add(message_id)
+
+            counters = tally.user(user_id)
+            counters.active = True
+            counters.message_types.update(message_type)
+            if "wordle" in message_type and counters.wordle is None:
+                counters.wordle = content
+            tally.count_content(user_id, content)
+
+    def add_message_types(
+        self, guild_id: int, user_id: int, message_id: int, timestamp: datetime.datetime, message_type: list[str]
+    ) -> None:
+        """Counts additional message types for a message that's already been counted.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user that sent the message
+            message_id (int): the message ID
+            timestamp (datetime.datetime): when the message was sent
+            message_type (list[str]): the additional message types
+        """
+        with self._lock:
+            tally = self._get_day(guild_id, timestamp.date())
+            if tally is not None and message_id in tally.message_ids:
+                tally.user(user_id).message_types.update(message_type)
+
+    def edit_entry(self, message: MessageDB, message_type: list[str], content: str | None) -> None:
+        """Updates the counters for an edited message.
+
+        Args:
+            message (MessageDB): the message before it was edited
+            message_type (list[str]): the new message type
+            content (str | None): the new message content
+        """
+        with self._lock:
+            tally = self._get_day(message.guild_id, message.timestamp.date())
+            if tally is None or message.message_id not in tally.message_ids:
+                return
+
+            counters = tally.user(message.user_id)
+            counters.message_types.subtract(message.message_type)
+            counters.message_types.update(message_type)
+            tally.count_content(message.user_id, message.content, -1)
+            tally.count_content(message.user_id, content)
+            if counters.wordle in {None, message.content}:
+                counters.wordle = content if "wordle" in message_type else None
+
+    def add_reply(
+        self,
+        guild_id: int,
+        message_id: int,
+        author_id: int,
+        sent: datetime.datetime,
+        user_id: int,
+        timestamp: datetime.datetime | None = None,
+    ) -> None:
+        """Counts a reply to a message, if we counted the message.
+
+        Args:
+            guild_id (int): the guild ID
+            message_id (int): the ID of the message that was replied to
+            author_id (int): the user that sent the message
+            sent (datetime.datetime): when the message was sent
+            user_id (int): the user that replied
+            timestamp (datetime.datetime | None, optional): when the reply was sent. Defaults to None.
+        """
+        if user_id == author_id:
+            return
+        with self._lock:
+            tally = self._get_day(guild_id, sent.date())
+            if tally is None or not tally.tallies(timestamp):
+                return
+            # while seeding, the message may only be in the tally that's being loaded
+            if tally.since is not None or message_id in tally.message_ids:
+                tally.user(author_id).message_types["reply_received"] += 1
+
+    def needs_message(self, guild_id: int, message_id: int, timestamp: datetime.datetime) -> bool:
+        """Whether we need the message to count a reaction to it.
+
+        Args:
+            guild_id (int): the guild ID
+            message_id (int): the ID of the message that was reacted to
+            timestamp (datetime.datetime): when the reaction happened
+
+        Returns:
+            bool: whether the message should be passed to `add_reaction`
+        """
+        with self._lock:
+            return (
+                self._get_day(guild_id, timestamp.date()) is not None and (guild_id, message_id) not in self._reactions
+            )
+
+    def add_reaction(  # noqa: PLR0913, PLR0917
+        self,
+        guild_id: int,
+        message_id: int,
+        author_id: int,
+        user_id: int,
+        content: str,
+        timestamp: datetime.datetime,
+        message: MessageDB | None = None,
+    ) -> None:
+        """Counts a reaction to a message.
+
+        Args:
+            guild_id (int): the guild ID
+            message_id (int): the ID of the message that was reacted to
+            author_id (int): the user that sent the message
+            user_id (int): the user that reacted
+            content (str): the reaction
+            timestamp (datetime.datetime): when the reaction happened
+            message (MessageDB | None, optional): the message, with its previous reactions. Only needed if
+                `needs_message` says so. Defaults to None.
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, timestamp.date())) is None or not tally.tallies(timestamp):
+                return
+
+            if (reactions := self._reactions.get((guild_id, message_id))) is None:
+                if message is None:
+                    # we don't have the message so the reaction isn't recorded
+                    return
+                reactions = self._reactions[guild_id, message_id] = {}
+                for reaction in message.reactions or []:
+                    reactions.setdefault(reaction.content, []).append((reaction.user_id, reaction.timestamp))
+
+            matching = reactions.setdefault(content, [])
+            before = _react_trains(matching)
+            matching.append((user_id, timestamp))
+            after = _react_trains(matching)
+            for day, train_user_id in before.keys() | after.keys():
+                delta = after[day, train_user_id] - before[day, train_user_id]
+                if delta and (train_tally := self._get_day(guild_id, day)) is not None:
+                    train_tally.user(train_user_id).message_types["react_train"] += delta
+
+            if user_id != author_id:
+                tally.user(author_id).message_types["reaction_received"] += 1
+            tally.user(user_id).reactions[content] += 1
+
+            # the salary counts everyone that reacted to a message with a reaction today as active
+            tally.user(author_id).active = True
+            for reactors in reactions.values():
+                for reactor_id, _ in reactors:
+                    tally.user(reactor_id).active = True
+
+    def remove_reaction(
+        self,
+        guild_id: int,
+        message_id: int,
+        author_id: int,
+        user_id: int,
+        content: str,
+        timestamp: datetime.datetime,
+    ) -> None:
+        """Uncounts a reaction that was removed from a message.
+
+        The react trains for the reaction's emoji on the message are worked out again without it. Whether the users
+        were active isn't undone as they may have been active otherwise.
+
+        Args:
+            guild_id (int): the guild ID
+            message_id (int): the ID of the message the reaction was removed from
+            author_id (int): the user that sent the message
+            user_id (int): the user that reacted
+            content (str): the reaction
+            timestamp (datetime.datetime): when the reaction happened
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, timestamp.date())) is None or not tally.tallies(timestamp):
+                return
+            reactions = self._reactions.get((guild_id, message_id))
+            if reactions is None or (user_id, timestamp) not in (matching := reactions.get(content, [])):
+                # we never counted the reaction
+                return
+
+            before = _react_trains(matching)
+            matching.remove((user_id, timestamp))
+            after = _react_trains(matching)
+            for day, train_user_id in before.keys() | after.keys():
+                delta = after[day, train_user_id] - before[day, train_user_id]
+                if delta and (train_tally := self._get_day(guild_id, day)) is not None:
+                    train_tally.user(train_user_id).message_types["react_train"] += delta
+
+            if user_id != author_id:
+                tally.user(author_id).message_types["reaction_received"] -= 1
+            counters = tally.user(user_id)
+            counters.reactions[content] -= 1
+            if counters.reactions[content] <= 0:
+                del counters.reactions[content]
+
+    def update_vc_session(  # noqa: PLR0913, PLR0917
+        self,
+        guild_id: int,
+        user_id: int,
+        session_id: Hashable,
+        joined: datetime.datetime,
+        time_in_vc: float,
+        time_streaming: float,
+        streamed: bool,
+    ) -> None:
+        """Sets the times for a VC session.
+
+        Args:
+            guild_id (int): the guild ID
+            user_id (int): the user in the VC
+            session_id (Hashable): the ID of the VC interaction
+            joined (datetime.datetime): when the user joined the VC
+            time_in_vc (float): the number of seconds the user has spent in the VC
+            time_streaming (float): the number of seconds the user has spent streaming
+            streamed (bool): whether the user has streamed
+        """
+        with self._lock:
+            if (tally := self._get_day(guild_id, joined.date())) is not None:
+                counters = tally.user(user_id)
+                counters.active = True
+                counters.vc_sessions[session_id] = (time_in_vc, time_streaming, streamed)
+
+
+_SALARY_TALLY = SalaryTally()
+
+
+def get_salary_tally() -> SalaryTally:
+    """Gets the salary tally shared by everything that records interactions.
+
+    Returns:
+        SalaryTally: the salary tally
+    """
+    return _SALARY_TALLY
@@ -0,0 +1,174 @@
+"""In-process read-through caching for our collections.
+
+Some lookups (eg: server emojis, stickers and guild config) are made for nearly every message or reaction we
+receive but the underlying documents very rarely change. We cache the results of those lookups here with a TTL
+and a maximum size. Collection classes clear their cache whenever they write to their collection.
+
+There is a single cache per name that is shared by every collection class instance so that a write made by one
+instance invalidates the results cached by all the others.
+
+Caches can also be given a maximum total weight (eg: the number of documents in the cached lists) so that
+caching large query results is bounded by memory as well as by the number of entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+_CACHES: dict[str, "TTLCache"] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class TTLCache:
+    """A thread-safe least recently used cache where entries expire after a given number of seconds."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        max_weight: int | None = None,
+        weigher: Callable[[any], int] | None = None,
+    ) -> None:
+        """Initialisation method.
+
+        Args:
+            max_size (int, optional): the maximum number of entries to keep. Defaults to 1024.
+            ttl (float, optional): the number of seconds an entry is valid for. Defaults to 300.0.
+            max_weight (int | None, optional): the maximum total weight of the entries to keep. Defaults to None.
+            weigher (Callable[[any], int] | None, optional): function to weigh a value. Defaults to weighing
+                every value as 1.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: OrderedDict[Hashable, tuple[float, any, int]] = OrderedDict()
+        self._weight: int = 0
+        # incremented on every clear so that loads started before a write don't cache stale values
+        self._generation: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of cached entries, including any that have expired but haven't been evicted yet.
+
+        Returns:
+            int: the number of cached entries
+        """
+        return len(self._entries)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], any]) -> any:
+        """Gets the cached value for the given key, calling the loader and caching the result on a miss.
+
+        Args:
+            key (Hashable): the key to cache the value with
+            loader (Callable[[], any]): function to load the value if it's not cached
+
+        Returns:
+            any: the cached or loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        weight = self.weigher(value) if self.weigher else 1
+        if self.max_weight is not None and weight > self.max_weight:
+            # too big to ever cache
+            return value
+
+        with self._lock:
+            if generation == self._generation:
+                self._pop(key)
+                self._entries[key] = (time.monotonic() + self.ttl, value, weight)
+                self._weight += weight
+                while len(self._entries) > self.max_size or (
+                    self.max_weight is not None and self._weight > self.max_weight
+                ):
+                    self._pop(next(iter(self._entries)))
+        return value
+
+    def _pop(self, key: Hashable) -> None:
+        """Removes the entry with the given key if there is one.
+
+        Must be called with the lock held.
+
+        Args:
+            key (Hashable): the key to remove
+        """
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._weight -= entry[2]
+
+    def find(self, predicate: Callable[[Hashable, any], bool]) -> any:
+        """Finds the most recently used valid value that matches the predicate.
+
+        Args:
+            predicate (Callable[[Hashable, any], bool]): function that checks whether a key and its value match
+
+        Returns:
+            any: the value, or None if no keys match
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in reversed(self._entries):
+                expiry, value, _ = self._entries[key]
+                if expiry > now and predicate(key, value):
+                    self._entries.move_to_end(key)
+                    return value
+        return None
+
+    def clear(self) -> None:
+        """Removes all the cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self._generation += 1
+
+    def stats(self) -> dict[str, int]:
+        """Gets the hit and miss counters for the cache.
+
+        Returns:
+            dict[str, int]: the number of hits, misses and cached entries, and their total weight if the
+                cache has a maximum weight
+        """
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+            if self.max_weight is not None:
+                stats["weight"] = self._weight
+            return stats
+
+
+def get_cache(name: str, **kwargs: any) -> TTLCache:
+    """Gets the shared cache with the given name, creating it if it doesn't exist yet.
+
+    Args:
+        name (str): the name of the cache
+        kwargs (any): the arguments to create the cache with, if it doesn't exist yet
+
+    Returns:
+        TTLCache: the cache
+    """
+    with _CACHES_LOCK:
+        if (cache := _CACHES.get(name)) is None:
+            cache = _CACHES[name] = TTLCache(**kwargs)
+        return cache
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Gets the hit and miss counters for all the caches.
+
+    Returns:
+        dict[str, dict[str, int]]: mapping of cache name to its counters
+    """
+    with _CACHES_LOCK:
+        caches = dict(_CACHES)
+    return {name: cache.stats() for name, cache in caches.items()}
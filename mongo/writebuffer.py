@@ -0,0 +1,340 @@
+"""Write-behind buffering for our collections.
+
+Some collections (eg: 'userinteractions') are written to for every message we receive. Rather than waiting
+on a database round trip for each of those writes, we buffer them here and send them in batches with a
+single ordered `bulk_write`. Buffers are flushed when they reach a maximum size, after a maximum delay,
+when anything needs to read the buffered documents, and when the process shuts down.
+
+Operations are only removed from the buffer once they've been written. An ordered write stops at the first operation
+that fails, so that operation and everything after it are put back at the front of the buffer and tried again with
+the next flush.
+
+There is a single buffer per collection name that is shared by every collection class instance so that
+all the writes for a collection are applied in the order they were made.
+"""
+
+import atexit
+import operator
+import threading
+from collections.abc import Callable, Hashable
+
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.operations import InsertOne, UpdateOne
+from pymongo.results import BulkWriteResult
+from slomanlogger import SlomanLogger
+
+from mongo import interface
+
+_BUFFERS: dict[str, "WriteBuffer"] = {}
+_BUFFERS_LOCK = threading.Lock()
+
+_DUPLICATE_KEY = 11000
+"""The error code for a duplicate key, ie: the document has already been inserted."""
+
+
+class WriteBuffer:
+    """Buffers inserts and updates for a collection and writes them in batches."""
+
+    def __init__(
+        self,
+        collection: Collection,
+        max_size: int = 100,
+        max_delay: float = 1.0,
+        max_attempts: int = 5,
+    ) -> None:
+        """Initialisation method.
+
+        Args:
+            collection (Collection): the collection to write to
+            max_size (int, optional): the number of operations to buffer before flushing. Defaults to 100.
+            max_delay (float, optional): the maximum number of seconds to buffer an operation. Defaults to 1.0.
+            max_attempts (int, optional): the number of times to try writing an operation before dropping it.
+                Defaults to 5.
+        """
+        self.collection = collection
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.logger = SlomanLogger("bsebot")
+
+        self._operations: list[InsertOne | UpdateOne] = []
+        # the pending inserted documents, and the keys with pending updates
+        # operations that were buffered without a key are tracked as a `None` key
+        self._documents: dict[Hashable, dict[str, any]] = {}
+        self._updated: set[Hashable | None] = set()
+        # the number of failed attempts to write each operation, by the operation's id
+        self._failures: dict[int, int] = {}
+        self._timer: threading.Timer | None = None
+
+        # guards the buffered operations
+        self._lock = threading.Lock()
+        # serialises the writes so that a flush only returns once everything before it has been written
+        self._flush_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of buffered operations.
+
+        Returns:
+            int: the number of buffered operations
+        """
+        return len(self._operations)
+
+    def _add(self, operation: InsertOne | UpdateOne) -> None:
+        """Adds the operation to the buffer.
+
+        Must be called with the lock held. Starts the flush timer for the first operation in the buffer.
+
+        Args:
+            operation (InsertOne | UpdateOne): the operation to buffer
+        """
+        self._operations.append(operation)
+        self._start_timer()
+
+    def _start_timer(self) -> None:
+        """Starts the flush timer if there are buffered operations and it isn't running already.
+
+        Must be called with the lock held.
+        """
+        if self._operations and self._timer is None:
+            self._timer = threading.Timer(self.max_delay, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def insert(self, document: dict[str, any], key: Hashable | None = None) -> None:
+        """Buffers a document to insert.
+
+        The document should already have an `_id` if the caller needs to know it.
+
+        Args:
+            document (dict[str, any]): the document to insert
+            key (Hashable | None, optional): a key to look the pending document up by. Defaults to None.
+        """
+        with self._lock:
+            self._add(InsertOne(document))
+            if key is not None:
+                self._documents[key] = document
+            else:
+                self._updated.add(None)
+            full = len(self._operations) >= self.max_size
+        if full:
+            self.flush()
+
+    def update(
+        self,
+        parameters: dict[str, any],
+        updated_vals: dict[str, any],
+        key: Hashable | None = None,
+        upsert: bool = False,
+    ) -> None:
+        """Buffers an update for a single document.
+
+        Args:
+            parameters (dict[str, any]): the parameters to match the document on
+            updated_vals (dict[str, any]): the update parameters
+            key (Hashable | None, optional): the key of the document being updated. Defaults to None.
+            upsert (bool, optional): whether to insert the document if it doesn't exist. Defaults to False.
+        """
+        operation = UpdateOne(parameters, updated_vals, upsert=True) if upsert else UpdateOne(parameters, updated_vals)
+        with self._lock:
+            self._add(operation)
+            self._updated.add(key)
+            full = len(self._operations) >= self.max_size
+        if full:
+            self.flush()
+
+    def has_pending(self, predicate: Callable[[Hashable], bool]) -> bool:
+        """Checks whether any of the buffered operations could match a read.
+
+        Lets readers only flush the buffer when it has writes they'd see. Operations that were buffered without a key
+        could match anything.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): whether an operation with the given key could match the read
+
+        Returns:
+            bool: whether there are buffered operations that could match
+        """
+        with self._lock:
+            if None in self._updated:
+                return True
+            return any(predicate(key) for key in self._documents.keys() | self._updated)
+
+    def get_pending_document(self, key: Hashable) -> dict[str, any] | None:
+        """Gets a copy of a pending inserted document if it hasn't got any pending updates.
+
+        Args:
+            key (Hashable): the key the document was buffered with
+
+        Returns:
+            dict[str, any] | None: the document, or None if it isn't pending or has been updated since
+        """
+        with self._lock:
+            if key in self._updated or (document := self._documents.get(key)) is None:
+                return None
+            return dict(document)
+
+    def _take(
+        self,
+    ) -> tuple[list[InsertOne | UpdateOne], dict[Hashable, dict[str, any]], set[Hashable | None]]:
+        """Empties the buffer and stops the flush timer.
+
+        Returns:
+            tuple[list[InsertOne | UpdateOne], dict[Hashable, dict[str, any]], set[Hashable | None]]: the operations,
+                the pending documents and the keys with pending updates that were buffered
+        """
+        with self._lock:
+            taken = self._operations, self._documents, self._updated
+            self._operations = []
+            self._documents = {}
+            self._updated = set()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return taken
+
+    def _requeue(
+        self,
+        operations: list[InsertOne | UpdateOne],
+        documents: dict[Hashable, dict[str, any]],
+        updated: set[Hashable | None],
+        attempted: int | None = None,
+    ) -> None:
+        """Puts operations that failed to write back at the front of the buffer.
+
+        Operations that have failed too many times are dropped and logged so that a bad operation can't stay in the
+        buffer forever.
+
+        Args:
+            operations (list[InsertOne | UpdateOne]): the operations that weren't written, in order
+            documents (dict[Hashable, dict[str, any]]): the pending documents that were taken with them
+            updated (set[Hashable | None]): the keys with pending updates that were taken with them
+            attempted (int | None, optional): the number of operations from the front that were tried and failed;
+                the rest weren't tried at all. Defaults to all of them.
+        """
+        retry = []
+        with self._lock:
+            for num, operation in enumerate(operations):
+                if attempted is not None and num >= attempted:
+                    retry.append(operation)
+                    continue
+                attempts = self._failures.get(id(operation), 0) + 1
+                if attempts >= self.max_attempts:
+                    self._failures.pop(id(operation), None)
+                    self.logger.error("Dropping %s after %s failed writes", operation, attempts)
+                    continue
+                self._failures[id(operation)] = attempts
+                retry.append(operation)
+            # anything buffered since goes after the operations we're retrying
+            self._operations[:0] = retry
+            self._documents = {**documents, **self._documents}
+            self._updated |= updated
+            self._start_timer()
+
+    def _forget(self, operations: list[InsertOne | UpdateOne]) -> None:
+        """Forgets the failed attempts of operations that have been written or dropped.
+
+        Args:
+            operations (list[InsertOne | UpdateOne]): the operations
+        """
+        if self._failures:
+            with self._lock:
+                for operation in operations:
+                    self._failures.pop(id(operation), None)
+
+    def clear(self) -> list[InsertOne | UpdateOne]:
+        """Empties the buffer without writing anything and stops the flush timer.
+
+        Returns:
+            list[InsertOne | UpdateOne]: the operations that were buffered
+        """
+        operations, _, _ = self._take()
+        self._forget(operations)
+        return operations
+
+    def flush(self) -> BulkWriteResult | None:
+        """Writes all the buffered operations in a single ordered bulk write.
+
+        The write is ordered so that the operations are applied in the order they were made (eg: a reaction being
+        added and then removed). If an insert fails because the document has already been inserted, the rest of the
+        operations are written after it. Otherwise, the failed operation and everything after it are put back in the
+        buffer.
+
+        Returns once all the operations buffered before the call have been written, or have failed and been put
+        back in the buffer.
+
+        Returns:
+            BulkWriteResult | None: the result of the last bulk write, or None if there was nothing to write
+
+        Raises:
+            PyMongoError: if any of the operations failed to write
+        """
+        with self._flush_lock:
+            operations, documents, updated = self._take()
+            result = None
+            while operations:
+                try:
+                    result = interface.bulk_write(self.collection, operations, ordered=True)
+                except BulkWriteError as exc:
+                    errors = exc.details.get("writeErrors", [])
+                    if exc.details.get("writeConcernErrors") or not errors:
+                        # can't tell which operations weren't acknowledged
+                        self._requeue(operations, documents, updated)
+                        raise
+                    # nothing after the first error was written
+                    error = min(errors, key=operator.itemgetter("index"))
+                    index = error["index"]
+                    if error["code"] == _DUPLICATE_KEY:
+                        self._forget(operations[: index + 1])
+                        operations = operations[index + 1 :]
+                        continue
+                    self._forget(operations[:index])
+                    self._requeue(operations[index:], documents, updated, attempted=1)
+                    raise
+                except PyMongoError:
+                    # eg: the connection failed or timed out, so we don't know what was written
+                    self._requeue(operations, documents, updated)
+                    raise
+                self._forget(operations)
+                break
+            return result
+
+    def _flush_from_timer(self) -> None:
+        """Flushes the buffer from the flush timer's thread, logging any errors as there's no caller to raise to."""
+        try:
+            self.flush()
+        except Exception:
+            self.logger.exception("Failed to flush the buffered writes for %s", self.collection)
+
+
+def get_write_buffer(name: str, collection: Collection) -> WriteBuffer:
+    """Gets the shared write buffer for the given collection, creating it if it doesn't exist yet.
+
+    Args:
+        name (str): the name of the collection
+        collection (Collection): the collection object to write to
+
+    Returns:
+        WriteBuffer: the write buffer
+    """
+    with _BUFFERS_LOCK:
+        if (buffer := _BUFFERS.get(name)) is None:
+            buffer = _BUFFERS[name] = WriteBuffer(collection)
+        return buffer
+
+
+def flush_write_buffers() -> None:
+    """Flushes all the write buffers.
+
+    Called on shutdown to make sure no buffered writes are lost.
+    """
+    with _BUFFERS_LOCK:
+        buffers = list(_BUFFERS.values())
+    for buffer in buffers:
+        try:
+            buffer.flush()
+        except PyMongoError:
+            buffer.logger.exception("Failed to flush the buffered writes for %s", buffer.collection)
+
+
+atexit.register(flush_write_buffers)
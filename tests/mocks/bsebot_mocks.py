@@ -27,6 +27,12 @@ class BSEBotMock:
     def add_view(self, *args, **kwargs) -> None:
         """Mock for adding a view."""
 
+    def add_listener(self, *args, **kwargs) -> None:
+        """Mock for adding a listener."""
+
+    def dispatch(self, *args, **kwargs) -> None:
+        """Mock for dispatching an event."""
+
     async def wait_until_ready(self) -> bool:
         """Mocks wait until ready method."""
         return True
@@ -79,6 +79,17 @@ class MockCollection:
         """Mock update_one method."""
         return MockResult(1)
 
+    def find_one_and_update(
+        self,
+        filter: dict[str, any],
+        update: dict[str, any],
+        projection: dict[str, any] | None = None,
+        upsert: bool = False,
+        return_document: bool = False,
+    ):
+        """Mock find_one_and_update method."""
+        return {"key": "value", "return_document": return_document}
+
     def find(
         self,
         params: dict[str, any],
@@ -90,6 +101,14 @@ class MockCollection:
         """Mock find method."""
         return ({"key": f"value{x}"} for x in range(5))
 
+    def aggregate(self, pipeline: list[dict[str, any]], allowDiskUse: bool = False):  # noqa: N803
+        """Mock aggregate method."""
+        return ({"_id": x, "count": 5 - x} for x in range(5))
+
+    def bulk_write(self, requests: list, ordered: bool = False):
+        """Mock bulk_write method."""
+        return MockResult(len(requests))
+
 
 class UserPointsMock:
     """Mock UserPoints class."""
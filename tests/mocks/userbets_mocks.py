@@ -52,9 +52,21 @@ def user_pending_points_query(query: dict) -> list[dict]:
     Returns any bets that match the user so we can mock the counting bit.
     """
     response = interface_mocks.query_mock("userbets", {"guild_id": query["guild_id"]})
-    _user_id = next(iter(query.keys())).split(".")[-1]
+    _user_id = query["users"]
     return [
         UserBets.make_data_class(bet)
         for bet in response
         if str(_user_id) in bet.get("betters", {}) and "betters" in bet
     ]
+
+
+def user_pending_points_aggregate(pipeline: list[dict]) -> list[dict]:
+    """Mocks our pending points aggregation.
+
+    Sums the points of the pending bets that match the user.
+    """
+    query = pipeline[0]["$match"]
+    bets = [bet for bet in user_pending_points_query(query) if bet.result is None]
+    if not bets:
+        return []
+    return [{"_id": None, "pending": sum(bet.betters[str(query["users"])].points for bet in bets)}]
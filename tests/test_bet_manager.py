@@ -6,6 +6,8 @@ from unittest.mock import patch
 import pytest
 
 from discordbot.betmanager import BetManager
+from discordbot.bot_enums import SupporterType, TransactionTypes
+from mongo.bsepoints.guilds import Guilds
 from mongo.bsepoints.points import UserPoints
 from mongo.datatypes.bet import BetDB
 from tests.mocks import bet_manager_mocks, interface_mocks
@@ -77,18 +79,28 @@ class TestBetManager:
     ) -> None:
         """Tests our '_calculate_taxed_winnings'."""
         bet_manager = BetManager()
-        _user = interface_mocks.mock_user(supporter_type=supporter_type)
-        user = UserPoints.make_data_class(_user)
-        with patch.object(bet_manager.user_points, "find_user", return_value=user):
-            result = bet_manager._calculate_taxed_winnings(user.uid, user.guild_id, tax, actual_won, points_won)
+        supporter = supporter_type == SupporterType.SUPPORTER
+        result = bet_manager._calculate_taxed_winnings(supporter, tax, actual_won, points_won)
         assert isinstance(result, tuple)
         assert result == expected
 
-    def test_process_bet_winner(self) -> None:
-        """Tests our _process_bet_winner."""
+    def test_get_supporters(self) -> None:
+        """Tests our '_get_supporters' looks up all the users at once."""
         bet_manager = BetManager()
-        with patch.object(bet_manager.user_points, "increment_points", new=lambda *args, **kwargs: None):  # noqa: ARG005
-            bet_manager._process_bet_winner("123", 123, "456", 100)
+        users = [
+            UserPoints.make_data_class(interface_mocks.mock_user(uid=123, supporter_type=SupporterType.SUPPORTER)),
+            UserPoints.make_data_class(interface_mocks.mock_user(uid=456)),
+        ]
+        with patch.object(bet_manager.user_points, "query", return_value=users) as query_mock:
+            assert bet_manager._get_supporters(654321, [123, 456]) == {123}
+        assert query_mock.call_args.args[0] == {"guild_id": 654321, "uid": {"$in": [123, 456]}}
+
+    def test_get_supporters_empty(self) -> None:
+        """Tests our '_get_supporters' with no users."""
+        bet_manager = BetManager()
+        with patch.object(bet_manager.user_points, "query") as query_mock:
+            assert bet_manager._get_supporters(654321, []) == set()
+        query_mock.assert_not_called()
 
     @pytest.mark.parametrize(
         "test_bet",
@@ -101,22 +113,16 @@ class TestBetManager:
         """Tests our 'close_a_bet'."""
         bet_manager = BetManager()
 
-        _user = interface_mocks.mock_user(supporter_type=0 if int(test_bet.guild_id) < 900 else 1)
-        user = UserPoints.make_data_class(_user)
+        guild = Guilds.make_data_class({**interface_mocks.mock_guild(guild_id=test_bet.guild_id), "king": 567})
 
         # SO MANY MOCKS
         with (
             patch.object(bet_manager.user_bets, "get_bet_from_id", new=lambda _g, _b: test_bet),  # noqa: ARG005
-            patch.object(bet_manager.user_bets, "close_a_bet", new=lambda _b, _e: None),  # noqa: ARG005
+            patch.object(bet_manager.user_bets, "close_a_bet") as close_mock,
             patch.object(bet_manager.guilds, "get_tax_rate", new=lambda _g: (0.2, 0.1)),  # noqa: ARG005
-            patch.object(bet_manager.user_points, "increment_points", new=lambda *args, **kwargs: None),  # noqa: ARG005
-            patch.object(
-                bet_manager.user_points,
-                "find_user",
-                return_value=user,
-            ),
-            patch.object(bet_manager.guilds, "get_king", new=lambda _g: 567),  # noqa: ARG005
-            patch.object(bet_manager.user_bets, "update", new=lambda _b, _e: None),  # noqa: ARG005
+            patch.object(bet_manager.guilds, "get_guild", return_value=guild),
+            patch.object(bet_manager, "_get_supporters", return_value={789}),
+            patch.object(bet_manager.user_points, "increment_points_by_type") as increment_mock,
         ):
             result = bet_manager.close_a_bet("123", 456, [":one:"])
             assert isinstance(result, dict)
@@ -125,3 +131,29 @@ class TestBetManager:
             assert isinstance(result["timestamp"], datetime.datetime)
             assert isinstance(result["losers"], dict)
             assert isinstance(result["winners"], dict)
+            assert result["king"] == 567
+
+        # the winnings are recorded when closing the bet
+        close_mock.assert_called_once_with(test_bet._id, [":one:"], result["winners"])
+        # and everyone gets their eddies at once
+        increment_mock.assert_called_once()
+        amounts = increment_mock.call_args.args[1]
+        assert amounts[TransactionTypes.BET_WIN] == {int(b): amount for b, amount in result["winners"].items()}
+        assert amounts[TransactionTypes.BET_TAX] == {567: result["king_tax"]}
+        assert increment_mock.call_args.kwargs == {"bet_id": "123"}
+
+    def test_close_a_bet_no_king(self) -> None:
+        """Tests our 'close_a_bet' when there isn't a King to give the tax to."""
+        bet_manager = BetManager()
+        test_bet = bet_manager_mocks.get_bet_dict(0)
+        with (
+            patch.object(bet_manager.user_bets, "get_bet_from_id", return_value=test_bet),
+            patch.object(bet_manager.user_bets, "close_a_bet"),
+            patch.object(bet_manager.guilds, "get_tax_rate", return_value=(0.2, 0.1)),
+            patch.object(bet_manager.guilds, "get_guild", return_value=None),
+            patch.object(bet_manager, "_get_supporters", return_value=set()),
+            patch.object(bet_manager.user_points, "increment_points_by_type") as increment_mock,
+        ):
+            result = bet_manager.close_a_bet("123", 456, [":one:"])
+        assert result["king"] is None
+        assert TransactionTypes.BET_TAX not in increment_mock.call_args.args[1]
@@ -1,10 +1,11 @@
 """Tests the BSEBot class."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import discord
 import pytest
 
+from discordbot import bsebot as bsebot_module
 from discordbot.bsebot import BSEBot
 from tests.mocks import bsebot_mocks
 
@@ -56,3 +57,12 @@ class TestBSEBot:
         bsebot = BSEBot(self.intents, self.activity)
         channel = await bsebot.fetch_channel(654321)
         assert channel.id == 654321
+
+    @patch.object(discord.Bot, "close", new_callable=AsyncMock)
+    async def test_close_flushes_write_buffers(self, close_mock: AsyncMock) -> None:
+        """Tests that closing the bot writes any buffered database writes."""
+        bsebot = BSEBot(self.intents, self.activity)
+        with patch.object(bsebot_module, "flush_write_buffers") as flush_mock:
+            await bsebot.close()
+        close_mock.assert_awaited_once()
+        flush_mock.assert_called_once()
@@ -124,5 +124,5 @@ class TestOnMessageEdit:
             ["message"],
         )
 
-        with mock.patch.object(event.interactions, "get_message", return_val=message_db):
+        with mock.patch.object(event.interactions, "get_message", return_value=message_db):
             await event.message_edit(before, after)
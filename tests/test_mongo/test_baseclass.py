@@ -1,9 +1,14 @@
 """Tests our baseclass.py module."""
 
+from unittest import mock
+
 import pytest
-from pymongo import MongoClient
+from pymongo import ASCENDING, IndexModel, InsertOne, MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
 
+from mongo import interface
 from mongo.baseclass import BaseClass, IncorrectDocumentError, NoVaultError
+from tests.mocks import interface_mocks
 
 
 class TestBaseClass:
@@ -77,3 +82,232 @@ class TestBaseClass:
         base_cls = BaseClass()
         with pytest.raises(IncorrectDocumentError, match=r"Not all documents in the list are dictionaries\."):
             base_cls.insert(doc)
+
+    def test_paginated_query(self) -> None:
+        """Tests BaseClass paginated_query pages on the _id instead of skipping."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls.make_data_class = lambda doc: doc
+        pages = [[{"_id": 1}, {"_id": 2}], [{"_id": 3}, {"_id": 4}], [{"_id": 5}]]
+        with mock.patch.object(interface, "query", side_effect=pages) as query_mock:
+            results = base_cls.paginated_query({"key": "value"}, limit=2)
+        assert results == [{"_id": num} for num in range(1, 6)]
+        assert query_mock.call_count == 3
+        first_call, second_call, third_call = query_mock.call_args_list
+        assert first_call.args[1] == {"key": "value"}
+        assert second_call.args[1] == {"$and": [{"key": "value"}, {"_id": {"$gt": 2}}]}
+        assert third_call.args[1] == {"$and": [{"key": "value"}, {"_id": {"$gt": 4}}]}
+        assert all(call.kwargs["skip"] == 0 for call in query_mock.call_args_list)
+        assert all(call.kwargs["sort"] == [("_id", 1)] for call in query_mock.call_args_list)
+
+    def test_paginated_query_sort_key(self) -> None:
+        """Tests BaseClass paginated_query pages on the sort key and breaks ties on the _id."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls.make_data_class = lambda doc: doc
+        pages = [[{"_id": 1, "timestamp": 10}, {"_id": 2, "timestamp": 20}], []]
+        with mock.patch.object(interface, "query", side_effect=pages) as query_mock:
+            results = base_cls.paginated_query({"key": "value"}, limit=2, skip=5, sort_key="timestamp")
+        assert len(results) == 2
+        first_call, second_call = query_mock.call_args_list
+        assert first_call.kwargs["skip"] == 5
+        assert first_call.kwargs["sort"] == [("timestamp", 1), ("_id", 1)]
+        assert second_call.kwargs["skip"] == 0
+        assert second_call.args[1] == {
+            "$and": [
+                {"key": "value"},
+                {"$or": [{"timestamp": {"$gt": 20}}, {"timestamp": 20, "_id": {"$gt": 2}}]},
+            ],
+        }
+
+    def test_paginated_query_as_gen(self) -> None:
+        """Tests BaseClass paginated_query lazily queries for pages when returning a generator."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls.make_data_class = lambda doc: doc
+        pages = [[{"_id": 1}, {"_id": 2}], [{"_id": 3}]]
+        with mock.patch.object(interface, "query", side_effect=pages) as query_mock:
+            results = base_cls.paginated_query({"key": "value"}, limit=2, as_gen=True)
+            assert query_mock.call_count == 0
+            assert next(results) == {"_id": 1}
+            assert query_mock.call_count == 1
+            assert [doc["_id"] for doc in results] == [2, 3]
+            assert query_mock.call_count == 2
+
+    def test_aggregate(self) -> None:
+        """Tests BaseClass aggregate method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        pipeline = [{"$group": {"_id": "$key", "count": {"$sum": 1}}}]
+        with mock.patch.object(interface, "aggregate", return_value=[{"_id": "value", "count": 1}]) as aggregate_mock:
+            results = base_cls.aggregate(pipeline)
+        assert results == [{"_id": "value", "count": 1}]
+        aggregate_mock.assert_called_once_with("vault", pipeline, False, False)
+
+    async def test_async_aggregate(self) -> None:
+        """Tests BaseClass async_aggregate method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with mock.patch.object(interface, "aggregate", return_value=[{"_id": "value", "count": 1}]) as aggregate_mock:
+            results = await base_cls.async_aggregate([{"$match": {"key": "value"}}])
+        assert results == [{"_id": "value", "count": 1}]
+        # should never ask for a cursor from the executor
+        assert aggregate_mock.call_args.args[2] is False
+
+    def test_cached_no_cache(self) -> None:
+        """Tests BaseClass cached calls the loader when caching isn't enabled."""
+        base_cls = BaseClass()
+        assert base_cls.cache is None
+        assert base_cls.cached(("key",), lambda: "value") == "value"
+        assert base_cls.cached(("key",), lambda: "other value") == "other value"
+        base_cls.invalidate_cache()
+
+    def test_cached(self) -> None:
+        """Tests BaseClass cached lookups are invalidated by writes."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls._CACHE_NAME = "test"
+        assert base_cls.cached(("key",), lambda: "value") == "value"
+        assert base_cls.cached(("key",), lambda: "other value") == "value"
+        with mock.patch.object(interface, "update", return_value=None):
+            base_cls.update({"key": "value"}, {"$set": {"key": "other value"}})
+        assert base_cls.cached(("key",), lambda: "other value") == "other value"
+
+    def test_bulk_write(self) -> None:
+        """Tests BaseClass bulk_write method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        requests = [InsertOne({"key": "value"}), UpdateOne({"key": "value"}, {"$inc": {"count": 1}})]
+        with mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock:
+            assert base_cls.bulk_write(requests) == "result"
+        bulk_write_mock.assert_called_once_with("vault", requests, False)
+
+    def test_find_one_and_update(self) -> None:
+        """Tests BaseClass find_one_and_update method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with (
+            mock.patch.object(interface, "find_one_and_update", return_value={"key": "value"}) as update_mock,
+            mock.patch.object(base_cls, "make_data_class", return_value="dataclass"),
+            mock.patch.object(base_cls, "invalidate_cache") as invalidate_mock,
+        ):
+            assert base_cls.find_one_and_update({"key": "value"}, {"$set": {"key": 123}}) == "dataclass"
+            assert base_cls.find_one_and_update({"key": "value"}, {"$set": {"key": 123}}, convert=False) == {
+                "key": "value"
+            }
+        update_mock.assert_called_with("vault", {"key": "value"}, {"$set": {"key": 123}}, None, False, True)
+        assert invalidate_mock.call_count == 2
+
+    def test_find_one_and_update_no_match(self) -> None:
+        """Tests BaseClass find_one_and_update method when nothing matches."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with mock.patch.object(interface, "find_one_and_update", return_value=None):
+            assert base_cls.find_one_and_update({"key": "value"}, {"$set": {"key": 123}}) is None
+
+    async def test_async_find_one_and_update(self) -> None:
+        """Tests BaseClass async_find_one_and_update method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with mock.patch.object(interface, "find_one_and_update", return_value={"key": "value"}):
+            result = await base_cls.async_find_one_and_update({"key": "value"}, {"$set": {"key": 123}}, convert=False)
+        assert result == {"key": "value"}
+
+    def test_bulk_write_empty(self) -> None:
+        """Tests BaseClass bulk_write method with no requests."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert base_cls.bulk_write([]) is None
+        bulk_write_mock.assert_not_called()
+
+    async def test_async_bulk_write(self) -> None:
+        """Tests BaseClass async_bulk_write method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        requests = [InsertOne({"key": "value"})]
+        with mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock:
+            assert await base_cls.async_bulk_write(requests, ordered=True) == "result"
+        bulk_write_mock.assert_called_once_with("vault", requests, True)
+
+    def test_ensure_indexes(self) -> None:
+        """Tests BaseClass ensure_indexes creates each index separately and returns the errors."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls._INDEXES = (IndexModel([("key", ASCENDING)]), IndexModel([("other", ASCENDING)]))
+        with mock.patch.object(
+            interface, "create_indexes", side_effect=[["key_1"], OperationFailure("conflict")]
+        ) as create_mock:
+            assert base_cls.ensure_indexes() == {"other_1": "conflict"}
+        assert create_mock.call_count == 2
+
+    def test_ensure_indexes_none(self) -> None:
+        """Tests BaseClass ensure_indexes with no declared indexes."""
+        base_cls = BaseClass()
+        with mock.patch.object(interface, "create_indexes") as create_mock:
+            assert base_cls.ensure_indexes() == {}
+        create_mock.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("plan", "expected"),
+        [
+            ({"stage": "COLLSCAN"}, True),
+            ({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}, False),
+            ({"stage": "FETCH", "inputStage": {"stage": "COLLSCAN"}}, True),
+            ({"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}, True),
+            ({}, False),
+        ],
+    )
+    def test_has_stage(self, plan: dict, expected: bool) -> None:
+        """Tests BaseClass _has_stage method."""
+        assert BaseClass._has_stage(plan, "COLLSCAN") is expected
+
+    def test_find_collection_scans(self) -> None:
+        """Tests BaseClass find_collection_scans returns the shapes that scan the collection."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        base_cls._QUERY_SHAPES = ({"indexed": 1}, {"unindexed": 1}, {"$text": {"$search": "text"}})
+        plans = [
+            {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}},
+            {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}},
+            OperationFailure("text index required for $text query"),
+        ]
+        with mock.patch.object(interface, "explain", side_effect=plans):
+            assert base_cls.find_collection_scans() == [{"unindexed": 1}, {"$text": {"$search": "text"}}]
+
+    async def test_run_async(self) -> None:
+        """Tests BaseClass run_async method runs the function in the executor."""
+        base_cls = BaseClass()
+        result = await base_cls.run_async(lambda x, y=1: x + y, 1, y=2)
+        assert result == 3
+
+    @mock.patch.object(interface, "insert", new=interface_mocks.insert_mock)
+    async def test_async_insert(self) -> None:
+        """Tests BaseClass async_insert method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        result = await base_cls.async_insert({"key": "value"})
+        assert isinstance(result, list)
+
+    async def test_async_insert_incorrect_document(self) -> None:
+        """Tests BaseClass async_insert raises exceptions from the executor."""
+        base_cls = BaseClass()
+        with pytest.raises(IncorrectDocumentError, match=r"Given document isn't a dictionary or a list\."):
+            await base_cls.async_insert(None)
+
+    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
+    async def test_async_update(self) -> None:
+        """Tests BaseClass async_update method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        await base_cls.async_update({"key": "value"}, {"$set": {"key": 123}})
+
+    async def test_async_query(self) -> None:
+        """Tests BaseClass async_query method."""
+        base_cls = BaseClass()
+        base_cls._vault = "vault"
+        with mock.patch.object(interface, "query", return_value=[{"key": "value"}]) as query_mock:
+            results = await base_cls.async_query({"key": "value"}, convert=False)
+        assert results == [{"key": "value"}]
+        # should never ask for a cursor from the executor
+        assert query_mock.call_args.args[4] is False
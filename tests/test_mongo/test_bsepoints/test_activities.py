@@ -47,6 +47,18 @@ class TestUserActivities:
         activities = UserActivities()
         activities.add_activity(123, 456, ActivityTypes.BSEDDIES_VIEW, extra="some extra data")
 
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_activities_add_activities(self) -> None:
+        """Tests UserActivities add_activities."""
+        activities = UserActivities()
+        with mock.patch.object(interface, "insert", return_value=[1, 2]) as insert_mock:
+            assert activities.add_activities([123, 456], 789, ActivityTypes.SERVER_JOIN) == [1, 2]
+            assert activities.add_activities([], 789, ActivityTypes.SERVER_JOIN) == []
+        docs = insert_mock.call_args.args[1]
+        assert [doc["uid"] for doc in docs] == [123, 456]
+        insert_mock.assert_called_once()
+
     @pytest.mark.parametrize("guild_id", sorted({entry["guild_id"] for entry in _get_activity_data()}))
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
@@ -80,3 +92,56 @@ class TestUserActivities:
         for act in all_activities:
             assert isinstance(act, ActivityDB)
             assert act.guild_id == guild_id
+
+
+class TestUserActivitiesStreaming:
+    """Tests our UserActivities streaming methods."""
+
+    @staticmethod
+    def _make_activity(uid: int, activity_type: ActivityTypes) -> ActivityDB:
+        """Creates an activity."""
+        return ActivityDB(_id=uid, guild_id=123, uid=uid, type=activity_type, timestamp=datetime.datetime.now())
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_activities_stream_guild_activities(self) -> None:
+        """Tests UserActivities stream_guild_activities filters in the database and pages by timestamp."""
+        activities = UserActivities()
+        start = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+        with mock.patch.object(activities, "paginated_query", return_value=iter([])) as query_mock:
+            assert not list(
+                activities.stream_guild_activities(
+                    123, start, user_id=1, activity_types=(ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS)
+                )
+            )
+        query_mock.assert_called_once_with(
+            {
+                "guild_id": 123,
+                "timestamp": {"$gt": start},
+                "uid": 1,
+                "type": {"$in": [ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS]},
+            },
+            as_gen=True,
+            sort_key="timestamp",
+        )
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_activities_get_all_guild_activities_uncapped(self) -> None:
+        """Tests UserActivities get_all_guild_activities returns every activity."""
+        activities = UserActivities()
+        streamed = [self._make_activity(num, ActivityTypes.HELP) for num in range(10001)]
+        with mock.patch.object(activities, "paginated_query", return_value=iter(streamed)):
+            assert activities.get_all_guild_activities(123) == streamed
+
+    def test_activities_count_by_type(self) -> None:
+        """Tests UserActivities count_by_type."""
+        activities = [
+            self._make_activity(1, ActivityTypes.HELP),
+            self._make_activity(2, ActivityTypes.KING_GAIN),
+            self._make_activity(3, ActivityTypes.KING_GAIN),
+        ]
+        assert list(UserActivities.count_by_type(iter(activities)).items()) == [
+            (ActivityTypes.KING_GAIN, 2),
+            (ActivityTypes.HELP, 1),
+        ]
@@ -1,5 +1,6 @@
 """Tests our UserBets class."""
 
+import datetime
 import operator
 from unittest import mock
 
@@ -24,6 +25,27 @@ def _get_bet_data(number: int | None = None) -> list[dict[str, any]]:
     return BET_CACHE[-number:]
 
 
+def _make_bet(active: bool = True) -> BetDB:
+    """Creates a bet."""
+    return UserBets.make_data_class({
+        "_id": ObjectId(),
+        "guild_id": 123,
+        "bet_id": "0001",
+        "user": 456,
+        "title": "some title",
+        "options": ["1️⃣", "2️⃣"],
+        "created": datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+        "timeout": datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC),
+        "active": active,
+        "result": None,
+        "users": [789],
+        "betters": {},
+        "option_dict": {},
+        "channel_id": 1,
+        "message_id": 2,
+    })
+
+
 @pytest.mark.xfail
 class TestUserBets:
     """Tests our UserBets class."""
@@ -53,17 +75,6 @@ class TestUserBets:
         with mock.patch.object(user_bets, "query", return_value=query):
             user_bets.create_counter_document(123456)
 
-    @pytest.mark.parametrize(("guild_id", "exp"), [(724395292912255056, "0581")])
-    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
-    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
-    def test_user_bets_get_new_bet_id(self, guild_id: int, exp: str) -> None:
-        """Tests UserBets _get_new_bet_id method."""
-        user_bets = UserBets()
-        count = user_bets._get_new_bet_id(guild_id)
-        assert count == exp
-
     @pytest.mark.parametrize(("bet", "exp"), userbets_mocks.user_bets_count_data())
     def test_count_eddies_for_bet(self, bet: BetDB, exp: int) -> None:
         """Tests UserBets count_eddies method."""
@@ -134,10 +145,22 @@ class TestUserBets:
     def test_user_bets_get_user_pending_points(self, guild_id: int, user_id: int) -> None:
         """Tests UserBets get_user_pending_points method."""
         user_bets = UserBets()
-        with mock.patch.object(user_bets, "query", new=userbets_mocks.user_pending_points_query):
+        with mock.patch.object(user_bets, "aggregate", new=userbets_mocks.user_pending_points_aggregate):
             points = user_bets.get_user_pending_points(user_id, guild_id)
         assert isinstance(points, int)
 
+    @pytest.mark.parametrize(("results", "exp"), [([{"_id": None, "pending": 150}], 150), ([], 0)])
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_bets_get_user_pending_points_pipeline(self, results: list[dict], exp: int) -> None:
+        """Tests UserBets get_user_pending_points matches on the indexed users and sums in the DB."""
+        user_bets = UserBets()
+        with mock.patch.object(user_bets, "aggregate", return_value=results) as aggregate_mock:
+            assert user_bets.get_user_pending_points(789, 123) == exp
+        match, group = aggregate_mock.call_args.args[0]
+        assert match == {"$match": {"guild_id": 123, "users": 789, "result": None}}
+        assert group["$group"]["pending"] == {"$sum": "$betters.789.points"}
+
     @pytest.mark.parametrize(
         ("guild_id", "user_id"),
         sorted(
@@ -214,112 +237,82 @@ class TestUserBets:
         user_bets = UserBets()
         user_bets.close_a_bet(bet_id, "")
 
-    @pytest.mark.parametrize(
-        "bet",
-        [UserBets.make_data_class(entry) for entry in sorted(_get_bet_data(50), key=operator.itemgetter("_id"))],
-    )
+
+class TestUserBetsPlacement:
+    """Tests placing bets with UserBets."""
+
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
-    def test_user_bets_add_new_better_to_bet(self, bet: BetDB) -> None:
-        """Tests UserBets _add_new_better_to_bet method."""
+    def test_user_bets_get_new_bet_id(self) -> None:
+        """Tests UserBets _get_new_bet_id increments the counter in a single operation."""
         user_bets = UserBets()
-        with mock.patch.object(user_bets.user_points, "increment_points", return_value=None) as inc_patch:
-            if bet.users and bet.betters:
-                user_id = bet.users[0]
-                try:
-                    emoji = bet.betters[str(user_id)].emoji
-                except KeyError:
-                    print(str(user_id))
-                result = user_bets._add_new_better_to_bet(bet, user_id, emoji, 100)
-                assert inc_patch.called
-                assert isinstance(result, dict)
-                assert result["success"]
-
-            result = user_bets._add_new_better_to_bet(bet, 123456, "", 50)
-            assert inc_patch.called
-            assert isinstance(result, dict)
-            assert result["success"]
+        with mock.patch.object(interface, "find_one_and_update", return_value={"count": 581}) as update_mock:
+            assert user_bets._get_new_bet_id(123) == "0581"
+        args = update_mock.call_args.args
+        assert args[1:3] == ({"type": "counter", "guild_id": 123}, {"$inc": {"count": 1}})
+        # should return the count from before the increment
+        assert args[5] is False
 
-    @pytest.mark.parametrize(
-        "bet",
-        [UserBets.make_data_class(entry) for entry in sorted(_get_bet_data(5), key=operator.itemgetter("_id"))],
-    )
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    def test_user_bets_add_new_better_to_bet_no_points(self, bet: BetDB) -> None:
-        """Tests UserBets add_new_better_to_bet method."""
+    def test_user_bets_backfill_users(self) -> None:
+        """Tests UserBets backfill_users only updates the bets whose users don't match their betters."""
         user_bets = UserBets()
-        with mock.patch.object(user_bets.user_points, "get_user_points", return_value=5):
-            user = 123456 if not bet.users else bet.users[0]
-            result = user_bets.add_better_to_bet(bet.bet_id, bet.guild_id, user, "", 50)
-            assert isinstance(result, dict)
-            assert not result["success"]
-            assert result["reason"] == "not enough points"
+        with mock.patch.object(user_bets, "update", return_value=mock.MagicMock(modified_count=3)) as update_mock:
+            assert user_bets.backfill_users() == 3
+        parameters, updated_vals = update_mock.call_args.args
+        assert "$expr" in parameters
+        assert updated_vals == [{"$set": {"users": parameters["$expr"]["$ne"][1]}}]
+        assert update_mock.call_args.kwargs == {"many": True}
 
-    @pytest.mark.parametrize(
-        "bet",
-        [UserBets.make_data_class(entry) for entry in sorted(_get_bet_data(50), key=operator.itemgetter("_id"))],
-    )
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    def test_user_bets_add_new_better_to_bet_not_existing(self, bet: BetDB) -> None:
-        """Tests UserBets add_new_better_to_bet method."""
+    def test_user_bets_add_better_to_bet(self) -> None:
+        """Tests UserBets add_better_to_bet with conditional updates."""
         user_bets = UserBets()
+        bet = _make_bet()
         with (
-            mock.patch.object(user_bets.user_points, "get_user_points", return_value=500),
-            mock.patch.object(user_bets, "_add_new_better_to_bet", return_value={"success": True}),
+            mock.patch.object(user_bets.user_points, "deduct_points", return_value=True) as deduct_mock,
+            mock.patch.object(user_bets, "find_one_and_update", return_value=bet) as update_mock,
+            mock.patch.object(user_bets._trans, "add_transaction") as transaction_mock,
         ):
-            user = 123456
-            result = user_bets.add_better_to_bet(bet.bet_id, bet.guild_id, user, "", 50)
-            assert isinstance(result, dict)
-            assert result["success"]
+            result = user_bets.add_better_to_bet("0001", 123, 789, "1️⃣", 50)
+        assert result == {"success": True, "bet": bet}
+        deduct_mock.assert_called_once_with(789, 123, 50)
+        parameters, update = update_mock.call_args.args
+        assert parameters["active"]
+        assert parameters["$or"] == [{"betters.789": {"$exists": False}}, {"betters.789.emoji": "1️⃣"}]
+        assert update["$inc"] == {"betters.789.points": 50}
+        assert update["$addToSet"] == {"users": 789}
+        assert transaction_mock.call_args.args[3] == -50
 
-    @pytest.mark.parametrize(
-        "bet",
-        [
-            UserBets.make_data_class(entry)
-            for entry in sorted(_get_bet_data(100), key=operator.itemgetter("_id"))
-            if entry.get("betters")
-        ],
-    )
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    def test_user_bets_add_new_better_to_bet_wrong_emoji(self, bet: BetDB) -> None:
-        """Tests UserBets add_new_better_to_bet method."""
+    def test_user_bets_add_better_to_bet_no_points(self) -> None:
+        """Tests UserBets add_better_to_bet when the user doesn't have enough points."""
         user_bets = UserBets()
-        with mock.patch.object(user_bets.user_points, "get_user_points", return_value=500):
-            user = next(iter(bet.betters.keys()))
-            emoji = ""
-            result = user_bets.add_better_to_bet(bet.bet_id, bet.guild_id, user, emoji, 50)
-            assert isinstance(result, dict)
-            assert not result["success"]
-            assert result["reason"] == "wrong option"
+        with (
+            mock.patch.object(user_bets.user_points, "deduct_points", return_value=False),
+            mock.patch.object(user_bets, "find_one_and_update") as update_mock,
+        ):
+            result = user_bets.add_better_to_bet("0001", 123, 789, "1️⃣", 50)
+        assert result == {"success": False, "reason": "not enough points"}
+        update_mock.assert_not_called()
 
-    @pytest.mark.parametrize(
-        "bet",
-        [
-            UserBets.make_data_class(entry)
-            for entry in sorted(_get_bet_data(50), key=operator.itemgetter("_id"))
-            if entry.get("betters")
-        ],
-    )
+    @pytest.mark.parametrize(("bet", "reason"), [(_make_bet(), "wrong option"), (_make_bet(False), "bet is closed")])
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
-    def test_user_bets_add_new_better_to_bet_success(self, bet: BetDB) -> None:
-        """Tests UserBets add_new_better_to_bet method."""
+    def test_user_bets_add_better_to_bet_failed(self, bet: BetDB, reason: str) -> None:
+        """Tests UserBets add_better_to_bet gives back the points when the bet can't be updated."""
         user_bets = UserBets()
         with (
-            mock.patch.object(user_bets.user_points, "get_user_points", return_value=500),
-            mock.patch.object(user_bets.user_points, "increment_points", return_value=None),
+            mock.patch.object(user_bets.user_points, "deduct_points", return_value=True),
+            mock.patch.object(user_bets.user_points, "restore_points") as restore_mock,
+            mock.patch.object(user_bets, "find_one_and_update", return_value=None),
+            mock.patch.object(user_bets, "get_bet_from_id", return_value=bet),
+            mock.patch.object(user_bets._trans, "add_transaction") as transaction_mock,
         ):
-            user = next(iter(bet.betters.keys()))
-            emoji = bet.betters[str(user)].emoji
-            result = user_bets.add_better_to_bet(bet.bet_id, bet.guild_id, user, emoji, 50)
-            assert isinstance(result, dict)
-            assert result["success"]
+            result = user_bets.add_better_to_bet("0001", 123, 789, "2️⃣", 50)
+        assert result == {"success": False, "reason": reason}
+        restore_mock.assert_called_once_with(789, 123, 50)
+        transaction_mock.assert_not_called()
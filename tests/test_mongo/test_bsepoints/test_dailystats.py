@@ -0,0 +1,247 @@
+"""Tests our DailyStats class."""
+
+import datetime
+from unittest import mock
+
+from bson import ObjectId
+from pymongo import ReplaceOne
+
+from mongo import interface
+from mongo.bsepoints.dailystats import DailyStats
+from mongo.datatypes.dailystats import DailyStatsDB
+from mongo.datatypes.message import MessageDB, ReplyDB
+from tests.mocks import interface_mocks
+
+TIMESTAMP = datetime.datetime(2024, 1, 15, 12, 30, tzinfo=datetime.UTC)
+DAY = datetime.datetime(2024, 1, 15, tzinfo=datetime.UTC)
+
+
+def _make_message(content: str = "hello", message_type: list[str] | None = None, **kwargs: any) -> MessageDB:
+    """Creates a message to count."""
+    return MessageDB(
+        _id=ObjectId(),
+        guild_id=123,
+        channel_id=321,
+        message_id=kwargs.pop("message_id", 1),
+        user_id=kwargs.pop("user_id", 789),
+        timestamp=kwargs.pop("timestamp", TIMESTAMP),
+        content=content,
+        message_type=message_type or ["message"],
+        **kwargs,
+    )
+
+
+class TestDailyStatsCounters:
+    """Tests our DailyStats counter calculations."""
+
+    def test_message_counters(self) -> None:
+        """Tests DailyStats message_counters with content."""
+        counters = DailyStats.message_counters(["reply", "message"], "oh shit, shit, what the fuck")
+        assert counters == {
+            "messages": 1,
+            "replied": 1,
+            "content_messages": 1,
+            "length": 28,
+            "words": 6,
+            "swears.shit": 2,
+            "swears.fuck": 1,
+        }
+
+    def test_message_counters_no_content(self) -> None:
+        """Tests DailyStats message_counters without any content."""
+        assert DailyStats.message_counters(["message"], "") == {"messages": 1}
+
+    def test_message_counters_wordle(self) -> None:
+        """Tests DailyStats message_counters with wordle messages."""
+        counters = DailyStats.message_counters(["message", "wordle"], "Wordle 1,000 4/6\n\n")
+        assert counters["wordles"] == 1
+        assert counters["wordle_score"] == 4
+        counters = DailyStats.message_counters(["message", "wordle"], "Wordle 1,000 X/6\n\n")
+        assert counters["wordle_score"] == 10
+
+    def test_is_counted(self) -> None:
+        """Tests DailyStats is_counted only counts non bot messages."""
+        assert DailyStats.is_counted(["reply", "message"])
+        assert not DailyStats.is_counted(["message"], is_bot=True)
+        assert not DailyStats.is_counted(["emoji_used"])
+
+
+class TestDailyStatsWrites:
+    """Tests our DailyStats buffered increments."""
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_add_message(self) -> None:
+        """Tests DailyStats add_message buffers an upsert for the day."""
+        daily_stats = DailyStats()
+        daily_stats.add_message(123, 789, 321, ["message"], "shit", TIMESTAMP, is_thread=True)
+        daily_stats.add_message(123, 789, 321, ["message"], "from a bot", TIMESTAMP, is_bot=True)
+        requests = daily_stats.write_buffer.clear()
+        assert len(requests) == 1
+        assert requests[0]._filter == {"guild_id": 123, "day": DAY, "user_id": 789, "channel_id": 321}
+        assert requests[0]._doc == {
+            "$inc": {"messages": 1, "content_messages": 1, "length": 4, "words": 1, "swears.shit": 1},
+            "$min": {"first": TIMESTAMP},
+            "$setOnInsert": {"is_thread": True, "is_vc": False},
+        }
+        assert requests[0]._upsert
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_add_reply(self) -> None:
+        """Tests DailyStats add_reply increments the replies for the message that was replied to."""
+        daily_stats = DailyStats()
+        daily_stats.add_reply(123, 789, 321, TIMESTAMP)
+        requests = daily_stats.write_buffer.clear()
+        assert requests[0]._filter == {"guild_id": 123, "day": DAY, "user_id": 789, "channel_id": 321}
+        assert requests[0]._doc == {"$inc": {"replies_received": 1}}
+        # only counted if the message that was replied to was counted
+        assert not requests[0]._upsert
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_edit_message(self) -> None:
+        """Tests DailyStats edit_message applies the difference between the old and new content."""
+        daily_stats = DailyStats()
+        daily_stats.edit_message(_make_message("fuck this"), ["message"], "fudge this please")
+        requests = daily_stats.write_buffer.clear()
+        assert requests[0]._doc["$inc"] == {"length": 8, "swears.fuck": -1, "words": 1}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_edit_message_no_change(self) -> None:
+        """Tests DailyStats edit_message doesn't write anything when the counters don't change."""
+        daily_stats = DailyStats()
+        daily_stats.edit_message(_make_message("hello"), ["message"], "world")
+        assert not len(daily_stats.write_buffer)
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_rebuild(self) -> None:
+        """Tests DailyStats rebuild replaces the daily documents with the counted messages."""
+        daily_stats = DailyStats()
+        reply = ReplyDB(user_id=1, content="reply", timestamp=TIMESTAMP, message_id=2)
+        messages = [
+            _make_message("shit", replies=[reply]),
+            _make_message("", timestamp=TIMESTAMP - datetime.timedelta(hours=1)),
+            _make_message("bot", is_bot=True),
+            _make_message("another day", timestamp=TIMESTAMP + datetime.timedelta(days=1)),
+        ]
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert daily_stats.rebuild(123, messages) == 2
+        requests = bulk_write_mock.call_args.args[1]
+        assert all(isinstance(request, ReplaceOne) for request in requests)
+        document = requests[0]._doc
+        assert document["day"] == DAY
+        assert document["first"] == TIMESTAMP - datetime.timedelta(hours=1)
+        assert document["messages"] == 2
+        assert document["content_messages"] == 1
+        assert document["replies_received"] == 1
+        assert document["swears"] == {"shit": 1}
+        assert isinstance(DailyStats.make_data_class({"_id": ObjectId(), **document}), DailyStatsDB)
+
+
+class TestDailyStatsAggregations:
+    """Tests our DailyStats aggregation pipeline methods."""
+
+    start = datetime.datetime(2024, 1, 1, 0, 0, 0, 1, tzinfo=datetime.UTC)
+    end = datetime.datetime(2024, 2, 1, 0, 0, 0, 1, tzinfo=datetime.UTC)
+
+    @staticmethod
+    def _group_doc(_id: any, messages: int, **kwargs: any) -> dict[str, any]:
+        """Creates a grouped aggregation document."""
+        doc = {
+            "_id": _id,
+            "messages": messages,
+            "content_messages": messages,
+            "length": 10 * messages,
+            "words": 2 * messages,
+            "replied": 0,
+            "replies_received": 0,
+            "wordles": 0,
+            "wordle_score": 0,
+            "first": TIMESTAMP,
+            "users": [1],
+            "channels": [3],
+            "threads": [],
+            "swear_fuck": 1,
+        }
+        doc.update(kwargs)
+        return doc
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_get_message_totals(self) -> None:
+        """Tests DailyStats get_message_totals method."""
+        daily_stats = DailyStats()
+        docs = [self._group_doc(None, 10, users=[1, 2], threads=[4])]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            totals = daily_stats.get_message_totals(123, self.start, self.end, 1)
+        assert totals["count"] == 10
+        assert totals["length"] == 100
+        assert totals["users"] == [1, 2]
+        assert totals["channels"] == [3, 4]
+        assert totals["swears"]["fuck"] == 1
+        assert totals["swears"]["shit"] == 0
+        pipeline = aggregate_mock.call_args.args[1]
+        # matches whole days
+        assert pipeline[0]["$match"] == {
+            "guild_id": 123,
+            "day": {
+                "$gte": datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+                "$lt": datetime.datetime(2024, 2, 1, tzinfo=datetime.UTC),
+            },
+            "user_id": 1,
+        }
+        assert pipeline[1]["$group"]["_id"] is None
+        assert pipeline[2] == {"$sort": {"messages": -1, "first": 1}}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_get_message_totals_empty(self) -> None:
+        """Tests DailyStats get_message_totals method with no messages."""
+        daily_stats = DailyStats()
+        with mock.patch.object(interface, "aggregate", return_value=[]):
+            totals = daily_stats.get_message_totals(123, self.start, self.end)
+        assert totals["count"] == 0
+        assert totals["users"] == []
+        assert not any(totals["swears"].values())
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_get_message_counts_by_channel(self) -> None:
+        """Tests DailyStats get_message_counts_by_channel method."""
+        daily_stats = DailyStats()
+        with mock.patch.object(interface, "aggregate", return_value=[self._group_doc(3, 10)]) as aggregate_mock:
+            counts = daily_stats.get_message_counts_by_channel(123, self.start, self.end)
+        assert counts[0]["_id"] == 3
+        assert counts[0]["count"] == 10
+        pipeline = aggregate_mock.call_args.args[1]
+        assert pipeline[0]["$match"]["is_thread"] == {"$ne": True}
+        assert pipeline[0]["$match"]["is_vc"] == {"$ne": True}
+        assert pipeline[1]["$group"]["_id"] == "$channel_id"
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_get_message_counts_by_day(self) -> None:
+        """Tests DailyStats get_message_counts_by_day method converts the dates."""
+        daily_stats = DailyStats()
+        with mock.patch.object(interface, "aggregate", return_value=[self._group_doc(DAY, 10, threads=[4])]):
+            counts = daily_stats.get_message_counts_by_day(123, self.start, self.end)
+        assert counts[0]["_id"] == datetime.date(2024, 1, 15)
+        assert counts[0]["channels"] == [3, 4]
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_aggregate_flushes(self) -> None:
+        """Tests DailyStats reads apply the buffered increments first."""
+        daily_stats = DailyStats()
+        daily_stats.add_message(123, 789, 321, ["message"], "hello", TIMESTAMP)
+        manager = mock.Mock()
+        manager.aggregate.return_value = []
+        with (
+            mock.patch.object(interface, "bulk_write", new=manager.bulk_write),
+            mock.patch.object(interface, "aggregate", new=manager.aggregate),
+        ):
+            daily_stats.get_message_counts_by_user(123, self.start, self.end)
+        assert [call[0] for call in manager.mock_calls] == ["bulk_write", "aggregate"]
@@ -4,6 +4,7 @@ import datetime
 from unittest import mock
 
 import pytest
+from bson import ObjectId
 
 from mongo import interface
 from mongo.bsepoints.emojis import ServerEmojis
@@ -97,3 +98,33 @@ class TestServerEmojis:
         for emoji in all_emojis:
             assert isinstance(emoji, EmojiDB)
             assert emoji.guild_id == guild_id
+
+
+class TestServerEmojisCache:
+    """Tests our ServerEmojis cached lookups."""
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_emojis_get_emoji_cached(self) -> None:
+        """Tests ServerEmojis get_emoji is cached across instances and invalidated by inserts."""
+        doc = {
+            "_id": ObjectId(),
+            "eid": 123,
+            "name": "emoji",
+            "created": datetime.datetime.now(),
+            "created_by": 456,
+            "guild_id": 789,
+        }
+        with mock.patch.object(interface, "query", return_value=[doc]) as query_mock:
+            emoji = ServerEmojis().get_emoji(789, 123)
+            assert ServerEmojis().get_emoji(789, 123) is emoji
+            assert query_mock.call_count == 1
+
+            with mock.patch.object(interface, "insert", new=interface_mocks.insert_mock):
+                ServerEmojis().insert_emoji(321, "name", datetime.datetime.now(), 456, 789)
+            assert ServerEmojis().get_emoji(789, 123) == emoji
+            assert query_mock.call_count == 2
+
+        stats = ServerEmojis().cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
@@ -5,6 +5,7 @@ from unittest import mock
 from zoneinfo import ZoneInfo
 
 import pytest
+from bson import ObjectId
 
 from mongo import interface
 from mongo.bsepoints.guilds import Guilds
@@ -338,3 +339,32 @@ class TestGuilds:
         """Tests Guilds set_last_rigged_time."""
         guilds = Guilds()
         guilds.set_last_rigged_time(123456)
+
+
+class TestGuildsCache:
+    """Tests our Guilds cached lookups."""
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_guilds_config_cached(self) -> None:
+        """Tests Guilds config lookups share the cached guild and are invalidated by setters."""
+        doc = {
+            "_id": ObjectId(),
+            "guild_id": 123,
+            "name": "guild",
+            "owner_id": 456,
+            "daily_minimum": 4,
+            "tax_rate": 0.2,
+            "supporter_tax_rate": 0.05,
+        }
+        guilds = Guilds()
+        with mock.patch.object(interface, "query", return_value=[doc]) as query_mock:
+            assert guilds.get_guild(123).name == "guild"
+            assert guilds.get_daily_minimum(123) == 4
+            assert guilds.get_tax_rate(123) == (0.2, 0.05)
+            assert query_mock.call_count == 1
+
+            with mock.patch.object(interface, "update", new=interface_mocks.update_mock):
+                guilds.set_daily_minimum(123, 5)
+            guilds.get_daily_minimum(123)
+            assert query_mock.call_count == 2
@@ -4,6 +4,8 @@ import datetime
 from unittest import mock
 
 import pytest
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
 
 from mongo import interface
 from mongo.bsepoints.interactions import UserInteractions
@@ -73,6 +75,20 @@ class TestUserInteractions:
         for message in messages:
             assert isinstance(message, MessageDB | VCInteractionDB)
 
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_ids(self) -> None:
+        """Tests UserInteractions get_message_ids only fetches the IDs of the messages within the window."""
+        user_interactions = UserInteractions()
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        end = datetime.datetime(2024, 1, 8, tzinfo=datetime.UTC)
+        results = [{"message_id": 1}, {"message_id": 2}, {}]
+        with mock.patch.object(interface, "query", return_value=iter(results)) as query_mock:
+            assert user_interactions.get_message_ids(123, 456, start, end) == {1, 2}
+        args = query_mock.call_args.args
+        assert args[1] == {"guild_id": 123, "channel_id": 456, "timestamp": {"$gte": start, "$lte": end}}
+        assert args[3] == {"message_id": True, "_id": False}
+
     @pytest.mark.parametrize(
         ("guild_id", "message_id"),
         [
@@ -163,7 +179,7 @@ class TestUserInteractions:
         """Tests UserInteractions add_reply_to_message method."""
         user_interactions = UserInteractions()
         reply = user_interactions.add_reply_to_message(
-            123456, 654321, 123654, 654123, datetime.datetime.now(), "content"
+            123456, 654321, 123654, 654123, datetime.datetime.now(), "content", 987654, 321, datetime.datetime.now()
         )
         assert isinstance(reply, ReplyDB)
 
@@ -178,8 +194,8 @@ class TestUserInteractions:
             654321,
             123654,
             654123,
-            datetime.datetime.now(),
             ":rey:",
+            datetime.datetime.now(),
             987654,
         )
         assert isinstance(reply, ReactionDB)
@@ -195,7 +211,179 @@ class TestUserInteractions:
             654321,
             123654,
             654123,
-            datetime.datetime.now(),
             ":rey:",
+            datetime.datetime.now(),
             987654,
         )
+
+
+class TestUserInteractionsBufferedWrites:
+    """Tests our UserInteractions buffered writes."""
+
+    timestamp = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_add_entry_is_buffered(self) -> None:
+        """Tests UserInteractions add_entry buffers the insert and reads it back from the buffer."""
+        user_interactions = UserInteractions()
+        with mock.patch.object(interface, "insert") as insert_mock, mock.patch.object(interface, "query") as query_mock:
+            inserted = user_interactions.add_entry(123, 456, 789, 321, ["message"], "content", self.timestamp)
+            message = user_interactions.get_message(456, 123)
+        insert_mock.assert_not_called()
+        query_mock.assert_not_called()
+        assert message == inserted
+        assert isinstance(inserted._id, ObjectId)
+        assert len(user_interactions.write_buffer) == 1
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_flushes_updates(self) -> None:
+        """Tests UserInteractions get_message writes pending updates before querying."""
+        user_interactions = UserInteractions()
+        user_interactions.add_entry(123, 456, 789, 321, ["message"], "content", self.timestamp)
+        user_interactions.add_reply_to_message(123, 124, 456, 987, self.timestamp, "reply", 789, 321, self.timestamp)
+        with (
+            mock.patch.object(interface, "bulk_write") as bulk_write_mock,
+            mock.patch.object(interface, "query", return_value=[]) as query_mock,
+        ):
+            assert user_interactions.get_message(456, 123) is None
+        requests = bulk_write_mock.call_args.args[1]
+        assert isinstance(requests[0], InsertOne)
+        assert isinstance(requests[1], UpdateOne)
+        query_mock.assert_called_once()
+        assert len(user_interactions.write_buffer) == 0
+
+    @pytest.mark.parametrize(
+        ("query", "flushes"),
+        [
+            ({"guild_id": 456, "message_id": 124}, False),
+            ({"guild_id": 456, "message_id": 123}, True),
+            ({"guild_id": 654, "timestamp": {"$gt": timestamp}}, False),
+            ({"guild_id": 456, "timestamp": {"$gt": timestamp}}, True),
+            ({"guild_id": 456, "message_id": {"$ne": 123}, "$text": {"$search": "link"}}, False),
+            ({"message_type": "wordle"}, True),
+        ],
+    )
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_query_only_flushes_matching(self, query: dict[str, any], flushes: bool) -> None:
+        """Tests UserInteractions reads only write the buffered writes when they could see them."""
+        user_interactions = UserInteractions()
+        user_interactions.write_buffer.clear()
+        user_interactions.add_entry(123, 456, 789, 321, ["message"], "content", self.timestamp)
+        with (
+            mock.patch.object(interface, "bulk_write") as bulk_write_mock,
+            mock.patch.object(interface, "query", return_value=[]),
+        ):
+            user_interactions.query(query)
+        assert bulk_write_mock.called == flushes
+        user_interactions.write_buffer.clear()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_updates_daily_stats(self) -> None:
+        """Tests UserInteractions counts new messages and replies in the daily stats."""
+        user_interactions = UserInteractions()
+        user_interactions.add_entry(123, 456, 789, 321, ["message"], "content", self.timestamp)
+        user_interactions.add_entry(124, 456, 789, 321, ["emoji_used"], "content", self.timestamp)
+        user_interactions.add_reply_to_message(123, 125, 456, 987, self.timestamp, "reply", 789, 321, self.timestamp)
+        requests = user_interactions.daily_stats.write_buffer.clear()
+        assert [request._doc["$inc"] for request in requests] == [
+            {"messages": 1, "content_messages": 1, "length": 7, "words": 1},
+            {"replies_received": 1},
+        ]
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_reactions_are_buffered(self) -> None:
+        """Tests UserInteractions reaction changes are buffered in order."""
+        user_interactions = UserInteractions()
+        user_interactions.add_reaction_entry(123, 456, 987, 321, ":rey:", self.timestamp, 789)
+        user_interactions.remove_reaction_entry(123, 456, 987, 321, ":rey:", self.timestamp, 789)
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            user_interactions.flush()
+        requests = bulk_write_mock.call_args.args[1]
+        assert [list(request._doc) for request in requests] == [["$push"], ["$pull"]]
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_update_flushes(self) -> None:
+        """Tests UserInteractions direct updates are applied after the buffered writes."""
+        user_interactions = UserInteractions()
+        user_interactions.add_entry(123, 456, 789, 321, ["message"], "content", self.timestamp)
+        manager = mock.Mock()
+        with (
+            mock.patch.object(interface, "bulk_write", new=manager.bulk_write),
+            mock.patch.object(interface, "update", new=manager.update),
+        ):
+            user_interactions.update({"message_id": 123}, {"$push": {"message_type": "alphabetical"}})
+        assert [call[0] for call in manager.mock_calls] == ["bulk_write", "update"]
+
+
+class TestUserInteractionsAggregations:
+    """Tests our UserInteractions aggregation pipeline methods."""
+
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    end = datetime.datetime(2024, 2, 1, tzinfo=datetime.UTC)
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_totals(self) -> None:
+        """Tests UserInteractions get_message_totals method."""
+        user_interactions = UserInteractions()
+        docs = [{"_id": None, "count": 10, "users": [1, 2], "channels": [3]}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            totals = user_interactions.get_message_totals(123, self.start, self.end, 1)
+        assert totals == {"count": 10, "users": [1, 2], "channels": [3]}
+        pipeline = aggregate_mock.call_args.args[1]
+        assert pipeline[0]["$match"]["guild_id"] == 123
+        assert pipeline[0]["$match"]["user_id"] == 1
+        assert pipeline[1]["$group"]["_id"] is None
+        assert pipeline[2] == {"$sort": {"count": -1, "first": 1}}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_totals_empty(self) -> None:
+        """Tests UserInteractions get_message_totals method with no messages."""
+        user_interactions = UserInteractions()
+        with mock.patch.object(interface, "aggregate", return_value=[]):
+            totals = user_interactions.get_message_totals(123, self.start, self.end)
+        assert totals == {"count": 0, "users": [], "channels": []}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_counts_by_channel(self) -> None:
+        """Tests UserInteractions get_message_counts_by_channel method."""
+        user_interactions = UserInteractions()
+        docs = [{"_id": 3, "count": 10, "users": [1, 2]}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            counts = user_interactions.get_message_counts_by_channel(123, self.start, self.end)
+        assert counts == docs
+        pipeline = aggregate_mock.call_args.args[1]
+        assert "user_id" not in pipeline[0]["$match"]
+        assert pipeline[0]["$match"]["is_thread"] == {"$ne": True}
+        assert pipeline[0]["$match"]["is_vc"] == {"$ne": True}
+        assert pipeline[1]["$group"]["_id"] == "$channel_id"
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_message_counts_by_day(self) -> None:
+        """Tests UserInteractions get_message_counts_by_day method converts the dates."""
+        user_interactions = UserInteractions()
+        docs = [{"_id": "2024-01-15", "count": 10, "users": [1], "channels": [3]}]
+        with mock.patch.object(interface, "aggregate", return_value=docs):
+            counts = user_interactions.get_message_counts_by_day(123, self.start, self.end)
+        assert counts[0]["_id"] == datetime.date(2024, 1, 15)
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_interactions_get_vc_totals(self) -> None:
+        """Tests UserInteractions get_vc_totals method."""
+        user_interactions = UserInteractions()
+        docs = [{"_id": None, "count": 2, "time_in_vc": 120.5, "users": [1, 2], "channels": [3]}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            totals = user_interactions.get_vc_totals(123, self.start, self.end)
+        assert totals == {"time_in_vc": 120.5, "users": [1, 2], "channels": [3]}
+        pipeline = aggregate_mock.call_args.args[1]
+        assert pipeline[0]["$match"]["message_type"] == "vc_joined"
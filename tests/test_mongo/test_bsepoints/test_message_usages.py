@@ -0,0 +1,63 @@
+"""Tests our MessageUsages class."""
+
+from unittest import mock
+
+from pymongo import UpdateOne
+
+from mongo import interface
+from mongo.bsepoints.messageusages import MessageUsages
+from mongo.datatypes.messageusage import MessageUsageDB
+from tests.mocks import interface_mocks
+
+TEMPLATES = ["Vally time {role}?", "Anyone for vally {role}?"]
+
+
+@mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+@mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+class TestMessageUsages:
+    """Tests our MessageUsages class."""
+
+    def test_make_data_class(self) -> None:
+        """Tests MessageUsages make_data_class."""
+        data = {"_id": "id", "guild_id": 123, "template": "hash", "count": 2}
+        assert MessageUsages.make_data_class(data) == MessageUsageDB(**data)
+
+    def test_template_hash(self) -> None:
+        """Tests the template hash is stable and unique to the template."""
+        assert MessageUsages.template_hash(TEMPLATES[0]) == MessageUsages.template_hash(TEMPLATES[0])
+        assert MessageUsages.template_hash(TEMPLATES[0]) != MessageUsages.template_hash(TEMPLATES[1])
+
+    def test_get_counts(self) -> None:
+        """Tests getting the counts for all the templates in a single query."""
+        usages = MessageUsages()
+        results = [{"template": usages.template_hash(TEMPLATES[0]), "count": 3}]
+        with mock.patch.object(interface, "query", return_value=results) as query_mock:
+            assert usages.get_counts(123, TEMPLATES) == {TEMPLATES[0]: 3}
+        query_mock.assert_called_once()
+        assert query_mock.call_args.args[1] == {
+            "guild_id": 123,
+            "template": {"$in": [usages.template_hash(template) for template in TEMPLATES]},
+        }
+
+    def test_increment(self) -> None:
+        """Tests incrementing a template's count upserts the counter."""
+        usages = MessageUsages()
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            usages.increment(123, TEMPLATES[0])
+        assert bulk_write_mock.call_args.args[1] == [
+            UpdateOne(
+                {"guild_id": 123, "template": usages.template_hash(TEMPLATES[0])}, {"$inc": {"count": 1}}, upsert=True
+            )
+        ]
+
+    def test_set_counts(self) -> None:
+        """Tests seeding the counts only ever raises them."""
+        usages = MessageUsages()
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            usages.set_counts(123, {TEMPLATES[0]: 2, TEMPLATES[1]: 0})
+        assert bulk_write_mock.call_args.args[1] == [
+            UpdateOne(
+                {"guild_id": 123, "template": usages.template_hash(template)}, {"$max": {"count": count}}, upsert=True
+            )
+            for template, count in ((TEMPLATES[0], 2), (TEMPLATES[1], 0))
+        ]
@@ -5,6 +5,7 @@ from unittest import mock
 
 import pytest
 
+from discordbot.bot_enums import TransactionTypes
 from mongo import interface
 from mongo.bsepoints.points import UserPoints
 from mongo.datatypes.user import UserDB
@@ -25,22 +26,17 @@ class TestUserPoints:
         for val in user_points._MINIMUM_PROJECTION_DICT.values():
             assert val is True
 
-    @pytest.mark.parametrize(
-        ("user_id", "guild_id"),
-        # load list of entries dynamically
-        [(entry["uid"], entry["guild_id"]) for entry in interface_mocks.query_mock("userpoints", {})]
-        + [
-            (123456, 654321),
-        ],
-    )
-    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
-    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
-    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
-    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
-    def test_user_points_check_highest_eddie_count(self, user_id: int, guild_id: int) -> None:
-        """Tests UserPoints _check_highest_eddie_count."""
-        user_points = UserPoints()
-        user_points._check_highest_eddie_count(user_id, guild_id)
+    @pytest.mark.parametrize("amount", [-10, 0])
+    def test_user_points_increment_update_not_positive(self, amount: int) -> None:
+        """Tests UserPoints _increment_update doesn't touch the high score when not gaining eddies."""
+        assert UserPoints._increment_update(amount) == {"$inc": {"points": amount}}
+
+    def test_user_points_increment_update_positive(self) -> None:
+        """Tests UserPoints _increment_update sets the high score in the same update."""
+        update = UserPoints._increment_update(10)
+        assert isinstance(update, list)
+        assert update[0] == {"$set": {"points": {"$add": [{"$ifNull": ["$points", 0]}, 10]}}}
+        assert update[1] == {"$set": {"high_score": {"$max": ["$high_score", "$points"]}}}
 
     def test_user_points_make_data_class(self) -> None:
         """Tests UserPoints make_data_class."""
@@ -175,6 +171,110 @@ class TestUserPoints:
         with mock.patch.object(user_points._trans, "add_transaction", return_value=None):
             user_points.increment_points(user_id, guild_id, random.randint(-10, 10), 0)
 
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_increment_points_many(self) -> None:
+        """Tests UserPoints increment_points_many."""
+        user_points = UserPoints()
+        amounts = {123: 10, 456: -5}
+        with (
+            mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock,
+            mock.patch.object(user_points._trans, "add_transactions", return_value=[]) as trans_mock,
+        ):
+            assert user_points.increment_points_many(654321, amounts, 0, comment="some comment") == "result"
+        requests = bulk_write_mock.call_args.args[1]
+        assert len(requests) == len(amounts)
+        trans_mock.assert_called_once_with(654321, amounts, 0, comment="some comment")
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_increment_points_many_empty(self) -> None:
+        """Tests UserPoints increment_points_many with no users."""
+        user_points = UserPoints()
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert user_points.increment_points_many(654321, {}, 0) is None
+        bulk_write_mock.assert_not_called()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_increment_points_by_type(self) -> None:
+        """Tests UserPoints increment_points_by_type."""
+        user_points = UserPoints()
+        amounts = {TransactionTypes.BET_WIN: {123: 10, 456: 20}, TransactionTypes.BET_TAX: {123: 5}}
+        with (
+            mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock,
+            mock.patch.object(user_points._trans, "add_transactions_by_type", return_value=[]) as trans_mock,
+        ):
+            assert user_points.increment_points_by_type(654321, amounts, bet_id="0001") == "result"
+        bulk_write_mock.assert_called_once()
+        assert len(bulk_write_mock.call_args.args[1]) == 3
+        trans_mock.assert_called_once_with(654321, amounts, bet_id="0001")
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_increment_points_by_type_empty(self) -> None:
+        """Tests UserPoints increment_points_by_type with no users."""
+        user_points = UserPoints()
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert user_points.increment_points_by_type(654321, {TransactionTypes.BET_WIN: {}}) is None
+        bulk_write_mock.assert_not_called()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_get_guild_user_states(self) -> None:
+        """Tests UserPoints get_guild_user_states."""
+        user_points = UserPoints()
+        docs = [{"uid": 123, "name": "one"}, {"uid": 456, "name": "two", "inactive": True}]
+        with mock.patch.object(interface, "query", return_value=docs) as query_mock:
+            assert user_points.get_guild_user_states(654321) == {123: ("one", False), 456: ("two", True)}
+        assert query_mock.call_args.args[1] == {"guild_id": 654321}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_sync_guild_members(self) -> None:
+        """Tests UserPoints sync_guild_members."""
+        user_points = UserPoints()
+        with (
+            mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock,
+            mock.patch.object(user_points._trans, "add_transactions", return_value=[]) as trans_mock,
+        ):
+            assert user_points.sync_guild_members(654321, {123: "new"}, {456: "renamed"}, {789, 987}) == "result"
+        insert, rename, leave = bulk_write_mock.call_args.args[1]
+        assert insert._doc["uid"] == 123
+        assert rename._filter == {"uid": 456, "guild_id": 654321}
+        assert sorted(leave._filter["uid"]["$in"]) == [789, 987]
+        trans_mock.assert_called_once_with(654321, {123: 10}, TransactionTypes.USER_CREATE, comment="User created")
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_sync_guild_members_empty(self) -> None:
+        """Tests UserPoints sync_guild_members with no changes."""
+        user_points = UserPoints()
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert user_points.sync_guild_members(654321, {}, {}, set()) is None
+        bulk_write_mock.assert_not_called()
+
+    @pytest.mark.parametrize(("matched", "exp"), [(1, True), (0, False)])
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_deduct_points(self, matched: int, exp: bool) -> None:
+        """Tests UserPoints deduct_points only takes points the user has."""
+        user_points = UserPoints()
+        with mock.patch.object(interface, "update", return_value=mock.Mock(matched_count=matched)) as update_mock:
+            assert user_points.deduct_points(123, 654321, 50) is exp
+        parameters, update = update_mock.call_args.args[1:3]
+        assert parameters["points"] == {"$gte": 50, "$gt": 0}
+        assert update == {"$inc": {"points": -50}}
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_user_points_restore_points(self) -> None:
+        """Tests UserPoints restore_points."""
+        user_points = UserPoints()
+        with mock.patch.object(interface, "update") as update_mock:
+            user_points.restore_points(123, 654321, 50)
+        assert update_mock.call_args.args[2] == {"$inc": {"points": 50}}
+
     @pytest.mark.parametrize(
         ("user_id", "guild_id"),
         # load list of entries dynamically
@@ -46,6 +46,64 @@ class TestUserTransactions:
         transactions = UserTransactions()
         transactions.add_transaction(123, 456, TransactionTypes.DAILY_SALARY, 50)
 
+    def test_transactions_make_transaction_document(self) -> None:
+        """Tests UserTransactions make_transaction_document."""
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        doc = UserTransactions.make_transaction_document(
+            123, 456, TransactionTypes.DAILY_SALARY, 50, now, comment="some comment"
+        )
+        assert doc == {
+            "uid": 123,
+            "guild_id": 456,
+            "type": TransactionTypes.DAILY_SALARY,
+            "amount": 50,
+            "timestamp": now,
+            "comment": "some comment",
+        }
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_add_transactions(self) -> None:
+        """Tests UserTransactions add_transactions inserts all the transactions at once."""
+        transactions = UserTransactions()
+        with mock.patch.object(interface, "insert", return_value=[]) as insert_mock:
+            transactions.add_transactions(456, {123: 50, 789: 25}, TransactionTypes.DAILY_SALARY)
+        docs = insert_mock.call_args.args[1]
+        assert [doc["uid"] for doc in docs] == [123, 789]
+        assert [doc["amount"] for doc in docs] == [50, 25]
+        assert len({doc["timestamp"] for doc in docs}) == 1
+
+    def test_transactions_add_transactions_empty(self) -> None:
+        """Tests UserTransactions add_transactions with no users."""
+        transactions = UserTransactions()
+        with mock.patch.object(interface, "insert") as insert_mock:
+            assert transactions.add_transactions(456, {}, TransactionTypes.DAILY_SALARY) == []
+        insert_mock.assert_not_called()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_add_transactions_by_type(self) -> None:
+        """Tests UserTransactions add_transactions_by_type inserts all the transactions at once."""
+        transactions = UserTransactions()
+        amounts = {TransactionTypes.BET_WIN: {123: 50, 789: 25}, TransactionTypes.BET_TAX: {123: 5}}
+        with mock.patch.object(interface, "insert", return_value=[]) as insert_mock:
+            transactions.add_transactions_by_type(456, amounts, bet_id="0001")
+        insert_mock.assert_called_once()
+        docs = insert_mock.call_args.args[1]
+        assert [(doc["uid"], doc["type"], doc["amount"]) for doc in docs] == [
+            (123, TransactionTypes.BET_WIN, 50),
+            (789, TransactionTypes.BET_WIN, 25),
+            (123, TransactionTypes.BET_TAX, 5),
+        ]
+        assert all(doc["bet_id"] == "0001" for doc in docs)
+
+    def test_transactions_add_transactions_by_type_empty(self) -> None:
+        """Tests UserTransactions add_transactions_by_type with no users."""
+        transactions = UserTransactions()
+        with mock.patch.object(interface, "insert") as insert_mock:
+            assert transactions.add_transactions_by_type(456, {TransactionTypes.BET_WIN: {}}) == []
+        insert_mock.assert_not_called()
+
     @pytest.mark.parametrize(
         "guild_id", sorted({entry["guild_id"] for entry in interface_mocks.query_mock("guilds", {})})
     )
@@ -83,3 +141,88 @@ class TestUserTransactions:
         for act in all_transactions:
             assert isinstance(act, TransactionDB)
             assert act.guild_id == guild_id
+
+
+class TestUserTransactionsAggregations:
+    """Tests our UserTransactions aggregation pipeline methods."""
+
+    start = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+    end = datetime.datetime(2024, 2, 1, tzinfo=ZoneInfo("UTC"))
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_get_amount_totals_by_type(self) -> None:
+        """Tests UserTransactions get_amount_totals_by_type."""
+        transactions = UserTransactions()
+        docs = [
+            {"_id": TransactionTypes.BET_WIN, "total": 500, "count": 2},
+            {"_id": TransactionTypes.BET_PLACE, "total": -200, "count": 4},
+        ]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            totals = transactions.get_amount_totals_by_type(123, self.start, self.end)
+        assert totals == {TransactionTypes.BET_WIN: 500, TransactionTypes.BET_PLACE: -200}
+        pipeline = aggregate_mock.call_args.args[1]
+        assert "uid" not in pipeline[0]["$match"]
+        assert pipeline[1]["$group"]["_id"] == "$type"
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_get_amount_totals_by_user(self) -> None:
+        """Tests UserTransactions get_amount_totals_by_user."""
+        transactions = UserTransactions()
+        docs = [{"_id": 1, "total": 500, "count": 2}, {"_id": 2, "total": 100, "count": 1}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            totals = transactions.get_amount_totals_by_user(
+                123, self.start, self.end, TransactionTypes.BET_WIN, user_id=1
+            )
+        assert list(totals.items()) == [(1, 500), (2, 100)]
+        pipeline = aggregate_mock.call_args.args[1]
+        assert pipeline[0]["$match"]["type"] == TransactionTypes.BET_WIN
+        assert pipeline[0]["$match"]["uid"] == 1
+        assert pipeline[1]["$group"]["_id"] == "$uid"
+
+
+class TestUserTransactionsStreaming:
+    """Tests our UserTransactions streaming methods."""
+
+    start = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+    end = datetime.datetime(2024, 2, 1, tzinfo=ZoneInfo("UTC"))
+
+    @staticmethod
+    def _make_transaction(uid: int, transaction_type: TransactionTypes, amount: int | None) -> TransactionDB:
+        """Creates a transaction."""
+        return TransactionDB(
+            _id=uid, guild_id=123, uid=uid, type=transaction_type, timestamp=datetime.datetime.now(), amount=amount
+        )
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_stream_guild_transactions(self) -> None:
+        """Tests UserTransactions stream_guild_transactions filters in the database and pages by timestamp."""
+        transactions = UserTransactions()
+        with mock.patch.object(transactions, "paginated_query", return_value=iter([])) as query_mock:
+            assert not list(
+                transactions.stream_guild_transactions(
+                    123, self.start, self.end, user_id=1, transaction_types=[TransactionTypes.BET_WIN]
+                )
+            )
+        query_mock.assert_called_once_with(
+            {
+                "guild_id": 123,
+                "timestamp": {"$gt": self.start, "$lt": self.end},
+                "uid": 1,
+                "type": {"$in": [TransactionTypes.BET_WIN]},
+            },
+            as_gen=True,
+            sort_key="timestamp",
+        )
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_transactions_get_all_guild_transactions_uncapped(self) -> None:
+        """Tests UserTransactions get_all_guild_transactions returns every transaction."""
+        transactions = UserTransactions()
+        streamed = [self._make_transaction(num, TransactionTypes.BET_WIN, 1) for num in range(10001)]
+        with mock.patch.object(transactions, "paginated_query", return_value=iter(streamed)) as query_mock:
+            assert transactions.get_all_guild_transactions(123) == streamed
+        query_mock.assert_called_once_with({"guild_id": 123}, as_gen=True, sort_key="timestamp")
@@ -0,0 +1,160 @@
+"""Tests our decoder.py module."""
+
+import datetime
+import threading
+import time
+from unittest import mock
+
+import pytest
+from bson import ObjectId
+
+from mongo.datatypes.actions import TransactionDB
+from mongo.datatypes.bet import BetDB, BetterDB
+from mongo.datatypes.message import MessageDB, ReactionDB
+from mongo.decoder import DataclassDecoder, LazyList, dict_of, get_decoder, list_of
+
+NOW = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+
+def _make_message() -> dict[str, any]:
+    """Creates a message document."""
+    return {
+        "_id": ObjectId(),
+        "guild_id": 1,
+        "channel_id": 2,
+        "message_id": 3,
+        "user_id": 4,
+        "timestamp": NOW,
+        "content": "content",
+        "message_type": ["message"],
+        "reactions": [{"user_id": 5, "content": "👍", "timestamp": NOW}],
+    }
+
+
+class TestDataclassDecoder:
+    """Tests our DataclassDecoder class."""
+
+    def test_decode(self) -> None:
+        """Tests decoding gives the same dataclass as creating it with keyword arguments."""
+        document = _make_message()
+        decoder = DataclassDecoder(MessageDB, converters={"reactions": list_of(get_decoder(ReactionDB))})
+        message = decoder(document)
+
+        expected = MessageDB(**{**document, "reactions": [ReactionDB(**document["reactions"][0])]})
+        assert message == expected
+        assert message.content_old == []
+        assert message.content_old is not decoder(document).content_old
+        assert message.replies is None
+        # we don't change the document
+        assert isinstance(document["reactions"][0], dict)
+
+    def test_decode_slotted(self) -> None:
+        """Tests decoding a slotted dataclass."""
+        reaction = get_decoder(ReactionDB)({"user_id": 5, "content": "👍", "timestamp": NOW})
+        assert reaction == ReactionDB(5, "👍", NOW)
+        assert not hasattr(reaction, "__dict__")
+
+    def test_decode_decoded(self) -> None:
+        """Tests already decoded documents are returned as they are."""
+        reaction = ReactionDB(5, "👍", NOW)
+        assert get_decoder(ReactionDB)(reaction) is reaction
+
+    @pytest.mark.parametrize(
+        ("document", "error"),
+        [
+            ({"user_id": 5, "content": "👍", "timestamp": NOW, "other": 1}, "unexpected"),
+            ({"user_id": 5, "content": "👍"}, "missing"),
+        ],
+    )
+    def test_decode_invalid(self, document: dict[str, any], error: str) -> None:
+        """Tests unknown and missing fields raise errors like the dataclass would."""
+        with pytest.raises(TypeError, match=error):
+            get_decoder(ReactionDB)(document)
+
+    def test_decode_extras(self) -> None:
+        """Tests unknown keys can be put in an extras field."""
+        decoder = DataclassDecoder(TransactionDB, extras="extras")
+        document = {"_id": ObjectId(), "guild_id": 1, "uid": 2, "type": 3, "timestamp": NOW, "other": 4}
+        transaction = decoder(document)
+        assert transaction.extras == {"other": 4}
+        assert not transaction.comment
+
+    def test_decode_nested_dict(self) -> None:
+        """Tests decoding a dict of documents."""
+        decoder = DataclassDecoder(BetDB, converters={"betters": dict_of(get_decoder(BetterDB))})
+        document = {
+            "_id": ObjectId(),
+            "guild_id": 1,
+            "channel_id": 2,
+            "message_id": 3,
+            "bet_id": "0001",
+            "user": 4,
+            "title": "title",
+            "created": NOW,
+            "active": True,
+            "betters": {"5": {"user_id": 5, "emoji": "1️⃣", "points": 10}},
+        }
+        assert decoder(document).betters == {"5": BetterDB(5, "1️⃣", 10)}
+        assert decoder({**document, "betters": None}).betters == {}
+
+    def test_get_decoder(self) -> None:
+        """Tests the plain decoders are shared."""
+        assert get_decoder(ReactionDB) is get_decoder(ReactionDB)
+
+
+class TestLazyList:
+    """Tests our LazyList class."""
+
+    def test_lazy(self) -> None:
+        """Tests the documents are only decoded once the list is accessed, and only once."""
+        convert = mock.Mock(side_effect=lambda item: item * 2)
+        items = LazyList([1, 2, 3], convert)
+        assert len(items) == 3
+        assert items
+        convert.assert_not_called()
+
+        assert list(items) == [2, 4, 6]
+        assert items[0] == 2
+        assert convert.call_count == 3
+
+    def test_lazy_compare(self) -> None:
+        """Tests comparing lazy lists decodes both sides."""
+        assert LazyList([1, 2], lambda item: item * 2) == [2, 4]
+        # the list on the left side of the comparison
+        assert [2, 4] == LazyList([1, 2], lambda item: item * 2)  # noqa: SIM300
+        assert LazyList([1, 2], lambda item: item * 2) == LazyList([4, 8], lambda item: item // 2)
+
+    def test_lazy_concatenate(self) -> None:
+        """Tests concatenating a lazy list onto another list decodes it."""
+        assert [0] + LazyList([1, 2], lambda item: item * 2) == [0, 2, 4]  # noqa: RUF005
+        assert LazyList([1, 2], lambda item: item * 2) + [0] == [2, 4, 0]  # noqa: RUF005
+        assert type([] + LazyList([1], lambda item: item)) is list  # noqa: RUF005
+
+    def test_lazy_threads(self) -> None:
+        """Tests the documents are only decoded once when the list is accessed from several threads at once."""
+        started = threading.Event()
+
+        def _convert(item: int) -> int:
+            started.set()
+            time.sleep(0.01)
+            return item * 2
+
+        convert = mock.Mock(side_effect=_convert)
+        items = LazyList([1, 2, 3], convert)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(list(items)))
+        thread.start()
+        started.wait()
+        results.append(list(items))
+        thread.join()
+
+        assert results == [[2, 4, 6], [2, 4, 6]]
+        assert convert.call_count == 3
+
+    def test_lazy_message(self) -> None:
+        """Tests lazily decoding the reactions of a message."""
+        decoder = DataclassDecoder(MessageDB, converters={"reactions": list_of(get_decoder(ReactionDB), lazy=True)})
+        message = decoder(_make_message())
+        assert isinstance(message.reactions, list)
+        assert message.reactions == [ReactionDB(5, "👍", NOW)]
+        assert decoder({**_make_message(), "reactions": None}).reactions == []
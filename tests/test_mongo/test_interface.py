@@ -1,6 +1,8 @@
 """Tests our interface.py module."""
 
-from pymongo import MongoClient
+from unittest import mock
+
+from pymongo import ASCENDING, IndexModel, InsertOne, MongoClient, ReturnDocument, UpdateOne
 
 from mongo import interface
 from mongo.interface import CachedMongoClient
@@ -95,6 +97,15 @@ class TestClientMethods:
         update = {"$set": {"key": 123}}
         interface.update(collection, params, update, many=True)
 
+    def test_find_one_and_update(self) -> None:
+        """Tests interface find_one_and_update returns the document from after the update by default."""
+        collection = MockCollection()
+        params = {"key": "value"}
+        update = {"$inc": {"count": 1}}
+        assert interface.find_one_and_update(collection, params, update)["return_document"] == ReturnDocument.AFTER
+        result = interface.find_one_and_update(collection, params, update, return_after=False)
+        assert result["return_document"] == ReturnDocument.BEFORE
+
     def test_query_not_list(self) -> None:
         """Tests interface query as not list."""
         collection = MockCollection()
@@ -108,3 +119,46 @@ class TestClientMethods:
         params = {"key": "value"}
         results = interface.query(collection, params, skip=0, as_gen=False)
         assert isinstance(results, list)
+
+    def test_aggregate_not_list(self) -> None:
+        """Tests interface aggregate as not list."""
+        collection = MockCollection()
+        results = interface.aggregate(collection, [{"$match": {"key": "value"}}], as_gen=True)
+        assert not isinstance(results, list)
+
+    def test_aggregate_list(self) -> None:
+        """Tests interface aggregate as list."""
+        collection = MockCollection()
+        results = interface.aggregate(collection, [{"$match": {"key": "value"}}])
+        assert isinstance(results, list)
+        assert len(results) == 5
+
+    def test_bulk_write(self) -> None:
+        """Tests interface bulk_write."""
+        collection = MockCollection()
+        requests = [InsertOne({"key": "value"}), UpdateOne({"key": "value"}, {"$inc": {"count": 1}})]
+        results = interface.bulk_write(collection, requests)
+        assert len(results.inserted_ids) == 2
+
+    def test_create_indexes(self) -> None:
+        """Tests interface create_indexes."""
+        collection = mock.Mock()
+        collection.create_indexes.return_value = ["key_1"]
+        indexes = [IndexModel([("key", ASCENDING)])]
+        assert interface.create_indexes(collection, indexes) == ["key_1"]
+        collection.create_indexes.assert_called_once_with(indexes)
+
+    def test_explain(self) -> None:
+        """Tests interface explain."""
+        collection = mock.Mock()
+        collection.find.return_value.explain.return_value = {"queryPlanner": {}}
+        assert interface.explain(collection, {"key": "value"}) == {"queryPlanner": {}}
+        collection.find.assert_called_once_with({"key": "value"})
+        collection.find.return_value.sort.assert_not_called()
+
+    def test_explain_sort(self) -> None:
+        """Tests interface explain with a sort."""
+        collection = mock.Mock()
+        collection.find.return_value.sort.return_value.explain.return_value = {"queryPlanner": {}}
+        assert interface.explain(collection, {"key": "value"}, sort=[("key", 1)]) == {"queryPlanner": {}}
+        collection.find.return_value.sort.assert_called_once_with([("key", 1)])
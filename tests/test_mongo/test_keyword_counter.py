@@ -0,0 +1,44 @@
+"""Tests our KeywordCounter class."""
+
+import pytest
+
+from mongo.keywordcounter import KeywordCounter
+
+
+class TestKeywordCounter:
+    """Tests our KeywordCounter class."""
+
+    def test_no_keywords(self) -> None:
+        """Tests KeywordCounter with no keywords."""
+        counter = KeywordCounter(["", ""])
+        assert not counter.keywords
+        assert counter.count("some text") == {}
+        assert counter.total("some text") == 0
+
+    def test_empty_text(self) -> None:
+        """Tests KeywordCounter with no text."""
+        counter = KeywordCounter(["word"])
+        assert counter.count("") == {}
+
+    def test_count_order(self) -> None:
+        """Tests KeywordCounter returns the counts in the order the keywords were given."""
+        counter = KeywordCounter(["shit", "fuck", "twat"])
+        assert list(counter.count("fuck this shit, fuck")) == ["shit", "fuck"]
+        assert counter.count("fuck this shit, fuck") == {"shit": 1, "fuck": 2}
+
+    @pytest.mark.parametrize(
+        ("keywords", "text"),
+        [
+            (["shit", "twat"], "shitwat shit twat"),
+            (["dick", "dickhead"], "dickhead dick"),
+            (["aa"], "aaaaa"),
+            ([":a:", ":b:"], ":a:b: :a:a: :ab:"),
+            (["a.b", "(x)"], "a.b axb (x) x"),
+        ],
+    )
+    def test_matches_str_count(self, keywords: list[str], text: str) -> None:
+        """Tests KeywordCounter counts match calling str.count for each keyword."""
+        counter = KeywordCounter(keywords)
+        expected = {keyword: text.count(keyword) for keyword in keywords if keyword in text}
+        assert counter.count(text) == expected
+        assert counter.total(text) == sum(expected.values())
@@ -0,0 +1,213 @@
+"""Tests our SalaryTally class."""
+
+import datetime
+import threading
+from collections import Counter
+from unittest import mock
+
+import pytest
+from bson import ObjectId
+from freezegun import freeze_time
+
+from mongo.datatypes.message import MessageDB, ReactionDB
+from mongo.salarytally import GuildDayTally, SalaryCounters, SalaryTally
+
+STARTED = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC)
+NOW = datetime.datetime(2024, 1, 2, 12, tzinfo=datetime.UTC)
+TODAY = NOW.date()
+
+
+def _make_message(message_id: int, user_id: int, reactions: list[ReactionDB] | None = None) -> MessageDB:
+    """Creates a message sent now."""
+    return MessageDB(
+        _id=ObjectId(),
+        guild_id=1,
+        channel_id=1,
+        message_id=message_id,
+        user_id=user_id,
+        timestamp=NOW,
+        content="content",
+        message_type=["message"],
+        reactions=reactions or [],
+    )
+
+
+class TestSalaryTally:
+    """Tests our SalaryTally class."""
+
+    def test_untracked_days(self) -> None:
+        """Tests we don't tally the days we weren't running for all of."""
+        tally = SalaryTally(STARTED)
+        tally.add_entry(1, 1, 1, ["message"], "content", STARTED)
+        assert tally.get_counters(1, STARTED.date()) is None
+        assert not tally.is_complete(1, STARTED.date())
+        assert tally.is_complete(1, TODAY)
+
+    def test_add_entry(self) -> None:
+        """Tests counting interactions, only counting each message once."""
+        tally = SalaryTally(STARTED)
+        tally.add_entry(1, 1, 1, ["message", "reply"], "content", NOW)
+        tally.add_entry(1, 1, 1, ["message", "reply"], "content", NOW)
+        tally.add_entry(1, 1, 2, ["message", "wordle"], "Wordle 1,000 3/6", NOW)
+        tally.add_entry(1, 2, 3, ["emoji_used"], "content", NOW)
+
+        counters = tally.get_counters(1, TODAY)
+        assert counters[1].message_types == {"message": 2, "reply": 1, "wordle": 1}
+        assert counters[1].wordle == "Wordle 1,000 3/6"
+        assert counters[1].active
+        assert counters[2].message_types == {"emoji_used": 1}
+
+    def test_edit_entry(self) -> None:
+        """Tests updating the counts when a message is edited."""
+        tally = SalaryTally(STARTED)
+        message = _make_message(1, 1)
+        tally.add_entry(1, 1, 1, message.message_type, message.content, NOW)
+        tally.edit_entry(message, ["message", "link"], "https://")
+        tally.add_message_types(1, 1, 1, NOW, ["alphabetical"])
+        assert tally.get_counters(1, TODAY)[1].counts([]) == {"message": 1, "link": 1, "alphabetical": 1}
+
+    def test_wordle_word(self) -> None:
+        """Tests counting the uses of the wordle word once we know it."""
+        tally = SalaryTally(STARTED)
+        tally.add_entry(1, 1, 1, ["message"], "is it crane?", NOW)
+        assert tally.needs_wordle_word(1, TODAY)
+        tally.set_wordle_word(1, TODAY, "crane")
+        tally.add_entry(1, 1, 2, ["message"], "definitely crane", NOW)
+        tally.add_entry(1, 1, 3, ["message"], "or slate", NOW)
+        assert not tally.needs_wordle_word(1, TODAY)
+        assert tally.get_counters(1, TODAY)[1].message_types["wordle_word_used"] == 2
+
+    def test_add_reply(self) -> None:
+        """Tests counting replies to someone else's messages that we counted."""
+        tally = SalaryTally(STARTED)
+        message = _make_message(1, 1)
+        tally.add_entry(1, 1, 1, message.message_type, message.content, NOW)
+        tally.add_reply(1, 1, 1, NOW, 2)
+        tally.add_reply(1, 1, 1, NOW, 1)
+        # a message we didn't count
+        tally.add_reply(1, 2, 1, NOW, 2)
+        assert tally.get_counters(1, TODAY)[1].message_types == {"message": 1, "reply_received": 1}
+
+    def test_add_reaction(self) -> None:
+        """Tests counting reactions, custom emoji reactions and react trains."""
+        tally = SalaryTally(STARTED)
+        earlier = NOW - datetime.timedelta(days=1)
+        message = _make_message(1, 1, [ReactionDB(user_id=4, content="custom", timestamp=earlier)])
+
+        assert tally.needs_message(1, 1, NOW)
+        tally.add_reaction(1, 1, 1, 2, "custom", NOW, message)
+        assert not tally.needs_message(1, 1, NOW)
+        tally.add_reaction(1, 1, 1, 3, "custom", NOW + datetime.timedelta(seconds=1))
+        tally.add_reaction(1, 1, 1, 1, "other", NOW + datetime.timedelta(seconds=2))
+        tally.add_reaction(1, 1, 1, 3, "other", NOW + datetime.timedelta(seconds=3))
+
+        counters = tally.get_counters(1, TODAY)
+        assert counters[1].counts({"custom"}) == {"reaction_received": 3, "react_train": 1}
+        assert counters[2].counts({"custom"}) == {"custom_emoji_reaction": 1}
+        assert counters[3].counts({"custom"}) == {"custom_emoji_reaction": 1}
+        # reacted to the message with a reaction today
+        assert counters[4].active
+
+    def test_remove_reaction(self) -> None:
+        """Tests uncounting removed reactions, including the react trains they were part of."""
+        tally = SalaryTally(STARTED)
+        later = NOW + datetime.timedelta(seconds=1)
+        tally.add_reaction(1, 1, 1, 2, "custom", NOW, _make_message(1, 1))
+        tally.add_reaction(1, 1, 1, 3, "custom", later)
+        assert tally.get_counters(1, TODAY)[2].counts({"custom"})["react_train"] == 1
+
+        tally.remove_reaction(1, 1, 1, 3, "custom", later)
+        # never counted
+        tally.remove_reaction(1, 1, 1, 3, "custom", NOW)
+        tally.remove_reaction(1, 2, 1, 3, "custom", NOW)
+
+        counters = tally.get_counters(1, TODAY)
+        assert counters[1].counts({"custom"}) == {"reaction_received": 1}
+        assert counters[2].counts({"custom"}) == {"custom_emoji_reaction": 1}
+        assert counters[3].counts({"custom"}) == {}
+
+    def test_add_reaction_unknown_message(self) -> None:
+        """Tests reactions to messages we don't have aren't counted."""
+        tally = SalaryTally(STARTED)
+        tally.add_reaction(1, 1, 1, 2, "custom", NOW)
+        assert tally.get_counters(1, TODAY) == {}
+
+    def test_update_vc_session(self) -> None:
+        """Tests the latest times for each VC session are kept."""
+        tally = SalaryTally(STARTED)
+        tally.update_vc_session(1, 1, "a", NOW, 0, 0, False)
+        tally.update_vc_session(1, 1, "a", NOW, 60, 30, True)
+        tally.update_vc_session(1, 1, "b", NOW, 10, 0, False)
+        assert tally.get_counters(1, TODAY)[1].vc_sessions == {"a": (60, 30, True), "b": (10, 0, False)}
+
+    def test_warm(self) -> None:
+        """Tests seeding the day we started partway through."""
+        tally = SalaryTally(STARTED)
+        seeded = GuildDayTally(users={1: SalaryCounters(active=True)}, message_ids={1})
+
+        assert tally.warm(1, STARTED.date(), lambda _: seeded)
+        tally.add_entry(1, 1, 1, ["message"], "content", STARTED)
+        tally.add_entry(1, 1, 2, ["message"], "content", STARTED)
+
+        assert not tally.is_complete(1, STARTED.date())
+        assert tally.get_counters(1, STARTED.date())[1].message_types == {"message": 1}
+        assert not tally.warm(1, STARTED.date() - datetime.timedelta(days=1), lambda _: seeded)
+
+    @freeze_time("2024-01-01 13:00:00")
+    def test_warm_records_meanwhile(self) -> None:
+        """Tests interactions recorded while seeding are merged in, and the earlier ones are left to the loader."""
+        tally = SalaryTally(STARTED)
+        loading = threading.Event()
+        loaded = threading.Event()
+
+        def _loader(since: datetime.datetime) -> GuildDayTally:
+            loading.set()
+            assert loaded.wait(5)
+            # the database already has message 1
+            return GuildDayTally(users={1: SalaryCounters(Counter(message=1), active=True)}, message_ids={1})
+
+        thread = threading.Thread(target=tally.warm, args=(1, STARTED.date(), _loader))
+        thread.start()
+        assert loading.wait(5)
+        # recording isn't blocked by the loader, and we don't count the interactions the loader counts
+        later = STARTED + datetime.timedelta(hours=1)
+        tally.add_entry(1, 1, 1, ["message"], "content", STARTED)
+        tally.add_entry(1, 2, 2, ["message"], "content", later)
+        assert tally.get_counters(1, STARTED.date()) is None
+        loaded.set()
+        thread.join(5)
+
+        counters = tally.get_counters(1, STARTED.date())
+        assert counters[1].message_types == {"message": 1}
+        assert counters[2].message_types == {"message": 1}
+        # waits for the seeding rather than seeding again
+        assert tally.warm(1, STARTED.date(), mock.Mock(side_effect=AssertionError))
+
+    def test_warm_failed(self) -> None:
+        """Tests the day can be seeded again if the loader fails."""
+        tally = SalaryTally(STARTED)
+        with pytest.raises(RuntimeError):
+            tally.warm(1, STARTED.date(), mock.Mock(side_effect=RuntimeError))
+        assert tally.get_counters(1, STARTED.date()) is None
+        assert tally.warm(1, STARTED.date(), lambda _: GuildDayTally())
+
+    def test_merge(self) -> None:
+        """Tests merging the interactions tallied while seeding, including counting the wordle word."""
+        seeded = GuildDayTally(users={1: SalaryCounters(Counter(message=2))}, message_ids={1, 2})
+        seeded.count_content(1, "crane")
+        meanwhile = GuildDayTally(wordle_word="crane", message_ids={3})
+        meanwhile.user(1).message_types["message"] += 1
+        meanwhile.user(1).vc_sessions["a"] = (60, 0, False)
+        seeded.merge(meanwhile)
+        assert seeded.message_ids == {1, 2, 3}
+        assert seeded.users[1].message_types == {"message": 3, "wordle_word_used": 1}
+        assert seeded.users[1].vc_sessions == {"a": (60, 0, False)}
+
+    def test_prune(self) -> None:
+        """Tests only the last two days are kept."""
+        tally = SalaryTally(STARTED)
+        tally.add_entry(1, 1, 1, ["message"], "content", NOW)
+        tally.add_entry(1, 1, 2, ["message"], "content", NOW + datetime.timedelta(days=1))
+        assert tally.get_counters(1, TODAY) is not None
+        tally.add_entry(1, 1, 3, ["message"], "content", NOW + datetime.timedelta(days=2))
+        assert tally.get_counters(1, TODAY) is None
@@ -0,0 +1,132 @@
+"""Tests our ttlcache.py module."""
+
+from unittest import mock
+
+from mongo.ttlcache import TTLCache, get_cache, get_cache_stats
+
+
+class TestTTLCache:
+    """Tests our TTLCache class."""
+
+    def test_get_or_load(self) -> None:
+        """Tests values are loaded once and then served from the cache."""
+        cache = TTLCache()
+        loader = mock.Mock(return_value="value")
+        assert cache.get_or_load("key", loader) == "value"
+        assert cache.get_or_load("key", loader) == "value"
+        loader.assert_called_once()
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_get_or_load_none(self) -> None:
+        """Tests missing lookups are cached too."""
+        cache = TTLCache()
+        loader = mock.Mock(return_value=None)
+        assert cache.get_or_load("key", loader) is None
+        assert cache.get_or_load("key", loader) is None
+        loader.assert_called_once()
+
+    def test_expiry(self) -> None:
+        """Tests values are reloaded after the TTL."""
+        cache = TTLCache(ttl=10)
+        loader = mock.Mock(side_effect=["old", "new"])
+        with mock.patch("time.monotonic", return_value=100):
+            assert cache.get_or_load("key", loader) == "old"
+        with mock.patch("time.monotonic", return_value=105):
+            assert cache.get_or_load("key", loader) == "old"
+        with mock.patch("time.monotonic", return_value=111):
+            assert cache.get_or_load("key", loader) == "new"
+        assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+    def test_eviction(self) -> None:
+        """Tests the least recently used entries are evicted once the cache is full."""
+        cache = TTLCache(max_size=2)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+        # use 'a' so that 'b' is the least recently used
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("c", lambda: 3)
+        assert len(cache) == 2
+        loader = mock.Mock(return_value=2)
+        cache.get_or_load("b", loader)
+        loader.assert_called_once()
+
+    def test_weight_eviction(self) -> None:
+        """Tests the least recently used entries are evicted once the cache is too heavy."""
+        cache = TTLCache(max_weight=5, weigher=len)
+        cache.get_or_load("a", lambda: [1, 2])
+        cache.get_or_load("b", lambda: [1, 2])
+        assert cache.stats()["weight"] == 4
+        cache.get_or_load("c", lambda: [1, 2])
+        assert len(cache) == 2
+        assert cache.stats()["weight"] == 4
+        loader = mock.Mock(return_value=[1, 2])
+        cache.get_or_load("a", loader)
+        loader.assert_called_once()
+
+    def test_too_heavy(self) -> None:
+        """Tests values heavier than the maximum weight aren't cached."""
+        cache = TTLCache(max_weight=2, weigher=len)
+        cache.get_or_load("a", lambda: [1])
+        assert cache.get_or_load("b", lambda: [1, 2, 3]) == [1, 2, 3]
+        assert len(cache) == 1
+        assert cache.stats()["weight"] == 1
+
+    def test_find(self) -> None:
+        """Tests finding the most recently used value that matches a predicate."""
+        cache = TTLCache(ttl=10)
+        with mock.patch("time.monotonic", return_value=100):
+            cache.get_or_load(("a", 1), lambda: "one")
+            cache.get_or_load(("a", 2), lambda: "two")
+            cache.get_or_load(("b", 3), lambda: "three")
+            assert cache.find(lambda key, _: key[0] == "a") == "two"
+            assert cache.find(lambda _, value: value == "one") == "one"
+            assert cache.find(lambda key, _: key[0] == "c") is None
+        with mock.patch("time.monotonic", return_value=111):
+            assert cache.find(lambda key, _: key[0] == "a") is None
+
+    def test_clear(self) -> None:
+        """Tests clearing the cache forces a reload."""
+        cache = TTLCache()
+        cache.get_or_load("key", lambda: "old")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.get_or_load("key", lambda: "new") == "new"
+
+    def test_clear_during_load(self) -> None:
+        """Tests values loaded while the cache is cleared aren't cached."""
+        cache = TTLCache()
+
+        def _loader() -> str:
+            cache.clear()
+            return "stale"
+
+        assert cache.get_or_load("key", _loader) == "stale"
+        assert len(cache) == 0
+
+
+def test_get_cache() -> None:
+    """Tests caches are shared per name."""
+    cache = get_cache("name")
+    assert get_cache("name") is cache
+    assert get_cache("other name") is not cache
+
+
+def test_get_cache_arguments() -> None:
+    """Tests caches are created with the given arguments."""
+    cache = get_cache("name", max_size=2, ttl=10)
+    assert cache.max_size == 2
+    assert cache.ttl == 10
+    # the arguments are only used when creating the cache
+    assert get_cache("name", max_size=5) is cache
+    assert cache.max_size == 2
+
+
+def test_get_cache_stats() -> None:
+    """Tests getting the counters for all the caches."""
+    get_cache("name").get_or_load("key", lambda: "value")
+    get_cache("name").get_or_load("key", lambda: "value")
+    get_cache("other name")
+    assert get_cache_stats() == {
+        "name": {"hits": 1, "misses": 1, "size": 1},
+        "other name": {"hits": 0, "misses": 0, "size": 0},
+    }
@@ -0,0 +1,175 @@
+"""Tests our writebuffer.py module."""
+
+import threading
+from unittest import mock
+
+import pytest
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from mongo import interface, writebuffer
+from mongo.writebuffer import WriteBuffer, flush_write_buffers, get_write_buffer
+
+
+class TestWriteBuffer:
+    """Tests our WriteBuffer class."""
+
+    def test_insert_and_flush(self) -> None:
+        """Tests buffered inserts are written in a single ordered bulk write."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1})
+        buffer.update({"key": 1}, {"$inc": {"count": 1}})
+        assert len(buffer) == 2
+        with mock.patch.object(interface, "bulk_write", return_value="result") as bulk_write_mock:
+            assert buffer.flush() == "result"
+        bulk_write_mock.assert_called_once_with(
+            "collection", [InsertOne({"key": 1}), UpdateOne({"key": 1}, {"$inc": {"count": 1}})], ordered=True
+        )
+        assert len(buffer) == 0
+
+    def test_update_upsert(self) -> None:
+        """Tests buffered updates can upsert."""
+        buffer = WriteBuffer("collection")
+        buffer.update({"key": 1}, {"$inc": {"count": 1}}, upsert=True)
+        assert buffer.clear() == [UpdateOne({"key": 1}, {"$inc": {"count": 1}}, upsert=True)]
+
+    def test_flush_empty(self) -> None:
+        """Tests flushing an empty buffer doesn't write anything."""
+        buffer = WriteBuffer("collection")
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert buffer.flush() is None
+        bulk_write_mock.assert_not_called()
+
+    def test_flush_on_max_size(self) -> None:
+        """Tests the buffer flushes once it's full."""
+        buffer = WriteBuffer("collection", max_size=3)
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            for num in range(7):
+                buffer.insert({"key": num})
+        assert bulk_write_mock.call_count == 2
+        assert len(buffer) == 1
+        buffer.clear()
+
+    def test_flush_on_max_delay(self) -> None:
+        """Tests the buffer flushes itself after the maximum delay."""
+        buffer = WriteBuffer("collection", max_delay=0.01)
+        flushed = threading.Event()
+        with mock.patch.object(interface, "bulk_write", side_effect=lambda *args, **kwargs: flushed.set()):  # noqa: ARG005
+            buffer.insert({"key": 1})
+            assert flushed.wait(5)
+        assert len(buffer) == 0
+
+    def test_flush_failed(self) -> None:
+        """Tests the operations are kept in the buffer, in order, if the write fails."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1}, key=1)
+        with mock.patch.object(interface, "bulk_write", side_effect=AutoReconnect("down")):
+            buffer.insert({"key": 2}, key=2)
+            with pytest.raises(AutoReconnect):
+                buffer.flush()
+        buffer.insert({"key": 3})
+        assert buffer.get_pending_document(1) == {"key": 1}
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            buffer.flush()
+        assert bulk_write_mock.call_args.args[1] == [InsertOne({"key": num}) for num in (1, 2, 3)]
+        assert len(buffer) == 0
+
+    def test_flush_partially_failed(self) -> None:
+        """Tests the failed operation and everything after it are kept, as the ordered write stopped there."""
+        buffer = WriteBuffer("collection", max_attempts=2)
+        for num in range(4):
+            buffer.insert({"key": num})
+        error = BulkWriteError({"writeErrors": [{"index": 1, "code": 2}], "writeConcernErrors": []})
+        with mock.patch.object(interface, "bulk_write", side_effect=error), pytest.raises(BulkWriteError):
+            buffer.flush()
+        assert buffer._operations == [InsertOne({"key": num}) for num in (1, 2, 3)]
+
+        # only the failed operation counts as an attempt, so only it's dropped once it fails again
+        error = BulkWriteError({"writeErrors": [{"index": 0, "code": 2}], "writeConcernErrors": []})
+        with mock.patch.object(interface, "bulk_write", side_effect=error), pytest.raises(BulkWriteError):
+            buffer.flush()
+        assert buffer.clear() == [InsertOne({"key": num}) for num in (2, 3)]
+
+    def test_flush_duplicate_insert(self) -> None:
+        """Tests the rest of the operations are written after an insert of a document that's already been written."""
+        buffer = WriteBuffer("collection")
+        for num in range(3):
+            buffer.insert({"key": num})
+        error = BulkWriteError({"writeErrors": [{"index": 1, "code": 11000}], "writeConcernErrors": []})
+        with mock.patch.object(interface, "bulk_write", side_effect=[error, "result"]) as bulk_write_mock:
+            assert buffer.flush() == "result"
+        assert bulk_write_mock.call_args.args[1] == [InsertOne({"key": 2})]
+        assert len(buffer) == 0
+
+    def test_flush_max_attempts(self) -> None:
+        """Tests operations are dropped once they've failed too many times."""
+        buffer = WriteBuffer("collection", max_attempts=2)
+        buffer.insert({"key": 1})
+        with mock.patch.object(interface, "bulk_write", side_effect=AutoReconnect("down")):
+            for _ in range(2):
+                with pytest.raises(AutoReconnect):
+                    buffer.flush()
+        assert len(buffer) == 0
+
+    def test_flush_from_timer_failed(self) -> None:
+        """Tests errors flushing from the timer are logged rather than lost."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1})
+        with (
+            mock.patch.object(interface, "bulk_write", side_effect=AutoReconnect("down")),
+            mock.patch.object(buffer, "logger") as logger_mock,
+        ):
+            buffer._flush_from_timer()
+        logger_mock.exception.assert_called_once()
+        assert buffer.clear() == [InsertOne({"key": 1})]
+
+    def test_get_pending_document(self) -> None:
+        """Tests pending documents can be read back until they're updated or written."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1}, key=1)
+        buffer.insert({"key": 2}, key=2)
+        buffer.update({"key": 2}, {"$inc": {"count": 1}}, key=2)
+        assert buffer.get_pending_document(1) == {"key": 1}
+        assert buffer.get_pending_document(2) is None
+        assert buffer.get_pending_document(3) is None
+        with mock.patch.object(interface, "bulk_write"):
+            buffer.flush()
+        assert buffer.get_pending_document(1) is None
+
+    def test_has_pending(self) -> None:
+        """Tests checking for buffered writes by their keys, and that writes without a key match anything."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1}, key=1)
+        buffer.update({"key": 2}, {"$inc": {"count": 1}}, key=2)
+        assert buffer.has_pending(lambda key: key == 2)
+        assert not buffer.has_pending(lambda key: key == 3)
+        buffer.update({"key": 3}, {"$inc": {"count": 1}})
+        assert buffer.has_pending(lambda key: key == 3)
+        buffer.clear()
+        assert not buffer.has_pending(lambda _: True)
+
+    def test_clear(self) -> None:
+        """Tests clearing the buffer returns the operations without writing them."""
+        buffer = WriteBuffer("collection")
+        buffer.insert({"key": 1}, key=1)
+        with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+            assert buffer.clear() == [InsertOne({"key": 1})]
+        bulk_write_mock.assert_not_called()
+        assert buffer.get_pending_document(1) is None
+
+
+def test_get_write_buffer() -> None:
+    """Tests write buffers are shared per collection name."""
+    buffer = get_write_buffer("name", "collection")
+    assert get_write_buffer("name", "other collection") is buffer
+    assert get_write_buffer("other name", "collection") is not buffer
+
+
+def test_flush_write_buffers() -> None:
+    """Tests flushing all the write buffers."""
+    get_write_buffer("name", "collection").insert({"key": 1})
+    get_write_buffer("other name", "other collection").insert({"key": 2})
+    with mock.patch.object(interface, "bulk_write") as bulk_write_mock:
+        flush_write_buffers()
+    assert bulk_write_mock.call_count == 2
+    assert all(not len(buffer) for buffer in writebuffer._BUFFERS.values())
@@ -24,3 +24,50 @@ class TestStats:
         assert isinstance(active, BaseEvent)
         assert active.activity_type == ActivityTypes.STATS
         assert active.help_string is not None
+
+    def test_do_message_counts(self) -> None:
+        """Tests working out the message stats from the daily counters."""
+        totals = {
+            "count": 12,
+            "content_messages": 10,
+            "length": 125,
+            "words": 33,
+            "replied": 2,
+            "replies_received": 3,
+            "wordles": 2,
+            "wordle_score": 7,
+            "swears": {"fuck": 2, "shit": 5, "cunt": 0, "piss": 1, "cock": 0, "bollock": 0, "dick": 0, "twat": 0},
+        }
+        channels = [{"_id": channel_id, "count": 8 - channel_id} for channel_id in range(7)]
+        users = [{"_id": 1, "count": 8}, {"_id": 2, "count": 4}]
+        counts = Stats._do_message_counts(totals, channels, users)
+        assert counts["total_messages"] == 12
+        assert counts["top_five"] == [(0, 8), (1, 7), (2, 6), (3, 5), (4, 4)]
+        # only ever shows the top five
+        assert counts["top_users"] == [(1, 8)]
+        assert counts["average_length"] == 12.5
+        assert counts["average_word_count"] == 3.3
+        assert counts["total_swears"] == 8
+        assert counts["top_swears"] == [("shit", 5), ("fuck", 2), ("piss", 1)]
+        assert counts["replies_count"] == 3
+        assert counts["replied_count"] == 2
+        assert counts["wordles"] == 2
+        assert counts["average_wordle_score"] == 3.5
+
+    def test_do_message_counts_no_messages(self) -> None:
+        """Tests working out the message stats without any messages."""
+        totals = {
+            "count": 0,
+            "content_messages": 0,
+            "length": 0,
+            "words": 0,
+            "replied": 0,
+            "replies_received": 0,
+            "wordles": 0,
+            "wordle_score": 0,
+            "swears": {"fuck": 0},
+        }
+        counts = Stats._do_message_counts(totals, [], [])
+        assert counts["average_length"] == 0.0
+        assert counts["average_wordle_score"] == 0.0
+        assert not counts["top_swears"]
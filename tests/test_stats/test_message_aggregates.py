@@ -0,0 +1,108 @@
+"""Tests our MessageAggregates class."""
+
+import datetime
+from zoneinfo import ZoneInfo
+
+from bson import ObjectId
+
+from discordbot.constants import BSE_BOT_ID, JERK_OFF_CHAT
+from discordbot.stats.messageaggregates import MessageAggregates
+from mongo.datatypes.message import MessageDB
+
+_NOW = datetime.datetime(2024, 1, 15, 12, tzinfo=ZoneInfo("UTC"))
+
+
+def _message(
+    user_id: int,
+    channel_id: int,
+    content: str = "",
+    message_type: list[str] | None = None,
+    is_thread: bool = False,
+    days: int = 0,
+) -> MessageDB:
+    """Creates a message for testing."""
+    return MessageDB(
+        _id=ObjectId(),
+        guild_id=123,
+        channel_id=channel_id,
+        message_id=456,
+        user_id=user_id,
+        timestamp=_NOW + datetime.timedelta(days=days),
+        content=content,
+        message_type=message_type or ["message"],
+        is_thread=is_thread,
+    )
+
+
+class TestMessageAggregates:
+    """Tests our MessageAggregates class."""
+
+    def test_empty(self) -> None:
+        """Tests MessageAggregates with no messages."""
+        aggregates = MessageAggregates([])
+        assert aggregates.total == 0
+        assert not aggregates.channel_groups
+        assert aggregates.longest_message is None
+
+    def test_totals(self) -> None:
+        """Tests MessageAggregates basic totals."""
+        messages = [
+            _message(1, 10, "hello there"),
+            _message(2, 10, "hi"),
+            _message(2, 20, "in a thread", is_thread=True),
+            _message(3, 30),
+        ]
+        aggregates = MessageAggregates(messages)
+        assert aggregates.total == 4
+        assert aggregates.thread_total == 1
+        assert list(aggregates.channels) == [10, 20, 30]
+        assert list(aggregates.users) == [1, 2, 3]
+        assert aggregates.content_count == 3
+        assert aggregates.content_length == len("hello there") + len("hi") + len("in a thread")
+        assert aggregates.content_words == 6
+
+    def test_groups(self) -> None:
+        """Tests MessageAggregates channel, thread and day groups."""
+        messages = [
+            _message(1, 10),
+            _message(2, 10, days=1),
+            _message(1, 10, days=1),
+            _message(2, 20, is_thread=True),
+        ]
+        aggregates = MessageAggregates(messages)
+        assert aggregates.channel_groups[10].as_dict() == {"count": 3, "users": [1, 2]}
+        assert 20 not in aggregates.channel_groups
+        assert aggregates.thread_groups[20].as_dict() == {"count": 1, "users": [2]}
+        assert aggregates.day_groups[_NOW.date()].count == 2
+        assert list(aggregates.day_groups[_NOW.date()].channels) == [10, 20]
+        assert aggregates.user_channel_counts == {1: {10: 2}, 2: {10: 1, 20: 1}}
+
+    def test_user_counts_exclude_bot(self) -> None:
+        """Tests MessageAggregates excludes the bot from the user counts."""
+        messages = [
+            _message(BSE_BOT_ID, 10, "a very very long message from the bot"),
+            _message(1, 10, "short"),
+            _message(1, 20, "thread", is_thread=True),
+        ]
+        aggregates = MessageAggregates(messages)
+        assert BSE_BOT_ID not in aggregates.user_messages
+        assert aggregates.user_messages[1].count == 2
+        assert list(aggregates.user_messages[1].channels) == [10]
+        assert list(aggregates.user_messages[1].threads) == [20]
+        assert aggregates.user_thread_messages == {1: 1}
+        assert aggregates.longest_message is messages[2]
+
+    def test_content_counters(self) -> None:
+        """Tests MessageAggregates content based counters."""
+        messages = [
+            _message(1, 10, "a b c d"),
+            _message(1, 10, "d c b a"),
+            _message(2, 10, "https://twitter.com/a", ["message", "link"]),
+            _message(2, JERK_OFF_CHAT, "", ["message", "attachment"]),
+            _message(3, 10, "Wordle 1,000 3/6", ["message", "wordle"]),
+        ]
+        aggregates = MessageAggregates(messages)
+        assert aggregates.alphabetical_users == {1: 1}
+        assert aggregates.twitter_users == {2: 1}
+        assert aggregates.jerk_off_users == {2: 1}
+        assert aggregates.wordle_messages == [messages[4]]
@@ -5,11 +5,39 @@ from unittest import mock
 from zoneinfo import ZoneInfo
 
 import pytest
+from bson import ObjectId
 
+from discordbot.bot_enums import TransactionTypes
 from discordbot.stats.statsdatacache import StatsDataCache
-from mongo import interface
+from mongo import interface, ttlcache
+from mongo.bsepoints.bets import UserBets
+from mongo.bsepoints.interactions import UserInteractions
+from mongo.bsepoints.transactions import UserTransactions
+from mongo.datatypes.actions import TransactionDB
+from mongo.datatypes.bet import BetDB
+from mongo.datatypes.message import MessageDB, ReactionDB
 from tests.mocks import interface_mocks
 
+YEAR_START = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+YEAR_END = datetime.datetime(2025, 1, 1, tzinfo=ZoneInfo("UTC"))
+MONTH_START = datetime.datetime(2024, 3, 1, tzinfo=ZoneInfo("UTC"))
+MONTH_END = datetime.datetime(2024, 4, 1, tzinfo=ZoneInfo("UTC"))
+
+
+def _make_message(timestamp: datetime.datetime, user_id: int = 1, **kwargs: any) -> MessageDB:
+    """Creates a message to cache."""
+    return MessageDB(
+        _id=ObjectId(),
+        guild_id=123,
+        channel_id=321,
+        message_id=1,
+        user_id=user_id,
+        timestamp=timestamp,
+        content="hello",
+        message_type=["message"],
+        **kwargs,
+    )
+
 
 class TestStatsDataCache:
     """Tests our StatsDataCache class."""
@@ -28,6 +56,168 @@ class TestStatsDataCache:
         assert cache.annual
         assert cache._user_id_cache == 123456
 
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_aggregates_are_cached(self) -> None:
+        """Tests StatsDataCache only runs the aggregation pipelines once."""
+        cache = StatsDataCache(uid=123456)
+        start = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+        end = datetime.datetime(2024, 2, 1, tzinfo=ZoneInfo("UTC"))
+        docs = [{"_id": 10, "messages": 5, "users": [123456], "first": start}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            channels = cache.get_channel_message_counts(123, start, end)
+            channels_again = cache.get_channel_message_counts(123, start, end)
+        assert aggregate_mock.call_count == 1
+        assert channels[10].as_dict() == {"count": 5, "users": [123456]}
+        assert channels_again[10].count == 5
+        # the user ID should have been used in the pipeline
+        assert aggregate_mock.call_args.args[1][0]["$match"]["user_id"] == 123456
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_get_message_counters(self) -> None:
+        """Tests StatsDataCache get_message_counters groups the daily counters."""
+        cache = StatsDataCache()
+        start = datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+        end = datetime.datetime(2024, 2, 1, tzinfo=ZoneInfo("UTC"))
+        docs = [{"_id": 10, "messages": 5, "first": start}]
+        with mock.patch.object(interface, "aggregate", return_value=docs) as aggregate_mock:
+            counters = cache.get_message_counters(123, start, end, "user_id")
+            cache.get_message_counters(123, start, end, "user_id")
+            cache.get_message_counters(123, start, end, "channel_id")
+        assert aggregate_mock.call_count == 2
+        assert counters[0]["count"] == 5
+        assert aggregate_mock.call_args.args[1][1]["$group"]["_id"] == "$channel_id"
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_is_shared(self) -> None:
+        """Tests StatsDataCache instances share the cached documents and aggregates."""
+        messages = [_make_message(MONTH_START + datetime.timedelta(days=1))]
+        with mock.patch.object(UserInteractions, "paginated_query", return_value=messages) as query_mock:
+            assert StatsDataCache().get_messages(123, MONTH_START, MONTH_END) is messages
+            assert StatsDataCache().get_messages(123, MONTH_START, MONTH_END) is messages
+            aggregates = StatsDataCache().get_message_aggregates(123, MONTH_START, MONTH_END)
+            assert StatsDataCache().get_message_aggregates(123, MONTH_START, MONTH_END) is aggregates
+            # different guilds are cached separately
+            StatsDataCache().get_messages(456, MONTH_START, MONTH_END)
+            # a single user's messages are filtered from the whole guild's
+            assert StatsDataCache(uid=1).get_messages(123, MONTH_START, MONTH_END) == messages
+        assert query_mock.call_count == 2
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_expires(self) -> None:
+        """Tests the cached documents are queried again after a few minutes so that new messages are included."""
+        messages = [_make_message(MONTH_START + datetime.timedelta(days=1))]
+        with (
+            mock.patch.object(UserInteractions, "paginated_query", return_value=messages) as query_mock,
+            mock.patch.object(ttlcache.time, "monotonic", return_value=1000.0) as monotonic_mock,
+        ):
+            StatsDataCache().get_messages(789, MONTH_START, MONTH_END)
+            monotonic_mock.return_value += 60
+            StatsDataCache().get_messages(789, MONTH_START, MONTH_END)
+            assert query_mock.call_count == 1
+
+            monotonic_mock.return_value += 300
+            StatsDataCache().get_messages(789, MONTH_START, MONTH_END)
+        assert query_mock.call_count == 2
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_filters_superset(self) -> None:
+        """Tests StatsDataCache filters the documents for a window from a cached larger window."""
+        in_month = _make_message(MONTH_START + datetime.timedelta(days=1))
+        other_user = _make_message(MONTH_START + datetime.timedelta(days=2), user_id=2)
+        out_of_month = _make_message(MONTH_END + datetime.timedelta(days=1))
+        with mock.patch.object(
+            UserInteractions, "paginated_query", return_value=[in_month, other_user, out_of_month]
+        ) as query_mock:
+            StatsDataCache().get_messages(123, YEAR_START, YEAR_END)
+            assert StatsDataCache().get_messages(123, MONTH_START, MONTH_END) == [in_month, other_user]
+            assert StatsDataCache(uid=1).get_messages(123, MONTH_START, MONTH_END) == [in_month]
+            # a window that's not within the cached window is queried
+            StatsDataCache().get_messages(123, MONTH_START, YEAR_END + datetime.timedelta(days=1))
+        assert query_mock.call_count == 2
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_filters_superset_arrays(self) -> None:
+        """Tests StatsDataCache filters on any of the timestamps in an array like MongoDB would."""
+        reaction = ReactionDB(user_id=2, content="👍", timestamp=MONTH_START + datetime.timedelta(days=1))
+        old_reaction = ReactionDB(user_id=2, content="👍", timestamp=YEAR_START + datetime.timedelta(days=1))
+        messages = [
+            _make_message(YEAR_START, reactions=[old_reaction, reaction]),
+            _make_message(YEAR_START, reactions=[old_reaction]),
+        ]
+        with mock.patch.object(UserInteractions, "paginated_query", return_value=messages) as query_mock:
+            StatsDataCache().get_reactions(123, YEAR_START, YEAR_END)
+            assert StatsDataCache().get_reactions(123, MONTH_START, MONTH_END) == messages[:1]
+        query_mock.assert_called_once()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_superset_user(self) -> None:
+        """Tests StatsDataCache filters a user's transactions from a cached window for everyone."""
+        transaction = TransactionDB(
+            _id=ObjectId(),
+            guild_id=123,
+            uid=1,
+            type=TransactionTypes.BET_WIN,
+            amount=1,
+            timestamp=MONTH_START + datetime.timedelta(days=1),
+        )
+        with mock.patch.object(UserTransactions, "stream_guild_transactions") as query_mock:
+            query_mock.return_value = [transaction]
+            StatsDataCache().get_transactions(123, YEAR_START, YEAR_END)
+            assert StatsDataCache(uid=1).get_transactions(123, MONTH_START, MONTH_END) == [transaction]
+            assert StatsDataCache(uid=2).get_transactions(123, MONTH_START, MONTH_END) == []
+            assert query_mock.call_count == 1
+
+            # no cached window for everyone, so we query for just the user
+            StatsDataCache(uid=1).get_transactions(456, MONTH_START, MONTH_END)
+            assert query_mock.call_args.kwargs["user_id"] == 1
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_superset_limit(self) -> None:
+        """Tests StatsDataCache doesn't filter from a cached window whose query hit its limit."""
+        bet = BetDB(
+            _id=ObjectId(),
+            guild_id=123,
+            channel_id=1,
+            message_id=1,
+            bet_id="0001",
+            user=1,
+            title="title",
+            created=MONTH_START + datetime.timedelta(days=1),
+            active=False,
+        )
+        with mock.patch.object(UserBets, "query") as query_mock:
+            query_mock.return_value = [bet]
+            StatsDataCache().get_bets(123, YEAR_START, YEAR_END)
+            assert StatsDataCache().get_bets(123, MONTH_START, MONTH_END) == [bet]
+            assert query_mock.call_count == 1
+
+            query_mock.return_value = [bet] * 10000
+            StatsDataCache().get_bets(456, YEAR_START, YEAR_END)
+            StatsDataCache().get_bets(456, MONTH_START, MONTH_END)
+            assert query_mock.call_count == 3
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def test_stats_data_cache_weight(self) -> None:
+        """Tests StatsDataCache bounds the cache on the number of cached documents."""
+        messages = [_make_message(MONTH_START + datetime.timedelta(days=1))] * 3
+        with (
+            mock.patch.object(StatsDataCache, "_cache_weight", new=4),
+            mock.patch.object(UserInteractions, "paginated_query", return_value=messages) as query_mock,
+        ):
+            StatsDataCache().get_messages(123, MONTH_START, MONTH_END)
+            StatsDataCache().get_messages(456, MONTH_START, MONTH_END)
+            StatsDataCache().get_messages(123, MONTH_START, MONTH_END)
+        assert query_mock.call_count == 3
+
     @pytest.mark.xfail
     @pytest.mark.parametrize(
         "guild_id",
@@ -47,16 +237,12 @@ class TestStatsDataCache:
         assert isinstance(messages, list)
         assert len(messages) > 0
 
-        # test that we set all this correctly
-        assert cache._message_cache is not None
-        assert cache._message_cache is messages
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_messages(guild_id, start, end) is messages
 
         messages_again = cache.get_messages(guild_id, start, end)
         assert isinstance(messages_again, list)
         # should be the same as above
-        assert messages_again is cache._message_cache
         assert messages_again is messages
 
     @pytest.mark.xfail
@@ -78,16 +264,12 @@ class TestStatsDataCache:
         assert isinstance(messages, list)
         assert len(messages) > 0
 
-        # test that we set all this correctly
-        assert cache._edit_cache is not None
-        assert cache._edit_cache is messages
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_edited_messages(guild_id, start, end) is messages
 
         messages_again = cache.get_edited_messages(guild_id, start, end)
         assert isinstance(messages_again, list)
         # should be the same as above
-        assert messages_again is cache._edit_cache
         assert messages_again is messages
 
     @pytest.mark.xfail
@@ -109,16 +291,12 @@ class TestStatsDataCache:
         assert isinstance(vcs, list)
         assert len(vcs) > 0
 
-        # test that we set all this correctly
-        assert cache._vc_cache is not None
-        assert cache._vc_cache is vcs
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_vc_interactions(guild_id, start, end) is vcs
 
         vcs_again = cache.get_vc_interactions(guild_id, start, end)
         assert isinstance(vcs_again, list)
         # should be the same as above
-        assert vcs_again is cache._vc_cache
         assert vcs_again is vcs
 
     @pytest.mark.xfail
@@ -140,16 +318,12 @@ class TestStatsDataCache:
         assert isinstance(bets, list)
         assert len(bets) > 0
 
-        # test that we set all this correctly
-        assert cache._bet_cache is not None
-        assert cache._bet_cache is bets
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_bets(guild_id, start, end) is bets
 
         bets_again = cache.get_bets(guild_id, start, end)
         assert isinstance(bets_again, list)
         # should be the same as above
-        assert bets_again is cache._bet_cache
         assert bets_again is bets
 
     @pytest.mark.xfail
@@ -171,16 +345,12 @@ class TestStatsDataCache:
         assert isinstance(users, list)
         assert len(users) > 0
 
-        # test that we set all this correctly
-        assert cache._user_cache is not None
-        assert cache._user_cache is users
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_users(guild_id, start, end) is users
 
         users_again = cache.get_users(guild_id, start, end)
         assert isinstance(users_again, list)
         # should be the same as above
-        assert users_again is cache._user_cache
         assert users_again is users
 
     @pytest.mark.xfail
@@ -202,16 +372,12 @@ class TestStatsDataCache:
         assert isinstance(transactions, list)
         assert len(transactions) > 0
 
-        # test that we set all this correctly
-        assert cache._transaction_cache is not None
-        assert cache._transaction_cache is transactions
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_transactions(guild_id, start, end) is transactions
 
         transactions_again = cache.get_transactions(guild_id, start, end)
         assert isinstance(transactions_again, list)
         # should be the same as above
-        assert transactions_again is cache._transaction_cache
         assert transactions_again is transactions
 
     @pytest.mark.xfail
@@ -233,16 +399,12 @@ class TestStatsDataCache:
         assert isinstance(activities, list)
         assert len(activities) > 0
 
-        # test that we set all this correctly
-        assert cache._activity_cache is not None
-        assert cache._activity_cache is activities
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_activities(guild_id, start, end) is activities
 
         activities_again = cache.get_activities(guild_id, start, end)
         assert isinstance(activities_again, list)
         # should be the same as above
-        assert activities_again is cache._activity_cache
         assert activities_again is activities
 
     @pytest.mark.xfail
@@ -264,16 +426,12 @@ class TestStatsDataCache:
         assert isinstance(emojis, list)
         assert len(emojis) > 0
 
-        # test that we set all this correctly
-        assert cache._emoji_cache is not None
-        assert cache._emoji_cache is emojis
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_emojis(guild_id, start, end) is emojis
 
         emojis_again = cache.get_emojis(guild_id, start, end)
         assert isinstance(emojis_again, list)
         # should be the same as above
-        assert emojis_again is cache._emoji_cache
         assert emojis_again is emojis
 
     @pytest.mark.xfail
@@ -295,9 +453,8 @@ class TestStatsDataCache:
         assert isinstance(threaded_messages, list)
         assert len(threaded_messages) > 0
 
-        # test that we set all this correctly
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_threaded_messages(guild_id, start, end) == threaded_messages
 
         threaded_messages_again = cache.get_threaded_messages(guild_id, start, end)
         assert isinstance(threaded_messages_again, list)
@@ -322,16 +479,12 @@ class TestStatsDataCache:
         reactions = cache.get_reactions(guild_id, start, end)
         assert isinstance(reactions, list)
 
-        # test that we set all this correctly
-        assert cache._reactions_cache is not None
-        assert cache._reactions_cache is reactions
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_reactions(guild_id, start, end) is reactions
 
         reactions_again = cache.get_reactions(guild_id, start, end)
         assert isinstance(reactions_again, list)
         # should be the same as above
-        assert reactions_again is cache._reactions_cache
         assert reactions_again == reactions
 
     @pytest.mark.xfail
@@ -353,14 +506,10 @@ class TestStatsDataCache:
         assert isinstance(replies, list)
         assert len(replies) > 0
 
-        # test that we set all this correctly
-        assert cache._reply_cache is not None
-        assert cache._reply_cache is replies
-        assert cache._start_cache == start
-        assert cache._end_cache == end
+        # cached for other instances too
+        assert StatsDataCache().get_replies(guild_id, start, end) is replies
 
         replies_again = cache.get_replies(guild_id, start, end)
         assert isinstance(replies_again, list)
         # should be the same as above
-        assert replies_again is cache._reply_cache
         assert replies_again is replies
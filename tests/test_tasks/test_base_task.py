@@ -0,0 +1,68 @@
+"""Tests our BaseTask class."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from discordbot.tasks.basetask import BaseTask
+from mongo import interface
+from tests.mocks import bsebot_mocks, interface_mocks
+
+
+class TestBaseTask:
+    """Tests our BaseTask class."""
+
+    @pytest.fixture(autouse=True)
+    def _test_data(self) -> None:
+        """Fixture to get test data.
+
+        Automatically called before each test.
+        """
+        self.bsebot = bsebot_mocks.BSEBotMock()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def _make_task(self) -> BaseTask:
+        """Creates the task."""
+        return BaseTask(self.bsebot, [])
+
+    async def test_for_each_guild(self) -> None:
+        """Tests processing guilds concurrently, keeping the results in the order of the guilds."""
+        task = self._make_task()
+
+        async def _process(guild_id: int) -> int:
+            # the first guild finishes last
+            await asyncio.sleep(0.01 if guild_id == 1 else 0)
+            return guild_id * 10
+
+        assert await task.for_each_guild([1, 2, 3], _process) == {1: 10, 2: 20, 3: 30}
+
+    async def test_for_each_guild_limit(self) -> None:
+        """Tests only processing so many guilds at once."""
+        task = self._make_task()
+        running = 0
+        most_running = 0
+
+        async def _process(_: int) -> None:
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        await task.for_each_guild(range(10), _process, limit=3)
+        assert most_running == 3
+
+    async def test_for_each_guild_failure(self) -> None:
+        """Tests a guild failing doesn't stop the other guilds being processed."""
+        task = self._make_task()
+
+        async def _process(guild_id: int) -> int:  # noqa: RUF029
+            if guild_id == 2:
+                raise ValueError
+            return guild_id
+
+        with mock.patch.object(task, "logger") as logger_mock:
+            assert await task.for_each_guild([1, 2, 3], _process) == {1: 1, 3: 3}
+        logger_mock.exception.assert_called_once()
@@ -5,12 +5,16 @@ from unittest import mock
 from zoneinfo import ZoneInfo
 
 import pytest
+from bson import ObjectId
+from freezegun import freeze_time
 
 from discordbot.slashcommandeventclasses.close import CloseBet
 from discordbot.slashcommandeventclasses.place import PlaceBet
 from discordbot.tasks.betcloser import BetCloser
+from discordbot.tasks.scheduler import Scheduler
 from mongo import interface
 from mongo.bsepoints.bets import UserBets
+from mongo.datatypes.bet import BetDB
 from tests.mocks import bsebot_mocks, interface_mocks
 
 
@@ -53,5 +57,103 @@ class TestBetCloser:
             bet["active"] = True
             bet["timeout"] = datetime.datetime.now(tz=ZoneInfo("UTC")) - datetime.timedelta(days=2)
         bets = [UserBets.make_data_class(b) for b in bet_datas]
-        with mock.patch.object(closer.user_bets, "get_all_active_bets", return_value=bets):
+        for bet in bets:
+            with mock.patch.object(closer.user_bets, "get_bet_from_id", return_value=bet):
+                await closer.close_bet(bet.guild_id, bet.bet_id)
+
+
+class TestBetCloserTimers:
+    """Tests our BetCloser scheduling timers for bets."""
+
+    @pytest.fixture(autouse=True)
+    def _test_data(self) -> None:
+        """Fixture to get test data.
+
+        Automatically called before each test.
+        """
+        self.bsebot = bsebot_mocks.BSEBotMock()
+
+    @staticmethod
+    def _make_bet(timeout: datetime.datetime | None, active: bool = True) -> BetDB:
+        """Creates a bet with the given timeout."""
+        return UserBets.make_data_class({
+            "_id": ObjectId(),
+            "guild_id": 123,
+            "bet_id": "0001",
+            "user": 456,
+            "title": "some title",
+            "options": ["1️⃣", "2️⃣"],
+            "created": datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+            "timeout": timeout,
+            "active": active,
+            "result": None,
+            "betters": {},
+            "option_dict": {},
+            "channel_id": 1,
+            "message_id": 2,
+        })
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def _make_closer(self) -> BetCloser:
+        """Creates a BetCloser with a scheduler."""
+        closer = BetCloser(self.bsebot, [], PlaceBet(self.bsebot), CloseBet(self.bsebot))
+        closer.scheduler = Scheduler()
+        return closer
+
+    def test_schedule_bet(self) -> None:
+        """Tests scheduling a bet's timer replaces any existing timer for it."""
+        closer = self._make_closer()
+        timeout = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC)
+        closer._schedule_bet(self._make_bet(timeout))
+        closer._schedule_bet(self._make_bet(timeout + datetime.timedelta(hours=1)))
+        assert len(closer.scheduler) == 1
+        assert ("bet", 123, "0001") in closer.scheduler
+        assert closer.scheduler.next_due() == timeout + datetime.timedelta(hours=1)
+
+    def test_schedule_bet_no_timeout(self) -> None:
+        """Tests we don't schedule timers for bets without a timeout or that aren't active."""
+        closer = self._make_closer()
+        closer._schedule_bet(self._make_bet(None))
+        closer._schedule_bet(self._make_bet(datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC), active=False))
+        assert not len(closer.scheduler)
+
+    async def test_bet_closer(self) -> None:
+        """Tests the task schedules all the active bets and clears the startup override."""
+        closer = self._make_closer()
+        bet = self._make_bet(datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC))
+        with mock.patch.object(closer.user_bets, "get_all_active_bets", return_value=[bet]) as active_mock:
             await closer.bet_closer()
+        assert active_mock.call_count == len(self.bsebot.guilds)
+        assert ("bet", 123, "0001") in closer.scheduler
+        assert not closer.schedule.overriden
+
+    async def test_on_bet_timeout_set(self) -> None:
+        """Tests the listener schedules the bet."""
+        closer = self._make_closer()
+        await closer.on_bet_timeout_set(self._make_bet(datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC)))
+        assert ("bet", 123, "0001") in closer.scheduler
+
+    @freeze_time("2024/01/01 12:00")
+    async def test_close_bet_extended(self) -> None:
+        """Tests closing a bet whose timeout has been extended reschedules it instead."""
+        closer = self._make_closer()
+        bet = self._make_bet(datetime.datetime(2024, 1, 1, 13, tzinfo=datetime.UTC))
+        with (
+            mock.patch.object(closer.user_bets, "get_bet_from_id", return_value=bet),
+            mock.patch.object(closer.user_bets, "update") as update_mock,
+        ):
+            await closer.close_bet(123, "0001")
+        update_mock.assert_not_called()
+        assert closer.scheduler.next_due() == bet.timeout
+
+    async def test_close_bet_inactive(self) -> None:
+        """Tests closing a bet that's already been closed does nothing."""
+        closer = self._make_closer()
+        bet = self._make_bet(datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC), active=False)
+        with (
+            mock.patch.object(closer.user_bets, "get_bet_from_id", return_value=bet),
+            mock.patch.object(closer.user_bets, "update") as update_mock,
+        ):
+            await closer.close_bet(123, "0001")
+        update_mock.assert_not_called()
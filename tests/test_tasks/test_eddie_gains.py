@@ -8,14 +8,17 @@ from unittest import mock
 from zoneinfo import ZoneInfo
 
 import pytest
+from bson import ObjectId
 from freezegun import freeze_time
 
-from discordbot.constants import HUMAN_MESSAGE_TYPES
+from discordbot.constants import HUMAN_MESSAGE_TYPES, WORDLE_VALUES
 from discordbot.tasks.eddiegains import BSEddiesManager, EddieGainMessager
 from mongo import interface
 from mongo.bsepoints.guilds import Guilds
 from mongo.bsepoints.points import UserPoints
+from mongo.datatypes.message import MessageDB, ReactionDB, ReplyDB, VCInteractionDB
 from mongo.datatypes.user import UserDB
+from mongo.salarytally import GuildDayTally, SalaryTally
 from tests.mocks import bsebot_mocks, interface_mocks, task_mocks
 
 
@@ -236,6 +239,199 @@ class TestBSEddiesManager:
         eddies = manager._calc_eddies(counter, start)
         assert eddies == expected
 
+    def test_bucket_interactions(self) -> None:
+        """Tests our _bucket_interactions method."""
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        messages = [
+            MessageDB(_id=ObjectId(), guild_id=1, channel_id=1, message_id=num, user_id=num % 2, timestamp=now)
+            for num in range(4)
+        ]
+        reacted = MessageDB(
+            _id=ObjectId(),
+            guild_id=1,
+            channel_id=1,
+            message_id=5,
+            user_id=1,
+            timestamp=now,
+            reactions=[
+                ReactionDB(user_id=2, content="a", timestamp=now),
+                ReactionDB(user_id=2, content="b", timestamp=now),
+                ReactionDB(user_id=3, content="a", timestamp=now),
+            ],
+        )
+        results, user_reacted, user_reactions = BSEddiesManager._bucket_interactions(messages, [reacted])
+        assert results == {0: [messages[0], messages[2]], 1: [messages[1], messages[3]]}
+        assert user_reacted == {1: [reacted]}
+        assert user_reactions == {2: [reacted], 3: [reacted]}
+
+    def test_calc_individual_emoji_names(self) -> None:
+        """Tests our calc_individual method uses the given emoji names rather than querying."""
+        manager = BSEddiesManager(self.bsebot, [])
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        start = now - datetime.timedelta(days=1)
+        user_db = UserDB(_id=ObjectId(), uid=1, guild_id=1, name="name", points=10, king=False, daily_minimum=4)
+        reacted = MessageDB(
+            _id=ObjectId(),
+            guild_id=1,
+            channel_id=1,
+            message_id=1,
+            user_id=2,
+            timestamp=now,
+            reactions=[
+                ReactionDB(user_id=1, content="custom", timestamp=now),
+                ReactionDB(user_id=1, content="other", timestamp=now),
+            ],
+        )
+        with mock.patch.object(manager.server_emojis, "get_emoji_from_name") as emoji_mock:
+            _, breakdown = manager.calc_individual(
+                1, user_db, [], [], [reacted], start, now + datetime.timedelta(days=1), 1, emoji_names={"custom"}
+            )
+        emoji_mock.assert_not_called()
+        assert breakdown["custom_emoji_reaction"] == 1
+
+    def test_salary_tally_matches_database(self) -> None:
+        """Tests the live salary tally gives the same salaries as counting the interactions from the database."""
+        manager = BSEddiesManager(self.bsebot, [])
+        now = datetime.datetime(2024, 1, 2, 12, tzinfo=ZoneInfo("UTC"))
+        start = now.replace(hour=0, minute=0, second=0)
+        end = now.replace(hour=23, minute=59, second=59)
+        later = now + datetime.timedelta(minutes=1)
+
+        def _message(message_id: int, user_id: int, message_type: list[str], content: str, **kwargs: any) -> MessageDB:
+            return MessageDB(
+                _id=ObjectId(),
+                guild_id=1,
+                channel_id=1,
+                message_id=message_id,
+                user_id=user_id,
+                timestamp=now,
+                content=content,
+                message_type=message_type,
+                **kwargs,
+            )
+
+        reactions = [
+            ReactionDB(user_id=2, content="custom", timestamp=now),
+            ReactionDB(user_id=3, content="custom", timestamp=later),
+        ]
+        replies = [ReplyDB(user_id=2, content="reply", timestamp=later, message_id=2)]
+        first = _message(1, 1, ["message", "wordle"], "Wordle 1,000 3/6 crane", reactions=reactions, replies=replies)
+        reply = _message(2, 2, ["message", "reply"], "reply")
+        vc = VCInteractionDB(
+            _id=ObjectId(),
+            guild_id=1,
+            channel_id=2,
+            message_id=None,
+            user_id=3,
+            timestamp=now,
+            message_type=["vc_joined", "vc_streaming"],
+            time_in_vc=60,
+            time_streaming=30,
+        )
+
+        with mock.patch.object(manager.interactions, "query", side_effect=[[first, reply, vc], [first]]):
+            database = manager._count_interactions(1, start, end, "crane", {"custom"}).users
+
+        tally = SalaryTally(now - datetime.timedelta(days=1))
+        tally.add_entry(1, 1, 1, first.message_type, first.content, now)
+        tally.add_reaction(1, 1, 1, 2, "custom", now, _message(1, 1, first.message_type, first.content))
+        tally.add_reaction(1, 1, 1, 3, "custom", later)
+        tally.add_entry(1, 2, 2, reply.message_type, reply.content, now)
+        tally.add_reply(1, first.message_id, first.user_id, first.timestamp, 2)
+        tally.update_vc_session(1, 3, vc._id, now, 60, 30, True)
+        tally.set_wordle_word(1, now.date(), "crane")
+        live = tally.get_counters(1, now.date())
+
+        for user in (1, 2, 3):
+            user_db = UserDB(_id=ObjectId(), uid=user, guild_id=1, name="name", points=10, king=False)
+            expected = manager.calc_salary(user, user_db, database[user], 1, emoji_names={"custom"}, server_min=4)
+            assert manager.calc_salary(user, user_db, live[user], 1, emoji_names={"custom"}, server_min=4) == expected
+            assert live[user].wordle == database[user].wordle
+
+    @freeze_time("2024-01-02 12:00:00")
+    def test_get_salary_counters(self) -> None:
+        """Tests giving out eddies always counts from the database and predictions use the salary tally."""
+        manager = BSEddiesManager(self.bsebot, [])
+        start, _ = manager.get_datetime_objects(1)
+        tally = SalaryTally(start)
+        today, today_end = manager.get_datetime_objects(0)
+        tally.add_entry(1, 1, 2, ["message"], "content", today)
+
+        with (
+            mock.patch.object(manager.interactions, "salary_tally", new=tally),
+            mock.patch.object(manager, "_count_interactions") as count_mock,
+        ):
+            # even though we've tallied all of today
+            manager.get_salary_counters(1, today, today_end, None, set(), real=True)
+            count_mock.assert_called_once_with(1, today, today_end, None, set())
+            count_mock.reset_mock()
+
+            counters = manager.get_salary_counters(1, today, today_end, None, set())
+            count_mock.assert_not_called()
+        assert counters[1].message_types == {"message": 1}
+
+    @freeze_time("2024-01-02 12:00:00")
+    def test_get_salary_counters_seeded(self) -> None:
+        """Tests predictions seed the salary tally with the interactions before we started seeding."""
+        manager = BSEddiesManager(self.bsebot, [])
+        today, today_end = manager.get_datetime_objects(0)
+        tally = SalaryTally(today + datetime.timedelta(hours=1))
+
+        with (
+            mock.patch.object(manager.interactions, "salary_tally", new=tally),
+            mock.patch.object(manager, "_count_interactions", return_value=GuildDayTally()) as count_mock,
+        ):
+            manager.get_salary_counters(1, today, today_end, None, set())
+        now = datetime.datetime.now(tz=ZoneInfo("UTC"))
+        count_mock.assert_called_once_with(1, today, now, None, set())
+
+    @freeze_time("2024-01-02 12:00:00")
+    @pytest.mark.parametrize(("user_id", "wordle_win"), [(1, True), (2, False), (3, False)])
+    def test_predict_salary(self, user_id: int, wordle_win: bool) -> None:
+        """Tests predicting a single user's salary only prices that user."""
+        manager = BSEddiesManager(self.bsebot, [])
+        start, _ = manager.get_datetime_objects(1)
+        today, _ = manager.get_datetime_objects(0)
+        tally = SalaryTally(start)
+        tally.add_entry(1, 1, 1, ["message", "wordle"], "Wordle 1,000 3/6", today)
+        tally.add_entry(1, 2, 2, ["message", "wordle"], "Wordle 1,000 4/6", today)
+        tally.add_entry(1, 3, 3, ["message"], "content", today)
+        user_db = UserDB(_id=ObjectId(), uid=user_id, guild_id=1, name="name", points=10, king=False)
+
+        with (
+            mock.patch.object(manager.interactions, "salary_tally", new=tally),
+            mock.patch.object(manager.interactions, "query", return_value=[]),
+            mock.patch.object(manager.user_points, "find_user", return_value=user_db),
+            mock.patch.object(manager.user_points, "get_all_users_for_guild") as all_users_mock,
+            mock.patch.object(manager.guilds, "get_daily_minimum", return_value=4),
+            mock.patch.object(manager.guilds, "get_tax_rate", return_value=(0.1, 0.0)),
+            mock.patch.object(manager.server_emojis, "get_all_emojis", return_value=[]),
+            mock.patch.object(manager.wordles, "find_wordles_at_timestamp", return_value=None),
+        ):
+            eddies, breakdown, tax = manager.predict_salary(1, user_id, 4)
+
+        all_users_mock.assert_not_called()
+        counters = tally.get_counters(1, today.date())[user_id]
+        expected, _ = manager.calc_salary(user_id, user_db, counters, 1, emoji_names=set(), server_min=4)
+        if counters.wordle is not None:
+            expected += WORDLE_VALUES[int(counters.wordle.split(" ")[-1][0])]
+        if wordle_win:
+            expected += 5
+        assert breakdown.get("wordle_win") == (1 if wordle_win else None)
+        assert tax == int(expected * 0.1)
+        assert eddies == expected - tax
+
+    def test_predict_salary_king(self) -> None:
+        """Tests predicting the king's salary works out everyone's salary for the tax gains."""
+        manager = BSEddiesManager(self.bsebot, [])
+        with (
+            mock.patch.object(manager, "give_out_eddies", return_value={1: [10, {"message": 1}, 5]}) as give_mock,
+            mock.patch.object(manager.user_points, "find_user") as find_mock,
+        ):
+            assert manager.predict_salary(1, 1, 1) == (10, {"message": 1}, 5)
+        give_mock.assert_called_once_with(1, False, 0)
+        find_mock.assert_not_called()
+
     @pytest.mark.parametrize(
         ("guild_id", "date"),
         [
@@ -1,12 +1,17 @@
 """Tests our guild checker task."""
 
+import datetime
 import operator
 from unittest import mock
 
 import pytest
+from freezegun import freeze_time
+from pymongo.errors import AutoReconnect
 
+from discordbot.bot_enums import ActivityTypes
 from discordbot.tasks.guildchecker import GuildChecker
 from mongo import interface
+from mongo.baseclass import BaseClass
 from mongo.datatypes.guild import GuildDB
 from tests.mocks import bsebot_mocks, discord_mocks, interface_mocks, slashcommand_mocks
 
@@ -88,6 +93,45 @@ class TestGuildChecker:
         guild = discord_mocks.GuildMock(guild_data["guild_id"], guild_data["owner_id"], guild_data["name"])
         await checker._check_guild_members(guild)
 
+    @pytest.mark.parametrize(
+        ("member_ids", "joined", "renamed", "left"),
+        [
+            ([1, 2, 3, 5], {5: "5"}, {2: "2"}, {4}),
+            ([1, 3], {}, {}, {2, 4}),
+            ([], {}, {}, set()),
+        ],
+    )
+    async def test_check_guild_members_changes(
+        self, member_ids: list[int], joined: dict[int, str], renamed: dict[int, str], left: set[int]
+    ) -> None:
+        """Tests that we work out who joined, was renamed or left and apply it all at once."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        members = [mock.Mock(id=uid, nick=None, bot=False) for uid in member_ids]
+        for member in members:
+            member.name = str(member.id)
+        if members:
+            members.append(mock.Mock(id=6, nick=None, bot=True))
+        guild = mock.Mock(id=123)
+        guild.fetch_members.return_value.flatten = mock.AsyncMock(return_value=members)
+        # user 1 has the same name, 2 has an old name, 3 has already left and 4 is still active
+        users = {1: ("1", False), 2: ("old", False), 3: ("3", True), 4: ("4", False)}
+        with (
+            mock.patch.object(checker.user_points, "get_guild_user_states", return_value=users),
+            mock.patch.object(checker.user_points, "sync_guild_members") as sync_mock,
+            mock.patch.object(checker.activities, "add_activities") as activities_mock,
+        ):
+            await checker._check_guild_members(guild)
+
+        if not (joined or renamed or left):
+            sync_mock.assert_not_called()
+            activities_mock.assert_not_called()
+            return
+        sync_mock.assert_called_once_with(123, joined, renamed, left)
+        assert activities_mock.call_args_list == [
+            mock.call(joined, 123, ActivityTypes.SERVER_JOIN),
+            mock.call(left, 123, ActivityTypes.SERVER_LEAVE),
+        ]
+
     @pytest.mark.parametrize(
         "guild_data", sorted(interface_mocks.query_mock("guilds", {}), key=operator.itemgetter("guild_id"))
     )
@@ -202,3 +246,87 @@ class TestGuildChecker:
         checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
         checker.finished = True
         await checker.guild_checker()
+
+    def test_check_indexes(self) -> None:
+        """Tests that we create the indexes and log any collection scans."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        with (
+            mock.patch.object(BaseClass, "ensure_indexes", return_value={"key_1": "conflict"}) as ensure_mock,
+            mock.patch.object(BaseClass, "find_collection_scans", return_value=[{"key": 1}]) as scans_mock,
+            mock.patch.object(checker, "logger") as logger_mock,
+        ):
+            checker._check_indexes()
+        assert ensure_mock.call_count == 9
+        assert scans_mock.call_count == 9
+        assert logger_mock.warning.call_count == 18
+
+    @pytest.mark.parametrize("count", [0, 5])
+    def test_check_bet_users(self, count: int) -> None:
+        """Tests that we backfill the users of the bets and log how many were updated."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        with (
+            mock.patch.object(checker.user_bets, "backfill_users", return_value=count) as backfill_mock,
+            mock.patch.object(checker, "logger") as logger_mock,
+        ):
+            checker._check_bet_users()
+        backfill_mock.assert_called_once_with()
+        assert logger_mock.info.call_count == bool(count)
+
+    @pytest.mark.parametrize(
+        ("checkpoint", "timestamp"),
+        [
+            (None, {"$lt": datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC)}),
+            (
+                datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+                {
+                    "$lt": datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC),
+                    "$gte": datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+                },
+            ),
+        ],
+    )
+    @freeze_time("2024-01-02 12:00:00")
+    def test_check_daily_stats(self, checkpoint: datetime.datetime | None, timestamp: dict) -> None:
+        """Tests that we backfill the days before today from the checkpoint and then move it up to today."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        daily_stats = checker.interactions.daily_stats
+        with (
+            mock.patch.object(checker.data_store, "get_daily_stats_checkpoint", return_value=checkpoint),
+            mock.patch.object(checker.data_store, "set_daily_stats_checkpoint") as set_mock,
+            mock.patch.object(daily_stats, "rebuild", return_value=5) as rebuild_mock,
+            mock.patch.object(checker.interactions, "paginated_query", return_value=[]) as query_mock,
+        ):
+            checker._check_daily_stats(123)
+        rebuild_mock.assert_called_once_with(123, [])
+        assert query_mock.call_args.args[0]["timestamp"] == timestamp
+        set_mock.assert_called_once_with(123, datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC))
+
+    @freeze_time("2024-01-02 12:00:00")
+    def test_check_daily_stats_up_to_date(self) -> None:
+        """Tests that we don't backfill anything if the counters were already backfilled today."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        daily_stats = checker.interactions.daily_stats
+        with (
+            mock.patch.object(
+                checker.data_store,
+                "get_daily_stats_checkpoint",
+                return_value=datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC),
+            ),
+            mock.patch.object(daily_stats, "rebuild") as rebuild_mock,
+        ):
+            checker._check_daily_stats(123)
+        rebuild_mock.assert_not_called()
+
+    def test_check_daily_stats_failed(self) -> None:
+        """Tests that we don't move the checkpoint up if the backfill fails."""
+        checker = GuildChecker(self.bsebot, [], self.place, self.close, start=False)
+        daily_stats = checker.interactions.daily_stats
+        with (
+            mock.patch.object(checker.data_store, "get_daily_stats_checkpoint", return_value=None),
+            mock.patch.object(checker.data_store, "set_daily_stats_checkpoint") as set_mock,
+            mock.patch.object(daily_stats, "rebuild", side_effect=AutoReconnect),
+            mock.patch.object(checker.interactions, "paginated_query", return_value=[]),
+            pytest.raises(AutoReconnect),
+        ):
+            checker._check_daily_stats(123)
+        set_mock.assert_not_called()
@@ -0,0 +1,136 @@
+"""Tests our MessageSync task."""
+
+import datetime
+from collections.abc import AsyncGenerator
+from unittest import mock
+
+import discord
+import pytest
+from freezegun import freeze_time
+
+from discordbot.tasks.messagesync import MessageSync
+from mongo import interface
+from tests.mocks import bsebot_mocks, interface_mocks
+
+NOW = datetime.datetime(2024, 1, 15, 12, tzinfo=datetime.UTC)
+
+
+def _make_message(message_id: int, created_at: datetime.datetime) -> mock.MagicMock:
+    """Creates a message."""
+    message = mock.MagicMock()
+    message.id = message_id
+    message.created_at = created_at
+    return message
+
+
+def _make_channel(messages: list[mock.MagicMock], channel_id: int = 1) -> mock.MagicMock:
+    """Creates a channel with the given message history."""
+    channel = mock.MagicMock(spec=discord.TextChannel)
+    channel.id = channel_id
+    channel.name = f"channel-{channel_id}"
+    channel.guild.id = 123
+    channel.threads = []
+
+    def _history(
+        after: datetime.datetime | None = None, before: datetime.datetime | None = None, **_: any
+    ) -> AsyncGenerator[mock.MagicMock]:
+        async def _iterate() -> AsyncGenerator[mock.MagicMock]:  # noqa: RUF029
+            for message in sorted(messages, key=lambda message: message.created_at):
+                if (after is None or message.created_at > after) and (before is None or message.created_at < before):
+                    yield message
+
+        return _iterate()
+
+    channel.history = mock.MagicMock(side_effect=_history)
+    return channel
+
+
+class TestMessageSync:
+    """Tests our MessageSync class."""
+
+    @pytest.fixture(autouse=True)
+    def _test_data(self) -> None:
+        """Fixture to get test data.
+
+        Automatically called before each test.
+        """
+        self.bsebot = bsebot_mocks.BSEBotMock()
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def _make_task(self) -> MessageSync:
+        """Creates the task with mocked database writes."""
+        task = MessageSync(self.bsebot, [], mock.AsyncMock())
+        task.interactions = mock.MagicMock()
+        task.interactions.run_async = mock.AsyncMock(side_effect=lambda func, *args: func(*args))
+        task.interactions.get_message_ids.return_value = set()
+        task.data_store = mock.MagicMock()
+        task.data_store.run_async = mock.AsyncMock(side_effect=lambda func, *args: func(*args))
+        return task
+
+    async def test_get_unsynced_messages(self) -> None:
+        """Tests streaming the unsynced messages in batches, oldest first."""
+        messages = [_make_message(num, NOW - datetime.timedelta(minutes=num)) for num in range(5)]
+        channel = _make_channel(messages)
+        batches = [batch async for batch in MessageSync.get_unsynced_messages(channel, {1}, batch_size=2)]
+        assert [[message.id for message in batch] for batch in batches] == [[4, 3], [2, 0]]
+
+    @freeze_time(NOW)
+    async def test_message_sync_checkpoint(self) -> None:
+        """Tests resuming from the checkpoint and moving it on once synced."""
+        task = self._make_task()
+        checkpoint = NOW - datetime.timedelta(days=1)
+        messages = [
+            _make_message(1, NOW - datetime.timedelta(days=2)),
+            _make_message(2, NOW - datetime.timedelta(hours=1)),
+        ]
+        task.interactions.get_message_ids.return_value = set()
+        channel = _make_channel(messages)
+
+        await task._message_sync(channel, checkpoint)
+
+        task.interactions.get_message_ids.assert_called_once_with(123, 1, checkpoint, NOW)
+        task.on_message.message_received.assert_awaited_once_with(messages[1], False, False)
+        task.interactions.flush.assert_called_once()
+        task.data_store.set_message_sync_checkpoint.assert_called_once_with(123, 1, NOW)
+
+    @freeze_time(NOW)
+    async def test_message_sync_no_checkpoint(self) -> None:
+        """Tests going further back while we keep finding unsynced messages without a checkpoint."""
+        task = self._make_task()
+        messages = [
+            _make_message(1, NOW - datetime.timedelta(days=1)),
+            _make_message(2, NOW - datetime.timedelta(days=20)),
+        ]
+        channel = _make_channel(messages)
+
+        await task._message_sync(channel)
+
+        windows = [call.args[2:] for call in task.interactions.get_message_ids.call_args_list]
+        assert windows == [
+            (NOW - datetime.timedelta(days=7), NOW),
+            (NOW - datetime.timedelta(days=37), NOW - datetime.timedelta(days=7)),
+            (NOW - datetime.timedelta(days=67), NOW - datetime.timedelta(days=37)),
+        ]
+        assert task.on_message.message_received.await_count == 2
+        task.data_store.set_message_sync_checkpoint.assert_called_once_with(123, 1, NOW)
+
+    @freeze_time(NOW)
+    async def test_message_sync_task(self) -> None:
+        """Tests syncing all the channels, even if we can't access some of them."""
+        task = self._make_task()
+        task.data_store.get_message_sync_checkpoints.return_value = {2: NOW}
+        forbidden = _make_channel([], 1)
+        forbidden.history.side_effect = discord.Forbidden(mock.MagicMock(), "forbidden")
+        channel = _make_channel([_make_message(1, NOW - datetime.timedelta(hours=1))], 2)
+        guild = mock.MagicMock()
+        guild.id = 123
+
+        with (
+            mock.patch.object(type(self.bsebot), "guilds", new=[guild]),
+            mock.patch.object(task, "_get_channels", return_value=[forbidden, channel]),
+        ):
+            await task.message_sync()
+
+        task.data_store.set_message_sync_checkpoint.assert_called_once_with(123, 2, NOW)
+        assert not task.schedule.overriden
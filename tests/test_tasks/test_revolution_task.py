@@ -227,6 +227,31 @@ class TestBSEddiesRevolutionTask:
         ):
             await task.resolve_revolution(event.guild_id, event)
 
+    @pytest.mark.parametrize("event_data", interface_mocks.query_mock("ticketedevents", {})[-1:])
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    @mock.patch.object(interface, "query", new=interface_mocks.query_mock)
+    @mock.patch.object(interface, "update", new=interface_mocks.update_mock)
+    @mock.patch.object(interface, "insert", new=interface_mocks.insert_mock)
+    async def test_resolve_revolution_success_duplicate_revolutionaries(self, event_data: dict) -> None:
+        """Tests the eddies are split evenly between each revolutionary, even if they're in the list twice."""
+        task = RevolutionTask(self.bsebot, [])
+
+        event_data = copy.deepcopy(event_data)
+        event_data["chance"] = 100
+        event_data["locked_in_eddies"] = 1000
+        event_data["supporters"] = []
+        event_data["revolutionaries"] = [1, 2, 1]
+        event = RevolutionEvent.make_data_class(event_data)
+        task.rev_started[event.guild_id] = True
+
+        with (
+            mock.patch.object(task.giphy_api, "random_gif"),
+            mock.patch.object(task.user_points, "increment_points_many") as increment_mock,
+        ):
+            await task.resolve_revolution(event.guild_id, event)
+        assert increment_mock.call_args.args[1] == {1: 250, 2: 250}
+
     @pytest.mark.parametrize("event_data", interface_mocks.query_mock("ticketedevents", {})[-1:])
     @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
     @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
@@ -0,0 +1,79 @@
+"""Tests our Scheduler class."""
+
+import asyncio
+import datetime
+from unittest import mock
+
+from discordbot.tasks.scheduler import Scheduler
+
+NOW = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC)
+
+
+class TestScheduler:
+    """Tests our Scheduler class."""
+
+    def test_schedule(self) -> None:
+        """Tests scheduling timers orders them by when they're due."""
+        scheduler = Scheduler()
+        assert scheduler.next_due() is None
+        scheduler.schedule(NOW + datetime.timedelta(minutes=5), "later", mock.AsyncMock())
+        scheduler.schedule(NOW, "sooner", mock.AsyncMock())
+        assert len(scheduler) == 2
+        assert "sooner" in scheduler
+        assert scheduler.next_due() == NOW
+
+    def test_schedule_replaces(self) -> None:
+        """Tests scheduling a timer with the same key replaces the existing timer."""
+        scheduler = Scheduler()
+        first = mock.AsyncMock()
+        second = mock.AsyncMock()
+        scheduler.schedule(NOW, "key", first)
+        scheduler.schedule(NOW + datetime.timedelta(minutes=5), "key", second)
+        assert len(scheduler) == 1
+        assert scheduler.next_due() == NOW + datetime.timedelta(minutes=5)
+        assert not scheduler.pop_due(NOW)
+        assert scheduler.pop_due(NOW + datetime.timedelta(minutes=5)) == [second]
+
+    def test_cancel(self) -> None:
+        """Tests cancelling a timer."""
+        scheduler = Scheduler()
+        scheduler.schedule(NOW, "key", mock.AsyncMock())
+        scheduler.cancel("key")
+        scheduler.cancel("missing")
+        assert not len(scheduler)
+        assert scheduler.next_due() is None
+
+    def test_pop_due(self) -> None:
+        """Tests popping the due timers returns them in the order they were due."""
+        scheduler = Scheduler()
+        callbacks = [mock.AsyncMock() for _ in range(3)]
+        for num, callback in enumerate(callbacks):
+            scheduler.schedule(NOW - datetime.timedelta(minutes=num), num, callback)
+        scheduler.schedule(NOW + datetime.timedelta(minutes=1), "later", mock.AsyncMock())
+        assert scheduler.pop_due(NOW) == callbacks[::-1]
+        assert len(scheduler) == 1
+
+    async def test_run_pending(self) -> None:
+        """Tests running the due timers, even if one of them fails."""
+        scheduler = Scheduler()
+        failing = mock.AsyncMock(side_effect=ValueError)
+        callback = mock.AsyncMock()
+        scheduler.schedule(NOW, "failing", failing)
+        scheduler.schedule(NOW, "callback", callback)
+        await scheduler.run_pending()
+        failing.assert_awaited_once()
+        callback.assert_awaited_once()
+        assert not len(scheduler)
+
+    async def test_run_pending_wakes_up(self) -> None:
+        """Tests that scheduling a timer wakes up the scheduler if it's waiting."""
+        scheduler = Scheduler()
+        waiting = asyncio.create_task(scheduler.run_pending())
+        await asyncio.sleep(0)
+        callback = mock.AsyncMock()
+        scheduler.schedule(NOW, "key", callback)
+        await asyncio.wait_for(waiting, 1)
+        # woken up to recalculate when to wake up next, this then runs the new timer
+        callback.assert_not_awaited()
+        await asyncio.wait_for(scheduler.run_pending(), 1)
+        callback.assert_awaited_once()
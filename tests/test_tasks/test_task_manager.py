@@ -0,0 +1,178 @@
+"""Tests our TaskManager task and task schedules."""
+
+import datetime
+from unittest import mock
+
+import pytest
+from discord.ext import tasks
+from freezegun import freeze_time
+
+from discordbot.tasks.basetask import TaskSchedule
+from discordbot.tasks.taskmanager import TaskManager
+from mongo import interface
+from tests.mocks import bsebot_mocks, interface_mocks
+
+# a Monday
+NOW = datetime.datetime(2024, 1, 1, 12, 0, 30, tzinfo=datetime.UTC)
+
+
+class TestTaskSchedule:
+    """Tests our TaskSchedule class."""
+
+    @pytest.mark.parametrize(
+        ("schedule", "expected"),
+        [
+            (TaskSchedule(range(7), range(24)), True),
+            (TaskSchedule([0], [12]), True),
+            (TaskSchedule([1], [12]), False),
+            (TaskSchedule([], [12], 0), True),
+            (TaskSchedule([], [12], 30), False),
+            (TaskSchedule([], [11, 13]), False),
+            (TaskSchedule([], [12], dates=[datetime.datetime(2021, 1, 1)]), True),
+            (TaskSchedule([], [12], dates=[datetime.datetime(2021, 2, 1)]), False),
+        ],
+    )
+    def test_matches(self, schedule: TaskSchedule, expected: bool) -> None:
+        """Tests TaskSchedule matches."""
+        assert schedule.matches(NOW) == expected
+
+    @pytest.mark.parametrize(
+        ("schedule", "expected"),
+        [
+            # always or never running
+            (TaskSchedule(range(7), range(24)), None),
+            (TaskSchedule([], range(24)), None),
+            (TaskSchedule(range(7), []), None),
+            # running now so when it stops
+            (TaskSchedule(range(7), [12, 13]), datetime.datetime(2024, 1, 1, 14, tzinfo=datetime.UTC)),
+            (TaskSchedule([0], range(24)), datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC)),
+            (TaskSchedule([], [12], 0), datetime.datetime(2024, 1, 1, 12, 1, tzinfo=datetime.UTC)),
+            # not running now so when it next starts
+            (TaskSchedule(range(7), [12], 30), datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.UTC)),
+            (TaskSchedule(range(7), [7], 30), datetime.datetime(2024, 1, 2, 7, 30, tzinfo=datetime.UTC)),
+            (TaskSchedule([6], [16], 0), datetime.datetime(2024, 1, 7, 16, tzinfo=datetime.UTC)),
+            (
+                TaskSchedule([], [11], 15, dates=[datetime.datetime(2021, x, 1) for x in range(1, 13)]),
+                datetime.datetime(2024, 2, 1, 11, 15, tzinfo=datetime.UTC),
+            ),
+            (
+                TaskSchedule([], [14], 15, dates=[datetime.datetime(2021, 1, 1)]),
+                datetime.datetime(2024, 1, 1, 14, 15, tzinfo=datetime.UTC),
+            ),
+            (
+                TaskSchedule([], [10], 15, dates=[datetime.datetime(2021, 1, 1)]),
+                datetime.datetime(2025, 1, 1, 10, 15, tzinfo=datetime.UTC),
+            ),
+            # a date later in the year
+            (
+                TaskSchedule([], [10], dates=[datetime.datetime(2021, 2, 28)]),
+                datetime.datetime(2024, 2, 28, 10, tzinfo=datetime.UTC),
+            ),
+        ],
+    )
+    def test_next_change(self, schedule: TaskSchedule, expected: datetime.datetime | None) -> None:
+        """Tests TaskSchedule next_change."""
+        assert schedule.next_change(NOW) == expected
+
+    def test_next_change_dates(self) -> None:
+        """Tests TaskSchedule next_change checks the months and days of dates separately."""
+        schedule = TaskSchedule([], [10], dates=[datetime.datetime(2021, 2, 1), datetime.datetime(2021, 1, 31)])
+        # matches the 31st of January as well as the 1st of February
+        assert schedule.next_change(NOW) == datetime.datetime(2024, 1, 31, 10, tzinfo=datetime.UTC)
+
+
+class TestTaskManager:
+    """Tests our TaskManager class."""
+
+    @pytest.fixture(autouse=True)
+    def _test_data(self) -> None:
+        """Fixture to get test data.
+
+        Automatically called before each test.
+        """
+        self.bsebot = bsebot_mocks.BSEBotMock()
+
+    @staticmethod
+    def _make_task(name: str, schedule: TaskSchedule | None, running: bool = False) -> mock.MagicMock:
+        """Creates a task with the given schedule."""
+        task = mock.MagicMock()
+        task.qualified_name = name
+        task.schedule = schedule
+        task.finished = False
+        task.task.is_running.return_value = running
+        task.task.next_iteration = None
+        return task
+
+    @mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock)
+    @mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock)
+    def _make_manager(self, startup_tasks: list[mock.MagicMock], all_tasks: list[mock.MagicMock]) -> TaskManager:
+        """Creates a TaskManager without starting its loop."""
+        with mock.patch.object(tasks.Loop, "start"):
+            return TaskManager(self.bsebot, startup_tasks, all_tasks)
+
+    def test_init(self) -> None:
+        """Tests the manager gives each task the scheduler."""
+        task = self._make_task("task", TaskSchedule(range(7), range(24)))
+        manager = self._make_manager([], [task])
+        assert task.scheduler is manager.scheduler
+
+    @freeze_time(NOW)
+    async def test_check_task_starts(self) -> None:
+        """Tests checking a task within its schedule starts it and schedules checking it at the end."""
+        task = self._make_task("task", TaskSchedule(range(7), [12]))
+        manager = self._make_manager([], [task])
+        await manager._check_task(task)
+        task.task.start.assert_called_once()
+        assert manager.scheduler.next_due() == datetime.datetime(2024, 1, 1, 13, tzinfo=datetime.UTC)
+
+    @freeze_time(NOW)
+    async def test_check_task_stops(self) -> None:
+        """Tests checking a running task outside its schedule stops it and schedules checking it at the start."""
+        task = self._make_task("task", TaskSchedule(range(7), [16]), running=True)
+        task.task.next_iteration = NOW + datetime.timedelta(hours=1)
+        manager = self._make_manager([], [task])
+        await manager._check_task(task)
+        task.task.start.assert_not_called()
+        task.task.stop.assert_called_once()
+        assert manager.scheduler.next_due() == datetime.datetime(2024, 1, 1, 16, tzinfo=datetime.UTC)
+
+    @freeze_time(NOW)
+    async def test_check_task_always(self) -> None:
+        """Tests checking a task that's always running doesn't schedule another check."""
+        task = self._make_task("task", TaskSchedule(range(7), range(24)))
+        manager = self._make_manager([], [task])
+        await manager._check_task(task)
+        task.task.start.assert_called_once()
+        assert not len(manager.scheduler)
+
+    @freeze_time(NOW)
+    async def test_check_task_overriden(self) -> None:
+        """Tests checking an overriden task starts it and checks it again in a minute."""
+        task = self._make_task("task", TaskSchedule(range(7), [3], 15, overriden=True))
+        manager = self._make_manager([], [task])
+        await manager._check_task(task)
+        task.task.start.assert_called_once()
+        assert manager.scheduler.next_due() == datetime.datetime(2024, 1, 1, 12, 1, tzinfo=datetime.UTC)
+
+    @freeze_time(NOW)
+    async def test_check_task_startup(self) -> None:
+        """Tests tasks wait for the start up tasks to finish and are checked once they have."""
+        startup_task = self._make_task("startup", TaskSchedule(range(7), [3], 15, overriden=True))
+        task = self._make_task("task", TaskSchedule(range(7), range(24)))
+        manager = self._make_manager([startup_task], [startup_task, task])
+
+        await manager._check_task(task)
+        task.task.start.assert_not_called()
+        assert ("task", "task") not in manager.scheduler
+
+        await manager._check_task(startup_task)
+        startup_task.task.start.assert_called_once()
+
+        startup_task.finished = True
+        startup_task.schedule.overriden = False
+        manager._on_task_done(startup_task, mock.MagicMock())
+        assert manager.scheduler.next_due() == NOW
+        for callback in manager.scheduler.pop_due(NOW):
+            await callback()
+        task.task.start.assert_called_once()
+        assert manager.scheduler.next_due() == datetime.datetime(2024, 1, 2, 3, 15, tzinfo=datetime.UTC)
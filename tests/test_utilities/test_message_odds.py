@@ -0,0 +1,67 @@
+"""Tests our calculate_message_odds function."""
+
+from unittest import mock
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from discordbot import utilities
+from mongo import interface
+from mongo.bsepoints.interactions import UserInteractions
+from tests.mocks import interface_mocks
+
+MESSAGES = ["Vally time {role}?", "Anyone for vally {role}?", "{role} - vally?"]
+
+
+@pytest.fixture
+def interactions() -> UserInteractions:
+    """Creates the interactions class with mocked collections."""
+    with (
+        mock.patch.object(interface, "get_collection", new=interface_mocks.get_collection_mock),
+        mock.patch.object(interface, "get_database", new=interface_mocks.get_database_mock),
+    ):
+        return UserInteractions()
+
+
+def test_counted(interactions: UserInteractions) -> None:
+    """Tests the odds come from the usage counts without searching the message history."""
+    counts = {MESSAGES[0]: 3, MESSAGES[1]: 1, MESSAGES[2]: 0}
+    with (
+        mock.patch.object(interactions.message_usages, "get_counts", return_value=counts) as get_counts_mock,
+        mock.patch.object(interactions, "query") as query_mock,
+    ):
+        odds = utilities.calculate_message_odds(interactions, 123, MESSAGES, "{role}", [0])
+
+    get_counts_mock.assert_called_once_with(123, MESSAGES)
+    query_mock.assert_not_called()
+    assert odds == [(MESSAGES[0], 25 + 25), (MESSAGES[1], 75), (MESSAGES[2], 100 + 25)]
+
+
+def test_seeded(interactions: UserInteractions) -> None:
+    """Tests messages without a usage count are counted from the message history once."""
+    history = [{"content": "Vally time @Valorant?"}, {"content": "Vally time? Nah"}]
+
+    def _query(query: dict[str, any], **_: any) -> list[dict[str, any]]:
+        if query["$text"]["$search"] == MESSAGES[2]:
+            msg = "text search failed"
+            raise OperationFailure(msg)
+        return history if query["$text"]["$search"] == MESSAGES[0] else []
+
+    with (
+        mock.patch.object(interactions.message_usages, "get_counts", return_value={MESSAGES[1]: 1}),
+        mock.patch.object(interactions.message_usages, "set_counts") as set_counts_mock,
+        mock.patch.object(interactions, "query", side_effect=_query) as query_mock,
+    ):
+        odds = utilities.calculate_message_odds(interactions, 123, MESSAGES, "{role}", [])
+
+    assert query_mock.call_count == 2
+    set_counts_mock.assert_called_once_with(123, {MESSAGES[0]: 1, MESSAGES[2]: 0})
+    assert odds == [(MESSAGES[0], 50), (MESSAGES[1], 50), (MESSAGES[2], 100 + 25)]
+
+
+def test_preset_odds(interactions: UserInteractions) -> None:
+    """Tests messages with odds already set are kept and badly formatted ones are skipped."""
+    messages = [("Preset {role}", 10), ("Bad {role}", "odds"), MESSAGES[0]]
+    with mock.patch.object(interactions.message_usages, "get_counts", return_value={MESSAGES[0]: 0}):
+        odds = utilities.calculate_message_odds(interactions, 123, messages, "{role}", [])
+    assert odds == [("Preset {role}", 10), (MESSAGES[0], 100 + 25)]
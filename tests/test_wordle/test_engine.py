@@ -0,0 +1,71 @@
+"""Tests our wordle solving engine."""
+
+import pytest
+
+from discordbot.wordle.engine import AnswerOracle, WordleEngine, get_tiles, solve_batch
+from discordbot.wordle.wordlist import WordList, load_word_list
+
+WORDS = ["speed", "abide", "eerie", "erase", "steed", "crane", "spend", "ended", "deeds"]
+
+
+@pytest.mark.parametrize(
+    ("guess", "answer", "expected"),
+    [
+        ("crane", "crane", ["correct"] * 5),
+        ("speed", "abide", ["absent", "absent", "present", "absent", "present"]),
+        # only the first two of the three 'e's are present
+        ("eerie", "speed", ["present", "present", "absent", "absent", "absent"]),
+        # the correct 'e' uses up one of the 'e's
+        ("eerie", "erase", ["correct", "absent", "present", "absent", "correct"]),
+    ],
+)
+def test_get_tiles(guess: str, answer: str, expected: list[str]) -> None:
+    """Tests working out the tiles for a guess."""
+    assert get_tiles(guess, answer) == expected
+
+
+class TestWordleEngine:
+    """Tests our WordleEngine class."""
+
+    async def test_answer_oracle(self) -> None:
+        """Tests the answer oracle gives the tiles for the answer."""
+        assert await AnswerOracle("crane").submit("erase") == get_tiles("erase", "crane")
+
+    async def test_update(self) -> None:
+        """Tests updating the engine with some tiles narrows down the candidates."""
+        engine = WordleEngine(WordList(WORDS))
+        engine.update("steed", get_tiles("steed", "speed"))
+        assert [engine.word_list.words[idx] for idx in engine.candidates] == ["speed"]
+        assert engine.pick_guess() == "speed"
+        engine.reset()
+        assert len(engine.candidates) == len(WORDS)
+
+    @pytest.mark.parametrize("entropy", [False, True])
+    async def test_play(self, entropy: bool) -> None:
+        """Tests playing a game against an oracle that knows the answer."""
+        engine = WordleEngine(WordList(WORDS), entropy=entropy)
+        for answer in WORDS:
+            game = await engine.play(AnswerOracle(answer), "erase")
+            assert game.solved
+            assert game.guesses[0] == "erase"
+            assert game.guesses[-1] == answer
+            assert game.states == [get_tiles(guess, answer) for guess in game.guesses]
+
+    async def test_play_fails(self) -> None:
+        """Tests we stop once we've run out of guesses."""
+        engine = WordleEngine(WordList(WORDS))
+        game = await engine.play(AnswerOracle("crane"), "deeds", max_guesses=1)
+        assert not game.solved
+        assert game.guesses == ["deeds"]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_solve_batch(processes: int) -> None:
+    """Tests solving a batch of answers, keeping them in order."""
+    answers = load_word_list().words[:: len(load_word_list()) // 10]
+    games = solve_batch(answers, "soare", entropy=True, processes=processes)
+    assert len(games) == len(answers)
+    for answer, game in zip(answers, games, strict=True):
+        assert game.guesses[0] == "soare"
+        if game.solved:
+            assert game.guesses[-1] == answer
@@ -0,0 +1,103 @@
+"""Tests our WordList class."""
+
+import pathlib
+
+import numpy as np
+import pytest
+
+from discordbot.wordle import wordlist
+from discordbot.wordle.wordlist import SOLVED_PATTERN, WordList, decode_pattern, encode_pattern
+
+WORDS = ["speed", "abide", "eerie", "erase", "steed", "crane", "spend", "ended", "deeds", "Upper", "toolong"]
+
+
+def _naive_pattern(guess: str, answer: str) -> int:
+    """Works out the feedback pattern a letter at a time."""
+    tiles = [0] * len(guess)
+    remaining: dict[str, int] = {}
+    for idx, (guess_letter, answer_letter) in enumerate(zip(guess, answer, strict=True)):
+        if guess_letter == answer_letter:
+            tiles[idx] = 2
+        else:
+            remaining[answer_letter] = remaining.get(answer_letter, 0) + 1
+    for idx, letter in enumerate(guess):
+        if tiles[idx] != 2 and remaining.get(letter):
+            tiles[idx] = 1
+            remaining[letter] -= 1
+    return encode_pattern(tiles)
+
+
+class TestWordList:
+    """Tests our WordList class."""
+
+    def test_init(self) -> None:
+        """Tests WordList ignores words that aren't five lowercase letters."""
+        word_list = WordList(WORDS)
+        assert len(word_list) == len(WORDS) - 2
+        assert word_list.words == sorted(WORDS[:-2])
+        speed = word_list.index("speed")
+        assert word_list.letters[speed].tolist() == [18, 15, 4, 4, 3]
+        assert word_list.masks[speed].tolist() == [1 << 18, 1 << 15, 1 << 4, 1 << 4, 1 << 3]
+        assert word_list.counts[speed, 4] == 2
+
+    def test_patterns(self) -> None:
+        """Tests encoding and decoding patterns."""
+        pattern = encode_pattern(["absent", "present", "correct", "absent", "correct"])
+        assert decode_pattern(pattern) == [0, 1, 2, 0, 2]
+        assert encode_pattern([2] * 5) == SOLVED_PATTERN
+
+    def test_feedback(self) -> None:
+        """Tests the feedback patterns, including repeated letters."""
+        word_list = WordList(WORDS)
+        for guess in word_list.words:
+            row = word_list.feedback(word_list.index(guess))
+            assert row.tolist() == [_naive_pattern(guess, answer) for answer in word_list.words]
+            assert row[word_list.index(guess)] == SOLVED_PATTERN
+
+    def test_feedback_cache(self) -> None:
+        """Tests the feedback rows are cached and the cache is bounded."""
+        word_list = WordList(WORDS, cache_size=2)
+        row = word_list.feedback(0)
+        assert word_list.feedback(0) is row
+        word_list.feedback(1)
+        word_list.feedback(2)
+        assert word_list.feedback(0) is not row
+
+    @pytest.mark.parametrize("guess", ["speed", "eerie", "deeds", "fjord"])
+    def test_filter(self, guess: str) -> None:
+        """Tests filtering keeps exactly the words that would give the same feedback, even for unknown guesses."""
+        word_list = WordList(WORDS)
+        for answer in word_list.words:
+            pattern = _naive_pattern(guess, answer)
+            candidates = word_list.filter(word_list.all(), guess, pattern)
+            expected = [word for word in word_list.words if _naive_pattern(guess, word) == pattern]
+            assert [word_list.words[idx] for idx in candidates] == expected
+
+    def test_entropies(self) -> None:
+        """Tests working out the information each guess gives."""
+        word_list = WordList(["aaaaa", "bbbbb", "ccccc", "ddddd"])
+        candidates = word_list.all()
+        entropies = word_list.entropies(candidates, candidates)
+        # each guess tells us if it's that word or one of the other three
+        assert entropies == pytest.approx([-(0.25 * np.log2(0.25) + 0.75 * np.log2(0.75))] * 4)
+
+    def test_best_guess(self) -> None:
+        """Tests picking the guess that splits the candidates up the most."""
+        word_list = WordList(["aaaaa", "bbbbb", "ccccc", "abcde"])
+        candidates = np.array([word_list.index(word) for word in ("aaaaa", "bbbbb", "ccccc")])
+        # guessing "abcde" tells us which of the three it is but can't be the answer
+        assert word_list.words[word_list.best_guess(candidates, word_list.all())] == "abcde"
+        assert word_list.words[word_list.best_guess(candidates)] in {"aaaaa", "bbbbb", "ccccc"}
+
+    def test_pick_weighted(self) -> None:
+        """Tests picking a word weighted by frequency."""
+        word_list = WordList(WORDS, {"crane": 1.0})
+        assert word_list.words[word_list.pick_weighted(word_list.all())] == "crane"
+        # no frequencies to go on
+        assert word_list.pick_weighted(np.array([0, 1])) in {0, 1}
+
+    def test_wordle_guesses(self) -> None:
+        """Tests all of our wordle guesses are valid words."""
+        path = pathlib.Path(wordlist.__file__).parent / "wordle_guesses"
+        words = path.read_text(encoding="utf-8").split()
+        assert len(WordList(words)) == len(words)